@@ -0,0 +1,284 @@
+"""
+Micro-benchmark the RepographBuilder on synthetic inspect4py workloads.
+
+Each workload is built against an in-memory graph sink, so neither a Neo4j instance nor any
+cloned repositories are required. For each scale the suite reports the time spent in each
+builder phase, the overall throughput in functions per second, and the peak memory
+allocated during the build. Results are compared against a stored baseline, and the suite
+exits with a non-zero status if throughput or peak memory regress beyond a tolerance.
+
+Usage:
+    python -m evaluation.benchmark
+    python -m evaluation.benchmark --scales 1000 10000 100000 1000000
+    python -m evaluation.benchmark --update-baseline
+"""
+# Base imports
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+# pip imports
+from pydantic import BaseModel
+
+# Build entity imports
+from repograph.entities.build.builder import RepographBuilder
+from repograph.entities.build.sinks import MemoryGraphSink
+
+# Utils
+from repograph.utils.logging import configure_logging
+
+# Evaluation imports
+from evaluation.synthetic import WorkloadConfig, generate_workload
+
+DEFAULT_SCALES = [1000, 10000, 100000]
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+
+DEFAULT_TOLERANCE = 0.25
+
+
+class BenchmarkResult(BaseModel):
+    """Result of benchmarking the builder at a single scale."""
+
+    functions: int
+    nodes: int
+    relationships: int
+    seconds: float
+    throughput: float
+    peak_memory_mb: Optional[float]
+    phases: Dict[str, float]
+
+
+def run_build(
+    config: WorkloadConfig,
+) -> Tuple[RepographBuilder, MemoryGraphSink, float]:
+    """Generate a workload and build it into an in-memory sink.
+
+    Generation is excluded from the timing.
+
+    Args:
+        config (WorkloadConfig): The workload config.
+
+    Returns:
+        RepographBuilder: The builder, with its instrumented phases.
+        MemoryGraphSink: The sink that was written to.
+        float: The build time in seconds.
+    """
+    directory_info, call_graph = generate_workload(config)
+    sink = MemoryGraphSink()
+    builder = RepographBuilder(None, "tmp", config.name, None, None, sink=sink)
+
+    gc.collect()
+    start = time.perf_counter()
+    builder.build(directory_info, call_graph)
+    return builder, sink, time.perf_counter() - start
+
+
+def measure_peak_memory(config: WorkloadConfig) -> float:
+    """Measure the peak memory allocated while building a workload.
+
+    Tracing slows down allocation, so this is done in a separate, untimed build.
+
+    Args:
+        config (WorkloadConfig): The workload config.
+
+    Returns:
+        float: The peak memory in MiB.
+    """
+    directory_info, call_graph = generate_workload(config)
+    builder = RepographBuilder(
+        None, "tmp", config.name, None, None, sink=MemoryGraphSink()
+    )
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        builder.build(directory_info, call_graph)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak / (1024 * 1024)
+
+
+def benchmark(functions: int, repeat: int = 3, memory: bool = True) -> BenchmarkResult:
+    """Benchmark the builder on a synthetic workload with a given number of functions.
+
+    Args:
+        functions (int): The number of functions and methods in the workload.
+        repeat (int): The number of timed builds. The fastest is reported.
+        memory (bool): Whether to measure peak memory.
+
+    Returns:
+        BenchmarkResult
+    """
+    config = WorkloadConfig.for_function_count(functions)
+
+    best = None
+    for _ in range(max(repeat, 1)):
+        builder, sink, seconds = run_build(config)
+        if best is None or seconds < best[2]:
+            phases = {
+                phase.name: phase.wall_time for phase in builder.instrumentation.phases
+            }
+            best = (phases, sink, seconds)
+        del builder, sink
+
+    phases, sink, seconds = best
+    return BenchmarkResult(
+        functions=config.function_count,
+        nodes=sink.node_count,
+        relationships=sink.relationship_count,
+        seconds=seconds,
+        throughput=config.function_count / seconds,
+        peak_memory_mb=measure_peak_memory(config) if memory else None,
+        phases=phases,
+    )
+
+
+def compare(
+    results: List[BenchmarkResult], baseline: Dict, tolerance: float
+) -> List[str]:
+    """Compare results against a baseline.
+
+    Args:
+        results (List[BenchmarkResult]): The benchmark results.
+        baseline (Dict): The baseline, keyed by function count.
+        tolerance (float): The allowed relative regression, e.g. 0.25 for 25%.
+
+    Returns:
+        List[str]: A description of each regression.
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(str(result.functions))
+        if not expected:
+            continue
+
+        minimum_throughput = expected["throughput"] * (1 - tolerance)
+        if result.throughput < minimum_throughput:
+            regressions.append(
+                f"{result.functions} functions: throughput {result.throughput:,.0f}/s "
+                f"is below {minimum_throughput:,.0f}/s"
+            )
+
+        if result.peak_memory_mb is not None and expected.get("peak_memory_mb"):
+            maximum_memory = expected["peak_memory_mb"] * (1 + tolerance)
+            if result.peak_memory_mb > maximum_memory:
+                regressions.append(
+                    f"{result.functions} functions: peak memory "
+                    f"{result.peak_memory_mb:,.1f} MiB is above {maximum_memory:,.1f} MiB"
+                )
+
+    return regressions
+
+
+def report(results: List[BenchmarkResult]) -> None:
+    """Print a table of results.
+
+    Args:
+        results (List[BenchmarkResult]): The benchmark results.
+
+    Returns:
+        None
+    """
+    phases = list(results[0].phases.keys()) if results else []
+    header = ["Functions", "Nodes", "Rels", "Time (s)", "Functions/s", "Peak MiB"]
+    print(" | ".join(header + phases))
+    for result in results:
+        row = [
+            f"{result.functions:,}",
+            f"{result.nodes:,}",
+            f"{result.relationships:,}",
+            f"{result.seconds:.3f}",
+            f"{result.throughput:,.0f}",
+            f"{result.peak_memory_mb:,.1f}" if result.peak_memory_mb else "-",
+        ]
+        row += [f"{result.phases.get(phase, 0):.3f}" for phase in phases]
+        print(" | ".join(row))
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the benchmark suite.
+
+    Args:
+        argv (List[str]): Optional command line arguments.
+
+    Returns:
+        int: The exit status. Non-zero if a regression was detected.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="Function counts."
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed builds per scale.")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip peak memory measurement."
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed relative regression against the baseline.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the results to the baseline file instead of comparing.",
+    )
+    parser.add_argument("--output", help="Optional file to write JSON results to.")
+    args = parser.parse_args(argv)
+
+    configure_logging(logging.CRITICAL)
+
+    results = []
+    for functions in args.scales:
+        result = benchmark(functions, repeat=args.repeat, memory=not args.no_memory)
+        results.append(result)
+
+    report(results)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump([result.dict() for result in results], file, indent=2)
+
+    if args.update_baseline:
+        baseline = dict()
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        for result in results:
+            baseline[str(result.functions)] = {
+                "throughput": round(result.throughput, 1),
+                "peak_memory_mb": (
+                    round(result.peak_memory_mb, 1) if result.peak_memory_mb else None
+                ),
+            }
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(f"Updated baseline: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found, skipping regression check.")
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Measure how long it takes to import the API and, optionally, to warm up its models.
+
+Each module is imported in a fresh interpreter, so that nothing is already cached. The
+suite reports the import time of each module and which heavy dependencies (torch,
+transformers, sentence_transformers and nltk) the import pulled in. Models are loaded
+on first use, so importing should pull in none of them. The suite exits with a non-zero
+status if it does, or if an import takes longer than a maximum.
+
+With --warm-up, the time taken to load and first run the semantic search and
+summarization models is also measured. This requires the models' dependencies, and the
+models are downloaded on the first run.
+
+Usage:
+    python -m evaluation.startup
+    python -m evaluation.startup --modules repograph.api repograph.worker --repeat 5
+    python -m evaluation.startup --warm-up
+"""
+# Base imports
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import List, Optional
+
+# pip imports
+from pydantic import BaseModel
+
+DEFAULT_MODULES = ["repograph.api", "repograph.container"]
+
+# Dependencies that are slow to import, and are only needed once a model is used
+HEAVY_MODULES = ["torch", "transformers", "sentence_transformers", "nltk"]
+
+DEFAULT_REPEAT = 3
+
+# Imports a module, printing the time taken and the heavy modules it imported as JSON
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+
+class StartupResult(BaseModel):
+    """Result of importing a single module."""
+
+    module: str
+    seconds: float
+    heavy_modules: List[str]
+
+
+class WarmUpResult(BaseModel):
+    """Time taken to load and first run each model."""
+
+    search: float
+    summarization: float
+
+
+def measure_import(module: str, repeat: int = DEFAULT_REPEAT) -> StartupResult:
+    """Import a module in fresh interpreters.
+
+    Args:
+        module (str): The module.
+        repeat (int): The number of times to import the module.
+
+    Returns:
+        StartupResult: The median import time, and the heavy modules imported.
+
+    Raises:
+        RuntimeError: If the module can't be imported.
+    """
+    script = IMPORT_SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+
+    times = []
+    heavy = []
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True
+        )
+        if process.returncode != 0:
+            raise RuntimeError(f"Unable to import {module}:\n{process.stderr}")
+
+        output = json.loads(process.stdout.strip().splitlines()[-1])
+        times.append(output["seconds"])
+        heavy = output["heavy"]
+
+    return StartupResult(
+        module=module, seconds=statistics.median(times), heavy_modules=heavy
+    )
+
+
+def measure_warm_up() -> WarmUpResult:
+    """Load and first run the semantic search and summarization models.
+
+    Returns:
+        WarmUpResult
+    """
+    from repograph.entities.search.service import SearchService
+    from repograph.entities.summarization.service import SummarizationService
+
+    return WarmUpResult(
+        search=SearchService(None).warm_up(),
+        summarization=SummarizationService(True).warm_up(),
+    )
+
+
+def report(results: List[StartupResult], warm_up: Optional[WarmUpResult]) -> None:
+    """Print a table of results.
+
+    Args:
+        results (List[StartupResult]): The import results.
+        warm_up (Optional[WarmUpResult]): The warm-up result, if measured.
+
+    Returns:
+        None
+    """
+    print(" | ".join(["Module", "Import (s)", "Heavy modules"]))
+    for result in results:
+        row = [
+            result.module,
+            f"{result.seconds:.3f}",
+            ", ".join(result.heavy_modules) or "-",
+        ]
+        print(" | ".join(row))
+
+    if warm_up:
+        print(f"Search model warm-up: {warm_up.search:.3f}s")
+        print(f"Summarization model warm-up: {warm_up.summarization:.3f}s")
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the startup benchmark.
+
+    Args:
+        argv (List[str]): Optional command line arguments.
+
+    Returns:
+        int: The exit status. Non-zero if an import pulled in a heavy module, or took
+             longer than the maximum.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--modules", nargs="+", default=DEFAULT_MODULES, help="Modules to import."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help="Imports per module."
+    )
+    parser.add_argument(
+        "--max-seconds", type=float, help="Maximum median import time of a module."
+    )
+    parser.add_argument(
+        "--warm-up", action="store_true", help="Also measure loading the models."
+    )
+    parser.add_argument("--output", help="Optional file to write JSON results to.")
+    args = parser.parse_args(argv)
+
+    results = [measure_import(module, args.repeat) for module in args.modules]
+    warm_up = measure_warm_up() if args.warm_up else None
+
+    report(results, warm_up)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "imports": [result.dict() for result in results],
+                    "warm_up": warm_up.dict() if warm_up else None,
+                },
+                file,
+                indent=2,
+            )
+
+    failed = False
+    for result in results:
+        if result.heavy_modules:
+            print(f"{result.module} imports {', '.join(result.heavy_modules)}")
+            failed = True
+        if args.max_seconds and result.seconds > args.max_seconds:
+            print(
+                f"{result.module} takes {result.seconds:.3f}s to import, more than "
+                f"{args.max_seconds:.3f}s"
+            )
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""
+Compare the summarization inference backends against the full-precision PyTorch baseline.
+
+Functions are taken from the Python files of a directory (by default, the repograph
+package itself) and summarized by the baseline, which is PyTorch with the model's default
+generation settings, and by each backend. For each backend the suite reports how many
+summarizations agree exactly with the baseline, their mean token-level similarity, and
+the generation throughput in tokens per second. The suite exits with a non-zero status
+if a backend's agreement is below a threshold.
+
+Requires torch, and optimum[onnxruntime] for the ONNX backends. The model is downloaded
+on the first run.
+
+Usage:
+    python -m evaluation.summarization_parity
+    python -m evaluation.summarization_parity --backends quantized onnx --num_beams 1
+    python -m evaluation.summarization_parity --functions 200 --min-agreement 0.8
+"""
+# Base imports
+import argparse
+import ast
+import difflib
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+# pip imports
+from pydantic import BaseModel
+
+# Summarization entity imports
+from repograph.entities.summarization.backends import INFERENCE_BACKENDS
+from repograph.entities.summarization.models import GenerationSettings
+from repograph.entities.summarization.service import SummarizationService
+
+# Utils
+from repograph.utils.logging import configure_logging
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "repograph")
+
+DEFAULT_FUNCTIONS = 50
+
+DEFAULT_MIN_AGREEMENT = 0.0
+
+
+class ParityResult(BaseModel):
+    """Result of summarizing the sample functions with a single backend."""
+
+    backend: str
+    generation: GenerationSettings
+    functions: int
+    agreement: float
+    similarity: float
+    tokens: int
+    seconds: float
+    tokens_per_second: float
+    speedup: Optional[float]
+
+
+def sample_functions(path: str, count: int) -> List[str]:
+    """Get the source code of functions in the Python files of a directory.
+
+    Args:
+        path (str): The directory.
+        count (int): The maximum number of functions.
+
+    Returns:
+        List[str]: The source code of the functions, in a deterministic order.
+    """
+    functions = []
+    for file_path in sorted(glob.glob(os.path.join(path, "**", "*.py"), recursive=True)):
+        with open(file_path) as file:
+            source = file.read()
+
+        for node in ast.walk(ast.parse(source)):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                segment = ast.get_source_segment(source, node)
+                if segment:
+                    functions.append(segment)
+                if len(functions) >= count:
+                    return functions
+
+    return functions
+
+
+def summarize_all(
+    service: SummarizationService, functions: List[str]
+) -> Tuple[List[str], int, float]:
+    """Summarize functions, timing generation.
+
+    Args:
+        service (SummarizationService): The service to summarize with.
+        functions (List[str]): The source code of the functions.
+
+    Returns:
+        List[str]: The summarizations.
+        int: The number of tokens generated.
+        float: The time taken, in seconds.
+    """
+    # Warm up, so that one-off initialisation isn't timed
+    service.summarize_code(functions[0])
+
+    summaries = []
+    start = time.perf_counter()
+    for function in functions:
+        summaries.append(service.summarize_code(function))
+    seconds = time.perf_counter() - start
+
+    tokens = sum(len(service.tokenizer(summary).input_ids) for summary in summaries)
+    return summaries, tokens, seconds
+
+
+def compare(
+    backend: str,
+    generation: GenerationSettings,
+    summaries: List[str],
+    baseline: List[str],
+    tokens: int,
+    seconds: float,
+    baseline_seconds: Optional[float],
+) -> ParityResult:
+    """Compare a backend's summarizations with the baseline's.
+
+    Args:
+        backend (str): The backend.
+        generation (GenerationSettings): The generation settings used.
+        summaries (List[str]): The backend's summarizations.
+        baseline (List[str]): The baseline's summarizations.
+        tokens (int): The number of tokens the backend generated.
+        seconds (float): The time the backend took.
+        baseline_seconds (Optional[float]): The time the baseline took.
+
+    Returns:
+        ParityResult
+    """
+    similarity = [
+        difflib.SequenceMatcher(None, summary.split(), expected.split()).ratio()
+        for summary, expected in zip(summaries, baseline)
+    ]
+    return ParityResult(
+        backend=backend,
+        generation=generation,
+        functions=len(summaries),
+        agreement=sum(a == b for a, b in zip(summaries, baseline)) / len(summaries),
+        similarity=sum(similarity) / len(similarity),
+        tokens=tokens,
+        seconds=seconds,
+        tokens_per_second=tokens / seconds,
+        speedup=baseline_seconds / seconds if baseline_seconds else None,
+    )
+
+
+def report(results: List[ParityResult]) -> None:
+    """Print a table of results.
+
+    Args:
+        results (List[ParityResult]): The results.
+
+    Returns:
+        None
+    """
+    header = ["Backend", "Beams", "Agreement", "Similarity", "Tokens/s", "Speedup"]
+    print(" | ".join(header))
+    for result in results:
+        row = [
+            result.backend,
+            str(result.generation.num_beams or "default"),
+            f"{result.agreement:.1%}",
+            f"{result.similarity:.3f}",
+            f"{result.tokens_per_second:,.1f}",
+            f"{result.speedup:.2f}x" if result.speedup else "-",
+        ]
+        print(" | ".join(row))
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the parity suite.
+
+    Args:
+        argv (List[str]): Optional command line arguments.
+
+    Returns:
+        int: The exit status. Non-zero if a backend's agreement is below the minimum.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=INFERENCE_BACKENDS,
+        choices=INFERENCE_BACKENDS,
+        help="Backends to compare with the baseline.",
+    )
+    parser.add_argument(
+        "--num_beams", type=int, help="Beams for the backends. 1 is greedy decoding."
+    )
+    parser.add_argument(
+        "--max_length", type=int, help="Maximum summarization length for the backends."
+    )
+    parser.add_argument("--path", default=DEFAULT_PATH, help="Directory of functions.")
+    parser.add_argument(
+        "--functions", type=int, default=DEFAULT_FUNCTIONS, help="Functions to sample."
+    )
+    parser.add_argument(
+        "--min-agreement",
+        type=float,
+        default=DEFAULT_MIN_AGREEMENT,
+        help="Minimum fraction of summarizations that must match the baseline.",
+    )
+    parser.add_argument("--output", help="Optional file to write JSON results to.")
+    args = parser.parse_args(argv)
+
+    configure_logging(logging.WARNING)
+
+    functions = sample_functions(args.path, args.functions)
+    if not functions:
+        print(f"No functions found in {args.path}")
+        return 1
+
+    baseline_generation = GenerationSettings()
+    baseline, tokens, baseline_seconds = summarize_all(
+        SummarizationService(True, generation=baseline_generation), functions
+    )
+    results = [
+        compare(
+            "pytorch",
+            baseline_generation,
+            baseline,
+            baseline,
+            tokens,
+            baseline_seconds,
+            baseline_seconds,
+        )
+    ]
+
+    generation = GenerationSettings(num_beams=args.num_beams, max_length=args.max_length)
+    for backend in args.backends:
+        if backend == "pytorch" and generation == baseline_generation:
+            continue
+
+        service = SummarizationService(True, backend=backend, generation=generation)
+        summaries, tokens, seconds = summarize_all(service, functions)
+        results.append(
+            compare(
+                backend,
+                generation,
+                summaries,
+                baseline,
+                tokens,
+                seconds,
+                baseline_seconds,
+            )
+        )
+        del service
+
+    report(results)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump([result.dict() for result in results], file, indent=2)
+
+    failures = [result for result in results if result.agreement < args.min_agreement]
+    for result in failures:
+        print(
+            f"{result.backend}: agreement {result.agreement:.1%} is below "
+            f"{args.min_agreement:.1%}"
+        )
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
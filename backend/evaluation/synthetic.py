@@ -0,0 +1,313 @@
+"""
+Deterministic generator of synthetic inspect4py output.
+
+Produces directory_info and call_graph JSON in the shape emitted by inspect4py, with tunable
+numbers of directories, modules, functions, classes, calls and imports, so that the
+RepographBuilder can be exercised at arbitrary scale without cloning real repositories.
+"""
+# Base imports
+import json
+import math
+import os
+import random
+from typing import List, Tuple
+
+# pip imports
+from pydantic import BaseModel
+
+# Utility imports
+from repograph.utils import JSONDict
+
+INIT = "__init__"
+
+EXTERNAL_MODULES = ["os", "sys", "json", "re", "typing", "logging", "itertools"]
+
+BUILTIN_CALLS = ["len", "print", "isinstance", "sorted", "range", "str"]
+
+
+class WorkloadConfig(BaseModel):
+    """Shape of a synthetic repository.
+
+    Every directory is a package containing an __init__ module and `modules_per_directory`
+    further modules. Directories form a tree with `directory_fanout` children per package.
+    """
+
+    name: str = "synthetic"
+    directories: int = 10
+    directory_fanout: int = 4
+    modules_per_directory: int = 10
+    functions_per_module: int = 10
+    classes_per_module: int = 2
+    methods_per_class: int = 5
+    calls_per_function: int = 5
+    imports_per_module: int = 5
+    external_imports_per_module: int = 2
+    class_hierarchy_depth: int = 2
+    docstring_ratio: float = 0.5
+    seed: int = 0
+
+    @property
+    def functions_per_directory(self) -> int:
+        """The number of functions and methods in each directory."""
+        return self.modules_per_directory * (
+            self.functions_per_module + self.classes_per_module * self.methods_per_class
+        )
+
+    @property
+    def function_count(self) -> int:
+        """The total number of functions and methods in the workload."""
+        return self.directories * self.functions_per_directory
+
+    @classmethod
+    def for_function_count(cls, functions: int, **kwargs) -> "WorkloadConfig":
+        """Create a config with enough directories to contain a number of functions.
+
+        Args:
+            functions (int): The approximate number of functions and methods.
+            **kwargs: Overrides for the other config values.
+
+        Returns:
+            WorkloadConfig
+        """
+        config = cls(**kwargs)
+        directories = max(1, math.ceil(functions / config.functions_per_directory))
+        return config.copy(update={"directories": directories})
+
+
+def _directory_path(config: WorkloadConfig, index: int) -> str:
+    """Get the path of a directory, relative to the repository root.
+
+    Args:
+        config (WorkloadConfig): The workload config.
+        index (int): The index of the directory.
+
+    Returns:
+        str
+    """
+    parts = []
+    while index >= 0:
+        parts.append(f"pkg_{index}")
+        index = index // config.directory_fanout - 1
+    return "/".join(reversed(parts))
+
+
+def _create_function(
+    rng: random.Random, name: str, line: int, documented: bool
+) -> JSONDict:
+    """Create the directory_info entry of a function or method.
+
+    Args:
+        rng (random.Random): The random number generator.
+        name (str): The function name.
+        line (int): The first line of the function.
+        documented (bool): Whether the function has a docstring.
+
+    Returns:
+        JSONDict
+    """
+    args = [f"arg_{i}" for i in range(rng.randint(0, 3))]
+    info = {
+        "args": args,
+        "annotated_arg_types": {arg: "int" for arg in args},
+        "annotated_return_type": "int",
+        "returns": [args[0] if args else "None"],
+        "min_max_lineno": {"min_lineno": line, "max_lineno": line + 4},
+        "source_code": f"def {name}({', '.join(args)}):\n    return {args[0] if args else None}\n",
+        "ast": [{"id": 0, "type": "FunctionDef", "value": name, "children": []}],
+    }
+
+    if documented:
+        info["doc"] = {
+            "short_description": f"Compute {name.replace('_', ' ')}.",
+            "long_description": f"Synthetic function {name}.",
+            "args": {
+                arg: {"description": f"The {arg}.", "type_name": "int"} for arg in args
+            },
+            "returns": {"description": "The result.", "type_name": "int"},
+        }
+
+    return info
+
+
+def generate_workload(config: WorkloadConfig) -> Tuple[JSONDict, JSONDict]:
+    """Generate synthetic inspect4py output.
+
+    The output is fully determined by the config, including its seed.
+
+    Args:
+        config (WorkloadConfig): The workload config.
+
+    Returns:
+        JSONDict: directory_info.json
+        JSONDict: call_graph.json
+    """
+    rng = random.Random(config.seed)
+    root = f"tmp/{config.name}"
+
+    # Canonical names of every non-init module
+    canonical_modules: List[str] = []
+    for directory in range(config.directories):
+        package = _directory_path(config, directory).replace("/", ".")
+        for module in range(config.modules_per_directory):
+            canonical_modules.append(f"{package}.mod_{module}")
+
+    directory_info: JSONDict = {
+        root: [
+            {
+                "file": {
+                    "path": f"{config.name}/main.py",
+                    "fileNameBase": "main",
+                    "extension": "py",
+                },
+                "dependencies": [],
+                "is_test": False,
+            }
+        ]
+    }
+    call_graph: JSONDict = {root: {}}
+
+    module_index = 0
+    for directory in range(config.directories):
+        path = f"{config.name}/{_directory_path(config, directory)}"
+        files = [
+            {
+                "file": {
+                    "path": f"{path}/{INIT}.py",
+                    "fileNameBase": INIT,
+                    "extension": "py",
+                },
+                "is_test": False,
+            }
+        ]
+
+        for module in range(config.modules_per_directory):
+            file_path = f"{path}/mod_{module}.py"
+            line = 1
+
+            # Module level functions
+            functions = dict()
+            for function in range(config.functions_per_module):
+                functions[f"func_{function}"] = _create_function(
+                    rng, f"func_{function}", line, rng.random() < config.docstring_ratio
+                )
+                line += 5
+
+            # Classes, extending the previous class in the module to form hierarchies
+            classes = dict()
+            for class_index in range(config.classes_per_module):
+                methods = dict()
+                for method in range(config.methods_per_class):
+                    methods[f"method_{method}"] = _create_function(
+                        rng,
+                        f"method_{method}",
+                        line,
+                        rng.random() < config.docstring_ratio,
+                    )
+                    line += 5
+
+                extend = []
+                if class_index % max(config.class_hierarchy_depth, 1) != 0:
+                    extend.append(f"Class_{class_index - 1}")
+
+                classes[f"Class_{class_index}"] = {
+                    "min_max_lineno": {
+                        "min_lineno": line - 5 * config.methods_per_class,
+                        "max_lineno": line,
+                    },
+                    "methods": methods,
+                    "extend": extend,
+                }
+
+            # Imports of functions defined in other modules, and of external modules
+            imported = []
+            dependencies = []
+            if len(canonical_modules) > 1:
+                for _ in range(config.imports_per_module):
+                    source = canonical_modules[rng.randrange(len(canonical_modules))]
+                    if source == canonical_modules[module_index]:
+                        continue
+                    name = f"func_{rng.randrange(max(config.functions_per_module, 1))}"
+                    dependencies.append(
+                        {
+                            "from_module": source,
+                            "import": name,
+                            "type": "internal",
+                            "type_element": "module",
+                        }
+                    )
+                    imported.append(f"{source}.{name}")
+
+            for external in rng.sample(
+                EXTERNAL_MODULES,
+                min(config.external_imports_per_module, len(EXTERNAL_MODULES)),
+            ):
+                dependencies.append(
+                    {"import": external, "type": "external", "type_element": "module"}
+                )
+
+            files.append(
+                {
+                    "file": {
+                        "path": file_path,
+                        "fileNameBase": f"mod_{module}",
+                        "extension": "py",
+                    },
+                    "dependencies": dependencies,
+                    "functions": functions,
+                    "classes": classes,
+                    "is_test": False,
+                }
+            )
+
+            # Calls: local functions, imported functions, built-ins and unresolvable calls
+            function_calls = dict()
+            for function in functions:
+                calls = []
+                for _ in range(config.calls_per_function):
+                    kind = rng.random()
+                    if kind < 0.5 and config.functions_per_module > 1:
+                        calls.append(
+                            f"func_{rng.randrange(config.functions_per_module)}"
+                        )
+                    elif kind < 0.75 and imported:
+                        calls.append(rng.choice(imported))
+                    elif kind < 0.9:
+                        calls.append(rng.choice(BUILTIN_CALLS))
+                    else:
+                        calls.append("self.helper")
+                function_calls[function] = {"local": calls}
+
+            call_graph[root][file_path] = {
+                "functions": function_calls,
+                "body": {"local": [rng.choice(BUILTIN_CALLS)]},
+            }
+            module_index += 1
+
+        directory_info[f"{root}/{_directory_path(config, directory)}"] = files
+
+    directory_info["directory_tree"] = {}
+    directory_info["software_type"] = "package"
+
+    return directory_info, call_graph
+
+
+def write_workload(config: WorkloadConfig, path: str) -> None:
+    """Write synthetic inspect4py output to a directory.
+
+    The directory can be parsed with BuildService.parse_inspect4py_output.
+
+    Args:
+        config (WorkloadConfig): The workload config.
+        path (str): The output directory.
+
+    Returns:
+        None
+    """
+    directory_info, call_graph = generate_workload(config)
+    os.makedirs(path, exist_ok=True)
+
+    with open(os.path.join(path, "directory_info.json"), "w") as file:
+        json.dump(directory_info, file)
+
+    with open(os.path.join(path, "call_graph.json"), "w") as file:
+        json.dump(call_graph, file)
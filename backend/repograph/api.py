@@ -4,6 +4,7 @@ API entrypoint.
 """
 # Base imports
 import logging
+from typing import Dict
 
 # pip imports
 from dependency_injector.wiring import inject, Provide
@@ -17,9 +18,12 @@ from repograph.container import ApplicationContainer
 
 # Entity imports
 from repograph.entities.build.router import BuildRouter
+from repograph.entities.build.runner import BuildRunnerPool
 from repograph.entities.graph.router import GraphRouter
 from repograph.entities.search.router import SearchRouter
+from repograph.entities.search.service import SearchService
 from repograph.entities.metadata.router import MetadataRouter
+from repograph.entities.summarization.service import SummarizationService
 
 # Utilities
 from repograph.utils.exception_handlers import generic_exception_handler
@@ -38,6 +42,15 @@ def create_app(
     metadata_router: MetadataRouter = Provide[
         ApplicationContainer.metadata.container.router
     ],
+    build_workers: BuildRunnerPool = Provide[
+        ApplicationContainer.build.container.workers
+    ],
+    search_service: SearchService = Provide[
+        ApplicationContainer.search.container.service
+    ],
+    summarization_service: SummarizationService = Provide[
+        ApplicationContainer.summarization.container.service
+    ],
 ) -> FastAPI:
     """Creates FastAPI application.
 
@@ -46,6 +59,10 @@ def create_app(
         graph_router (GraphRouter): The graph entity router.
         search_router (SearchRouter): The search entity router.
         metadata_router (MetadataRouter): The metadata entity router.
+        build_workers (BuildRunnerPool): The workers executing queued builds.
+        search_service (SearchService): The search service, to warm up.
+        summarization_service (SummarizationService): The summarization service, to
+                                                      warm up.
 
     Returns:
         FastAPI: Initialised FastAPI application object.
@@ -60,8 +77,10 @@ def create_app(
     application.include_router(graph_router.router)
     application.include_router(search_router.router)
     application.include_router(build_router.router)
+    application.include_router(build_router.jobRouter)
     application.include_router(metadata_router.router)
     application.include_router(search_router.graphRouter)
+    application.include_router(search_router.cacheRouter)
 
     # Configure CORS, https://developer.mozilla.org/en-US/docs/Web/HTTP/CORS
     application.add_middleware(
@@ -72,6 +91,20 @@ def create_app(
         allow_headers=["*"],
     )
 
+    # Run queued builds outside the API event loop, for the lifetime of the application
+    application.add_event_handler("startup", build_workers.start)
+    application.add_event_handler("shutdown", build_workers.stop)
+
+    # Models are loaded on first use. Warming them up loads them ahead of time.
+    def warm_up() -> Dict[str, float]:
+        """Load and run the models, returning the seconds each took."""
+        return {
+            "search": search_service.warm_up(),
+            "summarization": summarization_service.warm_up(),
+        }
+
+    application.add_api_route("/warmup", warm_up, methods=["POST"], tags=["Models"])
+
     # Add exception handlers
     application.add_exception_handler(Exception, generic_exception_handler)
 
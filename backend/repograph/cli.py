@@ -4,7 +4,9 @@ Command-Line Interface for manual invocation.
 """
 # Base imports
 import logging
-from typing import List
+import shlex
+import subprocess
+from typing import List, Optional
 
 # pip imports
 import configargparse
@@ -16,7 +18,11 @@ from repograph.container import ApplicationContainer
 # Build service
 from repograph.entities.build.service import BuildService
 
+# Graph service
+from repograph.entities.graph.service import GraphService
+
 # Utilities
+from repograph.utils.arguments import add_build_arguments
 from repograph.utils.logging import configure_logging
 
 # Configure logging format
@@ -25,20 +31,16 @@ log = logging.getLogger("repograph.cli")
 
 # Command-line / config-file argument parsing
 p = configargparse.ArgParser(default_config_files=["../default_config.yaml"])
-p.add_argument("-c", "--config", is_config_file=True, help="Config file path.")
-p.add_argument("--uri", required=True, help="The URI of the Neo4J server.")
-p.add_argument(
-    "--driver_uri", required=True, help="Alternative URI of the Neo4J server."
-)
 p.add_argument(
-    "--username", required=True, help="The username to supply to the Neo4J server."
-)
-p.add_argument(
-    "--password", required=True, help="The password to supply to the Neo4J server."
-)
-p.add_argument(
-    "--database", required=False, default="neo4j", help="The database name to use."
+    "command",
+    nargs="?",
+    default="build",
+    choices=["build", "export"],
+    help="Either build a graph, or export it to CSV files for neo4j-admin's bulk "
+    "importer. Defaults to build.",
 )
+p.add_argument("-c", "--config", is_config_file=True, help="Config file path.")
+add_build_arguments(p)
 p.add_argument(
     "--metadata_db", required=False, help="The path of the SQLite3 metadata DB to use."
 )
@@ -55,11 +57,42 @@ p.add_argument(
     help="Prune any existing nodes and relationships from the database.",
 )
 p.add_argument(
-    "--summarize",
+    "--search_batch_wait_ms",
     required=False,
-    dest="summarize",
-    action="store_true",
-    help='"Whether to generate function summarization docstrings',
+    type=float,
+    default=5,
+    help="The maximum time to wait for concurrent semantic search queries to batch "
+    "with, in milliseconds.",
+)
+p.add_argument(
+    "--search_max_batch",
+    required=False,
+    type=int,
+    default=32,
+    help="The maximum number of semantic search queries encoded together.",
+)
+p.add_argument(
+    "--search_query_cache_size",
+    required=False,
+    type=int,
+    default=1024,
+    help="The number of semantic search query embeddings to cache. 0 disables the "
+    "cache.",
+)
+p.add_argument(
+    "--search_result_cache_size",
+    required=False,
+    type=int,
+    default=256,
+    help="The number of ranked semantic search results to cache. 0 disables the cache.",
+)
+p.add_argument(
+    "--search_index_cache_size",
+    required=False,
+    type=int,
+    default=4,
+    help="The number of graph versions to cache the semantic search summarization "
+    "embeddings of. 0 disables the cache.",
 )
 p.add_argument(
     "--skip_inspect4py",
@@ -69,6 +102,18 @@ p.add_argument(
     help="Whether to skip running inspect4py. Use when the input directory "
     "is already an inspect4py output directory.",
 )
+p.add_argument(
+    "--output",
+    required=False,
+    default="./export",
+    help="The directory to export CSV files to.",
+)
+p.add_argument(
+    "--neo4j_admin",
+    required=False,
+    help="Path of the neo4j-admin executable. If given, the exported files are "
+    "imported into a new database, which is then registered as the graph.",
+)
 
 
 @inject
@@ -99,6 +144,50 @@ def main(
     build.build(input_list, name, description, prune=prune)
 
 
+@inject
+def export(
+    input_list: List[str],
+    name: str,
+    description: str,
+    output: str,
+    neo4j_admin: Optional[str] = None,
+    build: BuildService = Provide[ApplicationContainer.build.container.service],
+    graph: GraphService = Provide[ApplicationContainer.graph.container.service],
+) -> None:
+    """Export a graph to CSV files, and optionally bulk import them with neo4j-admin.
+
+    neo4j-admin must be run on the Neo4J server, which must be an Enterprise server
+    so that the imported database can be created alongside the existing ones.
+
+    Args:
+        input_list (List[str]): The list of input paths for the build service.
+        name (str): The graph name
+        description (str): The graph description
+        output (str): The directory to export CSV files to.
+        neo4j_admin (Optional[str]): Optional path of the neo4j-admin executable.
+        build (BuildService): The injected Build Service.
+        graph (GraphService): The injected Graph Service.
+
+    Returns:
+        None
+    """
+    sink = build.export(input_list, name, output)
+    command = sink.import_command(
+        name.lower(), neo4j_admin if neo4j_admin else "neo4j-admin"
+    )
+
+    if not neo4j_admin:
+        log.info("To import the graph, run: %s", shlex.join(command))
+        return
+
+    log.info("Importing graph with neo4j-admin...")
+    subprocess.check_call(command)
+
+    with graph.get_system_transaction() as (system_tx, metadata_tx):
+        created = graph.create_graph(name, description, system_tx, metadata_tx)
+    graph.metadata.set_graph_status_to_created(created)
+
+
 if __name__ == "__main__":
     args, _ = p.parse_known_args()
 
@@ -106,4 +195,13 @@ if __name__ == "__main__":
     container.config.from_dict(vars(args))
     container.wire(modules=[__name__])
 
-    main(args.input, args.name, args.description, prune=args.prune)
+    if args.command == "export":
+        export(
+            args.input,
+            args.name,
+            args.description,
+            args.output,
+            neo4j_admin=args.neo4j_admin,
+        )
+    else:
+        main(args.input, args.name, args.description, prune=args.prune)
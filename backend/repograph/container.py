@@ -12,6 +12,7 @@ from py2neo import GraphService
 from neo4j import GraphDatabase, Driver, ExperimentalWarning
 
 # Containers
+from repograph.entities.blob.container import BlobContainer
 from repograph.entities.build.container import BuildContainer
 from repograph.entities.graph.container import GraphContainer
 from repograph.entities.search.container import SearchContainer
@@ -49,17 +50,26 @@ class ApplicationContainer(DeclarativeContainer):
         config=config,
     )
 
+    # Container for Blob entity
+    blob: Container[BlobContainer] = Container(BlobContainer, config=config)
+
     # Container for Graph entity
     graph: Container[GraphContainer] = Container(
         GraphContainer,
         neo4j=neo4j.provided,
         driver=driver.provided,
         metadata=metadata.container.service,
+        blobs=blob.container.service,
     )
 
     # Container for Summarization entity
     summarization: Container[SummarizationContainer] = Container(
-        SummarizationContainer, config=config
+        SummarizationContainer, config=config, blobs=blob.container.service
+    )
+
+    # Container for Search entity
+    search: Container[SearchContainer] = Container(
+        SearchContainer, config=config, graph=graph.container.service
     )
 
     # Container for Build entity
@@ -69,9 +79,6 @@ class ApplicationContainer(DeclarativeContainer):
         summarization=summarization.container.service,
         config=config,
         metadata=metadata.container.service,
-    )
-
-    # Container for Search entity
-    search: Container[SearchContainer] = Container(
-        SearchContainer, config=config, graph=graph.container.service
+        blobs=blob.container.service,
+        search=search.container.service,
     )
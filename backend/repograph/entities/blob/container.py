@@ -0,0 +1,16 @@
+# pragma: no cover
+"""
+Container for blob entity for dependency injection.
+"""
+# pip imports
+from dependency_injector.containers import DeclarativeContainer
+from dependency_injector.providers import Configuration, Singleton
+
+# Blob entity imports
+from repograph.entities.blob.service import BlobService
+
+
+class BlobContainer(DeclarativeContainer):
+    config: Configuration = Configuration()
+
+    service: Singleton[BlobService] = Singleton(BlobService, path=config.blob_store)
@@ -0,0 +1,20 @@
+"""
+Custom exceptions for the blob entity.
+"""
+# pip imports
+from fastapi import status
+
+
+# Exceptions imports
+from repograph.utils.exception_handlers import RepographException
+
+
+class BlobNotFoundError(RepographException):
+    """
+    Exception for blobs that aren't in the blob store.
+    """
+
+    code = status.HTTP_404_NOT_FOUND
+
+    def __init__(self, key: str):
+        self.message = f"The blob '{key}' is not in the blob store!"
@@ -0,0 +1,175 @@
+"""
+Content-addressed, compressed storage of large properties, e.g. function source code.
+
+Blobs are keyed by the SHA-256 digest of their content, so identical source code is only
+stored once, and graph nodes only hold the key. Blobs are compressed with zstd when the
+zstandard package is installed, and with zlib otherwise. Both formats are always read.
+"""
+# Base imports
+import hashlib
+import os
+import tempfile
+import zlib
+from logging import getLogger
+from typing import Optional
+
+# pip imports
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Blob entity imports
+from repograph.entities.blob.exceptions import BlobNotFoundError
+
+# Configure logging
+log = getLogger("repograph.entities.blob.service")
+
+# The magic number at the start of every zstd frame
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class BlobService:
+    """
+    A file-backed blob store.
+
+    Each blob is written to its own file, in a directory named after the first two
+    characters of its key. Blobs are written to a temporary file and then renamed, so
+    concurrent build workers can share a store.
+    """
+
+    path: Optional[str]
+
+    def __init__(self, path: Optional[str] = None, level: int = 3) -> None:
+        """Constructor
+
+        Args:
+            path (Optional[str]): The directory of the store. If None, the store is
+                                  inactive and large properties are kept in the graph.
+            level (int): The compression level.
+        """
+        self.path = path
+        self.level = level
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            log.info("Storing blobs in %s", path)
+
+    @property
+    def active(self) -> bool:
+        """Whether blobs are stored outside the graph."""
+        return bool(self.path)
+
+    @staticmethod
+    def key(content: str) -> str:
+        """Get the key of some content.
+
+        Args:
+            content (str): The content.
+
+        Returns:
+            str: The SHA-256 digest of the content.
+        """
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _blob_path(self, key: str) -> str:
+        """Get the path of a blob.
+
+        Args:
+            key (str): The key of the blob.
+
+        Returns:
+            str
+        """
+        return os.path.join(self.path, key[:2], key)
+
+    def _compress(self, data: bytes) -> bytes:
+        """Compress data with zstd if available, otherwise zlib.
+
+        Args:
+            data (bytes): The data.
+
+        Returns:
+            bytes
+        """
+        if zstandard is not None:
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        return zlib.compress(data, self.level)
+
+    @staticmethod
+    def _decompress(data: bytes) -> bytes:
+        """Decompress data compressed with either zstd or zlib.
+
+        Args:
+            data (bytes): The compressed data.
+
+        Returns:
+            bytes
+        """
+        if data.startswith(ZSTD_MAGIC):
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd blobs")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def put(self, content: str) -> str:
+        """Store content, if it isn't already stored.
+
+        Args:
+            content (str): The content.
+
+        Returns:
+            str: The key of the content.
+        """
+        key = self.key(content)
+        path = self._blob_path(key)
+        if os.path.exists(path):
+            return key
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(self._compress(content.encode("utf-8")))
+            os.replace(temp_path, path)
+        except Exception as e:
+            os.unlink(temp_path)
+            raise e
+
+        return key
+
+    def get(self, key: str) -> str:
+        """Read stored content.
+
+        Args:
+            key (str): The key of the content.
+
+        Returns:
+            str: The content.
+
+        Raises:
+            BlobNotFoundError: If the content isn't stored.
+        """
+        if not self.active or len(key) < 2:
+            raise BlobNotFoundError(key)
+
+        try:
+            with open(self._blob_path(key), "rb") as file:
+                data = file.read()
+        except (FileNotFoundError, NotADirectoryError):
+            raise BlobNotFoundError(key)
+
+        return self._decompress(data).decode("utf-8")
+
+    def contains(self, key: str) -> bool:
+        """Check whether content is stored.
+
+        Args:
+            key (str): The key of the content.
+
+        Returns:
+            bool
+        """
+        return self.active and os.path.exists(self._blob_path(key))
@@ -0,0 +1,302 @@
+"""
+Spooling of uploaded repository archives to disk, and their safe extraction.
+
+Uploads are copied to disk in fixed-size chunks, so that an archive is never held in
+memory. Extraction is bounded by the total extracted size, the number of entries and the
+compression ratio, so that a small archive can't exhaust the disk (a "zip bomb"), and
+entries that would be written outside the extraction directory are rejected.
+"""
+# Base imports
+import hashlib
+import os
+import shutil
+import stat
+import tarfile
+import zipfile
+from logging import getLogger
+from typing import BinaryIO, Optional, Tuple
+
+# pip imports
+from pydantic import BaseModel
+
+# Build entity imports
+from repograph.entities.build.exceptions import (
+    UnsafeArchiveError,
+    UnsupportedArchiveError,
+    UploadTooLargeError,
+)
+
+# Configure logging
+log = getLogger("repograph.entities.build.archives")
+
+# Supported archive extensions, longest first so that e.g. .tar.gz is matched before .gz
+ARCHIVE_EXTENSIONS = [
+    ".tar.bz2",
+    ".tar.gz",
+    ".tar.xz",
+    ".tbz2",
+    ".tgz",
+    ".txz",
+    ".tar",
+    ".zip",
+]
+
+# Size of the chunks uploads and archive entries are copied in
+CHUNK_SIZE = 1024 * 1024
+
+# Default maximum total size of the archives uploaded in a single request
+DEFAULT_MAX_UPLOAD_SIZE = 4 * 1024 * 1024 * 1024
+
+
+class ExtractionLimits(BaseModel):
+    """
+    Limits applied when extracting an archive.
+
+    The maximum extracted size is the smaller of max_size and max_ratio times the size
+    of the archive. Archives smaller than min_ratio_size are treated as that size.
+    """
+
+    max_size: int = 16 * 1024 * 1024 * 1024
+    max_entries: int = 1000000
+    max_ratio: float = 200.0
+    min_ratio_size: int = 1024 * 1024
+
+
+def is_archive(filename: Optional[str]) -> bool:
+    """Check whether a filename has a supported archive extension.
+
+    Args:
+        filename (Optional[str]): The filename.
+
+    Returns:
+        bool
+    """
+    return bool(filename) and filename.lower().endswith(tuple(ARCHIVE_EXTENSIONS))
+
+
+def archive_stem(filename: str) -> str:
+    """Get the name of an archive without its archive extension.
+
+    Args:
+        filename (str): The filename, or path, of the archive.
+
+    Returns:
+        str
+    """
+    name = os.path.basename(filename)
+    for extension in ARCHIVE_EXTENSIONS:
+        if name.lower().endswith(extension):
+            return name[: -len(extension)]
+    return name
+
+
+def spool_upload(
+    source: BinaryIO, destination: str, max_size: int, uploaded: int = 0
+) -> Tuple[str, int]:
+    """Copy an uploaded file to disk in chunks, hashing it as it is copied.
+
+    Args:
+        source (BinaryIO): The uploaded file.
+        destination (str): The path to write the file to.
+        max_size (int): The maximum total size of the upload.
+        uploaded (int): The number of bytes of the upload already spooled, e.g. by
+                        other files in the same request.
+
+    Returns:
+        str: The SHA-256 digest of the file.
+        int: The size of the file in bytes.
+
+    Raises:
+        UploadTooLargeError: If the upload is larger than max_size.
+    """
+    digest = hashlib.sha256()
+    size = 0
+
+    with open(destination, "wb") as file:
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+
+            size += len(chunk)
+            if uploaded + size > max_size:
+                raise UploadTooLargeError(max_size)
+
+            digest.update(chunk)
+            file.write(chunk)
+
+    return digest.hexdigest(), size
+
+
+def _resolve_entry(destination: str, name: str) -> str:
+    """Resolve the path an archive entry is extracted to.
+
+    Args:
+        destination (str): The absolute path of the extraction directory.
+        name (str): The name of the entry.
+
+    Returns:
+        str
+
+    Raises:
+        UnsafeArchiveError: If the entry would be written outside the destination.
+    """
+    path = os.path.realpath(os.path.join(destination, name))
+    if os.path.commonpath([destination, path]) != destination:
+        raise UnsafeArchiveError(f"'{name}' is outside the extraction directory")
+    return path
+
+
+class _Budget:
+    """
+    Tracks the number of entries and bytes that may still be extracted.
+    """
+
+    def __init__(self, entries: int, size: int) -> None:
+        """Constructor
+
+        Args:
+            entries (int): The maximum number of entries.
+            size (int): The maximum number of bytes.
+        """
+        self.entries = entries
+        self.size = size
+
+    def take_entry(self) -> None:
+        """Account for an entry, raising UnsafeArchiveError if too many are extracted."""
+        self.entries -= 1
+        if self.entries < 0:
+            raise UnsafeArchiveError("too many entries")
+
+    def copy(self, source: BinaryIO, path: str) -> None:
+        """Copy an entry to disk, raising UnsafeArchiveError if too much is extracted.
+
+        Args:
+            source (BinaryIO): The entry's content.
+            path (str): The path to write the entry to.
+
+        Returns:
+            None
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                self.size -= len(chunk)
+                if self.size < 0:
+                    raise UnsafeArchiveError("extracted size exceeds the limit")
+                file.write(chunk)
+
+
+def _extract_zip(path: str, destination: str, budget: _Budget) -> None:
+    """Extract a zip archive.
+
+    Args:
+        path (str): The path of the archive.
+        destination (str): The absolute path of the extraction directory.
+        budget (_Budget): The remaining extraction budget.
+
+    Returns:
+        None
+    """
+    with zipfile.ZipFile(path, "r") as archive:
+        entries = archive.infolist()
+
+        # Check the declared sizes up front, so that most bombs fail before writing
+        if sum(entry.file_size for entry in entries) > budget.size:
+            raise UnsafeArchiveError("extracted size exceeds the limit")
+
+        for entry in entries:
+            budget.take_entry()
+            target = _resolve_entry(destination, entry.filename)
+
+            if entry.is_dir():
+                os.makedirs(target, exist_ok=True)
+                continue
+
+            if stat.S_ISLNK(entry.external_attr >> 16):
+                log.warning("Skipping symbolic link '%s' in archive", entry.filename)
+                continue
+
+            # Declared sizes can't be trusted, so the budget is enforced while copying
+            with archive.open(entry) as source:
+                budget.copy(source, target)
+
+
+def _extract_tar(path: str, destination: str, budget: _Budget) -> None:
+    """Extract a tar archive, optionally compressed with gzip, bzip2 or xz.
+
+    Only directories and regular files are extracted.
+
+    Args:
+        path (str): The path of the archive.
+        destination (str): The absolute path of the extraction directory.
+        budget (_Budget): The remaining extraction budget.
+
+    Returns:
+        None
+    """
+    with tarfile.open(path, "r:*") as archive:
+        for entry in archive:
+            budget.take_entry()
+            target = _resolve_entry(destination, entry.name)
+
+            if entry.isdir():
+                os.makedirs(target, exist_ok=True)
+            elif entry.isfile():
+                source = archive.extractfile(entry)
+                with source:
+                    budget.copy(source, target)
+            else:
+                log.warning("Skipping special entry '%s' in archive", entry.name)
+
+
+def extract_archive(
+    path: str, destination: str, limits: Optional[ExtractionLimits] = None
+) -> str:
+    """Safely extract a zip or tar archive of a repository.
+
+    If the archive contains a single top-level directory, that directory is the
+    repository. Otherwise, the extraction directory is.
+
+    Args:
+        path (str): The path of the archive.
+        destination (str): The directory to extract to. It is replaced if it exists.
+        limits (Optional[ExtractionLimits]): The extraction limits.
+
+    Returns:
+        str: The path of the extracted repository.
+
+    Raises:
+        UnsupportedArchiveError: If the archive isn't a zip or tar archive.
+        UnsafeArchiveError: If the archive exceeds the limits, or contains unsafe paths.
+    """
+    limits = limits if limits else ExtractionLimits()
+    archive_size = max(os.path.getsize(path), limits.min_ratio_size)
+    budget = _Budget(
+        limits.max_entries, min(limits.max_size, int(archive_size * limits.max_ratio))
+    )
+
+    destination = os.path.realpath(destination)
+    shutil.rmtree(destination, ignore_errors=True)
+    os.makedirs(destination)
+
+    try:
+        if zipfile.is_zipfile(path):
+            _extract_zip(path, destination, budget)
+        elif tarfile.is_tarfile(path):
+            _extract_tar(path, destination, budget)
+        else:
+            raise UnsupportedArchiveError(os.path.basename(path))
+    except Exception as e:
+        shutil.rmtree(destination, ignore_errors=True)
+        raise e
+
+    contents = os.listdir(destination)
+    if len(contents) == 1 and os.path.isdir(os.path.join(destination, contents[0])):
+        return os.path.join(destination, contents[0])
+
+    return destination
@@ -0,0 +1,607 @@
+"""
+Compact intermediate graph representation used by the RepographBuilder.
+
+Nodes and relationships are accumulated as lightweight __slots__ records rather than
+pydantic models, and are only converted into the write format when the buffer is flushed.
+"""
+# Base imports
+import sys
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+# pip imports
+import py2neo
+
+# Build entity imports
+from repograph.entities.build.exceptions import RepographBuildError
+
+# Model imports
+from repograph.entities.graph.models.base import (
+    InvalidRelationshipException,
+    Node,
+    Relationship,
+)
+
+# Utils imports
+from repograph.entities.graph.utils import (
+    LINE_RANGE_LABELS,
+    hash_key,
+    relationship_key,
+)
+
+# Property holding the deterministic key of nodes and relationships
+KEY_PROPERTY = "key"
+
+# Properties that identify a node within a repository. Nodes are keyed by all of these
+# that they have, so same-named modules in different directories get different keys
+IDENTITY_PROPERTIES = ["canonical_name", "path"]
+
+# Property marking nodes shared by every repository in a graph, e.g. built-in functions
+# and external packages, and the relationships between them
+SHARED_PROPERTY = "shared"
+
+# Relationship types that are written once between any two nodes, with the number of
+# times they were added held in the count property
+WEIGHTED_RELATIONSHIPS = frozenset(["Calls", "Imports"])
+COUNT_PROPERTY = "count"
+
+# Cache of allowed (parent label, child label) pairs for each Relationship model
+_allowed_labels: Dict[Type[Relationship], Optional[FrozenSet[Tuple[str, str]]]] = dict()
+
+
+class NodeRecord:
+    """A node held in a GraphBuffer.
+
+    Properties are exposed as attributes. Missing properties read as None, mirroring the
+    optional fields of the pydantic Node models.
+
+    Attributes:
+        handle (int): The integer handle of the node within its buffer.
+        label (str): The node label, i.e. the Node model name.
+        properties (Dict[str, Any]): The node properties.
+        added (bool): Whether the node will be written when the buffer is flushed.
+    """
+
+    __slots__ = ("handle", "label", "properties", "added")
+
+    def __init__(self, handle: int, label: str, properties: Dict[str, Any]) -> None:
+        """Constructor
+
+        Args:
+            handle (int): The integer handle of the node.
+            label (str): The node label.
+            properties (Dict[str, Any]): The node properties.
+        """
+        self.handle = handle
+        self.label = label
+        self.properties = properties
+        self.added = False
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return self.properties.get(name, None)
+
+    def __repr__(self) -> str:
+        return f"{self.label}({self.handle}, {self.properties.get('name', '')!r})"
+
+    def has_label(self, model: Type[Node]) -> bool:
+        """Check whether the record represents a particular Node model.
+
+        Args:
+            model (Type[Node]): The Node model.
+
+        Returns:
+            bool
+        """
+        return self.label == model.__name__
+
+
+class RelationshipRecord:
+    """A relationship held in a GraphBuffer.
+
+    Attributes:
+        type (str): The relationship type, i.e. the Relationship model name.
+        start (int): The handle of the parent node.
+        end (int): The handle of the child node.
+        properties (Dict[str, Any]): The relationship properties.
+    """
+
+    __slots__ = ("type", "start", "end", "properties")
+
+    def __init__(
+        self, rel_type: str, start: int, end: int, properties: Dict[str, Any]
+    ) -> None:
+        """Constructor
+
+        Args:
+            rel_type (str): The relationship type.
+            start (int): The handle of the parent node.
+            end (int): The handle of the child node.
+            properties (Dict[str, Any]): The relationship properties.
+        """
+        self.type = rel_type
+        self.start = start
+        self.end = end
+        self.properties = properties
+
+    def __repr__(self) -> str:
+        return f"{self.type}({self.start} -> {self.end})"
+
+
+def _get_allowed_labels(
+    model: Type[Relationship],
+) -> Optional[FrozenSet[Tuple[str, str]]]:
+    """Get the allowed (parent, child) label pairs for a Relationship model.
+
+    Args:
+        model (Type[Relationship]): The Relationship model.
+
+    Returns:
+        Optional[FrozenSet[Tuple[str, str]]]: The allowed pairs, or None if unrestricted.
+    """
+    if model not in _allowed_labels:
+        allowed_types = model._allowed_types
+        if allowed_types:
+            _allowed_labels[model] = frozenset(
+                (parent.__name__, child.__name__)
+                for parent, children in allowed_types.items()
+                for child in children
+            )
+        else:
+            _allowed_labels[model] = None
+
+    return _allowed_labels[model]
+
+
+def _clean_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop None-valued properties and intern the repository name.
+
+    Args:
+        properties (Dict[str, Any]): The raw properties.
+
+    Returns:
+        Dict[str, Any]
+    """
+    cleaned = {key: value for key, value in properties.items() if value is not None}
+    repository_name = cleaned.get("repository_name", None)
+    if isinstance(repository_name, str):
+        cleaned["repository_name"] = sys.intern(repository_name)
+    return cleaned
+
+
+class GraphBuffer:
+    """
+    Accumulates the nodes and relationships of a build until they are flushed.
+    """
+
+    def __init__(self) -> None:
+        """Constructor"""
+        self._nodes: List[NodeRecord] = []
+        self._relationships: List[RelationshipRecord] = []
+        self._added_count = 0
+
+        # Relationships between shared nodes that have been added
+        self._shared_relationships: Set[Tuple[str, int, int]] = set()
+
+        # Weighted relationships that have been added, by type and endpoints
+        self._weighted_relationships: Dict[Tuple[str, int, int], RelationshipRecord] = (
+            dict()
+        )
+
+    @property
+    def node_count(self) -> int:
+        """The number of nodes that will be written."""
+        return self._added_count
+
+    @property
+    def relationship_count(self) -> int:
+        """The number of relationships that will be written."""
+        return len(self._relationships)
+
+    def node(self, model: Type[Node], **properties: Any) -> NodeRecord:
+        """Create a new node record.
+
+        The record is not written unless it is added to the buffer, or is the endpoint of a
+        relationship added to the buffer.
+
+        Args:
+            model (Type[Node]): The Node model the record represents.
+            **properties (Any): The node properties.
+
+        Returns:
+            NodeRecord
+        """
+        record = NodeRecord(
+            len(self._nodes), sys.intern(model.__name__), _clean_properties(properties)
+        )
+        self._nodes.append(record)
+        return record
+
+    def relationship(
+        self,
+        model: Type[Relationship],
+        parent: NodeRecord,
+        child: NodeRecord,
+        repository_name: str,
+        **properties: Any,
+    ) -> RelationshipRecord:
+        """Create a new relationship record.
+
+        Args:
+            model (Type[Relationship]): The Relationship model the record represents.
+            parent (NodeRecord): The parent node.
+            child (NodeRecord): The child node.
+            repository_name (str): The name of the repository. Ignored if both nodes are
+                                   shared.
+            **properties (Any): The relationship properties.
+
+        Returns:
+            RelationshipRecord
+
+        Raises:
+            ValueError: If either node is missing.
+            InvalidRelationshipException: If the labels of the parent and child nodes violate
+                                          the allowed types of the model.
+        """
+        if parent is None or child is None:
+            raise ValueError(f"{model.__name__} relationship is missing a node")
+
+        allowed = _get_allowed_labels(model)
+        if allowed is not None and (parent.label, child.label) not in allowed:
+            raise InvalidRelationshipException(
+                parent.label, child.label, model.__name__
+            )
+
+        # Relationships between shared nodes are shared too
+        if parent.shared and child.shared:
+            repository_name = None
+            properties[SHARED_PROPERTY] = True
+
+        return RelationshipRecord(
+            sys.intern(model.__name__),
+            parent.handle,
+            child.handle,
+            _clean_properties(dict(repository_name=repository_name, **properties)),
+        )
+
+    def add(self, *records: Optional[Union[NodeRecord, RelationshipRecord]]) -> None:
+        """Add node and relationship records to the buffer.
+
+        None values are ignored. Adding a relationship also adds its endpoint nodes.
+        Relationships between shared nodes are only added once. Weighted relationships,
+        e.g. calls, are also only added once between the same nodes: adding another
+        increments the count property of the first instead.
+
+        Args:
+            *records (Optional[Union[NodeRecord, RelationshipRecord]]): The records to add.
+
+        Returns:
+            None
+        """
+        for record in records:
+            if record is None:
+                continue
+
+            if isinstance(record, RelationshipRecord):
+                if record.properties.get(SHARED_PROPERTY):
+                    identity = (record.type, record.start, record.end)
+                    if identity in self._shared_relationships:
+                        continue
+                    self._shared_relationships.add(identity)
+
+                if record.type in WEIGHTED_RELATIONSHIPS:
+                    identity = (record.type, record.start, record.end)
+                    existing = self._weighted_relationships.get(identity)
+                    if existing is not None:
+                        existing.properties[COUNT_PROPERTY] += 1
+                        continue
+                    record.properties[COUNT_PROPERTY] = 1
+                    self._weighted_relationships[identity] = record
+
+                self._relationships.append(record)
+                self._mark_added(self._nodes[record.start])
+                self._mark_added(self._nodes[record.end])
+            else:
+                self._mark_added(record)
+
+    def _mark_added(self, record: NodeRecord) -> None:
+        """Mark a node record as added, keeping count of added nodes.
+
+        Args:
+            record (NodeRecord): The node record.
+
+        Returns:
+            None
+        """
+        if not record.added:
+            record.added = True
+            self._added_count += 1
+
+    def get_node(self, handle: int) -> NodeRecord:
+        """Get a node record by its handle.
+
+        Args:
+            handle (int): The node handle.
+
+        Returns:
+            NodeRecord
+        """
+        return self._nodes[handle]
+
+    def nodes(self) -> Iterator[NodeRecord]:
+        """Iterate over the nodes that will be written.
+
+        Returns:
+            Iterator[NodeRecord]
+        """
+        return (record for record in self._nodes if record.added)
+
+    def relationships(self) -> Iterator[RelationshipRecord]:
+        """Iterate over the relationships that will be written.
+
+        Returns:
+            Iterator[RelationshipRecord]
+        """
+        return iter(self._relationships)
+
+    def select(self, handles: Set[int]) -> "BufferSelection":
+        """Get a view of some of the nodes that will be written.
+
+        The view includes the relationships to or from the selected nodes.
+
+        Args:
+            handles (Set[int]): The handles of the selected nodes.
+
+        Returns:
+            BufferSelection
+        """
+        return BufferSelection(
+            self,
+            handles,
+            [
+                relationship
+                for relationship in self._relationships
+                if relationship.start in handles or relationship.end in handles
+            ],
+        )
+
+    def exclude(self, handles: Set[int]) -> "BufferSelection":
+        """Get a view of the nodes that will be written, other than some excluded ones.
+
+        Relationships to or from the excluded nodes are left out of the view as well.
+
+        Args:
+            handles (Set[int]): The handles of the excluded nodes.
+
+        Returns:
+            BufferSelection
+        """
+        return BufferSelection(
+            self,
+            {record.handle for record in self.nodes() if record.handle not in handles},
+            [
+                relationship
+                for relationship in self._relationships
+                if relationship.start not in handles and relationship.end not in handles
+            ],
+        )
+
+    def assign_keys(self) -> None:
+        """Give every node and relationship that will be written a deterministic key.
+
+        Nodes with a canonical name or path are keyed by their repository, label,
+        canonical name and path, plus their line range for classes and functions.
+        Records with the same key and properties, e.g. an object inferred from two
+        imports, are merged into one node. Shared nodes have no repository or path, so
+        they get the same key in every build (see shared_node_key). Other nodes, e.g. arguments and docstrings, are keyed by the
+        node they're attached to, the relationship type and their name, and those that
+        would share a key are numbered in the order they were created. Relationships are
+        keyed by their type and endpoints, so relationships of the same type between the
+        same nodes are written as one.
+
+        Returns:
+            None
+
+        Raises:
+            RepographBuildError: If two nodes with different properties have the same
+                                 label and identity.
+        """
+        used: Set[str] = set()
+
+        def unique(*parts: Any) -> str:
+            key = hash_key(*parts)
+            occurrence = 1
+            while key in used:
+                key = hash_key(*parts, occurrence)
+                occurrence += 1
+            used.add(key)
+            return key
+
+        nodes = self._nodes
+        identities: Dict[str, int] = dict()
+        pending: Set[int] = set()
+        duplicates: Dict[int, int] = dict()
+        for record in self.nodes():
+            properties = record.properties
+            if properties.get(SHARED_PROPERTY):
+                identity = [properties["canonical_name"]]
+            else:
+                identity = [
+                    properties[p]
+                    for p in IDENTITY_PROPERTIES
+                    if properties.get(p) is not None
+                ]
+            if not identity and record.label == "Repository":
+                identity = [record.name]
+
+            if not identity:
+                pending.add(record.handle)
+                continue
+
+            parts = [record.repository_name, record.label, *identity]
+            if record.label in LINE_RANGE_LABELS:
+                parts.extend([record.min_line_number, record.max_line_number])
+            key = hash_key(*parts)
+            if key in identities:
+                original = nodes[identities[key]]
+                if original.properties != dict(properties, **{KEY_PROPERTY: key}):
+                    raise RepographBuildError(
+                        f"More than one {record.label} node is identified by "
+                        f"{', '.join(map(str, parts[2:]))}"
+                    )
+                duplicates[record.handle] = original.handle
+                continue
+
+            identities[key] = record.handle
+            properties[KEY_PROPERTY] = key
+
+        if duplicates:
+            self._merge_duplicates(duplicates)
+
+        # Key the remaining nodes by the keyed nodes they are attached to. Each pass
+        # only visits the relationships between two unkeyed nodes left by the last one
+        relationships = [
+            relationship
+            for relationship in self._relationships
+            if relationship.start in pending or relationship.end in pending
+        ]
+        while relationships:
+            deferred = []
+            for relationship in relationships:
+                for handle, other, direction in [
+                    (relationship.end, relationship.start, "in"),
+                    (relationship.start, relationship.end, "out"),
+                ]:
+                    if handle in pending and other not in pending:
+                        pending.remove(handle)
+                        record = nodes[handle]
+                        record.properties[KEY_PROPERTY] = unique(
+                            nodes[other].properties[KEY_PROPERTY],
+                            relationship.type,
+                            direction,
+                            record.label,
+                            record.name,
+                        )
+                if relationship.start in pending and relationship.end in pending:
+                    deferred.append(relationship)
+
+            if len(deferred) == len(relationships):
+                break
+            relationships = deferred
+
+        # Nodes that aren't attached to a keyed node are keyed by their properties
+        for handle in sorted(pending):
+            record = nodes[handle]
+            record.properties[KEY_PROPERTY] = unique(
+                record.repository_name,
+                record.label,
+                *sorted(record.properties.items()),
+            )
+
+        for relationship in self._relationships:
+            relationship.properties[KEY_PROPERTY] = relationship_key(
+                nodes[relationship.start].properties[KEY_PROPERTY],
+                relationship.type,
+                nodes[relationship.end].properties[KEY_PROPERTY],
+            )
+
+    def _merge_duplicates(self, duplicates: Dict[int, int]) -> None:
+        """Merge duplicate node records into the records they duplicate.
+
+        Relationships of the duplicates are moved to the originals. Those that then
+        repeat a relationship of the same type between the same nodes are dropped, and
+        their counts added to the one that is kept.
+
+        Args:
+            duplicates (Dict[int, int]): The handle of the record each duplicate
+                                         record duplicates, by the duplicate's handle.
+
+        Returns:
+            None
+        """
+        for handle in duplicates:
+            self._nodes[handle].added = False
+            self._added_count -= 1
+
+        originals = set(duplicates.values())
+        kept: Dict[Tuple[int, str, int], RelationshipRecord] = dict()
+        relationships = []
+        for relationship in self._relationships:
+            relationship.start = duplicates.get(relationship.start, relationship.start)
+            relationship.end = duplicates.get(relationship.end, relationship.end)
+            if relationship.start in originals or relationship.end in originals:
+                identity = (relationship.start, relationship.type, relationship.end)
+                existing = kept.get(identity)
+                if existing is not None:
+                    if COUNT_PROPERTY in existing.properties:
+                        existing.properties[COUNT_PROPERTY] += relationship.properties[
+                            COUNT_PROPERTY
+                        ]
+                    continue
+                kept[identity] = relationship
+            relationships.append(relationship)
+        self._relationships = relationships
+
+    def to_subgraph(self) -> Optional[py2neo.Subgraph]:
+        """Convert the buffer into a py2neo Subgraph for writing.
+
+        Returns:
+            Optional[py2neo.Subgraph]: The Subgraph, or None if the buffer is empty.
+        """
+        nodes = {
+            record.handle: py2neo.Node(record.label, **record.properties)
+            for record in self.nodes()
+        }
+        if not nodes:
+            return None
+
+        relationships = [
+            py2neo.Relationship(
+                nodes[record.start], record.type, nodes[record.end], **record.properties
+            )
+            for record in self._relationships
+        ]
+
+        return py2neo.Subgraph(nodes.values(), relationships)
+
+
+class BufferSelection(GraphBuffer):
+    """
+    A read-only view of some of the nodes and relationships of a GraphBuffer, so that
+    they can be written separately.
+    """
+
+    def __init__(
+        self,
+        buffer: GraphBuffer,
+        handles: Set[int],
+        relationships: List[RelationshipRecord],
+    ) -> None:
+        """Constructor
+
+        Args:
+            buffer (GraphBuffer): The buffer to select from.
+            handles (Set[int]): The handles of the selected nodes.
+            relationships (List[RelationshipRecord]): The selected relationships. Their
+                                                      endpoints must be selected, or
+                                                      already written.
+        """
+        super().__init__()
+        self._nodes = buffer._nodes
+        self._relationships = relationships
+        self._handles = handles
+        self._added_count = len(handles)
+
+    def nodes(self) -> Iterator[NodeRecord]:
+        return (self._nodes[handle] for handle in sorted(self._handles))
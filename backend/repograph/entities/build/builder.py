@@ -4,16 +4,23 @@ RepographBuilder generates a populated Repograph from inspect4py JSON output.
 # Base imports
 import logging
 import os
-from typing import Callable, Dict, Set, List, Optional, Tuple, Union
+from typing import Callable, ContextManager, Dict, Set, List, Optional, Tuple
 
 # Pip imports
 from py2neo import Transaction
 from requirements.requirement import Requirement
 
 # Build entity imports
+from repograph.entities.build.buffer import GraphBuffer, NodeRecord, SHARED_PROPERTY
 from repograph.entities.build.exceptions import RepographBuildError
+from repograph.entities.build.instrumentation import BuildInstrumentation
+from repograph.entities.build.pipeline import SummarizationPipeline
+from repograph.entities.build.sinks import GraphSink, Neo4jGraphSink
 from repograph.entities.graph.service import GraphService
 
+# Blob entity imports
+from repograph.entities.blob.service import BlobService
+
 # Models imports
 from repograph.entities.graph.models.nodes import (
     Argument,
@@ -23,6 +30,7 @@ from repograph.entities.graph.models.nodes import (
     DocstringRaises,
     DocstringReturnValue,
     Directory,
+    EXCLUDED_METADATA_KEYS,
     Module,
     Function,
     License,
@@ -69,18 +77,40 @@ class RepographBuilder:
 
     def __init__(
         self,
-        summarize: Optional[Callable[[Function], str]],
+        summarize: Optional[Callable[[NodeRecord], str]],
         base_path: str,
         graph_name: str,
         graph: GraphService,
         tx: Transaction,
+        sink: Optional[GraphSink] = None,
+        instrumentation: Optional[BuildInstrumentation] = None,
+        compact: bool = False,
+        blobs: Optional[BlobService] = None,
+        skip_ast: bool = False,
+        summarization_workers: int = 1,
     ) -> None:
         """Constructor
 
         Args:
-            summarize (Optional[Callable[[Function], str]]): The optional summarization method.
+            summarize (Optional[Callable[[NodeRecord], str]]): The optional summarization method.
             base_path (str): The base path directory
             graph_name (str): The name of the graph nodes are being added to.
+            graph (GraphService): The graph service.
+            tx (Transaction): The transaction to write with.
+            sink (Optional[GraphSink]): Optional sink to write to. Defaults to writing to the
+                                        graph service using the transaction.
+            instrumentation (Optional[BuildInstrumentation]): Optional instrumentation to
+                                                              record build phases with.
+            compact (bool): Whether to store arguments, return values and docstring parts
+                            as list properties of their Function or Docstring, rather
+                            than as separate nodes.
+            blobs (Optional[BlobService]): Optional blob store to write function source
+                                           code and ASTs to. Nodes then only store their
+                                           keys.
+            skip_ast (bool): Whether to skip storing function ASTs.
+            summarization_workers (int): The number of threads to summarize functions
+                                         in, while parsing and writing continue. If 0,
+                                         functions are summarized as they are parsed.
         """
         # The base directory path used for normalizing paths
         self.base_path = base_path
@@ -98,34 +128,177 @@ class RepographBuilder:
         self.graph: GraphService = graph
 
         # The optional summarization function
-        self.summarize: Optional[Callable[[Function], str]] = summarize
+        self.summarize: Optional[Callable[[NodeRecord], str]] = summarize
+
+        # Optional pipeline summarizing functions concurrently with parsing and writing
+        self.pipeline: Optional[SummarizationPipeline] = (
+            SummarizationPipeline(summarize, workers=summarization_workers)
+            if summarize and summarization_workers > 0
+            else None
+        )
 
-        # Mapping of paths to Directory (or the Repository) object
-        self.directories: Dict[str, Union[Repository, Directory]] = dict()
+        # Sink the buffered nodes and relationships are written to
+        self.sink: GraphSink = sink if sink else Neo4jGraphSink(graph, graph_name, tx)
 
-        # Mapping of paths/pacakge names to modules
-        self.modules: Dict[str, Module] = dict()
+        # Buffer accumulating created nodes and relationships until they are flushed
+        self.buffer = GraphBuffer()
 
-        # Mapping of Module objects to Classes/Function objects
-        self.module_objects: Dict[Module, List[Union[Class, Function]]] = dict()
+        # Whether to use the compact schema
+        self.compact = compact
+
+        # Optional blob store for function source code and ASTs
+        self.blobs: Optional[BlobService] = blobs
+
+        # Whether to skip storing ASTs
+        self.skip_ast = skip_ast
+
+        # Resource usage of each build phase
+        self.instrumentation: BuildInstrumentation = (
+            instrumentation if instrumentation else BuildInstrumentation()
+        )
+
+        # Mapping of paths to Directory (or the Repository) records
+        self.directories: Dict[str, NodeRecord] = dict()
+
+        # Mapping of paths/pacakge names to Module records
+        self.modules: Dict[str, NodeRecord] = dict()
+
+        # Mapping of Module records to Class/Function records
+        self.module_objects: Dict[NodeRecord, List[NodeRecord]] = dict()
 
         # Mapping Module dependencies for retrospective parsing
-        self.dependencies: List[Tuple[List[JSONDict], Module]] = []
+        self.dependencies: List[Tuple[List[JSONDict], NodeRecord]] = []
 
         # Mapping Class extends for retrospective parsing
-        self.extends: List[Tuple[Class, Module, JSONDict]] = []
+        self.extends: List[Tuple[NodeRecord, NodeRecord, JSONDict]] = []
 
         # The objects a given Module depends on/imports
-        self.module_dependencies: Dict[Module, List[Union[Class, Module, Function]]] = dict()
+        self.module_dependencies: Dict[NodeRecord, List[NodeRecord]] = dict()
 
         # Module imports
-        self.module_imports: Dict[Module, Set[str]] = dict()
+        self.module_imports: Dict[NodeRecord, Set[str]] = dict()
 
         # Packages from requirements file
-        self.requirements: Dict[str, Package] = dict()
+        self.requirements: Dict[str, NodeRecord] = dict()
 
         # Mapping of built-in functions that have been called in the repository
-        self.called_builtin_functions: Dict[str, Function] = dict()
+        self.called_builtin_functions: Dict[str, NodeRecord] = dict()
+
+        # Nodes shared with other repositories, by label and canonical name
+        self.shared_nodes: Dict[Tuple[str, str], NodeRecord] = dict()
+
+    def _share(self, record: NodeRecord) -> NodeRecord:
+        """Make a new record a node shared by every repository in the graph.
+
+        Shared nodes, e.g. built-in functions and external packages, have no repository
+        and are keyed by their label and canonical name only, so every repository
+        built into a graph links to the same node. If this build already has a shared
+        node with the same label and canonical name, that is returned instead.
+
+        Args:
+            record (NodeRecord): The new record. It must not have any relationships.
+
+        Returns:
+            NodeRecord: The shared record.
+        """
+        identity = (record.label, record.canonical_name)
+        if identity in self.shared_nodes:
+            return self.shared_nodes[identity]
+
+        record.properties.pop("repository_name", None)
+        record.properties[SHARED_PROPERTY] = True
+        self.shared_nodes[identity] = record
+        return record
+
+    def _create_directory(self, path: str, inferred: bool = False) -> NodeRecord:
+        """Create a Directory record.
+
+        Args:
+            path (str): Path of the directory.
+            inferred (bool): Whether this directory has been inferred when walking paths
+                             provided by inspect4py.
+
+        Returns:
+            NodeRecord: The Directory record.
+        """
+        return self.buffer.node(
+            Directory,
+            path=path,
+            name=get_path_name(path),
+            parent_path=get_path_parent(path),
+            repository_name=self.repository_name,
+            inferred=inferred,
+        )
+
+    def _create_package(
+        self,
+        canonical_name: str,
+        path: Optional[str] = None,
+        external: bool = False,
+        inferred: bool = False,
+    ) -> NodeRecord:
+        """Create a Package record.
+
+        Args:
+            canonical_name (str): The full canonical name of the package.
+            path (Optional[str]): The path of the package, if within the repository.
+            external (bool): Whether the package is an external dependency.
+            inferred (bool): Whether the package was inferred when parsing dependencies.
+
+        Returns:
+            NodeRecord: The Package record.
+        """
+        parent_package, name = get_package_parent_and_name(canonical_name)
+        return self.buffer.node(
+            Package,
+            name=name,
+            canonical_name=canonical_name,
+            parent_package=parent_package,
+            path=path,
+            parent_path=get_path_parent(path) if path else None,
+            external=external,
+            repository_name=self.repository_name,
+            inferred=inferred,
+        )
+
+    def _create_inferred_object(
+        self, name: str, canonical_name: str, variables: bool = False
+    ) -> NodeRecord:
+        """Create an inferred Class, Function or Variable record for an imported object.
+
+        Args:
+            name (str): The name of the imported object.
+            canonical_name (str): The canonical name of the imported object.
+            variables (bool): Whether to infer Variables from constant-style names.
+
+        Returns:
+            NodeRecord: The inferred record.
+        """
+        if variables and (name.isupper() or name.startswith("__")):
+            return self.buffer.node(
+                Variable,
+                name=name,
+                canonical_name=canonical_name,
+                inferred=True,
+                repository_name=self.repository_name,
+            )
+        elif name[0].isupper():
+            return self.buffer.node(
+                Class,
+                name=name,
+                canonical_name=canonical_name,
+                repository_name=self.repository_name,
+                inferred=True,
+            )
+        else:
+            return self.buffer.node(
+                Function,
+                name=name,
+                canonical_name=canonical_name,
+                type=str(Function.FunctionType.FUNCTION.value),
+                repository_name=self.repository_name,
+                inferred=True,
+            )
 
     def _parse_repository(
         self,
@@ -133,7 +306,7 @@ class RepographBuilder:
         metadata: JSONDict = None,
         software_type: str = None,
         directory_info: List[JSONDict] = None,
-    ) -> Repository:
+    ) -> NodeRecord:
         """Parses information about the repository, i.e. the root,
         itself.
 
@@ -143,7 +316,7 @@ class RepographBuilder:
             directory_info (Optional[List[JSONDict]]): Optional list of directories to parse
 
         Returns:
-            Repository: The created Repository node
+            NodeRecord: The created Repository record
         """
         is_package = False
         modules = []
@@ -152,38 +325,39 @@ class RepographBuilder:
         if directory_info:
             modules, is_package = self._parse_files_in_directory(directory_info)
 
-        if metadata:
-            repository = Repository.create_from_metadata(
-                path, metadata, is_package, software_type, path
-            )
-        else:
-            repository = Repository(
-                name=path,
-                is_root_package=is_package,
-                type=software_type,
-                repository_name=path,
-            )
+        metadata = {
+            key: value
+            for key, value in (metadata or {}).items()
+            if key not in EXCLUDED_METADATA_KEYS
+        }
+        repository = self.buffer.node(
+            Repository,
+            name=path,
+            is_root_package=is_package,
+            type=software_type,
+            repository_name=path,
+            **metadata,
+        )
 
         self.repository_name = repository.name
 
-        self.graph.add(repository, tx=self.tx, graph_name=self.graph_name)
+        self.buffer.add(repository)
         self.directories[repository.name] = repository
 
         # Parse each extracted module
         for module, file_info in modules:
             # If repository root is a package, add the full canonical name as such
             if repository.is_root_package:
-                module = module.update_canonical_name(
-                    f"{repository.name}.{module.name}"
-                )
+                module.properties["canonical_name"] = f"{repository.name}.{module.name}"
 
             # Now parse the contents of the  module
             self._parse_module_contents(module, file_info)
 
             # Create a relationship between the Repository and the Module
-            relationship = Contains(repository, module, self.repository_name)
-            self.graph.add(module, tx=self.tx, graph_name=self.graph_name)
-            self.graph.add(relationship, tx=self.tx, graph_name=self.graph_name)
+            relationship = self.buffer.relationship(
+                Contains, repository, module, self.repository_name
+            )
+            self.buffer.add(module, relationship)
 
             # Finally add the module to the list of stored modules
             self.modules[module.canonical_name] = module
@@ -192,44 +366,45 @@ class RepographBuilder:
         return repository
 
     def _parse_requirements(
-        self, requirements: List[Requirement], repository: Repository
+        self, requirements: List[Requirement], repository: NodeRecord
     ) -> None:
         """Parses information extracted from the requirements.txt file.
 
         Args:
             requirements (Optional[JSONDict]): The JSON describing the requirements.
                                                May be None if not found.
-            repository (Repository): The parent Repository node for any created
-                                     Package nodes.
+            repository (NodeRecord): The parent Repository record for any created
+                                     Package records.
         """
         if not requirements:
             log.warning("No requirements information found.")
         else:
             log.info("Parsing requirements information...")
             for requirement in requirements:
-                package = Package.create_from_external_dependency(
-                    requirement.name, self.repository_name
+                package = self._share(
+                    self._create_package(requirement.name, external=True)
                 )
 
-                relationship = Requires(
+                relationship = self.buffer.relationship(
+                    Requires,
                     repository,
                     package,
                     self.repository_name,
                     specifications=list(map(lambda spec: " ".join(spec), requirement.specs)),
                 )
 
-                self.graph.add(package, tx=self.tx, graph_name=self.graph_name)
-                self.graph.add(relationship, tx=self.tx, graph_name=self.graph_name)
+                self.buffer.add(package, relationship)
                 self.requirements[requirement.name] = package
 
     def _parse_license(
-        self, licenses: Optional[JSONDict], repository: Repository
+        self, licenses: Optional[JSONDict], repository: NodeRecord
     ) -> None:
         """Parses extracted license information.
 
         Args:
             licenses (Optional[JSONDict]): The JSON describing the extracted licenses.
-            repository (Repository): The parent Repository node for any created License nodes.
+            repository (NodeRecord): The parent Repository record for any created License
+                                     records.
 
         Returns:
             None
@@ -244,18 +419,18 @@ class RepographBuilder:
 
             for detected in detected_types:
                 for detected_type, confidence in detected.items():
-                    license_node = License(
+                    license_node = self.buffer.node(
+                        License,
                         text=licenses.get("extracted_text", None),
                         license_type=detected_type,
                         confidence=(float(confidence.strip("%")) / 100),
                         graph_name=self.graph_name,
                         repository_name=self.repository_name,
                     )
-                    relationship = LicensedBy(
-                        repository, license_node, self.repository_name
+                    relationship = self.buffer.relationship(
+                        LicensedBy, repository, license_node, self.repository_name
                     )
-                    self.graph.add(license_node, tx=self.tx, graph_name=self.graph_name)
-                    self.graph.add(relationship, tx=self.tx, graph_name=self.graph_name)
+                    self.buffer.add(license_node, relationship)
 
     def _parse_readme(self, info: JSONDict):
         """Parse README files in the repository
@@ -277,7 +452,8 @@ class RepographBuilder:
 
         for path, content in info.items():
             path = str(Path(path).relative_to(self.base_path))
-            readme = README(
+            readme = self.buffer.node(
+                README,
                 path=path,
                 content=content,
                 graph_name=self.graph_name,
@@ -289,15 +465,16 @@ class RepographBuilder:
             parent = self.directories.get(parent_path, None)
 
             if parent:
-                relationship = Contains(parent, readme, self.repository_name)
+                relationship = self.buffer.relationship(
+                    Contains, parent, readme, self.repository_name
+                )
                 relationships.append(relationship)
             else:
                 log.error("Couldn't find parent for README at path: %s", path)
 
-        self.graph.add(*readmes, tx=self.tx, graph_name=self.graph_name)
-        self.graph.add(*relationships, tx=self.tx, graph_name=self.graph_name)
+        self.buffer.add(*readmes, *relationships)
 
-    def _get_parent_directory(self, parent_path: str) -> Directory:
+    def _get_parent_directory(self, parent_path: str) -> NodeRecord:
         """Retrieves the parent directory for supplied path.
 
         Recursively creates missing parent directories and adds relationship.
@@ -306,15 +483,15 @@ class RepographBuilder:
             parent_path (str): The path the parent directory to retrieve
 
         Returns:
-            Type[Directory]: The parent Directory.
+            NodeRecord: The parent Directory record.
         """
 
-        def add_parents_recursively(child: Directory) -> None:
+        def add_parents_recursively(child: NodeRecord) -> None:
             """Recursively adds further missing parent directories
 
             Args:
-                child (Directory): The immediate parent directory to the true child directory.
-                                   i.e. the Directory with the path of parent_path.
+                child (NodeRecord): The immediate parent directory to the true child directory.
+                                    i.e. the Directory with the path of parent_path.
 
             Returns:
                 None
@@ -322,18 +499,18 @@ class RepographBuilder:
             parent = self.directories.get(child.parent_path, None)
 
             if not parent:
-                parent = Directory(child.parent_path, self.repository_name, inferred=True)
-                relationship = Contains(parent, child, self.repository_name)
-                self.graph.add(parent, tx=self.tx, graph_name=self.graph_name)
-                self.graph.add(relationship, tx=self.tx, graph_name=self.graph_name)
+                parent = self._create_directory(child.parent_path, inferred=True)
+                relationship = self.buffer.relationship(
+                    Contains, parent, child, self.repository_name
+                )
+                self.buffer.add(parent, relationship)
                 self.directories[parent.path] = parent
                 return add_parents_recursively(parent)
             else:
-                parent_relationship = Contains(parent, child, self.repository_name)
-                self.graph.add(child, tx=self.tx, graph_name=self.graph_name)
-                self.graph.add(
-                    parent_relationship, tx=self.tx, graph_name=self.graph_name
+                parent_relationship = self.buffer.relationship(
+                    Contains, parent, child, self.repository_name
                 )
+                self.buffer.add(child, parent_relationship)
                 return
 
         # Attempt to get the parent directory from the list of created directories.
@@ -342,8 +519,8 @@ class RepographBuilder:
             return existing_parent
 
         # If it doesn't exist create a new Directory and then call the recursive function.
-        new_parent = Directory(parent_path, self.repository_name, inferred=True)
-        self.graph.add(new_parent, tx=self.tx, graph_name=self.graph_name)
+        new_parent = self._create_directory(parent_path, inferred=True)
+        self.buffer.add(new_parent)
         self.directories[new_parent.path] = new_parent
         add_parents_recursively(new_parent)
 
@@ -364,8 +541,9 @@ class RepographBuilder:
         while parent != "":
             parent_node = self.directories.get(parent, None)
 
-            if isinstance(parent_node, Package) or (
-                isinstance(parent_node, Repository) and parent_node.is_root_package
+            if parent_node is not None and (
+                parent_node.has_label(Package)
+                or (parent_node.has_label(Repository) and parent_node.is_root_package)
             ):
                 parts = [get_path_name(parent)] + parts
                 parent = get_path_parent(parent)
@@ -404,35 +582,35 @@ class RepographBuilder:
         # otherwise create a Directory node.
         if is_package:
             canonical_name = self._create_canonical_package_name(directory_path)
-            directory = Package.create_from_directory(
-                directory_path, canonical_name, self.repository_name
-            )
+            directory = self._create_package(canonical_name, path=directory_path)
         else:
-            directory = Directory(directory_path, self.repository_name)
+            directory = self._create_directory(directory_path)
 
         # Add the list of created directories, the directory node,
         # and the relationship to its parent, to the Repograph.
         self.directories[directory.path] = directory
-        relationship = Contains(parent, directory, self.repository_name)
-        self.graph.add(parent, tx=self.tx, graph_name=self.graph_name)
-        self.graph.add(relationship, tx=self.tx, graph_name=self.graph_name)
+        relationship = self.buffer.relationship(
+            Contains, parent, directory, self.repository_name
+        )
+        self.buffer.add(parent, relationship)
 
         # Parse each extracted module
         for module, file_info in modules:
             # If parent is a package, add the full canonical path name and add to modules.
-            if isinstance(directory, Package):
-                module = module.update_canonical_name(
-                    f"{directory.canonical_name}.{module.name}"
-                )
+            if directory.has_label(Package):
+                module.properties[
+                    "canonical_name"
+                ] = f"{directory.canonical_name}.{module.name}"
                 self.modules[module.canonical_name] = module
 
             # Now parse the contents of the module.
             self._parse_module_contents(module, file_info)
 
             # Create a relationship between the Directory and the Module.
-            relationship = Contains(directory, module, self.repository_name)
-            self.graph.add(module, tx=self.tx, graph_name=self.graph_name)
-            self.graph.add(relationship, tx=self.tx, graph_name=self.graph_name)
+            relationship = self.buffer.relationship(
+                Contains, directory, module, self.repository_name
+            )
+            self.buffer.add(module, relationship)
 
             # Finally add the module to the list of stored modules.
             self.modules[module.path] = module
@@ -440,15 +618,16 @@ class RepographBuilder:
 
     def _parse_files_in_directory(
         self, directory_info: List[JSONDict]
-    ) -> Tuple[List[Tuple[Module, JSONDict]], bool]:
-        """Parses files within a directory into Python Module nodes.
+    ) -> Tuple[List[Tuple[NodeRecord, JSONDict]], bool]:
+        """Parses files within a directory into Python Module records.
 
         Args:
             directory_info (List[JSONDict]): The list of JSONDict objects to parse.
 
         Returns:
-            Tuple[List[Tuple[Module, JSONDict]], bool]: The list of parsed Module nodes and whether
-                                                        the enclosing directory is a package.
+            Tuple[List[Tuple[NodeRecord, JSONDict]], bool]: The list of parsed Module records and
+                                                            whether the enclosing directory is a
+                                                            package.
         """
         is_package = False
         modules = []
@@ -460,7 +639,7 @@ class RepographBuilder:
 
         return modules, is_package
 
-    def _parse_module(self, file_info: JSONDict, index: int, total: int) -> Module:
+    def _parse_module(self, file_info: JSONDict, index: int, total: int) -> NodeRecord:
         """Parses a Python module with a parent directory.
 
         Args:
@@ -469,7 +648,7 @@ class RepographBuilder:
             total (int): The total number of Modules within the parent Folder.
 
         Returns:
-            bool: Whether Module is an __init__.py.
+            NodeRecord: The Module record.
         """
         log.debug(
             "--> Parsing file `%s` (%d/%d)",
@@ -478,7 +657,8 @@ class RepographBuilder:
             total,
         )
 
-        module = Module(
+        module = self.buffer.node(
+            Module,
             name=file_info["file"]["fileNameBase"],
             canonical_name=file_info["file"]["fileNameBase"],
             path=file_info["file"]["path"],
@@ -486,19 +666,20 @@ class RepographBuilder:
             extension=file_info["file"]["extension"],
             is_test=file_info.get("is_test", False),
             repository_name=self.repository_name,
+            inferred=False,
         )
 
         self.module_objects[module] = []
 
         return module
 
-    def _parse_module_contents(self, module: Module, file_info: JSONDict) -> None:
+    def _parse_module_contents(self, module: NodeRecord, file_info: JSONDict) -> None:
         """Parse the contents of the module.
 
         This includes functions/methods and classes.
 
         Args:
-            module (Module): Module object to link extracted functions/classes to.
+            module (NodeRecord): Module record to link extracted functions/classes to.
             file_info (JSONDict): The JSONDict of information containing information about
                                   the module.
 
@@ -517,7 +698,7 @@ class RepographBuilder:
     def _parse_functions_and_methods(
         self,
         functions_info: JSONDict,
-        parent: Union[Module, Class],
+        parent: NodeRecord,
         methods: bool = False,
     ) -> None:
         """Parses function/method information into Function/Method nodes and adds links
@@ -525,7 +706,7 @@ class RepographBuilder:
 
         Args:
             functions_info (JSONDict): JSON dictionary containing the function information.
-            parent (Union[Module, Class]): Parent File or Class node.
+            parent (NodeRecord): Parent Module or Class record.
             methods (bool): Whether to create Method nodes rather than Function nodes.
         """
         for name, info in functions_info.items():
@@ -536,9 +717,11 @@ class RepographBuilder:
 
             # Serialise the AST
             ast = info.get("ast")
-            if ast:
+            if self.skip_ast:
+                ast_string = None
+            elif ast:
                 ast_string = marshall_json_to_string(ast)
-                if not ast:
+                if not ast_string:
                     log.error("Couldn't serialise AST for function %s", name)
             else:
                 log.warning("AST missing for function %s", name)
@@ -549,38 +732,53 @@ class RepographBuilder:
             if not source_code:
                 log.warning("Source code missing for function %s", name)
 
+            # Move the source code and AST to the blob store, keeping only their keys
+            source_hash, ast_hash = None, None
+            if self.blobs:
+                if source_code:
+                    source_hash = self.blobs.put(source_code)
+                    source_code = None
+                if ast_string:
+                    ast_hash = self.blobs.put(ast_string)
+                    ast_string = None
+
             # Create Function Node
             if methods:
                 function_type = str(Function.FunctionType.METHOD.value)
             else:
                 function_type = str(Function.FunctionType.FUNCTION.value)
 
-            function = Function(
+            function = self.buffer.node(
+                Function,
                 name=name,
                 type=function_type,
                 canonical_name=f"{parent.canonical_name}.{name}",
                 source_code=source_code,
+                source_hash=source_hash,
                 ast=ast_string,
+                ast_hash=ast_hash,
                 min_line_number=min_lineno,
                 max_line_number=max_lineno,
                 repository_name=self.repository_name,
             )
 
             # Add to graph
-            self.graph.add(function, tx=self.tx, graph_name=self.graph_name)
+            self.buffer.add(function)
 
             # Parse the docstring for the function
             self._parse_docstring(info.get("doc", {}), function)
 
             # Create HasFunction Relationship
-            if methods:
-                relationship = HasMethod(parent, function, self.repository_name)
-            else:
-                relationship = HasFunction(parent, function, self.repository_name)
-            self.graph.add(relationship, tx=self.tx, graph_name=self.graph_name)
+            relationship = self.buffer.relationship(
+                HasMethod if methods else HasFunction,
+                parent,
+                function,
+                self.repository_name,
+            )
+            self.buffer.add(relationship)
 
             # If parent is a module, add to the module_objects set
-            if isinstance(parent, Module):
+            if parent.has_label(Module):
                 self.module_objects[parent].append(function)
 
             # Parse arguments and create Argument nodes
@@ -595,26 +793,28 @@ class RepographBuilder:
                 function,
             )
 
-    def _parse_classes(self, class_info: Dict, parent: Module) -> None:
+    def _parse_classes(self, class_info: Dict, parent: NodeRecord) -> None:
         """Parses class information into Class nodes and
         adds links to parent File node.
 
         Args:
             class_info (Dict): Dictionary containing class information.
-            parent (Module): Parent File node.
+            parent (NodeRecord): Parent Module record.
         """
         for name, info in class_info.items():
             min_lineno, max_lineno = parse_min_max_line_numbers(info)
-            class_node = Class(
+            class_node = self.buffer.node(
+                Class,
                 name=name,
                 canonical_name=f"{parent.canonical_name}.{name}",
                 min_line_number=min_lineno,
                 max_line_number=max_lineno,
                 repository_name=self.repository_name,
             )
-            relationship = Contains(parent, class_node, self.repository_name)
-            self.graph.add(class_node, tx=self.tx, graph_name=self.graph_name)
-            self.graph.add(relationship, tx=self.tx, graph_name=self.graph_name)
+            relationship = self.buffer.relationship(
+                Contains, parent, class_node, self.repository_name
+            )
+            self.buffer.add(class_node, relationship)
 
             # Add to module objects set
             self.module_objects[parent].append(class_node)
@@ -636,38 +836,46 @@ class RepographBuilder:
         self,
         args_list: List[str],
         annotated_arg_types: Dict[str, str],
-        parent: Function,
+        parent: NodeRecord,
     ) -> None:
         """Parse arguments from method information.
 
         Args:
             args_list (List[str]): The list of argument names.
             annotated_arg_types (Dict[str, str]): The annotated argument types.
-            parent (Function): The parent function the arguments belong to.
+            parent (NodeRecord): The parent Function record the arguments belong to.
         """
         arg_types = annotated_arg_types
+        if self.compact:
+            parent.properties["argument_names"] = list(args_list)
+            parent.properties["argument_types"] = [
+                arg_types.get(arg, "Any") if arg_types else "Any" for arg in args_list
+            ]
+            return
+
         for arg in args_list:
             if arg_types:
                 arg_type = arg_types.get(arg, "Any")
             else:
                 arg_type = "Any"
 
-            argument = Argument(
-                name=arg, type=arg_type, repository_name=self.repository_name
+            argument = self.buffer.node(
+                Argument, name=arg, type=arg_type, repository_name=self.repository_name
+            )
+            relationship = self.buffer.relationship(
+                HasArgument, parent, argument, self.repository_name
             )
-            relationship = HasArgument(parent, argument, self.repository_name)
-            self.graph.add(argument, tx=self.tx, graph_name=self.graph_name)
-            self.graph.add(relationship, tx=self.tx, graph_name=self.graph_name)
+            self.buffer.add(argument, relationship)
 
     def _parse_return_values(
-        self, return_values: List[List[str]], annotated_type: str, parent: Function
+        self, return_values: List[List[str]], annotated_type: str, parent: NodeRecord
     ) -> None:
         """Parse return values from function/method information.
 
         Args:
             return_values (List[str]): The list of return value names.
             annotated_type (Dict[str, str]): The annotated return value types.
-            parent (Function): The parent function the return values belong to.
+            parent (NodeRecord): The parent Function record the return values belong to.
         """
         if len(return_values) > 1:
             return_type = "Any"
@@ -676,19 +884,25 @@ class RepographBuilder:
         else:
             return
 
+        names = []
+
         def parse(values):
             for value in values:
                 if isinstance(value, list):
                     parse(value)
+                elif isinstance(value, str) and self.compact:
+                    names.append(value)
                 elif isinstance(value, str):
-                    return_value = ReturnValue(
+                    return_value = self.buffer.node(
+                        ReturnValue,
                         name=value,
                         type=return_type,
                         repository_name=self.repository_name,
                     )
-                    relationship = Returns(parent, return_value, self.repository_name)
-                    self.graph.add(return_value, tx=self.tx, graph_name=self.graph_name)
-                    self.graph.add(relationship, tx=self.tx, graph_name=self.graph_name)
+                    relationship = self.buffer.relationship(
+                        Returns, parent, return_value, self.repository_name
+                    )
+                    self.buffer.add(return_value, relationship)
                 else:
                     log.error(
                         "Unexpected return value type `%s` for function `%s`",
@@ -698,25 +912,31 @@ class RepographBuilder:
 
         parse(return_values)
 
+        if self.compact:
+            parent.properties["return_value_names"] = names
+            parent.properties["return_value_types"] = [
+                return_type if return_type else "Any" for _ in names
+            ]
+
     def _parse_docstring(
-        self, docstring_info: Optional[JSONDict], parent: Union[Function, Class]
+        self, docstring_info: Optional[JSONDict], parent: NodeRecord
     ) -> None:
         """Parse docstring information for function or class
 
         Args:
             docstring_info (JSONDict): The JSONDict containing docstring information.
-            parent (Union[Function, Class): The parent node the docstring describes.
+            parent (NodeRecord): The parent Function or Class record the docstring describes.
 
         Returns:
             None
         """
         # Return immediately depending on whether Class/Function, if docstring info
         # provided, and whether summarization enabled.
-        if isinstance(parent, Class):
+        if parent.has_label(Class):
             if not docstring_info or not bool(docstring_info):
                 log.debug(f"No docstring information for class {parent.name}")
                 return
-        elif isinstance(parent, Function):
+        elif parent.has_label(Function):
             if (not docstring_info or not bool(docstring_info)) and not self.summarize:
                 log.debug(f"No docstring information for {parent.name}")
                 return
@@ -728,27 +948,36 @@ class RepographBuilder:
         relationships = []
 
         # If the summarization flag is set and parent is a Function (not a Class),
-        # call the function summarizer.
-        if self.summarize and isinstance(parent, Function):
+        # call the function summarizer, unless it is called by the pipeline.
+        if self.summarize and not self.pipeline and parent.has_label(Function):
             summary = self.summarize(parent)
         else:
             summary = None
 
         # Parse docstring
-        docstring = Docstring(
+        docstring = self.buffer.node(
+            Docstring,
             summarization=summary,
             short_description=docstring_info.get("short_description", None),
             long_description=docstring_info.get("long_description", None),
             repository_name=self.repository_name,
         )
-        relationship = Documents(docstring, parent, self.repository_name)
+        relationship = self.buffer.relationship(
+            Documents, docstring, parent, self.repository_name
+        )
         nodes.append(docstring)
         relationships.append(relationship)
 
-        if isinstance(parent, Class):
+        if self.pipeline and parent.has_label(Function):
+            self.pipeline.submit(parent, docstring)
+
+        if parent.has_label(Class) and self.compact:
+            self._inline_docstring_parts(docstring_info, docstring)
+        elif parent.has_label(Class):
             # Parse docstring arguments
             for arg, arg_info in docstring_info.get("args", {}).items():
-                docstring_arg = DocstringArgument(
+                docstring_arg = self.buffer.node(
+                    DocstringArgument,
                     name=arg,
                     type=arg_info.get("type_name", None),
                     description=arg_info.get("description", None),
@@ -756,42 +985,97 @@ class RepographBuilder:
                     default=arg_info.get("default", None),
                     repository_name=self.repository_name,
                 )
-                relationship = Describes(docstring, docstring_arg, self.repository_name)
+                relationship = self.buffer.relationship(
+                    Describes, docstring, docstring_arg, self.repository_name
+                )
                 nodes.append(docstring_arg)
                 relationships.append(relationship)
 
             if "returns" in docstring_info:
                 # Parse docstring return values
                 returns_info = docstring_info.get("returns", {})
-                docstring_return_value = DocstringReturnValue(
+                docstring_return_value = self.buffer.node(
+                    DocstringReturnValue,
                     name=returns_info.get("return_name", None),
                     description=returns_info.get("description", None),
                     type=returns_info.get("type_name", None),
                     is_generator=returns_info.get("is_generator", False),
                     repository_name=self.repository_name,
                 )
-                relationship = Describes(
-                    docstring, docstring_return_value, self.repository_name
+                relationship = self.buffer.relationship(
+                    Describes, docstring, docstring_return_value, self.repository_name
                 )
                 nodes.append(docstring_return_value)
                 relationships.append(relationship)
 
             # Parse docstring raises
             for raises in docstring_info.get("raises", []):
-                docstring_raises = DocstringRaises(
+                docstring_raises = self.buffer.node(
+                    DocstringRaises,
                     description=raises.get("description", None),
                     type=raises.get("type_name", None),
                     repository_name=self.repository_name,
                 )
-                relationship = Describes(
-                    docstring, docstring_raises, self.repository_name
+                relationship = self.buffer.relationship(
+                    Describes, docstring, docstring_raises, self.repository_name
                 )
                 nodes.append(docstring_raises)
                 relationships.append(relationship)
 
         # Add nodes and relationships to graph
-        self.graph.add(*nodes, tx=self.tx, graph_name=self.graph_name)
-        self.graph.add(*relationships, tx=self.tx, graph_name=self.graph_name)
+        self.buffer.add(*nodes, *relationships)
+
+    @staticmethod
+    def _inline_docstring_parts(docstring_info: JSONDict, docstring: NodeRecord) -> None:
+        """Store the arguments, return value and raises of a docstring as properties.
+
+        Neo4j list properties can't hold nulls, so missing values are stored as empty
+        strings.
+
+        Args:
+            docstring_info (JSONDict): The JSONDict containing docstring information.
+            docstring (NodeRecord): The Docstring record.
+
+        Returns:
+            None
+        """
+
+        def value(info: JSONDict, key: str) -> str:
+            return info.get(key, None) or ""
+
+        arguments = docstring_info.get("args", {})
+        if arguments:
+            docstring.properties.update(
+                argument_names=list(arguments),
+                argument_types=[value(a, "type_name") for a in arguments.values()],
+                argument_descriptions=[
+                    value(a, "description") for a in arguments.values()
+                ],
+                argument_optional=[
+                    bool(a.get("is_optional", False)) for a in arguments.values()
+                ],
+                argument_defaults=[value(a, "default") for a in arguments.values()],
+            )
+
+        if "returns" in docstring_info:
+            returns_info = docstring_info.get("returns", {})
+            docstring.properties.update(
+                returns_name=returns_info.get("return_name", None),
+                returns_description=returns_info.get("description", None),
+                returns_type=returns_info.get("type_name", None),
+                returns_is_generator=returns_info.get("is_generator", False),
+            )
+
+        raises = docstring_info.get("raises", [])
+        if raises:
+            docstring.properties.update(
+                raises_types=[value(r, "type_name") for r in raises],
+                raises_descriptions=[value(r, "description") for r in raises],
+            )
+
+        # Drop missing values, as for any other property
+        for key in [key for key, v in docstring.properties.items() if v is None]:
+            del docstring.properties[key]
 
     def _parse_dependencies(self) -> None:  # noqa: C901
         """Parse the dependencies between Modules.
@@ -853,10 +1137,10 @@ class RepographBuilder:
                     if imports_module:
                         # ...and it already exists create the relationship
                         if imported_module:
-                            self.graph.add(
-                                Imports(module, imported_module, self.graph_name),
-                                tx=self.tx,
-                                graph_name=self.graph_name,
+                            self.buffer.add(
+                                self.buffer.relationship(
+                                    Imports, module, imported_module, self.repository_name
+                                )
                             )
                             self.module_dependencies[module].append(imported_module)
                         # ...and if it doesn't recursively create it
@@ -876,10 +1160,10 @@ class RepographBuilder:
                                     missing, parent=self.modules[source_module]
                                 )
 
-                            self.graph.add(
-                                Imports(module, child, self.repository_name),
-                                tx=self.tx,
-                                graph_name=self.graph_name,
+                            self.buffer.add(
+                                self.buffer.relationship(
+                                    Imports, module, child, self.repository_name
+                                )
                             )
                             self.module_dependencies[module].append(child)
 
@@ -888,29 +1172,26 @@ class RepographBuilder:
                         # ...or it already exists then create the relationship
                         if imported_module:
                             if imported_module.inferred:
-                                if imported_object[0].isupper():
-                                    imported_object = Class(
-                                        name=imported_object,
-                                        canonical_name=f"{dependency['from_module']}.{dependency['import']}",
-                                        repository_name=self.repository_name,
-                                        inferred=True,
-                                    )
-                                else:
-                                    imported_object = Function(
-                                        name=imported_object,
-                                        canonical_name=f"{dependency['from_module']}.{dependency['import']}",
-                                        type=str(Function.FunctionType.FUNCTION.value),
-                                        repository_name=self.repository_name,
-                                        inferred=True,
-                                    )
-
-                                self.graph.add(
-                                    Imports(module, imported_object, self.graph_name),
-                                    Imports(
-                                        imported_module, imported_object, self.graph_name
+                                imported_object = self._create_inferred_object(
+                                    imported_object,
+                                    f"{dependency['from_module']}.{dependency['import']}",
+                                )
+                                if imported_module.shared:
+                                    imported_object = self._share(imported_object)
+
+                                self.buffer.add(
+                                    self.buffer.relationship(
+                                        Imports,
+                                        module,
+                                        imported_object,
+                                        self.repository_name,
+                                    ),
+                                    self.buffer.relationship(
+                                        Imports,
+                                        imported_module,
+                                        imported_object,
+                                        self.repository_name,
                                     ),
-                                    tx=self.tx,
-                                    graph_name=self.graph_name,
                                 )
 
                                 self.module_dependencies[imported_module].append(
@@ -959,52 +1240,44 @@ class RepographBuilder:
                                     )
 
                                 for match in matching_objects:
-                                    self.graph.add(
-                                        Imports(module, match, self.repository_name),
-                                        tx=self.tx,
+                                    self.buffer.add(
+                                        self.buffer.relationship(
+                                            Imports, module, match, self.repository_name
+                                        )
                                     )
                                     self.module_dependencies[module].append(match)
                         # ...and if it doesn't recursively create it
                         else:
-                            if imported_object[0].isupper():
-                                imported_object = Class(
-                                    name=imported_object,
-                                    canonical_name=f"{dependency['from_module']}.{dependency['import']}",
-                                    repository_name=self.repository_name,
-                                    inferred=True,
-                                )
-                            else:
-                                imported_object = Function(
-                                    name=imported_object,
-                                    canonical_name=f"{dependency['from_module']}.{dependency['import']}",
-                                    type=str(Function.FunctionType.FUNCTION.value),
-                                    repository_name=self.repository_name,
-                                    inferred=True,
-                                )
+                            imported_object = self._create_inferred_object(
+                                imported_object,
+                                f"{dependency['from_module']}.{dependency['import']}",
+                            )
 
                             source_module, missing = self._calculate_missing_packages(
                                 source_module
                             )
 
                             if source_module == "":
-                                self._create_missing_nodes(missing, import_object=imported_object)
+                                imported_object = self._create_missing_nodes(
+                                    missing, import_object=imported_object
+                                )
                             elif source_module in self.requirements:
-                                self._create_missing_nodes(
+                                imported_object = self._create_missing_nodes(
                                     missing,
                                     parent=self.requirements[source_module],
                                     import_object=imported_object,
                                 )
                             else:
-                                self._create_missing_nodes(
+                                imported_object = self._create_missing_nodes(
                                     missing,
                                     parent=self.modules[source_module],
                                     import_object=imported_object,
                                 )
 
-                            self.graph.add(
-                                Imports(module, imported_object, self.repository_name),
-                                tx=self.tx,
-                                graph_name=self.graph_name,
+                            self.buffer.add(
+                                self.buffer.relationship(
+                                    Imports, module, imported_object, self.repository_name
+                                )
                             )
                             self.module_dependencies[module].append(imported_object)
             except Exception as e:
@@ -1029,8 +1302,10 @@ class RepographBuilder:
                 ]
                 if len(matching_objects) > 0:
                     for match in matching_objects:
-                        self.graph.add(
-                            Imports(module, match, self.repository_name), tx=self.tx
+                        self.buffer.add(
+                            self.buffer.relationship(
+                                Imports, module, match, self.repository_name
+                            )
                         )
                         self.module_dependencies[module].append(match)
                     continue
@@ -1044,8 +1319,10 @@ class RepographBuilder:
                 ]
                 if len(matching_objects) > 0:
                     for match in matching_objects:
-                        self.graph.add(
-                            Imports(module, match, self.repository_name), tx=self.tx
+                        self.buffer.add(
+                            self.buffer.relationship(
+                                Imports, module, match, self.repository_name
+                            )
                         )
                         self.module_dependencies[module].append(match)
                     continue
@@ -1065,34 +1342,19 @@ class RepographBuilder:
             imported_object,
             dependency,
         ) in unresolved:
-            if imported_object.isupper() or imported_object.startswith("__"):
-                imported_object = Variable(
-                    name=imported_object,
-                    canonical_name=f"{dependency['from_module']}.{dependency['import']}",
-                    inferred=True,
-                    repository_name=self.repository_name,
-                )
-            elif imported_object[0].isupper():
-                imported_object = Class(
-                    name=imported_object,
-                    canonical_name=f"{dependency['from_module']}.{dependency['import']}",
-                    repository_name=self.repository_name,
-                    inferred=True,
-                )
-            else:
-                imported_object = Function(
-                    name=imported_object,
-                    canonical_name=f"{dependency['from_module']}.{dependency['import']}",
-                    type=str(Function.FunctionType.FUNCTION.value),
-                    repository_name=self.repository_name,
-                    inferred=True,
-                )
+            imported_object = self._create_inferred_object(
+                imported_object,
+                f"{dependency['from_module']}.{dependency['import']}",
+                variables=True,
+            )
 
-            self.graph.add(
-                Contains(imported_module, imported_object, self.repository_name),
-                Imports(module, imported_object, self.repository_name),
-                tx=self.tx,
-                graph_name=self.graph_name,
+            self.buffer.add(
+                self.buffer.relationship(
+                    Contains, imported_module, imported_object, self.repository_name
+                ),
+                self.buffer.relationship(
+                    Imports, module, imported_object, self.repository_name
+                ),
             )
             self.module_objects[imported_module].append(imported_object)
             self.module_dependencies[module].append(imported_object)
@@ -1107,7 +1369,7 @@ class RepographBuilder:
 
         Returns:
             str: Any pre-existing source package.
-            List[str]: Missing packages/modules.
+            List[str]: Missing packages/modules, outermost first.
         """
         missing = []
         while (
@@ -1119,36 +1381,48 @@ class RepographBuilder:
             missing.append(child)
             source_module = parent
 
+        # Order the missing packages/modules from the outermost
+        missing.reverse()
         return source_module, missing
 
     def _create_missing_nodes(
         self,
         missing: List[str],
-        parent: Package = None,
-        import_object: Union[Class, Function] = None,
-    ) -> Union[Module, Function]:
+        parent: NodeRecord = None,
+        import_object: NodeRecord = None,
+    ) -> NodeRecord:
         """Create missing nodes.
 
+        Missing nodes outside the repository, i.e. with no parent or a shared parent,
+        are shared with the other repositories in the graph, as is the import object
+        if it is imported from them.
+
         Args:
-            missing (List[str]):
-            parent (Package): The parent Package. Optional.
-            import_object (Union[Class, Function]): The Class or Function being imported from the
+            missing (List[str]): The missing packages/modules, outermost first.
+            parent (NodeRecord): The parent Package record. Optional.
+            import_object (NodeRecord): The Class or Function record being imported from the
+                                        last missing module. Optional.
 
         Returns:
-            Union[Module, Function]: The child Node.
+            NodeRecord: The child record.
         """
         nodes = []
         relationships = []
         child = None
 
         for index, m in enumerate(missing):
+            shared = parent is None or parent.shared
             if index == len(missing) - 1 and len(missing) > 1:
-                new = Module(
-                    name=m, repository_name=self.repository_name, inferred=True
+                new = self.buffer.node(
+                    Module,
+                    name=m,
+                    canonical_name=f"{parent.canonical_name}.{m}",
+                    repository_name=self.repository_name,
+                    inferred=True,
                 )
-                child = new
             else:
-                new = Package(
+                new = self.buffer.node(
+                    Package,
                     name=m,
                     canonical_name=f"{parent.canonical_name}.{m}" if parent else m,
                     parent_package=parent.canonical_name if parent else "",
@@ -1157,11 +1431,16 @@ class RepographBuilder:
                     inferred=True,
                 )
 
-                if index == len(missing) - 1:
-                    child = new
+            if shared:
+                new = self._share(new)
+
+            if index == len(missing) - 1:
+                child = new
 
             if parent:
-                relationships.append(Contains(parent, new, self.repository_name))
+                relationships.append(
+                    self.buffer.relationship(Contains, parent, new, self.repository_name)
+                )
 
             parent = new
             nodes.append(new)
@@ -1169,30 +1448,43 @@ class RepographBuilder:
         # If we have an import_object, but the parent is a Package, we check to see if an __init__
         # module exists for the package. If not, we create an __init__ Module as this is actually
         # where the import_object is being imported from.
-        if import_object and parent and isinstance(parent, Package):
+        if import_object and parent and parent.has_label(Package):
             init_name = f"{parent.canonical_name}.__init__"
             if init_name in self.modules:
                 parent = self.modules[init_name]
             else:
-                new = Module.create_init_module(
-                    parent.canonical_name, self.repository_name
+                new = self.buffer.node(
+                    Module,
+                    name=INIT,
+                    canonical_name=init_name,
+                    repository_name=self.repository_name,
+                    inferred=True,
+                )
+                if parent.shared:
+                    new = self._share(new)
+                relationships.append(
+                    self.buffer.relationship(Contains, parent, new, self.repository_name)
                 )
-                relationships.append(Contains(parent, new, self.repository_name))
                 self.modules[init_name] = new
                 self.module_dependencies[new] = []
                 parent = new
 
         # If we have an import object, create a Contains relationship with the parent module.
         if import_object:
-            relationships.append(Contains(parent, import_object, self.repository_name))
+            if parent and parent.shared and import_object.inferred:
+                import_object = self._share(import_object)
+            relationships.append(
+                self.buffer.relationship(
+                    Contains, parent, import_object, self.repository_name
+                )
+            )
             child = import_object
 
-        if child == None and parent:
+        if child is None and parent:
             child = parent
 
         # Add the created nodes and relationships to the Repograph.
-        self.graph.add(*nodes, tx=self.tx, graph_name=self.graph_name)
-        self.graph.add(*relationships, tx=self.tx, graph_name=self.graph_name)
+        self.buffer.add(*nodes, *relationships)
 
         return child
 
@@ -1244,27 +1536,24 @@ class RepographBuilder:
                     )
 
         # Add called builtin functions to the graph
-        self.graph.add(
-            *self.called_builtin_functions.values(),
-            tx=self.tx,
-            graph_name=self.graph_name,
-        )
+        self.buffer.add(*self.called_builtin_functions.values())
 
     def _parse_calls(
         self,
-        parent_module: Module,
+        parent_module: NodeRecord,
         call_info: Optional[JSONDict],
-        module_objects: List[any],
+        module_objects: List[NodeRecord],
         module_imports: Set[str],
-        module_dependencies: List[any],
-        caller: Optional[Function] = None,
+        module_dependencies: List[NodeRecord],
+        caller: Optional[NodeRecord] = None,
     ) -> None:
         """Parse the call graph for a particular module.
 
         Args:
-            parent_module (Module): The parent module.
+            parent_module (NodeRecord): The parent Module record.
             call_info (Optional[JSONDict]): The call info.
-            caller (Optional[Function): An optional specific function that the call info is for.
+            caller (Optional[NodeRecord]): An optional specific Function record that the call
+                                           info is for.
         Returns:
             None
         """
@@ -1281,7 +1570,8 @@ class RepographBuilder:
                 # If the call is to an imported function...
                 if call in module_imports:
                     matching_imports = find_node_object_by_name(module_dependencies, call)
-                    relationship = Calls(
+                    relationship = self.buffer.relationship(
+                        Calls,
                         caller if caller else parent_module,
                         matching_imports,
                         self.repository_name,
@@ -1291,17 +1581,22 @@ class RepographBuilder:
                     if function in self.called_builtin_functions:
                         function_node = self.called_builtin_functions[function]
                     else:
-                        function_node = Function(
-                            name=function,
-                            type=str(Function.FunctionType.FUNCTION.value),
-                            builtin=True,
-                            repository_name=self.repository_name,
-                            inferred=True,
+                        function_node = self._share(
+                            self.buffer.node(
+                                Function,
+                                name=function,
+                                canonical_name=f"builtins.{function}",
+                                type=str(Function.FunctionType.FUNCTION.value),
+                                builtin=True,
+                                repository_name=self.repository_name,
+                                inferred=True,
+                            )
                         )
                         self.called_builtin_functions[function] = function_node
 
                     # Create the relationship between the caller and the new function_node
-                    relationship = Calls(
+                    relationship = self.buffer.relationship(
+                        Calls,
                         caller if caller else parent_module,
                         function_node,
                         self.repository_name,
@@ -1309,7 +1604,8 @@ class RepographBuilder:
 
                 # ...or if the call is to a function defined in the module
                 elif matching_objects_in_module:
-                    relationship = Calls(
+                    relationship = self.buffer.relationship(
+                        Calls,
                         caller if caller else parent_module,
                         matching_objects_in_module,
                         self.repository_name,
@@ -1318,7 +1614,7 @@ class RepographBuilder:
                     log.debug("Call to some other variable (%s). Ignoring.", call)
                     relationship = None
 
-                self.graph.add(relationship, tx=self.tx, graph_name=self.graph_name)
+                self.buffer.add(relationship)
             except Exception as e:
                 log.warning("Unable to parse call (%s). An error occurred: %s", call, e)
 
@@ -1337,15 +1633,15 @@ class RepographBuilder:
                     if
                     obj is not None and
                     (obj.name == extends or obj.canonical_name == extends) and
-                    isinstance(obj, Class)
+                    obj.has_label(Class)
                 ]
 
                 if matching_objects:
                     for obj in matching_objects:
-                        self.graph.add(
-                            Extends(class_node, obj, self.graph_name),
-                            tx=self.tx,
-                            graph_name=self.graph_name
+                        self.buffer.add(
+                            self.buffer.relationship(
+                                Extends, class_node, obj, self.repository_name
+                            )
                         )
                     continue
 
@@ -1356,15 +1652,15 @@ class RepographBuilder:
                     if
                     obj is not None and
                     (obj.name == extends or obj.canonical_name == extends) and
-                    isinstance(obj, Class)
+                    obj.has_label(Class)
                 ]
 
                 if matching_objects:
                     for obj in matching_objects:
-                        self.graph.add(
-                            Extends(class_node, obj, self.graph_name),
-                            tx=self.tx,
-                            graph_name=self.graph_name
+                        self.buffer.add(
+                            self.buffer.relationship(
+                                Extends, class_node, obj, self.repository_name
+                            )
                         )
                     continue
 
@@ -1413,50 +1709,103 @@ class RepographBuilder:
             key=lambda file: (os.path.dirname(file), os.path.basename(file)),
         )
 
-        # Parse repository root folder if it exists, otherwise manually create
-        # the repository node.
-        path = strip_file_path_prefix(directories[0])
-        self.repository_name = path
-
-        if is_root_folder(path):
-            directory = directories.pop(0)
-            repository = self._parse_repository(
-                path,
-                directory_info=directory_info[directory],
-                metadata=metadata,
-                software_type=software_type,
-            )
-        else:
-            repository = self._parse_repository(
-                get_path_root(path), metadata=metadata, software_type=software_type
-            )
+        try:
+            with self._phase("repository"):
+                # Parse repository root folder if it exists, otherwise manually create
+                # the repository node.
+                path = strip_file_path_prefix(directories[0])
+                self.repository_name = path
+
+                if is_root_folder(path):
+                    directory = directories.pop(0)
+                    repository = self._parse_repository(
+                        path,
+                        directory_info=directory_info[directory],
+                        metadata=metadata,
+                        software_type=software_type,
+                    )
+                else:
+                    repository = self._parse_repository(
+                        get_path_root(path),
+                        metadata=metadata,
+                        software_type=software_type,
+                    )
+
+                # Parse requirements
+                self._parse_requirements(requirements, repository)
 
-        # Parse requirements
-        self._parse_requirements(requirements, repository)
+                # Parse license
+                self._parse_license(licenses, repository)
 
-        # Parse license
-        self._parse_license(licenses, repository)
+            # Parse each directory
+            log.info("Extracting information from directories...")
+            with self._phase("directories"):
+                for index, directory in enumerate(directories):
+                    self._parse_directory(
+                        directory, directory_info[directory], index, len(directories)
+                    )
 
-        # Parse each directory
-        log.info("Extracting information from directories...")
-        for index, directory in enumerate(directories):
-            self._parse_directory(
-                directory, directory_info[directory], index, len(directories)
+            # Retrospectively parse module dependencies
+            log.info("Parsing module dependencies...")
+            with self._phase("dependencies"):
+                self._parse_dependencies()
+
+            # Parse the call list, now that most Nodes should be added to the graph
+            log.info("Parsing call graph...")
+            with self._phase("call_graph"):
+                self._parse_call_graph(call_graph)
+
+            # Parse extends relationships
+            log.info("Parsing extends relationships...")
+            with self._phase("extends"):
+                self._parse_extends()
+
+            # Parse READMEs
+            with self._phase("readme"):
+                self._parse_readme(readmes)
+
+            # Write the accumulated nodes and relationships
+            self.instrumentation.start("commit")
+            self._flush()
+            self.instrumentation.stop(
+                "commit",
+                nodes=self.buffer.node_count,
+                relationships=self.buffer.relationship_count,
             )
+        finally:
+            # Stop the summarization workers, even if the build failed
+            if self.pipeline:
+                self.pipeline.close()
+
+        log.info("Successfully built a Repograph!")
 
-        # Retrospectively parse module dependencies
-        log.info("Parsing module dependencies...")
-        self._parse_dependencies()
+    def _flush(self) -> None:
+        """Key the buffered nodes and relationships, and write them to the sink.
 
-        # Parse the call list, now that most Nodes should be added to the graph
-        log.info("Parsing call graph...")
-        self._parse_call_graph(call_graph)
+        This happens once parsing has finished, as keys depend on the whole buffer.
+        Only the summarization of functions continues alongside the writes.
 
-        # Parse extends relationships
-        log.info("Parsing extends relationships...")
-        self._parse_extends()
+        Returns:
+            None
+        """
+        log.info(
+            "Writing %d nodes and %d relationships...",
+            self.buffer.node_count,
+            self.buffer.relationship_count,
+        )
+        self.buffer.assign_keys()
+        if self.pipeline:
+            self.pipeline.write(self.buffer, self.sink)
+        else:
+            self.sink.write(self.buffer)
 
-        # Parse READMEs
-        self._parse_readme(readmes)
+    def _phase(self, name: str) -> ContextManager[None]:
+        """Record the resource usage of a phase of the build.
 
-        log.info("Successfully built a Repograph!")
+        Args:
+            name (str): The name of the phase.
+
+        Returns:
+            ContextManager[None]
+        """
+        return self.instrumentation.phase(name, self.buffer)
@@ -7,11 +7,15 @@ from dependency_injector.containers import DeclarativeContainer
 from dependency_injector.providers import Configuration, Dependency, Singleton
 
 # Build entity imports
+from repograph.entities.build.queue import BuildQueue
+from repograph.entities.build.runner import BuildRunner, BuildRunnerPool
 from repograph.entities.build.service import BuildService
 from repograph.entities.build.router import BuildRouter
 
 # Other entity imports
+from repograph.entities.blob.service import BlobService
 from repograph.entities.graph.service import GraphService
+from repograph.entities.search.service import SearchService
 from repograph.entities.summarization.service import SummarizationService
 from repograph.entities.metadata.service import MetadataService
 
@@ -25,15 +29,46 @@ class BuildContainer(DeclarativeContainer):
 
     metadata: Dependency[MetadataService] = Dependency()
 
+    blobs: Dependency[BlobService] = Dependency()
+
+    search: Dependency[SearchService] = Dependency()
+
     service: Singleton[BuildService] = Singleton(
         BuildService,
         graph=graph,
         summarization=summarization,
         metadata=metadata,
-        extract_metadata=config.extract_metadata
+        blobs=blobs,
+        extract_metadata=config.extract_metadata,
+        compact_schema=config.compact_schema,
+        skip_ast=config.skip_ast,
+        summarization_workers=config.summarization_workers,
+        search=search
+    )
+
+    queue: Singleton[BuildQueue] = Singleton(
+        BuildQueue,
+        metadata=metadata
+    )
+
+    runner: Singleton[BuildRunner] = Singleton(
+        BuildRunner,
+        service=service,
+        metadata=metadata,
+        max_extracted_size=config.extract_max_size
+    )
+
+    workers: Singleton[BuildRunnerPool] = Singleton(
+        BuildRunnerPool,
+        runner=runner.provider,
+        config=config,
+        workers=config.build_workers,
+        mode=config.build_worker_mode
     )
 
     router: Singleton[BuildRouter] = Singleton(
         BuildRouter,
-        service=service
+        queue=queue,
+        upload_dir=config.upload_dir,
+        max_upload_size=config.upload_max_size
     )
@@ -1,7 +1,88 @@
 """
 Custom exceptions for the build entity.
 """
+# pip imports
+from fastapi import status
+
+# Exceptions imports
+from repograph.utils.exception_handlers import RepographException
 
 
 class RepographBuildError(Exception):
     pass
+
+
+class BuildCancelledError(Exception):
+    """
+    Raised within a build when cancellation of its job has been requested.
+    """
+
+    def __init__(self, job_id: str):
+        super().__init__(f"The build job '{job_id}' was cancelled")
+
+
+class BuildNotFoundError(RepographException):
+    """
+    Exception for builds that don't exist.
+    """
+
+    code = status.HTTP_404_NOT_FOUND
+
+    def __init__(self, build_id: str):
+        self.message = f"The build '{build_id}' doesn't exist!"
+
+
+class JobNotFoundError(RepographException):
+    """
+    Exception for build jobs that don't exist.
+    """
+
+    code = status.HTTP_404_NOT_FOUND
+
+    def __init__(self, job_id: str):
+        self.message = f"The build job '{job_id}' doesn't exist!"
+
+
+class JobNotCancellableError(RepographException):
+    """
+    Exception for cancelling build jobs that have already finished.
+    """
+
+    code = status.HTTP_409_CONFLICT
+
+    def __init__(self, job_id: str, job_status: str):
+        self.message = f"The build job '{job_id}' can't be cancelled as it is {job_status}!"
+
+
+class UnsupportedArchiveError(RepographException):
+    """
+    Exception for uploads that aren't a supported archive format.
+    """
+
+    code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+    def __init__(self, filename: str):
+        self.message = f"'{filename}' isn't a zip or tar archive!"
+
+
+class UploadTooLargeError(RepographException):
+    """
+    Exception for uploads that exceed the maximum upload size.
+    """
+
+    code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+    def __init__(self, max_size: int):
+        self.message = f"Uploads can't be larger than {max_size} bytes!"
+
+
+class UnsafeArchiveError(RepographException):
+    """
+    Exception for archives that exceed the extraction limits, or contain paths outside
+    the extraction directory.
+    """
+
+    code = status.HTTP_400_BAD_REQUEST
+
+    def __init__(self, reason: str):
+        self.message = f"Refusing to extract archive: {reason}"
@@ -0,0 +1,186 @@
+"""
+Per-phase resource usage instrumentation for builds.
+"""
+# Base imports
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from logging import getLogger
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Build entity imports
+from repograph.entities.build.buffer import GraphBuffer
+
+# Metadata entity imports
+from repograph.entities.metadata.models import BuildPhase
+
+# Configure logging
+log = getLogger("repograph.entities.build.instrumentation")
+
+# The phases of building a single input repository, in order
+BUILD_PHASES = [
+    "fingerprint",
+    "clone",
+    "extraction",
+    "repository",
+    "directories",
+    "dependencies",
+    "call_graph",
+    "extends",
+    "readme",
+    "commit",
+    "docstring_similarity",
+]
+
+
+def get_peak_memory() -> int:
+    """Get the peak resident set size of the process so far.
+
+    Returns:
+        int: The peak resident set size in bytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS, and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def get_cpu_time() -> float:
+    """Get the CPU time used by the process so far, including its finished child
+    processes, e.g. inspect4py, and all of its threads, e.g. summarization workers.
+
+    Returns:
+        float: The user and system CPU time in seconds.
+    """
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+class BuildInstrumentation:
+    """
+    Records wall time, CPU time, emitted nodes/relationships and peak memory growth
+    for each phase of a build.
+
+    CPU time is that of the whole process and its child processes, so it includes the
+    work of other threads, e.g. of concurrent builds in a threaded worker.
+
+    Phases are recorded per input repository. Recording the same phase more than once
+    for an input accumulates into a single BuildPhase.
+    """
+
+    def __init__(
+        self, listener: Optional[Callable[[BuildPhase], None]] = None
+    ) -> None:
+        """Constructor
+
+        Args:
+            listener (Optional[Callable[[BuildPhase], None]]): Optional callback invoked
+                                                               whenever a phase starts.
+        """
+        # The recorded phases, in the order they were started
+        self.phases: List[BuildPhase] = []
+
+        # Callback invoked whenever a phase starts
+        self.listener = listener
+
+        # The index of the input repository currently being built
+        self.input_index = 0
+
+        # Start wall time, CPU time and peak memory of running phases
+        self._running: Dict[str, Tuple[float, float, int]] = dict()
+
+    def _get_phase(self, name: str) -> BuildPhase:
+        """Get the recorded phase for the current input, creating it if necessary.
+
+        Args:
+            name (str): The name of the phase.
+
+        Returns:
+            BuildPhase
+        """
+        for phase in self.phases:
+            if phase.name == name and phase.input_index == self.input_index:
+                return phase
+
+        phase = BuildPhase(name=name, input_index=self.input_index)
+        self.phases.append(phase)
+        return phase
+
+    def start(self, name: str) -> None:
+        """Start timing a phase.
+
+        Args:
+            name (str): The name of the phase.
+
+        Returns:
+            None
+        """
+        phase = self._get_phase(name)
+        if self.listener:
+            self.listener(phase)
+
+        self._running[name] = (
+            time.perf_counter(),
+            get_cpu_time(),
+            get_peak_memory(),
+        )
+
+    def stop(
+        self, name: str, nodes: int = 0, relationships: int = 0
+    ) -> Optional[BuildPhase]:
+        """Stop timing a phase, accumulating its resource usage.
+
+        Stopping a phase that isn't running does nothing.
+
+        Args:
+            name (str): The name of the phase.
+            nodes (int): The number of nodes emitted during the phase.
+            relationships (int): The number of relationships emitted during the phase.
+
+        Returns:
+            Optional[BuildPhase]: The recorded phase, if it was running.
+        """
+        if name not in self._running:
+            return None
+
+        wall_start, cpu_start, memory_start = self._running.pop(name)
+        phase = self._get_phase(name)
+        phase.wall_time += time.perf_counter() - wall_start
+        phase.cpu_time += get_cpu_time() - cpu_start
+        phase.peak_memory_delta += get_peak_memory() - memory_start
+        phase.nodes += nodes
+        phase.relationships += relationships
+
+        log.debug(
+            "Phase '%s' took %.3fs (%.3fs CPU), emitting %d nodes and %d relationships",
+            name,
+            phase.wall_time,
+            phase.cpu_time,
+            phase.nodes,
+            phase.relationships,
+        )
+        return phase
+
+    @contextmanager
+    def phase(self, name: str, buffer: GraphBuffer = None) -> Iterator[None]:
+        """Record a phase over the body of a with statement.
+
+        Args:
+            name (str): The name of the phase.
+            buffer (GraphBuffer): Optional buffer to count emitted nodes and
+                                  relationships from.
+
+        Returns:
+            Iterator[None]
+        """
+        nodes = buffer.node_count if buffer is not None else 0
+        relationships = buffer.relationship_count if buffer is not None else 0
+
+        self.start(name)
+        try:
+            yield
+        finally:
+            if buffer is not None:
+                nodes = buffer.node_count - nodes
+                relationships = buffer.relationship_count - relationships
+            self.stop(name, nodes=nodes, relationships=relationships)
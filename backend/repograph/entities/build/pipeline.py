@@ -0,0 +1,220 @@
+"""
+Pipelining of function summarization with parsing and graph writes.
+
+Summarizing a function with CodeT5 takes far longer than parsing it or writing it. The
+SummarizationPipeline runs summarization in a pool of worker threads, so that the
+builder carries on parsing while functions are summarized, and the graph is written
+while the remaining summaries are generated. Model inference releases the GIL, so
+summarization overlaps with both parsing and writing.
+
+Writing only starts once parsing has finished, as nodes can only be keyed once the
+whole repository is buffered, and each repository is written in a single transaction.
+Parsing and writing therefore run one after the other, each alongside summarization.
+
+    parse (builder) -> [bounded queue] -> summarize (workers) -> write (batches)
+"""
+# Base imports
+import queue
+import threading
+from logging import getLogger
+from typing import Callable, List, Optional, Set, Tuple
+
+# Build entity imports
+from repograph.entities.build.buffer import GraphBuffer, NodeRecord
+from repograph.entities.build.sinks import GraphSink
+
+# Configure logging
+log = getLogger("repograph.entities.build.pipeline")
+
+# The default maximum number of functions waiting to be summarized
+DEFAULT_MAX_PENDING = 64
+
+# The default number of summarized docstrings written at a time
+DEFAULT_BATCH_SIZE = 500
+
+
+class SummarizationPipeline:
+    """
+    Summarizes functions in worker threads, and writes their docstrings as they complete.
+
+    Functions are passed to the workers through a bounded queue, so the builder blocks
+    once max_pending functions are waiting to be summarized, rather than running ahead
+    of the workers. Summaries are set as the summarization property of the docstrings.
+    """
+
+    def __init__(
+        self,
+        summarize: Callable[[NodeRecord], str],
+        workers: int = 1,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """Constructor
+
+        Args:
+            summarize (Callable[[NodeRecord], str]): The summarization method.
+            workers (int): The number of worker threads.
+            max_pending (int): The maximum number of functions waiting to be summarized.
+            batch_size (int): The number of summarized docstrings written at a time.
+        """
+        self.summarize = summarize
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+
+        self._requests: "queue.Queue[Optional[Tuple[NodeRecord, NodeRecord]]]" = (
+            queue.Queue(maxsize=max(1, max_pending))
+        )
+        self._threads: List[threading.Thread] = []
+
+        # Handles of the docstrings being summarized, and of those summarized since the
+        # buffer started being written. Guarded by the condition.
+        self._condition = threading.Condition()
+        self._pending: Set[int] = set()
+        self._completed: List[int] = []
+
+        # The first error raised by the summarization method
+        self._error: Optional[Exception] = None
+
+    def _start(self) -> None:
+        """Start the worker threads, if they haven't been started.
+
+        Returns:
+            None
+        """
+        if self._threads:
+            return
+
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"summarization-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, function: NodeRecord, docstring: NodeRecord) -> None:
+        """Queue a function to be summarized, blocking if the queue is full.
+
+        Args:
+            function (NodeRecord): The Function record.
+            docstring (NodeRecord): The Docstring record to set the summary of.
+
+        Returns:
+            None
+        """
+        self._start()
+        with self._condition:
+            self._pending.add(docstring.handle)
+        self._requests.put((function, docstring))
+
+    def _work(self) -> None:
+        """Summarize queued functions until the pipeline is closed.
+
+        Returns:
+            None
+        """
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+
+            function, docstring = request
+            try:
+                summary = self.summarize(function)
+                if summary is not None:
+                    docstring.properties["summarization"] = summary
+            except Exception as e:
+                log.error("Unable to summarize function `%s` - %s", function.name, e)
+                with self._condition:
+                    self._error = self._error or e
+
+            with self._condition:
+                self._pending.discard(docstring.handle)
+                self._completed.append(docstring.handle)
+                self._condition.notify_all()
+
+    def write(self, buffer: GraphBuffer, sink: GraphSink) -> None:
+        """Write a keyed buffer, writing docstrings once they have been summarized.
+
+        This is called once parsing has finished and the buffer has been keyed, so no
+        writes overlap with parsing. Everything except the docstrings that are still
+        being summarized is written first. The remaining docstrings are then written in batches as they complete.
+        Sinks that can't write a buffer in several parts are written to once all the
+        summaries are complete.
+
+        Args:
+            buffer (GraphBuffer): The buffer to write.
+            sink (GraphSink): The sink to write to.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: The first error raised by the summarization method.
+        """
+        if not sink.incremental:
+            self.join()
+            sink.write(buffer)
+            return
+
+        with self._condition:
+            self._raise()
+            pending = set(self._pending)
+            self._completed.clear()
+
+        log.info("Writing while %d functions are summarized...", len(pending))
+        sink.write(buffer.exclude(pending))
+
+        while pending:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: len(self._completed) >= min(self.batch_size, len(pending))
+                )
+                self._raise()
+                batch = set(self._completed[: self.batch_size])
+                del self._completed[: self.batch_size]
+
+            sink.write(buffer.select(batch))
+            pending -= batch
+
+    def join(self) -> None:
+        """Wait for every queued function to be summarized.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: The first error raised by the summarization method.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: not self._pending)
+            self._raise()
+
+    def _raise(self) -> None:
+        """Raise the first error raised by the summarization method, if any.
+
+        Must be called whilst holding the condition.
+
+        Returns:
+            None
+        """
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self) -> None:
+        """Stop the worker threads, dropping any functions still waiting to be summarized.
+
+        Returns:
+            None
+        """
+        while True:
+            try:
+                self._requests.get_nowait()
+            except queue.Empty:
+                break
+
+        for _ in self._threads:
+            self._requests.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
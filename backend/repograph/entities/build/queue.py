@@ -0,0 +1,205 @@
+"""
+Persistent queue of build jobs, backed by the metadata database.
+"""
+# Base imports
+import hashlib
+import json
+from logging import getLogger
+from typing import List, Optional, Tuple
+from uuid import uuid4
+
+# Build entity imports
+from repograph.entities.build.exceptions import (
+    BuildNotFoundError,
+    JobNotCancellableError,
+    JobNotFoundError,
+)
+from repograph.entities.build.runner import cleanup_job
+
+# Metadata entity imports
+from repograph.entities.metadata.models import Build, BuildJob, BuildWorker
+from repograph.entities.metadata.service import MetadataService
+
+# Configure logging
+log = getLogger("repograph.entities.build.queue")
+
+# Statuses of jobs that have finished
+FINISHED_STATUSES = ["SUCCEEDED", "FAILED", "CANCELLED"]
+
+
+class BuildQueue:
+    """
+    Queue of build jobs.
+
+    Jobs are stored in the metadata database, so that queued jobs survive a restart and
+    their status and progress can be queried by any process. Jobs are executed by
+    BuildRunners, which may run in separate processes.
+    """
+
+    metadata: MetadataService
+
+    def __init__(self, metadata: MetadataService) -> None:
+        """Constructor
+
+        Args:
+            metadata (MetadataService): The metadata service the queue is stored in.
+        """
+        self.metadata = metadata
+
+    @staticmethod
+    def fingerprint(inputs: List[str], name: str, prune: bool = False) -> str:
+        """Compute the fingerprint of a submission from its inputs.
+
+        Args:
+            inputs (List[str]): The paths to the input repositories.
+            name (str): The name of the graph.
+            prune (bool): Whether existing nodes are pruned from the graph.
+
+        Returns:
+            str
+        """
+        return hashlib.sha256(
+            json.dumps([name.lower(), inputs, prune]).encode("utf-8")
+        ).hexdigest()
+
+    def submit(
+        self,
+        inputs: List[str],
+        name: str,
+        description: str,
+        prune: bool = False,
+        cleanup: Optional[List[str]] = None,
+        fingerprint: Optional[str] = None,
+    ) -> Tuple[BuildJob, bool]:
+        """Add a build to the queue.
+
+        If an identical submission is already waiting in the queue, that job is returned
+        instead of queueing a duplicate.
+
+        Args:
+            inputs (List[str]): The paths to the input repositories.
+            name (str): The name to assign to the graph.
+            description (str): The description to associate with the graph.
+            prune (bool): Whether to prune existing nodes from the graph.
+            cleanup (Optional[List[str]]): Paths to delete once the job has finished.
+            fingerprint (Optional[str]): Identifies duplicate submissions. Defaults to
+                                         a hash of the inputs, name and prune flag.
+
+        Returns:
+            BuildJob: The queued job.
+            bool: Whether the job was newly created.
+        """
+        if fingerprint is None:
+            fingerprint = self.fingerprint(inputs, name, prune)
+
+        existing = self.metadata.find_queued_job(fingerprint)
+        if existing:
+            log.info("Build of '%s' is already queued as job %s", name, existing.id)
+            return existing, False
+
+        job = BuildJob(
+            id=str(uuid4()),
+            name=name,
+            description=description,
+            inputs=inputs,
+            prune=prune,
+            cleanup=cleanup if cleanup else [],
+            fingerprint=fingerprint,
+        )
+        self.metadata.add_job(job)
+
+        log.info("Queued build of '%s' as job %s", name, job.id)
+        return job, True
+
+    def get_job(self, job_id: str) -> BuildJob:
+        """Get a job.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            BuildJob
+
+        Raises:
+            JobNotFoundError: If the job doesn't exist.
+        """
+        job = self.metadata.get_job(job_id)
+        if job is None:
+            raise JobNotFoundError(job_id)
+        return job
+
+    def list_jobs(self, status: Optional[str] = None) -> List[BuildJob]:
+        """List jobs, oldest first.
+
+        Args:
+            status (Optional[str]): Optional status to filter by.
+
+        Returns:
+            List[BuildJob]
+        """
+        return self.metadata.get_jobs(status.upper() if status else None)
+
+    def cancel(self, job_id: str) -> BuildJob:
+        """Cancel a job.
+
+        Queued jobs are cancelled immediately. Running jobs are cancelled at the next
+        phase boundary, rolling back the repository being built.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            BuildJob: The updated job.
+
+        Raises:
+            JobNotFoundError: If the job doesn't exist.
+            JobNotCancellableError: If the job has already finished.
+        """
+        job = self.get_job(job_id)
+        if job.status in FINISHED_STATUSES:
+            raise JobNotCancellableError(job_id, job.status)
+
+        self.metadata.cancel_job(job_id)
+        job = self.get_job(job_id)
+
+        if job.status == "CANCELLED":
+            cleanup_job(job)
+
+        return job
+
+    def list_workers(self) -> List[BuildWorker]:
+        """List the registered build workers.
+
+        Returns:
+            List[BuildWorker]
+        """
+        return self.metadata.get_workers()
+
+    def get_build(self, build_id: str) -> Build:
+        """Get the details of a build, including the resource usage of each phase.
+
+        Args:
+            build_id (str): The ID of the build.
+
+        Returns:
+            Build
+
+        Raises:
+            BuildNotFoundError: If no build with the ID exists.
+        """
+        build = self.metadata.get_build(build_id)
+        if not build:
+            raise BuildNotFoundError(build_id)
+
+        return build
+
+    def get_builds(self, graph_name: str) -> List[Build]:
+        """Get the builds of a graph.
+
+        Args:
+            graph_name (str): The name of the graph.
+
+        Returns:
+            List[Build]
+        """
+        return self.metadata.get_builds(graph_name)
@@ -3,71 +3,114 @@
 Routing for build entity.
 """
 # Base imports
-from io import BytesIO
+import hashlib
 import os
 import shutil
-from zipfile import ZipFile
 from uuid import uuid4
-from typing import List
+from typing import Optional
 
 # pip imports
-from fastapi import APIRouter, BackgroundTasks, Form, UploadFile
+from fastapi import APIRouter, Form, UploadFile
 
 # Build entity imports
-from repograph.entities.build.service import BuildService
-
-# Utils imports
-from repograph.utils.exception_handlers import RepographException
+from repograph.entities.build.archives import (
+    DEFAULT_MAX_UPLOAD_SIZE,
+    is_archive,
+    spool_upload,
+)
+from repograph.entities.build.exceptions import UnsupportedArchiveError
+from repograph.entities.build.queue import BuildQueue
 
 
 class BuildRouter:
-    service: BuildService
+    queue: BuildQueue
 
-    def __init__(self, service: BuildService):
-        self.service = service
+    def __init__(
+        self,
+        queue: BuildQueue,
+        upload_dir: Optional[str] = None,
+        max_upload_size: Optional[int] = None,
+    ):
+        self.queue = queue
+        self.upload_dir = os.path.abspath(upload_dir if upload_dir else "./uploads")
+        self.max_upload_size = (
+            max_upload_size if max_upload_size else DEFAULT_MAX_UPLOAD_SIZE
+        )
         self.router = APIRouter(prefix="/graph", tags=["Build"])
         self.router.add_api_route("/build", self.build, methods=["POST"])
+        self.router.add_api_route("/build/{build_id}", self.get_build, methods=["GET"])
+        self.router.add_api_route("/{graph}/builds", self.get_builds, methods=["GET"])
 
-    def _cleanup_inputs(self, inputs: List[str]):
-        for p in inputs:
-            shutil.rmtree(p, ignore_errors=True)
+        self.jobRouter = APIRouter(prefix="/jobs", tags=["Build"])
+        self.jobRouter.add_api_route("", self.get_jobs, methods=["GET"])
+        self.jobRouter.add_api_route("/workers", self.get_workers, methods=["GET"])
+        self.jobRouter.add_api_route("/{job_id}", self.get_job, methods=["GET"])
+        self.jobRouter.add_api_route(
+            "/{job_id}/cancel", self.cancel_job, methods=["POST"]
+        )
 
     def build(
         self,
         files: list[UploadFile],
-        background_tasks: BackgroundTasks,
         name: str = Form(),
         description: str = Form(),
     ):
+        # Archives are spooled to disk here, and extracted later by the build worker
+        upload = os.path.join(self.upload_dir, str(uuid4()))
         paths = []
-        cleanup_inputs = []
+
+        # Identical submissions have the same archives, name and description
+        fingerprint = hashlib.sha256(f"{name.lower()}\0{description}".encode("utf-8"))
+        uploaded = 0
 
         try:
-            for file in files:
-                with ZipFile(BytesIO(file.file.read()), "r") as repository:
-                    u = str(uuid4())
-                    outer_path = str(os.path.join(os.getcwd(), u))
-                    repository.extractall(path=outer_path)
-
-                    if len(os.listdir(outer_path)) == 1:
-                        paths.append(
-                            str(os.path.join(outer_path, os.listdir(outer_path)[0]))
-                        )
-                    else:
-                        paths.append(outer_path)
-
-                    cleanup_inputs.append(outer_path)
-        except RepographException as e:
-            background_tasks.add_task(self._cleanup_inputs, cleanup_inputs)
+            for i, file in enumerate(files):
+                if not is_archive(file.filename):
+                    raise UnsupportedArchiveError(file.filename)
+
+                # Keep the archive's name, as it names the repository if it has no root
+                directory = os.path.join(upload, str(i))
+                os.makedirs(directory)
+                path = os.path.join(directory, os.path.basename(file.filename))
+
+                digest, size = spool_upload(
+                    file.file, path, self.max_upload_size, uploaded
+                )
+                fingerprint.update(bytes.fromhex(digest))
+                uploaded += size
+                paths.append(path)
+        except Exception as e:
+            shutil.rmtree(upload, ignore_errors=True)
             raise e
 
-        background_tasks.add_task(
-            self.service.build,
+        job, created = self.queue.submit(
             paths,
             name,
             description,
+            cleanup=[upload],
+            fingerprint=fingerprint.hexdigest(),
         )
 
-        background_tasks.add_task(self._cleanup_inputs, cleanup_inputs)
+        # The queued duplicate already owns a copy of the archives
+        if not created:
+            shutil.rmtree(upload, ignore_errors=True)
+
+        return {"status": job.status.lower(), "job_id": job.id, "build_id": job.id}
+
+    def get_build(self, build_id: str):
+        return self.queue.get_build(build_id)
+
+    def get_builds(self, graph: str):
+        return self.queue.get_builds(graph)
+
+    def get_jobs(self, status: Optional[str] = None):
+        return self.queue.list_jobs(status)
+
+    def get_workers(self):
+        return self.queue.list_workers()
+
+    def get_job(self, job_id: str):
+        return self.queue.get_job(job_id)
 
-        return {"status": "pending"}
+    def cancel_job(self, job_id: str):
+        return self.queue.cancel(job_id)
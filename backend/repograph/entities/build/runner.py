@@ -0,0 +1,351 @@
+"""
+Execution of jobs from the build queue, in worker threads or separate worker processes.
+"""
+# Base imports
+import datetime
+import multiprocessing
+import os
+import shutil
+import socket
+import threading
+from logging import getLogger
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+# Build entity imports
+from repograph.entities.build.archives import (
+    ExtractionLimits,
+    archive_stem,
+    extract_archive,
+    is_archive,
+)
+from repograph.entities.build.exceptions import BuildCancelledError
+from repograph.entities.build.service import BuildService
+
+# Metadata entity imports
+from repograph.entities.metadata.models import BuildJob, BuildWorker
+from repograph.entities.metadata.service import MetadataService
+
+# Utils imports
+from repograph.utils.exception_handlers import RepographException
+
+# Configure logging
+log = getLogger("repograph.entities.build.runner")
+
+# Ways of running workers
+WORKER_MODES = ["process", "thread"]
+
+
+class BuildRunner:
+    """
+    Claims jobs from the build queue and runs them.
+
+    Runners only communicate through the metadata database, so any number of them can run
+    in any number of processes. Each running runner records a heartbeat, and runners return
+    jobs held by runners that have stopped recording heartbeats to the queue.
+    """
+
+    service: BuildService
+    metadata: MetadataService
+
+    def __init__(
+        self,
+        service: BuildService,
+        metadata: MetadataService,
+        poll_interval: float = 1.0,
+        heartbeat_interval: float = 5.0,
+        heartbeat_timeout: float = 60.0,
+        max_extracted_size: Optional[int] = None,
+    ) -> None:
+        """Constructor
+
+        Args:
+            service (BuildService): The build service used to run jobs.
+            metadata (MetadataService): The metadata service the queue is stored in.
+            poll_interval (float): Seconds between polls of the queue when it is empty.
+            heartbeat_interval (float): Seconds between heartbeats.
+            heartbeat_timeout (float): Seconds without a heartbeat after which a worker is
+                                       considered dead.
+            max_extracted_size (Optional[int]): Optional maximum size of an extracted
+                                                archive, in bytes.
+        """
+        self.service = service
+        self.metadata = metadata
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.extraction_limits = ExtractionLimits()
+        if max_extracted_size:
+            self.extraction_limits.max_size = max_extracted_size
+
+    def run(self, stop: Any) -> None:
+        """Run jobs until stopped.
+
+        Args:
+            stop (Any): Event that is set to stop the runner, once its current job has
+                        finished. Either a threading or multiprocessing Event.
+
+        Returns:
+            None
+        """
+        worker = BuildWorker(
+            id=f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:8]}",
+            host=socket.gethostname(),
+            pid=os.getpid(),
+        )
+        self.metadata.register_worker(worker)
+        log.info("Build worker %s started", worker.id)
+
+        stopped = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(worker.id, stopped), daemon=True
+        )
+        heartbeat.start()
+
+        try:
+            while not stop.is_set():
+                try:
+                    self.requeue_stale_jobs()
+                    ran = self.run_next(worker.id)
+                except Exception as e:
+                    log.error("Build worker %s failed to run job - %s", worker.id, e)
+                    ran = False
+
+                if not ran:
+                    stop.wait(self.poll_interval)
+        finally:
+            stopped.set()
+            heartbeat.join()
+            self.metadata.deregister_worker(worker.id)
+            log.info("Build worker %s stopped", worker.id)
+
+    def _heartbeat(self, worker_id: str, stopped: threading.Event) -> None:
+        """Record heartbeats until the runner has stopped.
+
+        Args:
+            worker_id (str): The ID of the worker.
+            stopped (threading.Event): Event set when the runner has stopped.
+
+        Returns:
+            None
+        """
+        while not stopped.wait(self.heartbeat_interval):
+            try:
+                self.metadata.record_worker_heartbeat(worker_id)
+            except Exception as e:
+                log.error("Build worker %s failed to record heartbeat - %s", worker_id, e)
+
+    def requeue_stale_jobs(self) -> int:
+        """Return jobs held by dead workers to the queue.
+
+        Returns:
+            int: The number of requeued jobs.
+        """
+        requeued = self.metadata.requeue_interrupted_jobs(
+            datetime.datetime.now() - datetime.timedelta(seconds=self.heartbeat_timeout)
+        )
+        if requeued:
+            log.info("Requeued %d interrupted build jobs", requeued)
+        return requeued
+
+    def run_next(self, worker_id: str) -> bool:
+        """Claim and run the oldest queued job.
+
+        Args:
+            worker_id (str): The ID of the worker.
+
+        Returns:
+            bool: Whether a job was run.
+        """
+        job = self.metadata.claim_job(worker_id)
+        if job is None:
+            return False
+
+        self._run(job)
+        return True
+
+    def _run(self, job: BuildJob) -> None:
+        """Run a claimed job, recording its progress and final status.
+
+        Args:
+            job (BuildJob): The job.
+
+        Returns:
+            None
+        """
+        log.info("Running build job %s", job.id)
+
+        def progress(fraction: float, phase: Optional[str]) -> None:
+            if self.metadata.update_job_progress(job.id, fraction, phase):
+                raise BuildCancelledError(job.id)
+
+        message = None
+        try:
+            progress(0.0, "unpacking")
+            inputs = [self._unpack(path) for path in job.inputs]
+
+            build = self.service.build(
+                inputs,
+                job.name,
+                job.description,
+                prune=job.prune,
+                build_id=job.id,
+                progress=progress,
+            )
+            status = build.status
+        except BuildCancelledError:
+            status = "CANCELLED"
+        except RepographException as e:
+            log.error("Build job %s failed - %s", job.id, e.message)
+            status = "FAILED"
+            message = e.message
+        except Exception as e:
+            log.error("Build job %s failed - %s", job.id, e)
+            status = "FAILED"
+            message = str(e)
+
+        self.metadata.finish_job(job.id, status, message)
+        log.info("Build job %s finished with status %s", job.id, status)
+
+        cleanup_job(job)
+
+    def _unpack(self, path: str) -> str:
+        """Extract an uploaded archive next to itself.
+
+        Args:
+            path (str): The path of an input repository, or of an archive of one.
+
+        Returns:
+            str: The path of the input repository.
+        """
+        if not (os.path.isfile(path) and is_archive(path)):
+            return path
+
+        log.info("Extracting %s", path)
+        destination = os.path.join(os.path.dirname(path), archive_stem(path))
+        return extract_archive(path, destination, self.extraction_limits)
+
+
+def cleanup_job(job: BuildJob) -> None:
+    """Delete the paths a job owns, e.g. its uploaded inputs.
+
+    Args:
+        job (BuildJob): The job.
+
+    Returns:
+        None
+    """
+    for path in job.cleanup:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class BuildRunnerPool:
+    """
+    Runs a number of BuildRunners, in worker threads or in separate worker processes.
+
+    Builds are CPU heavy, so running them in the API process degrades the latency of every
+    other request. In process mode, each worker process builds its own application
+    container from the config, and the API process never loads the build dependencies.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[], BuildRunner],
+        config: Dict[str, Any],
+        workers: int = 1,
+        mode: Optional[str] = "process",
+    ) -> None:
+        """Constructor
+
+        Args:
+            runner (Callable[[], BuildRunner]): Provides the runner used in thread mode.
+            config (Dict[str, Any]): The application config, passed to worker processes.
+            workers (int): The number of workers. No workers are started if 0.
+            mode (Optional[str]): Either "process" or "thread". Defaults to "process".
+        """
+        mode = mode if mode else "process"
+        if mode not in WORKER_MODES:
+            raise ValueError(f"Unknown build worker mode '{mode}'")
+
+        self.runner = runner
+        self.config = config
+        self.workers = workers if workers is not None else 1
+        self.mode = mode
+
+        self._stop: Any = None
+        self._workers: List[Any] = []
+
+    def start(self) -> None:
+        """Start the workers.
+
+        Returns:
+            None
+        """
+        if self._workers or self.workers <= 0:
+            return
+
+        if self.mode == "process":
+            # Import here to avoid a circular import with the application container
+            from repograph.worker import run_worker
+
+            context = multiprocessing.get_context("spawn")
+            self._stop = context.Event()
+            for i in range(self.workers):
+                self._workers.append(
+                    context.Process(
+                        target=run_worker,
+                        args=(self.config, self._stop),
+                        name=f"repograph-build-worker-{i}",
+                        daemon=True,
+                    )
+                )
+        else:
+            runner = self.runner()
+            self._stop = threading.Event()
+            for i in range(self.workers):
+                self._workers.append(
+                    threading.Thread(
+                        target=runner.run,
+                        args=(self._stop,),
+                        name=f"repograph-build-worker-{i}",
+                        daemon=True,
+                    )
+                )
+
+        for worker in self._workers:
+            worker.start()
+
+        log.info("Started %d build workers in %s mode", self.workers, self.mode)
+
+    def join(self) -> None:
+        """Wait for the workers to exit.
+
+        Returns:
+            None
+        """
+        for worker in self._workers:
+            worker.join()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop the workers once their current jobs have finished.
+
+        Worker processes still running a job after the timeout are terminated. Their jobs
+        are requeued by the remaining workers once their heartbeat goes stale.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for each worker.
+
+        Returns:
+            None
+        """
+        if not self._workers:
+            return
+
+        self._stop.set()
+        for worker in self._workers:
+            worker.join(timeout)
+            if self.mode == "process" and worker.is_alive():
+                log.warning("Terminating build worker %s", worker.name)
+                worker.terminate()
+
+        self._workers = []
@@ -2,22 +2,41 @@
 
 """
 # Base imports
+import functools
+import json
 import shutil
 import subprocess
 from logging import getLogger
 import os
-from typing import Any, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+# pip imports
+from py2neo import Transaction
 
 # Build entity imports
 from repograph.entities.build.builder import RepographBuilder
-from repograph.entities.build.exceptions import RepographBuildError
-from repograph.entities.build.utils import read_json_from_file, find_requirements
+from repograph.entities.build.exceptions import BuildCancelledError, RepographBuildError
+from repograph.entities.build.instrumentation import BUILD_PHASES, BuildInstrumentation
+from repograph.entities.build.sinks import CsvGraphSink, GraphSink
+from repograph.entities.build.utils import (
+    find_requirements,
+    hash_file_tree,
+    read_json_from_file,
+)
 
 # Other service imports
+from repograph.entities.blob.service import BlobService
 from repograph.entities.graph.service import GraphService
+from repograph.entities.search.service import SearchService
+from repograph.entities.summarization.models import PolicyStats
 from repograph.entities.summarization.service import SummarizationService
+from repograph.entities.metadata.models import Build, BuildPhase, RepositoryFingerprint
 from repograph.entities.metadata.service import MetadataService
 
+# Utils imports
+from repograph.utils.exception_handlers import RepographException
+
 
 # Configure logging
 log = getLogger("repograph.entities.build.service")
@@ -35,7 +54,12 @@ class BuildService:
         graph: GraphService,
         summarization: SummarizationService,
         metadata: MetadataService,
-        extract_metadata: bool = False
+        blobs: Optional[BlobService] = None,
+        extract_metadata: bool = False,
+        compact_schema: bool = False,
+        skip_ast: bool = False,
+        summarization_workers: Optional[int] = 1,
+        search: Optional[SearchService] = None,
     ):
         """Constructor
 
@@ -43,11 +67,31 @@ class BuildService:
             graph (GraphService): The Graph Service.
             summarization (SummarizationService): The Summarization Service
             metadata (MetadataService): The Metadata Service
+            blobs (Optional[BlobService]): The blob store function source code and ASTs
+                                           are written to, if active.
+            extract_metadata (bool): Whether to extract repository metadata.
+            compact_schema (bool): Whether to store arguments, return values and docstring
+                                   parts as properties rather than separate nodes.
+            skip_ast (bool): Whether to skip extracting and storing function ASTs.
+            summarization_workers (Optional[int]): The number of threads each build
+                                                   summarizes functions in. If 0,
+                                                   functions are summarized as they
+                                                   are parsed.
+            search (Optional[SearchService]): The search service docstrings are scored
+                                              against their summarizations with, after
+                                              building, if active.
         """
         self.graph = graph
         self.summarization = summarization
         self.metadata = metadata
         self.extract_metadata = extract_metadata
+        self.compact_schema = bool(compact_schema)
+        self.blobs = blobs if blobs and blobs.active else None
+        self.skip_ast = bool(skip_ast)
+        self.summarization_workers = (
+            1 if summarization_workers is None else int(summarization_workers)
+        )
+        self.search = search if search and search.active else None
 
     def call_inspect4py(self, input_path: str, output_path: str) -> str:
         """Call inspect4py for code analysis and extraction.
@@ -76,11 +120,13 @@ class BuildService:
                     "-si",
                     "-ld",
                     "-sc",
-                    "-ast",
                     "-dt",
                     "-cl",
                 ]
 
+            if not self.skip_ast:
+                args.append("-ast")
+
             if self.extract_metadata:
                 args.append("-md")
 
@@ -119,33 +165,212 @@ class BuildService:
         return di, cg
 
     @staticmethod
-    def cleanup_inspect4py_output() -> None:
+    def cleanup_inspect4py_output(path: str = "./tmp") -> None:
         """Remove the temporary inspect4py output folder
 
+        Args:
+            path (str): Path to the output directory.
+
         Returns:
             None
         """
         log.info("Cleaning up temporary directory...")
-        shutil.rmtree("./tmp", ignore_errors=True)
+        shutil.rmtree(path, ignore_errors=True)
         log.info("Done!")
 
+    @property
+    def fingerprint_salt(self) -> str:
+        """The build settings that affect the graph built from a repository.
+
+        Repositories are only reused by builds with the same settings.
+        """
+        return json.dumps(
+            {
+                "summarize": self.summarization.active,
+                "extract_metadata": self.extract_metadata,
+                "compact_schema": self.compact_schema,
+                "blobs": self.blobs is not None,
+                "skip_ast": self.skip_ast,
+            },
+            sort_keys=True,
+        )
+
+    def copy_existing_repository(
+        self,
+        fingerprint: str,
+        graph_name: str,
+        tx: Transaction,
+        instrumentation: BuildInstrumentation,
+    ) -> Optional[str]:
+        """Copy an identical, previously built repository into a graph.
+
+        If the graph already has an identical repository, e.g. when an upload is
+        retried, nothing is written.
+
+        Args:
+            fingerprint (str): The content hash of the repository.
+            graph_name (str): The name of the graph to copy into.
+            tx (Transaction): Transaction of the graph to copy into.
+            instrumentation (BuildInstrumentation): The build instrumentation.
+
+        Returns:
+            Optional[str]: The name of the copied or existing repository, if there was
+                           one.
+        """
+        matches = self.metadata.find_repositories_by_fingerprint(fingerprint)
+        for existing in matches:
+            if existing.neo4j_name == graph_name:
+                log.info(
+                    "Graph '%s' already has identical repository '%s'",
+                    graph_name,
+                    existing.name,
+                )
+                return existing.name
+
+        for existing in matches:
+
+            instrumentation.start("clone")
+            try:
+                copy = self.graph.copy_repository(
+                    existing.neo4j_name, graph_name, existing.name, tx=tx
+                )
+            except RepographException as e:
+                # The source graph may have changed since the repository was recorded
+                log.warning("Unable to copy identical repository - %s", e.message)
+                instrumentation.stop("clone")
+                continue
+            instrumentation.stop(
+                "clone", nodes=copy.nodes, relationships=copy.relationships
+            )
+
+            log.info(
+                "Copied identical repository '%s' from graph '%s'",
+                existing.name,
+                existing.neo4j_name,
+            )
+            return existing.name
+
+        return None
+
+    def build_repository(
+        self,
+        path: str,
+        graph_name: str,
+        tx: Optional[Transaction],
+        instrumentation: BuildInstrumentation,
+        temp_output: str,
+        sink: Optional[GraphSink] = None,
+        policy_stats: Optional[PolicyStats] = None,
+    ) -> str:
+        """Extract a repository with inspect4py and build it into a graph.
+
+        Args:
+            path (str): The path of the repository.
+            graph_name (str): The name of the graph to build into.
+            tx (Optional[Transaction]): Transaction of the graph to build into.
+            instrumentation (BuildInstrumentation): The build instrumentation.
+            temp_output (str): The directory to output inspect4py to.
+            sink (Optional[GraphSink]): Optional sink to write to instead of the graph.
+            policy_stats (Optional[PolicyStats]): Counts to record how each function was
+                summarized in, e.g. for the build.
+
+        Returns:
+            str: The name of the built repository.
+        """
+        with instrumentation.phase("extraction"):
+            self.call_inspect4py(path, temp_output)
+            directory_info, call_graph = self.parse_inspect4py_output(temp_output)
+
+        # Attempt to parse requirements
+        try:
+            requirements = find_requirements(path)
+        except Exception as e:
+            log.error("Error passing requirements: %s", e)
+            requirements = []
+
+        builder = RepographBuilder(
+            functools.partial(self.summarization.summarize_function, stats=policy_stats)
+            if self.summarization.active
+            else None,
+            temp_output,
+            graph_name,
+            self.graph,
+            tx,
+            sink=sink,
+            instrumentation=instrumentation,
+            compact=self.compact_schema,
+            blobs=self.blobs,
+            skip_ast=self.skip_ast,
+            # Keep every summarization replica busy
+            summarization_workers=max(
+                self.summarization_workers, self.summarization.replicas
+            ),
+        )
+
+        builder.build(directory_info, call_graph, requirements=requirements)
+        if self.summarization.active:
+            self.summarization.log_stats()
+        return builder.repository_name
+
+    def export(self, input_list: List[str], name: str, output: str) -> CsvGraphSink:
+        """Build repositories into CSV files for neo4j-admin's bulk importer.
+
+        This is much faster than building into a graph for large initial loads, but the
+        graph can only be imported into a new database.
+
+        Args:
+            input_list (List[str]): The list of paths to repositories to export.
+            name (str): The name of the graph.
+            output (str): The directory to write the CSV files to.
+
+        Returns:
+            CsvGraphSink: The sink the files were written by.
+        """
+        sink = CsvGraphSink(output)
+        instrumentation = BuildInstrumentation()
+        temp_output = f"{self.temp_output}-{uuid4()}"
+
+        for index, i in enumerate(input_list):
+            instrumentation.input_index = index
+            try:
+                self.build_repository(
+                    i, name.lower(), None, instrumentation, temp_output, sink=sink
+                )
+            finally:
+                self.cleanup_inspect4py_output(temp_output)
+
+        log.info(
+            "Exported %d nodes and %d relationships to %s",
+            sink.node_count,
+            sink.relationship_count,
+            output,
+        )
+        return sink
+
     def build(
         self,
         input_list: List[str],
         name: str,
         description: str,
         prune: bool = False,
-    ) -> None:
+        build_id: Optional[str] = None,
+        progress: Optional[Callable[[float, Optional[str]], None]] = None,
+    ) -> Build:
         """Build a  graph using the input repositories.
 
         Args:
             input_list (List[str]): The list of paths to repositories to add the graph.
             name (str): The name to assign to the graph.
             description (str): The description to associate with the graph.
-            prune (bool): Whether to prune existing nodes from the graph.
+            prune (bool): Whether to prune existing nodes from the graph. Otherwise, the
+                          repositories are upserted into the graph if it exists.
+            build_id (Optional[str]): Optional ID to record the build under.
+            progress (Optional[Callable[[float, Optional[str]], None]]): Optional callback
+                invoked with the fraction of the build completed and the current phase. It
+                may raise BuildCancelledError to abort the build.
 
         Returns:
-            None
+            Build: The recorded build.
         """
         failure = 0
         success = 0
@@ -154,54 +379,137 @@ class BuildService:
             log.info("Pruning existing graph...")
             self.graph.delete_graph(name.lower())
 
-        with self.graph.get_system_transaction() as (system_tx, metadata_tx):
-            graph = self.graph.create_graph(name, description, system_tx, metadata_tx)
+        # Writes are idempotent upserts, so repositories can be rebuilt into a graph
+        graph = next(
+            (
+                existing
+                for existing in self.metadata.get_all_graph_listings()
+                if existing.neo4j_name == name.lower()
+            ),
+            None,
+        )
 
-        for i in input_list:
-            with self.graph.get_transaction(graph.neo4j_name) as tx:
-                try:
-                    self.call_inspect4py(i, self.temp_output)
-                    directory_info, call_graph = self.parse_inspect4py_output(
-                        self.temp_output
-                    )
+        # Only a graph created by this build is deleted if nothing is built into it.
+        # Each repository is written in its own transaction, which is rolled back if it
+        # fails, so a failed build leaves an existing graph as it was.
+        created = graph is None
+        if graph:
+            log.info("Updating existing graph '%s'...", graph.neo4j_name)
+        else:
+            with self.graph.get_system_transaction() as (system_tx, metadata_tx):
+                graph = self.graph.create_graph(
+                    name, description, system_tx, metadata_tx
+                )
+            self.graph.create_key_constraints(graph.neo4j_name)
+
+        build = Build(
+            id=build_id if build_id else str(uuid4()), neo4j_name=graph.neo4j_name
+        )
+        self.metadata.register_build(build)
 
-                    # Attempt to parse requirements
-                    try:
-                        requirements = find_requirements(i)
-                    except Exception as e:
-                        log.error("Error passing requirements: %s", e)
-                        requirements = []
-
-                    builder = RepographBuilder(
-                        self.summarization.summarize_function
-                        if self.summarization.active
-                        else None,
-                        self.temp_output,
-                        graph.neo4j_name,
-                        self.graph,
-                        tx,
-                    )
+        def report_progress(phase: BuildPhase) -> None:
+            position = BUILD_PHASES.index(phase.name) if phase.name in BUILD_PHASES else 0
+            progress(
+                (phase.input_index + position / len(BUILD_PHASES)) / len(input_list),
+                phase.name,
+            )
+
+        instrumentation = BuildInstrumentation(
+            listener=report_progress if progress else None
+        )
 
-                    builder.build(directory_info, call_graph, requirements=requirements)
+        # Each build uses its own output directory, so that builds can run concurrently
+        temp_output = f"{self.temp_output}-{build.id}"
 
-                    log.info("Done!")
+        # Content hashes of the repositories built so far, mapped to their names
+        built: Dict[str, str] = dict()
 
+        # How this build's functions were summarized, separately from concurrent builds
+        policy_stats = PolicyStats()
+
+        try:
+            for index, i in enumerate(input_list):
+                instrumentation.input_index = index
+                cancelled = None
+                repository_name = None
+                if progress:
+                    progress(index / len(input_list), None)
+
+                with instrumentation.phase("fingerprint"):
+                    fingerprint = hash_file_tree(i, self.fingerprint_salt)
+
+                # Identical inputs within a single build are only built once
+                if fingerprint in built:
+                    log.info("%s is identical to repository '%s'", i, built[fingerprint])
                     success += 1
-                except subprocess.CalledProcessError as e:
-                    log.error("Error invoking inspect4py - %s", str(e))
-                    failure += 1
-                    raise e
-                except RepographBuildError as e:
-                    log.error("Error building repograph - %s", str(e))
-                    failure += 1
-                    raise e
-                finally:
-                    self.cleanup_inspect4py_output()
+                    continue
 
-        if success == 0:
-            self.graph.delete_graph(graph.neo4j_name)
-        else:
-            self.metadata.set_graph_status_to_created(graph)
+                with self.graph.get_transaction(graph.neo4j_name) as tx:
+                    try:
+                        written = self.copy_existing_repository(
+                            fingerprint, graph.neo4j_name, tx, instrumentation
+                        )
+                        if written is None:
+                            written = self.build_repository(
+                                i,
+                                graph.neo4j_name,
+                                tx,
+                                instrumentation,
+                                temp_output,
+                                policy_stats=policy_stats,
+                            )
+
+                        # Include committing the transaction in the commit phase
+                        instrumentation.start("commit")
+
+                        log.info("Done!")
+
+                        success += 1
+                        repository_name = written
+                    except subprocess.CalledProcessError as e:
+                        log.error("Error invoking inspect4py - %s", str(e))
+                        failure += 1
+                        raise e
+                    except RepographBuildError as e:
+                        log.error("Error building repograph - %s", str(e))
+                        failure += 1
+                        raise e
+                    except BuildCancelledError as e:
+                        # Roll back the transaction, then abort the remaining inputs
+                        cancelled = e
+                        raise e
+                    finally:
+                        self.cleanup_inspect4py_output(temp_output)
+
+                if cancelled:
+                    raise cancelled
+
+                instrumentation.stop("commit")
+
+                if repository_name:
+                    built[fingerprint] = repository_name
+                    self.metadata.record_repository_fingerprint(
+                        RepositoryFingerprint(
+                            neo4j_name=graph.neo4j_name,
+                            name=repository_name,
+                            fingerprint=fingerprint,
+                        )
+                    )
+        except BuildCancelledError as e:
+            log.warning("Build cancelled after %d repositories", success)
+            if success == 0 and created:
+                self.graph.delete_graph(graph.neo4j_name)
+            else:
+                self.metadata.set_graph_status_to_created(graph)
+            self.metadata.complete_build(
+                build, "CANCELLED", instrumentation.phases, policy_stats.dict()
+            )
+            raise e
+        except Exception as e:
+            self.metadata.complete_build(
+                build, "FAILED", instrumentation.phases, policy_stats.dict()
+            )
+            raise e
 
         log.info(
             "Parsed %d repositories successfully with %d failures (%d total)",
@@ -209,3 +517,42 @@ class BuildService:
             failure,
             len(input_list),
         )
+
+        if success == 0:
+            if created:
+                self.graph.delete_graph(graph.neo4j_name)
+            return self.metadata.complete_build(
+                build, "FAILED", instrumentation.phases, policy_stats.dict()
+            )
+
+        self.score_docstrings(graph.neo4j_name, instrumentation)
+
+        self.metadata.set_graph_status_to_created(graph)
+        return self.metadata.complete_build(
+            build, "SUCCEEDED", instrumentation.phases, policy_stats.dict()
+        )
+
+    def score_docstrings(
+        self, graph_name: str, instrumentation: BuildInstrumentation
+    ) -> None:
+        """Score the docstrings of a graph against their summarizations, so that possibly
+        incorrect docstrings can be found without running the model.
+
+        Docstrings that aren't scored, because scoring fails or search isn't active, are
+        scored when incorrect docstrings are first requested.
+
+        Args:
+            graph_name (str): The name of the graph.
+            instrumentation (BuildInstrumentation): The build instrumentation.
+
+        Returns:
+            None
+        """
+        if not (self.search and self.summarization.active):
+            return
+
+        try:
+            with instrumentation.phase("docstring_similarity"):
+                self.search.score_docstrings(graph_name)
+        except Exception as e:
+            log.warning("Unable to score docstrings - %s", e)
@@ -0,0 +1,406 @@
+"""
+Graph sinks that a RepographBuilder writes its buffered nodes and relationships to.
+"""
+# Base imports
+import csv
+import datetime
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Set, Tuple, Union
+
+# pip imports
+from py2neo import Transaction
+
+# Build entity imports
+from repograph.entities.build.buffer import (
+    KEY_PROPERTY,
+    SHARED_PROPERTY,
+    GraphBuffer,
+    NodeRecord,
+    RelationshipRecord,
+)
+from repograph.entities.build.exceptions import RepographBuildError
+from repograph.entities.graph.service import GraphService
+
+
+class GraphSink(ABC):
+    """
+    Destination for the contents of a GraphBuffer.
+    """
+
+    # Whether a buffer can be written in several parts, e.g. to write some nodes before
+    # the properties of the others are complete
+    incremental: bool = False
+
+    @abstractmethod
+    def write(self, buffer: GraphBuffer) -> None:
+        """Write the nodes and relationships held in a buffer.
+
+        Args:
+            buffer (GraphBuffer): The buffer to write.
+
+        Returns:
+            None
+        """
+        pass
+
+
+class Neo4jGraphSink(GraphSink):
+    """
+    Upserts buffered nodes and relationships into a Neo4j graph via the GraphService.
+
+    Records are matched by their keys, so writing a repository again updates its nodes
+    and relationships instead of duplicating them.
+    """
+
+    incremental = True
+
+    def __init__(
+        self, graph: GraphService, graph_name: str, tx: Transaction = None
+    ) -> None:
+        """Constructor
+
+        Args:
+            graph (GraphService): The graph service.
+            graph_name (str): The name of the graph to write to.
+            tx (Transaction): Optional, existing Transaction to use.
+        """
+        self.graph = graph
+        self.graph_name = graph_name
+        self.tx = tx
+
+    def write(self, buffer: GraphBuffer) -> None:
+        nodes: Dict[str, List[Dict[str, Any]]] = dict()
+        for node in buffer.nodes():
+            nodes.setdefault(node.label, []).append(
+                {"key": node.properties[KEY_PROPERTY], "properties": node.properties}
+            )
+        if not nodes:
+            return
+
+        relationships: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = dict()
+        for relationship in buffer.relationships():
+            start = buffer.get_node(relationship.start)
+            end = buffer.get_node(relationship.end)
+            relationships.setdefault(
+                (relationship.type, start.label, end.label), []
+            ).append(
+                {
+                    "start": start.properties[KEY_PROPERTY],
+                    "end": end.properties[KEY_PROPERTY],
+                    "key": relationship.properties[KEY_PROPERTY],
+                    "properties": relationship.properties,
+                }
+            )
+
+        self.graph.merge(nodes, relationships, tx=self.tx, graph_name=self.graph_name)
+
+
+class MemoryGraphSink(GraphSink):
+    """
+    Keeps written nodes and relationships in memory.
+
+    Used for benchmarking and testing the builder without a Neo4j instance.
+    """
+
+    incremental = True
+
+    def __init__(self) -> None:
+        """Constructor"""
+        self.nodes: List[NodeRecord] = []
+        self.relationships: List[RelationshipRecord] = []
+
+    @property
+    def node_count(self) -> int:
+        """The number of nodes written to the sink."""
+        return len(self.nodes)
+
+    @property
+    def relationship_count(self) -> int:
+        """The number of relationships written to the sink."""
+        return len(self.relationships)
+
+    def write(self, buffer: GraphBuffer) -> None:
+        self.nodes.extend(buffer.nodes())
+        self.relationships.extend(buffer.relationships())
+
+
+# ID space shared by the nodes and relationships written by a CsvGraphSink
+CSV_ID_SPACE = "Node"
+
+# Delimiter between the elements of array properties in CSV files. The unit separator
+# control character doesn't appear in source code, unlike e.g. ";", and is given to
+# neo4j-admin in its U+ notation
+CSV_ARRAY_DELIMITER = "\x1f"
+
+
+def _csv_type(value: Any) -> str:
+    """Get the neo4j-admin import type of a property value.
+
+    Args:
+        value (Any): The property value.
+
+    Returns:
+        str
+    """
+    if isinstance(value, (list, tuple)):
+        types = {_csv_type(element) for element in value}
+        return (_merge_csv_types(types) if types else "string") + "[]"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "long"
+    if isinstance(value, float):
+        return "double"
+    if isinstance(value, datetime.datetime):
+        return "datetime"
+    return "string"
+
+
+def _merge_csv_types(types: Iterable[str]) -> str:
+    """Get a type that can represent values of each of a set of types.
+
+    Args:
+        types (Iterable[str]): The neo4j-admin import types.
+
+    Returns:
+        str
+    """
+    types = set(types)
+    if len(types) == 1:
+        return types.pop()
+    if types == {"long", "double"}:
+        return "double"
+    if types == {"long[]", "double[]"}:
+        return "double[]"
+    return "string[]" if all(t.endswith("[]") for t in types) else "string"
+
+
+def _csv_value(value: Any) -> str:
+    """Format a property value for a CSV file.
+
+    Args:
+        value (Any): The property value.
+
+    Returns:
+        str
+
+    Raises:
+        RepographBuildError: If an element of an array contains the array delimiter.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        elements = [_csv_value(element) for element in value]
+        if any(CSV_ARRAY_DELIMITER in element for element in elements):
+            raise RepographBuildError(
+                f"Array element contains the CSV array delimiter: {value!r}"
+            )
+        return CSV_ARRAY_DELIMITER.join(elements)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class CsvGraphSink(GraphSink):
+    """
+    Writes buffered nodes and relationships to CSV files for neo4j-admin's importer.
+
+    Each node label and relationship type is written to its own data file, with a
+    separate header file. Records of a label whose properties have different types are
+    written to separate files. Node IDs combine the name of the repository and the
+    node's handle, so the same inputs always produce the same files. Shared nodes, and
+    the relationships between them, are identified by their key and only written once.
+
+    The files are imported into a new database with the command from import_command().
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Constructor
+
+        Args:
+            directory (str): The directory to write the files to. It is created if it
+                             doesn't exist.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        # Header and data files of each label/type, keyed by their columns
+        self.node_files: Dict[Tuple[str, Tuple[str, ...]], Tuple[str, str]] = dict()
+        self.relationship_files: Dict[
+            Tuple[str, Tuple[str, ...]], Tuple[str, str]
+        ] = dict()
+
+        # ID prefixes of the buffers written so far
+        self.prefixes: List[str] = []
+
+        # Keys of the shared nodes and relationships written so far
+        self.shared_keys: Set[str] = set()
+
+        # The number of nodes and relationships written
+        self.node_count = 0
+        self.relationship_count = 0
+
+    def _prefix(self, buffer: GraphBuffer) -> str:
+        """Get a unique ID prefix for the nodes of a buffer.
+
+        Args:
+            buffer (GraphBuffer): The buffer.
+
+        Returns:
+            str
+        """
+        prefix = next(
+            (
+                node.name
+                for node in buffer.nodes()
+                if node.label == "Repository" and node.name
+            ),
+            str(len(self.prefixes)),
+        )
+        if prefix in self.prefixes:
+            prefix = f"{prefix}-{len(self.prefixes)}"
+
+        self.prefixes.append(prefix)
+        return prefix
+
+    def _write_group(
+        self,
+        kind: str,
+        name: str,
+        id_columns: List[str],
+        rows: List[Tuple[List[str], Dict[str, Any]]],
+        files: Dict[Tuple[str, Tuple[str, ...]], Tuple[str, str]],
+    ) -> None:
+        """Append the records of a single label or type to its files.
+
+        Args:
+            kind (str): Either "nodes" or "relationships".
+            name (str): The label or type.
+            id_columns (List[str]): The header of the ID columns.
+            rows (List[Tuple[List[str], Dict[str, Any]]]): The ID values and properties
+                                                           of each record.
+            files (Dict[Tuple[str, Tuple[str, ...]], Tuple[str, str]]): The files
+                written so far.
+
+        Returns:
+            None
+        """
+        types: Dict[str, set] = dict()
+        for _, properties in rows:
+            for key, value in properties.items():
+                types.setdefault(key, set()).add(_csv_type(value))
+
+        keys = sorted(types)
+        columns = tuple(f"{key}:{_merge_csv_types(types[key])}" for key in keys)
+
+        if (name, columns) not in files:
+            index = len([key for key in files if key[0] == name])
+            header = os.path.join(self.directory, f"{kind}_{name}_{index}_header.csv")
+            data = os.path.join(self.directory, f"{kind}_{name}_{index}.csv")
+            with open(header, "w", newline="") as file:
+                csv.writer(file).writerow(
+                    [*id_columns, *columns, ":LABEL" if kind == "nodes" else ":TYPE"]
+                )
+            open(data, "w").close()
+            files[(name, columns)] = (header, data)
+
+        with open(files[(name, columns)][1], "a", newline="") as file:
+            writer = csv.writer(file)
+            for ids, properties in rows:
+                writer.writerow(
+                    [*ids, *[_csv_value(properties.get(key)) for key in keys], name]
+                )
+
+    def _is_written(self, record: Union[NodeRecord, RelationshipRecord]) -> bool:
+        """Check whether a shared record has already been written, recording it if not.
+
+        Args:
+            record (Union[NodeRecord, RelationshipRecord]): The record.
+
+        Returns:
+            bool
+        """
+        key = record.properties.get(KEY_PROPERTY)
+        if not record.properties.get(SHARED_PROPERTY) or not key:
+            return False
+
+        if key in self.shared_keys:
+            return True
+
+        self.shared_keys.add(key)
+        return False
+
+    def write(self, buffer: GraphBuffer) -> None:
+        prefix = self._prefix(buffer)
+
+        ids: Dict[int, str] = dict()
+        nodes: Dict[str, List[Tuple[List[str], Dict[str, Any]]]] = dict()
+        for node in buffer.nodes():
+            if node.shared and node.key:
+                ids[node.handle] = f"{SHARED_PROPERTY}:{node.key}"
+            else:
+                ids[node.handle] = f"{prefix}:{node.handle}"
+
+            if self._is_written(node):
+                continue
+
+            nodes.setdefault(node.label, []).append(([ids[node.handle]], node.properties))
+            self.node_count += 1
+
+        relationships: Dict[str, List[Tuple[List[str], Dict[str, Any]]]] = dict()
+        for relationship in buffer.relationships():
+            if self._is_written(relationship):
+                continue
+
+            relationships.setdefault(relationship.type, []).append(
+                (
+                    [ids[relationship.start], ids[relationship.end]],
+                    relationship.properties,
+                )
+            )
+            self.relationship_count += 1
+
+        for label, rows in nodes.items():
+            self._write_group(
+                "nodes", label, [f":ID({CSV_ID_SPACE})"], rows, self.node_files
+            )
+
+        for rel_type, rows in relationships.items():
+            self._write_group(
+                "relationships",
+                rel_type,
+                [f":START_ID({CSV_ID_SPACE})", f":END_ID({CSV_ID_SPACE})"],
+                rows,
+                self.relationship_files,
+            )
+
+    def import_command(
+        self, database: str, neo4j_admin: str = "neo4j-admin"
+    ) -> List[str]:
+        """Get the neo4j-admin command that imports the written files.
+
+        Args:
+            database (str): The name of the database to import into.
+            neo4j_admin (str): The path of the neo4j-admin executable.
+
+        Returns:
+            List[str]: The command and its arguments.
+        """
+        command = [neo4j_admin, "database", "import", "full"]
+        for (label, _), (header, data) in sorted(self.node_files.items()):
+            command.append(f"--nodes={label}={header},{data}")
+        for (rel_type, _), (header, data) in sorted(self.relationship_files.items()):
+            command.append(f"--relationships={rel_type}={header},{data}")
+
+        command.extend(
+            [
+                f"--array-delimiter=U+{ord(CSV_ARRAY_DELIMITER):04X}",
+                "--multiline-fields=true",
+                "--overwrite-destination=true",
+                database,
+            ]
+        )
+        return command
@@ -2,6 +2,7 @@
 Utility functions for the build entity.
 """
 # Base imports
+import hashlib
 import json
 import os
 from typing import Any, Dict, List, Union, Optional, Tuple, Set
@@ -34,6 +35,43 @@ def read_json_from_file(file_path: str) -> Dict[str, Any]:
         return json_obj
 
 
+def hash_file_tree(path: str, salt: str = "") -> str:
+    """Compute a content hash of a directory tree.
+
+    The hash covers the name of the directory, and the relative path and content of every
+    regular file below it. Version control directories and symbolic links are ignored.
+
+    Args:
+        path (str): The root of the tree.
+        salt (str): Optional string mixed into the hash, e.g. build settings.
+
+    Returns:
+        str: The SHA-256 hex digest.
+    """
+    root = os.path.normpath(path)
+    digest = hashlib.sha256(f"{salt}\0{os.path.basename(root)}".encode("utf-8"))
+
+    for directory, directories, files in os.walk(root):
+        # Walk in a stable order, so that the hash doesn't depend on the filesystem
+        directories[:] = sorted(d for d in directories if d not in [".git", ".hg"])
+
+        for name in sorted(files):
+            file_path = os.path.join(directory, name)
+            if os.path.islink(file_path) or not os.path.isfile(file_path):
+                continue
+
+            file_digest = hashlib.sha256()
+            with open(file_path, "rb") as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                    file_digest.update(chunk)
+
+            relative = os.path.relpath(file_path, root).replace(os.sep, "/")
+            digest.update(f"\0{relative}\0".encode("utf-8"))
+            digest.update(file_digest.digest())
+
+    return digest.hexdigest()
+
+
 def find_node_object_by_name(
     nodes: List[Union[Class, Function, Module]],
     name: str,
@@ -13,6 +13,9 @@ from repograph.entities.graph.repository import GraphRepository
 from repograph.entities.graph.router import GraphRouter
 from repograph.entities.graph.service import GraphService
 
+# Blob entity imports
+from repograph.entities.blob.service import BlobService
+
 # Metadata entity imports
 from repograph.entities.metadata.service import MetadataService
 
@@ -24,12 +27,14 @@ class GraphContainer(DeclarativeContainer):
 
     metadata: Dependency[MetadataService] = Dependency()
 
+    blobs: Dependency[BlobService] = Dependency()
+
     repository: Singleton[GraphRepository] = Singleton(
         GraphRepository, graph=neo4j, driver=driver
     )
 
     service: Singleton[GraphService] = Singleton(
-        GraphService, repository=repository, metadata=metadata
+        GraphService, repository=repository, metadata=metadata, blobs=blobs
     )
 
     router: Singleton[GraphRouter] = Singleton(GraphRouter, service=service)
@@ -29,3 +29,51 @@ class GraphExistsError(RepographException):
 
     def __init__(self, graph_name: str):
         self.message = f"The graph '{graph_name}' already exists!"
+
+
+class GraphNotFoundError(RepographException):
+    """
+    Exception for graphs that don't exist.
+    """
+
+    code = status.HTTP_404_NOT_FOUND
+
+    def __init__(self, graph_name: str):
+        self.message = f"The graph '{graph_name}' does not exist!"
+
+
+class RepositoryNotFoundError(RepographException):
+    """
+    Exception for repositories that aren't in a graph.
+    """
+
+    code = status.HTTP_404_NOT_FOUND
+
+    def __init__(self, graph_name: str, repository_name: str):
+        self.message = (
+            f"The repository '{repository_name}' is not in the graph '{graph_name}'!"
+        )
+
+
+class RepositoryExistsError(RepographException):
+    """
+    Exception for repositories that are already in a graph.
+    """
+
+    code = status.HTTP_409_CONFLICT
+
+    def __init__(self, graph_name: str, repository_name: str):
+        self.message = (
+            f"The repository '{repository_name}' is already in the graph '{graph_name}'!"
+        )
+
+
+class NodeNotFoundError(RepographException):
+    """
+    Exception for nodes that aren't in a graph.
+    """
+
+    code = status.HTTP_404_NOT_FOUND
+
+    def __init__(self, graph_name: str, node_id: int):
+        self.message = f"The node {node_id} is not in the graph '{graph_name}'!"
@@ -86,17 +86,26 @@ class InvalidRelationshipException(TypeError):
     based on the parent and child types.
     """
 
-    def __init__(self, parent: Node, child: Node, relationship: Relationship) -> None:
+    def __init__(
+        self,
+        parent: Union[Node, str],
+        child: Union[Node, str],
+        relationship: Union[Relationship, str],
+    ) -> None:
         """Constructor
 
         Args:
-            parent (Node): Parent node.
-            child (Node): Child node.
-            relationship (Relationship): The attempted relationship.
+            parent (Union[Node, str]): Parent node, or its label.
+            child (Union[Node, str]): Child node, or its label.
+            relationship (Union[Relationship, str]): The attempted relationship, or its type.
         """
+        parent, child, relationship = (
+            item if isinstance(item, str) else type(item)
+            for item in (parent, child, relationship)
+        )
         message = f"""
-          {type(parent)} -> {type(child)} is not a valid
-          pairing for relationship of type: {type(relationship)}
+          {parent} -> {child} is not a valid
+          pairing for relationship of type: {relationship}
           """
         super().__init__(message)
 
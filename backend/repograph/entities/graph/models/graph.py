@@ -46,6 +46,7 @@ class CallGraph(BaseModel):
         from_id: str = Field(..., alias="source")
         to_id: str = Field(..., alias="target")
         type: str
+        count: Optional[int]
 
         class Config:
             allow_population_by_field_name = True
@@ -98,3 +99,123 @@ class IssuesResult(BaseModel):
         List[PossibleIncorrectDocstring],
         List[MissingDocstring],
     ]
+
+
+class RepositoryCopyRequest(BaseModel):
+    """
+    Request to copy a repository into a graph from another graph.
+
+    Args:
+        source_graph (str): The graph to copy the repository from.
+        repository_name (str): The name of the repository.
+    """
+
+    source_graph: str
+    repository_name: str
+
+
+class RepositoryCopy(BaseModel):
+    """
+    The result of copying a repository between graphs.
+
+    Args:
+        source_graph (str): The graph the repository was copied from.
+        target_graph (str): The graph the repository was copied into.
+        repository_name (str): The name of the repository.
+        nodes (int): The number of nodes copied.
+        relationships (int): The number of relationships copied.
+    """
+
+    source_graph: str
+    target_graph: str
+    repository_name: str
+    nodes: int = 0
+    relationships: int = 0
+
+
+class SharedNodeCompaction(BaseModel):
+    """
+    The result of merging the duplicate built-in and external package nodes of a graph.
+
+    Args:
+        graph (str): The graph that was compacted.
+        shared_nodes (int): The number of shared nodes.
+        merged_nodes (int): The number of duplicate nodes merged into shared nodes.
+    """
+
+    graph: str
+    shared_nodes: int = 0
+    merged_nodes: int = 0
+
+
+class ArgumentDetails(BaseModel):
+    """
+    An argument of a function, or an argument described by a docstring.
+    """
+
+    name: Optional[str]
+    type: Optional[str]
+    description: Optional[str]
+    is_optional: Optional[bool]
+    default: Optional[str]
+
+
+class ReturnValueDetails(BaseModel):
+    """
+    A return value of a function, or a return value described by a docstring.
+    """
+
+    name: Optional[str]
+    type: Optional[str]
+    description: Optional[str]
+    is_generator: Optional[bool]
+
+
+class RaisesDetails(BaseModel):
+    """
+    An exception described by a docstring.
+    """
+
+    type: Optional[str]
+    description: Optional[str]
+
+
+class DocstringDetails(BaseModel):
+    """
+    A docstring, including the arguments, return value and exceptions it describes.
+    """
+
+    short_description: Optional[str]
+    long_description: Optional[str]
+    summarization: Optional[str]
+    arguments: List[ArgumentDetails] = []
+    returns: Optional[ReturnValueDetails]
+    raises: List[RaisesDetails] = []
+
+
+class NodeDetails(BaseModel):
+    """
+    The arguments, return values and docstring of a Function or Class node.
+
+    These are read from either the compact schema, where they are properties of the
+    Function and Docstring nodes, or from separate nodes.
+    """
+
+    id: int
+    name: Optional[str]
+    canonical_name: Optional[str]
+    arguments: List[ArgumentDetails] = []
+    return_values: List[ReturnValueDetails] = []
+    docstring: Optional[DocstringDetails]
+
+
+class FunctionSource(BaseModel):
+    """
+    The source code, and optionally the AST, of a Function node.
+
+    These are read from the blob store if the node only holds their keys.
+    """
+
+    id: int
+    source_code: Optional[str]
+    ast: Optional[str]
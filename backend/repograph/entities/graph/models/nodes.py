@@ -3,7 +3,7 @@ Nodes.
 """
 import datetime
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, List, Optional, Type
 
 from repograph.entities.graph.models.base import Node
 from repograph.utils import JSONDict
@@ -15,6 +15,9 @@ from repograph.entities.graph.utils import (
 
 PYTHON_EXTENSION = ".py"
 
+# Repository metadata keys that are not stored as Repository properties
+EXCLUDED_METADATA_KEYS = ["owner", "license", "topics", "organization", "name", "id"]
+
 
 class Repository(Node):
     """Represents a software repository.
@@ -137,12 +140,8 @@ class Repository(Node):
         Returns:
             Repository
         """
-        metadata.pop("owner", None)
-        metadata.pop("license", None)
-        metadata.pop("topics", None)
-        metadata.pop("organization", None)
-        metadata.pop("name", None)
-        metadata.pop("id", None)
+        for key in EXCLUDED_METADATA_KEYS:
+            metadata.pop(key, None)
 
         return Repository(
             name=name,
@@ -397,10 +396,18 @@ class Function(Node):
         type (FunctionType): Whether this is a function or a method.
         builtin (bool): Whether the function is a Python interpreter built-in function.
         source_code (Optional[str]): The original source code string.
+        source_hash (Optional[str]): The blob store key of the source code, if it is
+                                     stored outside the graph.
         ast (Optional[ast.AST]): Abstract Syntax Tree extracted from the source code.
+        ast_hash (Optional[str]): The blob store key of the AST, if it is stored outside
+                                  the graph.
         min_line_number (Optional[int]): The first line of the function definition.
         max_line_number (Optional[int]): The last line of the function definition.
         inferred (bool): This object was inferred when parsing dependencies or calls. Default False.
+        argument_names (Optional[List[str]]): Argument names, in the compact schema.
+        argument_types (Optional[List[str]]): Argument types, in the compact schema.
+        return_value_names (Optional[List[str]]): Return value names, in the compact schema.
+        return_value_types (Optional[List[str]]): Return value types, in the compact schema.
     """
 
     class FunctionType(Enum):
@@ -417,10 +424,17 @@ class Function(Node):
     builtin: bool = False
     canonical_name: Optional[str]
     source_code: Optional[str]
+    source_hash: Optional[str]
     ast: Optional[Any]
+    ast_hash: Optional[str]
     min_line_number: Optional[int]
     max_line_number: Optional[int]
     inferred: bool = False
+    # Compact schema
+    argument_names: Optional[List[str]]
+    argument_types: Optional[List[str]]
+    return_value_names: Optional[List[str]]
+    return_value_types: Optional[List[str]]
 
 
 class Variable(Node):
@@ -488,11 +502,32 @@ class Docstring(Node):
         short_description (str): The short headline description of the docstring.
         long_description (Optional[str]): The main body of the docstring.
         summarization (str): The generated text summary of whatever the docstring is documenting.
+        summarization_similarity (Optional[float]): The similarity of the description to
+                                                    the summarization, computed after
+                                                    building.
+
+    In the compact schema, the documented arguments, return value and raised exceptions
+    are stored as properties rather than as DocstringArgument, DocstringReturnValue and
+    DocstringRaises nodes. Lists hold one entry per argument or exception, with missing
+    values stored as empty strings.
     """
 
     short_description: Optional[str]
     long_description: Optional[str]
     summarization: Optional[str]
+    summarization_similarity: Optional[float]
+    # Compact schema
+    argument_names: Optional[List[str]]
+    argument_types: Optional[List[str]]
+    argument_descriptions: Optional[List[str]]
+    argument_optional: Optional[List[bool]]
+    argument_defaults: Optional[List[str]]
+    returns_name: Optional[str]
+    returns_type: Optional[str]
+    returns_description: Optional[str]
+    returns_is_generator: Optional[bool]
+    raises_types: Optional[List[str]]
+    raises_descriptions: Optional[List[str]]
 
 
 class DocstringArgument(Argument):
@@ -535,3 +570,19 @@ class DocstringRaises(Node):
 
     description: str
     type: Optional[str]
+
+
+def get_node_models() -> List[Type[Node]]:
+    """Get every Node model, i.e. every node label.
+
+    Returns:
+        List[Type[Node]]
+    """
+    models = []
+    pending = list(Node.__subclasses__())
+    while pending:
+        model = pending.pop()
+        if model not in models:
+            models.append(model)
+            pending.extend(model.__subclasses__())
+    return models
@@ -60,6 +60,10 @@ class Imports(Relationship):
 
     Usage:
         - Module -> Module, Function, Package, Class
+
+    Attributes:
+        alias (str): The alias the object is imported as.
+        count (int): The number of times the object is imported by the module.
     """
 
     _allowed_types = {
@@ -67,6 +71,7 @@ class Imports(Relationship):
     }
 
     alias: Optional[str]
+    count: Optional[int]
 
 
 class HasMethod(Relationship):
@@ -150,6 +155,11 @@ class Calls(Relationship):
 
     Module -> Function, Class
     Function -> Function, Class
+
+    Attributes:
+        count (int): The number of calls.
     """
 
     _allowed_types = {Module: {Function, Class}, Function: {Function, Class, Module}}
+
+    count: Optional[int]
@@ -2,11 +2,12 @@
 Graph database repository.
 """
 # Base imports
-from typing import Any, Dict, List, Tuple
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Tuple
 from logging import getLogger
 
 # pip imports
-from py2neo import GraphService, NodeMatch, Transaction, Node as py2neoNode
+from py2neo import GraphService, NodeMatch, Subgraph, Transaction, Node as py2neoNode
 from neo4j import Driver, Transaction as neo4jTransaction
 from neo4j.exceptions import ClientError
 
@@ -15,6 +16,7 @@ from repograph.entities.graph.models.base import BaseSubgraph, Node
 
 # Utils
 from repograph.entities.graph.exceptions import GraphExistsError
+from repograph.entities.graph.utils import relationship_key, shared_node_key
 
 # Configure logging
 log = getLogger("repograph.entities.graph.repository")
@@ -97,6 +99,530 @@ class GraphRepository:
         if not tx:
             transaction.commit()
 
+    def add_subgraph(
+        self, subgraph: Subgraph, graph_name: str = None, tx: Transaction = None
+    ) -> None:
+        """Add a py2neo Subgraph of nodes and relationships to the graph.
+
+        Creating a single Subgraph allows py2neo to batch the writes by label and type.
+
+        Args:
+            subgraph (Subgraph): The Subgraph to add.
+            graph_name (str): The graph name to execute query on.
+            tx (Transaction): Optional, existing Transaction to use.
+
+        Return:
+            None
+        """
+        if not tx:
+            transaction = self._graph_service[graph_name].begin()
+        else:
+            transaction = tx
+
+        transaction.create(subgraph)
+
+        if not tx:
+            transaction.commit()
+
+    def create_key_constraints(self, labels: List[str], graph_name: str) -> None:
+        """Create uniqueness constraints on the key property of nodes.
+
+        Args:
+            labels (List[str]): The node labels to constrain.
+            graph_name (str): The graph name to execute query on.
+
+        Return:
+            None
+        """
+        graph = self._graph_service[graph_name]
+        for label in labels:
+            graph.run(
+                f"CREATE CONSTRAINT `{label}_key` IF NOT EXISTS "
+                f"FOR (n:`{label}`) REQUIRE n.key IS UNIQUE"
+            )
+
+    def merge(
+        self,
+        nodes: Dict[str, List[Dict[str, Any]]],
+        relationships: Dict[Tuple[str, str, str], List[Dict[str, Any]]],
+        graph_name: str = None,
+        tx: Transaction = None,
+        batch_size: int = 1000,
+    ) -> None:
+        """Upsert keyed nodes and relationships in batches.
+
+        Nodes and relationships are matched by their key property, so writing the same
+        records again replaces their properties instead of duplicating them.
+
+        Args:
+            nodes (Dict[str, List[Dict[str, Any]]]): Rows of key and properties, by
+                label.
+            relationships (Dict[Tuple[str, str, str], List[Dict[str, Any]]]): Rows of
+                start key, end key, key and properties, by type, start label and end
+                label.
+            graph_name (str): The graph name to execute query on.
+            tx (Transaction): Optional, existing Transaction to use.
+            batch_size (int): The number of nodes or relationships written per query.
+
+        Return:
+            None
+        """
+        if not tx:
+            transaction = self._graph_service[graph_name].begin()
+        else:
+            transaction = tx
+
+        for label, rows in nodes.items():
+            for batch in self._batches(iter(rows), batch_size):
+                transaction.run(
+                    f"""
+                    UNWIND $rows AS row MERGE (n:`{label}` {{key: row.key}})
+                    SET n = row.properties
+                    """,
+                    rows=batch,
+                )
+
+        for (rel_type, start, end), rows in relationships.items():
+            for batch in self._batches(iter(rows), batch_size):
+                transaction.run(
+                    f"""
+                    UNWIND $rows AS row
+                    MATCH (a:`{start}` {{key: row.start}})
+                    MATCH (b:`{end}` {{key: row.end}})
+                    MERGE (a)-[r:`{rel_type}` {{key: row.key}}]->(b)
+                    SET r = row.properties
+                    """,
+                    rows=batch,
+                )
+
+        if not tx:
+            transaction.commit()
+
+    @staticmethod
+    def _batches(cursor: Iterator[Any], size: int) -> Iterator[List[Any]]:
+        """Group the records of a cursor into batches.
+
+        Args:
+            cursor (Iterator[Any]): The cursor.
+            size (int): The maximum size of each batch.
+
+        Returns:
+            Iterator[List[Any]]
+        """
+        batch = []
+        for record in cursor:
+            batch.append(record)
+            if len(batch) == size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def _copy_nodes(
+        self,
+        records: Iterator[Any],
+        tx: Transaction,
+        identities: Dict[int, int],
+        batch_size: int,
+        merge: bool = False,
+    ) -> None:
+        """Write copies of nodes read from another graph, in batches grouped by labels.
+
+        Args:
+            records (Iterator[Any]): Records of the id, labels and properties of nodes.
+            tx (Transaction): Transaction of the graph to copy into.
+            identities (Dict[int, int]): Map of source to copied node identities, which
+                                         the copies are added to.
+            batch_size (int): The number of nodes written per query.
+            merge (bool): Whether to merge the nodes on their key, rather than create them.
+
+        Returns:
+            None
+        """
+        for batch in self._batches(records, batch_size):
+            by_labels = defaultdict(list)
+            for record in batch:
+                labels = ":".join(f"`{label}`" for label in sorted(record["labels"]))
+                by_labels[labels].append(
+                    {"id": record["id"], "properties": record["properties"]}
+                )
+
+            for labels, rows in by_labels.items():
+                if merge:
+                    write = f"MERGE (n:{labels} {{key: row.properties.key}})"
+                else:
+                    write = f"CREATE (n:{labels})"
+
+                created = tx.run(
+                    f"""
+                    UNWIND $rows AS row {write} SET n = row.properties
+                    RETURN row.id AS source, id(n) AS target
+                    """,
+                    rows=rows,
+                )
+                identities.update(
+                    {record["source"]: record["target"] for record in created}
+                )
+
+    def _copy_relationships(
+        self,
+        records: Iterator[Any],
+        tx: Transaction,
+        identities: Dict[int, int],
+        batch_size: int,
+        merge: bool = False,
+    ) -> int:
+        """Write copies of relationships read from another graph, in batches grouped by
+        type.
+
+        Args:
+            records (Iterator[Any]): Records of the start, end, type and properties of
+                                     relationships.
+            tx (Transaction): Transaction of the graph to copy into.
+            identities (Dict[int, int]): Map of source to copied node identities.
+            batch_size (int): The number of relationships written per query.
+            merge (bool): Whether to merge the relationships on their key, rather than
+                          create them.
+
+        Returns:
+            int: The number of relationships copied.
+        """
+        count = 0
+        for batch in self._batches(records, batch_size):
+            by_type = defaultdict(list)
+            for record in batch:
+                by_type[record["type"]].append(
+                    {
+                        "start": identities[record["start"]],
+                        "end": identities[record["end"]],
+                        "properties": record["properties"],
+                    }
+                )
+
+            for relationship_type, rows in by_type.items():
+                if merge:
+                    write = (
+                        f"MERGE (a)-[r:`{relationship_type}` "
+                        f"{{key: row.properties.key}}]->(b)"
+                    )
+                else:
+                    write = f"CREATE (a)-[r:`{relationship_type}`]->(b)"
+
+                tx.run(
+                    f"""
+                    UNWIND $rows AS row
+                    MATCH (a) WHERE id(a) = row.start
+                    MATCH (b) WHERE id(b) = row.end
+                    {write} SET r = row.properties
+                    """,
+                    rows=rows,
+                )
+                count += len(rows)
+
+        return count
+
+    def copy_repository(
+        self,
+        source_graph: str,
+        repository_name: str,
+        tx: Transaction,
+        batch_size: int = 1000,
+    ) -> Tuple[int, int]:
+        """Copy the nodes and relationships of a repository from another graph.
+
+        Records are streamed from the source graph and written in batches with UNWIND,
+        grouped by label and relationship type. The shared nodes the repository links
+        to are merged with those already in the graph on their key.
+
+        Args:
+            source_graph (str): The graph to copy from.
+            repository_name (str): The name of the repository to copy.
+            tx (Transaction): Transaction of the graph to copy into.
+            batch_size (int): The number of nodes or relationships written per query.
+
+        Return:
+            int: The number of nodes copied.
+            int: The number of relationships copied.
+        """
+        source = self._graph_service[source_graph]
+
+        # Map the identities of the source nodes to the identities of their copies
+        identities: Dict[int, int] = dict()
+        nodes = source.run(
+            """
+            MATCH (n {repository_name: $name})
+            RETURN id(n) AS id, labels(n) AS labels, properties(n) AS properties
+            """,
+            name=repository_name,
+        )
+        self._copy_nodes(nodes, tx, identities, batch_size)
+
+        # The shared nodes the repository links to, and the shared nodes containing them
+        shared_nodes = source.run(
+            """
+            MATCH ({repository_name: $name})--(s {shared: true})
+            WITH DISTINCT s
+            MATCH (n {shared: true})-[:Contains*0..]->(s)
+            RETURN DISTINCT id(n) AS id, labels(n) AS labels, properties(n) AS properties
+            """,
+            name=repository_name,
+        )
+        repository_count = len(identities)
+        self._copy_nodes(shared_nodes, tx, identities, batch_size, merge=True)
+        shared_ids = list(identities)[repository_count:]
+
+        relationships = source.run(
+            """
+            MATCH (a {repository_name: $name})-[r]->(b)
+            WHERE b.repository_name = $name OR b.shared = true
+            RETURN id(a) AS start, id(b) AS end, type(r) AS type,
+            properties(r) AS properties
+            UNION ALL
+            MATCH (a {shared: true})-[r]->(b {repository_name: $name})
+            RETURN id(a) AS start, id(b) AS end, type(r) AS type,
+            properties(r) AS properties
+            """,
+            name=repository_name,
+        )
+        relationship_count = self._copy_relationships(
+            relationships, tx, identities, batch_size
+        )
+
+        shared_relationships = source.run(
+            """
+            MATCH (a)-[r {shared: true}]->(b) WHERE id(a) IN $ids AND id(b) IN $ids
+            RETURN id(a) AS start, id(b) AS end, type(r) AS type,
+            properties(r) AS properties
+            """,
+            ids=shared_ids,
+        )
+        relationship_count += self._copy_relationships(
+            shared_relationships, tx, identities, batch_size, merge=True
+        )
+
+        return len(identities), relationship_count
+
+    def compact_shared_nodes(
+        self, graph_name: str, batch_size: int = 1000
+    ) -> Tuple[int, int]:
+        """Merge the duplicate built-in function and external package nodes of a graph.
+
+        Graphs built before nodes were shared contain a copy of these nodes for every
+        repository. Duplicates are identified by their label and canonical name. Their
+        relationships are moved to a single node, which is made a shared node, and the
+        duplicates are deleted. The keys of the moved relationships are recalculated.
+
+        Args:
+            graph_name (str): The graph name to execute query on.
+            batch_size (int): The number of nodes or relationships updated per query.
+
+        Return:
+            int: The number of shared nodes.
+            int: The number of duplicate nodes removed.
+        """
+        transaction = self._graph_service[graph_name].begin()
+
+        try:
+            # Give the nodes that don't have a canonical name one
+            transaction.run(
+                """
+                MATCH (f:Function {builtin: true}) WHERE f.canonical_name IS NULL
+                SET f.canonical_name = 'builtins.' + f.name
+                """
+            )
+            transaction.run(
+                """
+                MATCH (p:Package {external: true})-[:Contains]->(m:Module {inferred: true})
+                WHERE m.canonical_name IS NULL
+                SET m.canonical_name = p.canonical_name + '.' + m.name
+                """
+            )
+
+            # Group the nodes to share by label and canonical name
+            groups: Dict[Tuple[str, str], List[Any]] = defaultdict(list)
+            candidates = transaction.run(
+                """
+                MATCH (n:Function {builtin: true})
+                RETURN id(n) AS id, labels(n) AS labels, n.canonical_name AS name,
+                n.shared AS shared
+                UNION
+                MATCH (n:Package {external: true})
+                RETURN id(n) AS id, labels(n) AS labels, n.canonical_name AS name,
+                n.shared AS shared
+                UNION
+                MATCH (:Package {external: true})-[:Contains*]->(n {inferred: true})
+                RETURN id(n) AS id, labels(n) AS labels, n.canonical_name AS name,
+                n.shared AS shared
+                """
+            )
+            for record in candidates:
+                if record["name"] is not None and len(record["labels"]) == 1:
+                    groups[(record["labels"][0], record["name"])].append(record)
+
+            shared, duplicates = [], []
+            for (label, name), records in groups.items():
+                records = sorted(records, key=lambda r: (not r["shared"], r["id"]))
+                keep = records[0]["id"]
+                shared.append({"id": keep, "key": shared_node_key(label, name)})
+                duplicates.extend(
+                    {"duplicate": record["id"], "keep": keep} for record in records[1:]
+                )
+
+            # Move the relationships of the duplicates to the node that is kept
+            duplicate_ids = [row["duplicate"] for row in duplicates]
+            relationship_types = [
+                record["type"]
+                for record in transaction.run(
+                    """
+                    MATCH (n)-[r]-() WHERE id(n) IN $ids
+                    RETURN DISTINCT type(r) AS type
+                    """,
+                    ids=duplicate_ids,
+                )
+            ]
+            for relationship_type in relationship_types:
+                for pattern, copy in [
+                    ("(d)<-[r:`{0}`]-(o)", "(o)-[c:`{0}`]->(k)"),
+                    ("(d)-[r:`{0}`]->(o)", "(k)-[c:`{0}`]->(o)"),
+                ]:
+                    for batch in self._batches(iter(duplicates), batch_size):
+                        transaction.run(
+                            f"""
+                            UNWIND $rows AS row
+                            MATCH (d) WHERE id(d) = row.duplicate
+                            MATCH (k) WHERE id(k) = row.keep
+                            MATCH {pattern.format(relationship_type)}
+                            CREATE {copy.format(relationship_type)} SET c = properties(r)
+                            DELETE r
+                            """,
+                            rows=batch,
+                        )
+
+            for batch in self._batches(iter(duplicate_ids), batch_size):
+                transaction.run(
+                    "UNWIND $ids AS id MATCH (n) WHERE id(n) = id DETACH DELETE n",
+                    ids=batch,
+                )
+
+            for batch in self._batches(iter(shared), batch_size):
+                transaction.run(
+                    """
+                    UNWIND $rows AS row MATCH (n) WHERE id(n) = row.id
+                    SET n.shared = true, n.key = row.key REMOVE n.repository_name
+                    """,
+                    rows=batch,
+                )
+
+            self._rekey_shared_relationships(
+                transaction, [row["id"] for row in shared], batch_size
+            )
+
+            transaction.commit()
+        except Exception as e:
+            transaction.rollback()
+            raise e
+
+        return len(shared), len(duplicates)
+
+    def _rekey_shared_relationships(
+        self, tx: Transaction, shared_ids: List[int], batch_size: int
+    ) -> None:
+        """Recalculate the keys of the relationships of shared nodes.
+
+        Duplicate relationships between shared nodes are deleted, and the remaining ones
+        are made shared relationships.
+
+        Args:
+            tx (Transaction): The transaction.
+            shared_ids (List[int]): The identities of the shared nodes.
+            batch_size (int): The number of relationships updated per query.
+
+        Returns:
+            None
+        """
+        records = tx.run(
+            """
+            MATCH (n)-[r]-() WHERE id(n) IN $ids
+            WITH DISTINCT r
+            RETURN id(r) AS id, startNode(r).key AS start, type(r) AS type,
+            endNode(r).key AS end,
+            coalesce(startNode(r).shared, false) AND coalesce(endNode(r).shared, false)
+            AS shared
+            ORDER BY id
+            """,
+            ids=shared_ids,
+        )
+
+        occurrences: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        keyed, shared, deleted = [], [], []
+        for record in records:
+            if record["start"] is None or record["end"] is None:
+                continue
+
+            identity = (record["start"], record["type"], record["end"])
+            occurrence = occurrences[identity]
+            occurrences[identity] += 1
+
+            if record["shared"] and occurrence:
+                deleted.append(record["id"])
+                continue
+
+            row = {"id": record["id"], "key": relationship_key(*identity, occurrence)}
+            (shared if record["shared"] else keyed).append(row)
+
+        for rows, update in [
+            (keyed, "SET r.key = row.key"),
+            (shared, "SET r.key = row.key, r.shared = true REMOVE r.repository_name"),
+        ]:
+            for batch in self._batches(iter(rows), batch_size):
+                tx.run(
+                    f"""
+                    UNWIND $rows AS row MATCH ()-[r]->() WHERE id(r) = row.id
+                    {update}
+                    """,
+                    rows=batch,
+                )
+
+        for batch in self._batches(iter(deleted), batch_size):
+            tx.run(
+                "UNWIND $ids AS id MATCH ()-[r]->() WHERE id(r) = id DELETE r",
+                ids=batch,
+            )
+
+    def set_node_properties(
+        self,
+        rows: List[Dict[str, Any]],
+        graph_name: str = None,
+        batch_size: int = 1000,
+    ) -> None:
+        """Set properties of existing nodes, by identity, in batches.
+
+        Args:
+            rows (List[Dict[str, Any]]): Rows of the id of a node and the properties to
+                set on it. Other properties of the node are kept.
+            graph_name (str): The graph name to execute query on.
+            batch_size (int): The number of nodes updated per query.
+
+        Return:
+            None
+        """
+        transaction = self._graph_service[graph_name].begin()
+
+        try:
+            for batch in self._batches(iter(rows), batch_size):
+                transaction.run(
+                    """
+                    UNWIND $rows AS row MATCH (n) WHERE id(n) = row.id
+                    SET n += row.properties
+                    """,
+                    rows=batch,
+                )
+            transaction.commit()
+        except Exception as e:
+            transaction.rollback()
+            raise e
+
     def has_nodes(self, graph_name: str = None) -> bool:
         """Checks whether the graph contains any nodes.
 
@@ -9,7 +9,15 @@ from typing import List
 from fastapi import APIRouter, status
 
 # Model imports
-from repograph.entities.graph.models.graph import CallGraph, IssuesResult
+from repograph.entities.graph.models.graph import (
+    CallGraph,
+    FunctionSource,
+    IssuesResult,
+    NodeDetails,
+    RepositoryCopy,
+    RepositoryCopyRequest,
+    SharedNodeCompaction,
+)
 
 # Graph entity imports
 from repograph.entities.graph.service import GraphService
@@ -46,6 +54,22 @@ class GraphRouter:
             response_model=CallGraph,
         )
 
+        self.router.add_api_route(
+            "/{graph}/node/{node_id}/details",
+            self.node_details,
+            methods=["GET"],
+            status_code=status.HTTP_200_OK,
+            response_model=NodeDetails,
+        )
+
+        self.router.add_api_route(
+            "/{graph}/node/{node_id}/source",
+            self.function_source,
+            methods=["GET"],
+            status_code=status.HTTP_200_OK,
+            response_model=FunctionSource,
+        )
+
         self.router.add_api_route(
             "/{graph}",
             self.delete_graph,
@@ -71,6 +95,22 @@ class GraphRouter:
             "/{graph}/repositories", self.get_repositories, methods=["GET"]
         )
 
+        self.router.add_api_route(
+            "/{graph}/repositories",
+            self.copy_repository,
+            methods=["POST"],
+            status_code=status.HTTP_201_CREATED,
+            response_model=RepositoryCopy,
+        )
+
+        self.router.add_api_route(
+            "/{graph}/compact",
+            self.compact_shared_nodes,
+            methods=["POST"],
+            status_code=status.HTTP_200_OK,
+            response_model=SharedNodeCompaction,
+        )
+
     async def summary(self, graph: str):
         return self.service.get_summary(graph)
 
@@ -92,8 +132,26 @@ class GraphRouter:
     async def call_graph_by_id(self, graph: str, node_id: int) -> CallGraph:
         return self.service.get_call_graph_by_id(node_id, graph)
 
+    async def node_details(self, graph: str, node_id: int) -> NodeDetails:
+        return self.service.get_node_details(node_id, graph)
+
+    def function_source(
+        self, graph: str, node_id: int, ast: bool = False
+    ) -> FunctionSource:
+        return self.service.get_function_source(node_id, graph, ast)
+
     async def get_repositories(self, graph: str) -> List[str]:
         return self.service.get_repository_names(graph)
 
+    def copy_repository(
+        self, graph: str, request: RepositoryCopyRequest
+    ) -> RepositoryCopy:
+        return self.service.copy_repository(
+            request.source_graph, graph, request.repository_name
+        )
+
+    def compact_shared_nodes(self, graph: str) -> SharedNodeCompaction:
+        return self.service.compact_shared_nodes(graph)
+
     async def delete_graph(self, graph: str) -> None:
         self.service.delete_graph(graph)
@@ -9,11 +9,11 @@ import traceback
 from logging import getLogger
 import re
 from sqlite3 import Connection
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import sys
 
 # pip imports
-from py2neo import Transaction
+from py2neo import Subgraph, Transaction
 from neo4j import Transaction as neo4jTransaction
 
 # Model imports
@@ -26,23 +26,41 @@ from repograph.entities.graph.models.nodes import (
     Package,
     Repository,
     README,
+    get_node_models,
 )
 from repograph.entities.graph.models.graph import (
     GraphSummary,
     CallGraph,
     CircularDependency,
     MissingRequirement,
+    RepositoryCopy,
+    SharedNodeCompaction,
+    ArgumentDetails,
+    FunctionSource,
+    DocstringDetails,
+    NodeDetails,
+    RaisesDetails,
+    ReturnValueDetails,
 )
 
 # Graph entity imports
 from repograph.entities.graph.repository import GraphRepository
 
+# Blob entity imports
+from repograph.entities.blob.service import BlobService
+
 # Metadata entity imports
 from repograph.entities.metadata.models import Graph
 from repograph.entities.metadata.service import MetadataService
 
 # Exceptions
-from repograph.entities.graph.exceptions import InvalidGraphNameError
+from repograph.entities.graph.exceptions import (
+    GraphNotFoundError,
+    InvalidGraphNameError,
+    NodeNotFoundError,
+    RepositoryExistsError,
+    RepositoryNotFoundError,
+)
 from repograph.utils import JSONDict
 
 # Configure logging
@@ -56,16 +74,25 @@ class GraphService:
 
     repository: GraphRepository
     metadata: MetadataService
+    blobs: Optional[BlobService]
 
-    def __init__(self, repository: GraphRepository, metadata: MetadataService):
+    def __init__(
+        self,
+        repository: GraphRepository,
+        metadata: MetadataService,
+        blobs: Optional[BlobService] = None,
+    ):
         """Constructor
 
         Args:
             repository (GraphRepository): The Neo4j graph repository.
             metadata (MetadataService): The metadata service.
+            blobs (Optional[BlobService]): The blob store that function source code and
+                                           ASTs may be stored in.
         """
         self.repository = repository
         self.metadata = metadata
+        self.blobs = blobs
 
     def create_graph(
         self,
@@ -112,6 +139,18 @@ class GraphService:
         self.repository.delete_graph(name)
         self.metadata.delete_graph(name)
 
+    def get_graph_version(self, name: str) -> Optional[str]:
+        """Get a token that changes whenever a graph is recreated, built or written to,
+        so that results computed from the graph can be cached.
+
+        Args:
+            name (str): Name of the graph.
+
+        Returns:
+            Optional[str]: The version, or None if the graph doesn't exist.
+        """
+        return self.metadata.get_graph_version(name)
+
     @contextlib.contextmanager
     def get_transaction(self, graph_name):
         """Obtain a Neo4j transaction for a given graph.
@@ -157,6 +196,169 @@ class GraphService:
         """
         self.repository.add(*args, tx=tx, graph_name=graph_name)
 
+    def add_subgraph(
+        self, subgraph: Subgraph, tx: Transaction = None, graph_name: str = None
+    ) -> None:
+        """Add a py2neo Subgraph of nodes and relationships to the graph.
+
+        Args:
+            subgraph (Subgraph): The Subgraph to add.
+            tx (Transaction): The optional transaction object to use
+            graph_name (str): The optional graph name to obtain a transaction for if no tx is used.
+        """
+        self.repository.add_subgraph(subgraph, tx=tx, graph_name=graph_name)
+
+    def create_key_constraints(self, graph_name: str) -> None:
+        """Create uniqueness constraints on the keys of every node label in a graph.
+
+        Failing to create the constraints is logged rather than raised, as keyed writes
+        remain idempotent without them, only slower.
+
+        Args:
+            graph_name (str): The name of the graph.
+
+        Returns:
+            None
+        """
+        labels = sorted(model.__name__ for model in get_node_models())
+        try:
+            self.repository.create_key_constraints(labels, graph_name)
+        except Exception as e:
+            log.warning("Unable to create key constraints on '%s' - %s", graph_name, e)
+
+    def merge(
+        self,
+        nodes: Dict[str, List[JSONDict]],
+        relationships: Dict[Tuple[str, str, str], List[JSONDict]],
+        tx: Transaction = None,
+        graph_name: str = None,
+    ) -> None:
+        """Upsert keyed nodes and relationships.
+
+        Args:
+            nodes (Dict[str, List[JSONDict]]): Rows of key and properties, by label.
+            relationships (Dict[Tuple[str, str, str], List[JSONDict]]): Rows of start
+                key, end key, key and properties, by type, start label and end label.
+            tx (Transaction): Optional, existing Transaction to use.
+            graph_name (str): The name of the graph.
+
+        Returns:
+            None
+        """
+        self.repository.merge(nodes, relationships, tx=tx, graph_name=graph_name)
+
+    def copy_repository(
+        self,
+        source_graph: str,
+        target_graph: str,
+        repository_name: str,
+        tx: Transaction = None,
+    ) -> RepositoryCopy:
+        """Copy a repository's nodes and relationships from one graph to another.
+
+        All properties are copied, including docstring summarizations. If no transaction
+        is given, the copy is committed in its own transaction, the target graph's
+        version changes, and the repository's content hash is recorded for the target
+        graph so that later builds can reuse it. Copies made in a build's transaction
+        change the version when the build finishes.
+
+        Args:
+            source_graph (str): The name of the graph to copy from.
+            target_graph (str): The name of the graph to copy into.
+            repository_name (str): The name of the repository to copy.
+            tx (Transaction): Optional transaction of the target graph to use.
+
+        Returns:
+            RepositoryCopy
+
+        Raises:
+            GraphNotFoundError: If either graph doesn't exist.
+            RepositoryNotFoundError: If the repository isn't in the source graph.
+            RepositoryExistsError: If the repository is already in the target graph.
+        """
+        graphs = [graph.neo4j_name for graph in self.metadata.get_all_graph_listings()]
+        for graph_name in [source_graph, target_graph]:
+            if graph_name not in graphs:
+                raise GraphNotFoundError(graph_name)
+
+        if repository_name not in self.get_repository_names(source_graph):
+            raise RepositoryNotFoundError(source_graph, repository_name)
+        if repository_name in self.get_repository_names(target_graph):
+            raise RepositoryExistsError(target_graph, repository_name)
+
+        log.info(
+            "Copying repository '%s' from graph '%s' to '%s'...",
+            repository_name,
+            source_graph,
+            target_graph,
+        )
+
+        if tx:
+            nodes, relationships = self.repository.copy_repository(
+                source_graph, repository_name, tx
+            )
+        else:
+            transaction = self.repository.get_transaction(target_graph)
+            try:
+                nodes, relationships = self.repository.copy_repository(
+                    source_graph, repository_name, transaction
+                )
+                transaction.commit()
+            except Exception as e:
+                transaction.rollback()
+                raise e
+            self.metadata.record_graph_write(target_graph)
+
+            fingerprint = self.metadata.get_repository_fingerprint(
+                source_graph, repository_name
+            )
+            if fingerprint:
+                self.metadata.record_repository_fingerprint(
+                    fingerprint.copy(
+                        update={
+                            "neo4j_name": target_graph,
+                            "created": datetime.datetime.now(),
+                        }
+                    )
+                )
+
+        log.info("Copied %d nodes and %d relationships", nodes, relationships)
+        return RepositoryCopy(
+            source_graph=source_graph,
+            target_graph=target_graph,
+            repository_name=repository_name,
+            nodes=nodes,
+            relationships=relationships,
+        )
+
+    def compact_shared_nodes(self, graph_name: str) -> SharedNodeCompaction:
+        """Merge the per-repository copies of built-in and external package nodes.
+
+        Graphs built before these nodes were shared between repositories contain a
+        copy of them for every repository. This merges the copies into shared nodes.
+
+        Args:
+            graph_name (str): The name of the graph.
+
+        Returns:
+            SharedNodeCompaction
+
+        Raises:
+            GraphNotFoundError: If the graph doesn't exist.
+        """
+        graphs = [graph.neo4j_name for graph in self.metadata.get_all_graph_listings()]
+        if graph_name not in graphs:
+            raise GraphNotFoundError(graph_name)
+
+        log.info("Compacting shared nodes of graph '%s'...", graph_name)
+        shared, merged = self.repository.compact_shared_nodes(graph_name)
+        self.metadata.record_graph_write(graph_name)
+        log.info("Merged %d nodes into %d shared nodes", merged, shared)
+
+        return SharedNodeCompaction(
+            graph=graph_name, shared_nodes=shared, merged_nodes=merged
+        )
+
     def bulk_add(
         self, nodes: List[Node], relationships: List[Relationship], graph_name: str
     ):
@@ -352,6 +554,7 @@ class GraphService:
                         from_id=y.start_node.identity,
                         to_id=y.end_node.identity,
                         type="Calls",
+                        count=y["count"],
                     ),
                     x["relationship"],
                 )
@@ -367,6 +570,216 @@ class GraphService:
 
         return call_graph
 
+    def get_node_details(self, node_id: int, graph_name: str) -> NodeDetails:
+        """Get the arguments, return values and docstring of a Function or Class node.
+
+        Both the compact schema and the schema with separate nodes are supported.
+
+        Args:
+            node_id (int): ID of the Function or Class node.
+            graph_name (str): The graph name.
+
+        Returns:
+            NodeDetails
+
+        Raises:
+            NodeNotFoundError: If there is no Function or Class with the ID.
+        """
+        results = self.repository.execute_query(
+            f"""
+            MATCH (n) WHERE ID(n) = {int(node_id)} AND (n:Function OR n:Class)
+            OPTIONAL MATCH (n)-[:HasArgument]->(a:Argument)
+            WITH n, collect(properties(a)) AS arguments
+            OPTIONAL MATCH (n)-[:Returns]->(r:ReturnValue)
+            WITH n, arguments, collect(properties(r)) AS return_values
+            OPTIONAL MATCH (d:Docstring)-[:Documents]->(n)
+            OPTIONAL MATCH (d)-[:Describes]->(p)
+            RETURN properties(n) AS `node`, arguments, return_values,
+            properties(d) AS `docstring`,
+            collect({{labels: labels(p), properties: properties(p)}}) AS `parts`
+            """,
+            graph_name=graph_name,
+        )
+
+        if not results:
+            raise NodeNotFoundError(graph_name, node_id)
+
+        node = results[0]["node"]
+        details = NodeDetails(
+            id=node_id,
+            name=node.get("name"),
+            canonical_name=node.get("canonical_name"),
+        )
+
+        if "argument_names" in node:
+            details.arguments = [
+                ArgumentDetails(name=name, type=arg_type or None)
+                for name, arg_type in zip(
+                    node["argument_names"], node.get("argument_types", [])
+                )
+            ]
+        else:
+            details.arguments = [
+                ArgumentDetails(**argument) for argument in results[0]["arguments"]
+            ]
+
+        if "return_value_names" in node:
+            details.return_values = [
+                ReturnValueDetails(name=name, type=return_type or None)
+                for name, return_type in zip(
+                    node["return_value_names"], node.get("return_value_types", [])
+                )
+            ]
+        else:
+            details.return_values = [
+                ReturnValueDetails(**return_value)
+                for return_value in results[0]["return_values"]
+            ]
+
+        docstring = results[0]["docstring"]
+        if docstring:
+            details.docstring = self._get_docstring_details(
+                docstring, results[0]["parts"]
+            )
+
+        return details
+
+    def get_function_source(
+        self, node_id: int, graph_name: str, ast: bool = False
+    ) -> FunctionSource:
+        """Get the source code, and optionally the AST, of a Function node.
+
+        Args:
+            node_id (int): ID of the Function node.
+            graph_name (str): The graph name.
+            ast (bool): Whether to include the AST.
+
+        Returns:
+            FunctionSource
+
+        Raises:
+            NodeNotFoundError: If there is no Function with the ID.
+        """
+        results = self.repository.execute_query(
+            f"""
+            MATCH (n:Function) WHERE ID(n) = {int(node_id)}
+            RETURN n.source_code AS `source_code`, n.source_hash AS `source_hash`,
+            {"n.ast" if ast else "null"} AS `ast`, n.ast_hash AS `ast_hash`
+            """,
+            graph_name=graph_name,
+        )
+
+        if not results:
+            raise NodeNotFoundError(graph_name, node_id)
+
+        result = results[0]
+        return FunctionSource(
+            id=node_id,
+            source_code=self._read_blob(result["source_code"], result["source_hash"]),
+            ast=self._read_blob(result["ast"], result["ast_hash"]) if ast else None,
+        )
+
+    def get_source_code(self, function: Function) -> Optional[str]:
+        """Get the source code of a Function, reading it from the blob store if needed.
+
+        Args:
+            function (Function): The Function.
+
+        Returns:
+            Optional[str]
+        """
+        return self._read_blob(function.source_code, function.source_hash)
+
+    def _read_blob(self, value: Optional[str], key: Optional[str]) -> Optional[str]:
+        """Read a property that is either stored in the graph or in the blob store.
+
+        Args:
+            value (Optional[str]): The value stored in the graph, if any.
+            key (Optional[str]): The blob store key of the value, if any.
+
+        Returns:
+            Optional[str]
+        """
+        if value is not None or not key:
+            return value
+
+        if not self.blobs:
+            log.warning("Blob '%s' can't be read as no blob store is configured", key)
+            return None
+
+        return self.blobs.get(key)
+
+    @staticmethod
+    def _get_docstring_details(
+        docstring: JSONDict, parts: List[JSONDict]
+    ) -> DocstringDetails:
+        """Read a docstring from either the compact schema, or its described nodes.
+
+        Args:
+            docstring (JSONDict): The properties of the Docstring node.
+            parts (List[JSONDict]): The labels and properties of the described nodes.
+
+        Returns:
+            DocstringDetails
+        """
+        details = DocstringDetails(
+            short_description=docstring.get("short_description"),
+            long_description=docstring.get("long_description"),
+            summarization=docstring.get("summarization"),
+        )
+
+        def column(key: str, length: int) -> list:
+            return list(docstring.get(key, [])) + [None] * length
+
+        names = docstring.get("argument_names", [])
+        for name, arg_type, description, optional, default in zip(
+            names,
+            column("argument_types", len(names)),
+            column("argument_descriptions", len(names)),
+            column("argument_optional", len(names)),
+            column("argument_defaults", len(names)),
+        ):
+            details.arguments.append(
+                ArgumentDetails(
+                    name=name,
+                    type=arg_type or None,
+                    description=description or None,
+                    is_optional=optional,
+                    default=default or None,
+                )
+            )
+
+        if any(key.startswith("returns_") for key in docstring):
+            details.returns = ReturnValueDetails(
+                name=docstring.get("returns_name"),
+                type=docstring.get("returns_type"),
+                description=docstring.get("returns_description"),
+                is_generator=docstring.get("returns_is_generator"),
+            )
+
+        types = docstring.get("raises_types", [])
+        for raises_type, description in zip(
+            types, column("raises_descriptions", len(types))
+        ):
+            details.raises.append(
+                RaisesDetails(type=raises_type or None, description=description or None)
+            )
+
+        # Nodes described by the docstring, in the schema with separate nodes
+        for part in parts:
+            labels = part["labels"] or []
+            properties = part["properties"] or {}
+            if "DocstringArgument" in labels:
+                if properties.get("default") is not None:
+                    properties["default"] = str(properties["default"])
+                details.arguments.append(ArgumentDetails(**properties))
+            elif "DocstringReturnValue" in labels:
+                details.returns = ReturnValueDetails(**properties)
+            elif "DocstringRaises" in labels:
+                details.raises.append(RaisesDetails(**properties))
+
+        return details
+
     def get_cyclical_dependencies(self, graph: str) -> List[CircularDependency]:
         """Get the number of cyclical dependencies in the specified graph.
 
@@ -411,9 +824,18 @@ class GraphService:
         Returns:
             List[MissingRequirement]: The list of missing requirements found.
         """
+        # Shared packages don't belong to a repository, so they are missing for each
+        # repository that imports from them without requiring them.
         result = self.repository.execute_query(
-            "MATCH (n:Package|Module) WHERE (n.inferred) = true AND  NOT (n)<-[*]-()  "
-            "RETURN DISTINCT n.canonical_name as `name`, n.repository_name as `repository`",
+            "MATCH (n:Package|Module) WHERE (n.inferred) = true AND n.shared IS NULL "
+            "AND NOT (n)<-[*]-() "
+            "RETURN DISTINCT n.canonical_name as `name`, n.repository_name as `repository` "
+            "UNION "
+            "MATCH (m:Module)-[:Imports]->(d {shared: true}) "
+            "MATCH (p:Package {shared: true})-[:Contains*0..]->(d) "
+            "WHERE NOT (p)<-[:Contains]-() "
+            "AND NOT (:Repository {repository_name: m.repository_name})-[:Requires]->(p) "
+            "RETURN DISTINCT p.canonical_name as `name`, m.repository_name as `repository`",
             graph_name=graph,
         )
 
@@ -552,6 +974,72 @@ class GraphService:
             graph_name=graph,
         )
 
+    def get_unscored_docstrings(self, graph: str) -> List[JSONDict]:
+        """Get the documented functions and classes whose docstring hasn't been compared
+        with their summarization.
+
+        Args:
+            graph (str): The graph to search.
+
+        Returns:
+            List[JSONDict]: The id of each Docstring node, its summarization and its
+                            description.
+        """
+        return self.repository.execute_query(
+            """
+            MATCH (n:Docstring)-[:Documents]->()
+            WHERE COALESCE(n.short_description, n.long_description) IS NOT NULL
+            AND n.summarization IS NOT NULL AND n.summarization_similarity IS NULL
+            RETURN DISTINCT id(n) as `id`, n.summarization as `summarization`,
+            COALESCE(n.short_description, n.long_description) as `docstring`
+            """,
+            graph_name=graph,
+        )
+
+    def set_docstring_similarities(
+        self, graph: str, similarities: Dict[int, float]
+    ) -> None:
+        """Store the similarity of docstrings to the summarizations of what they document.
+
+        Args:
+            graph (str): The graph.
+            similarities (Dict[int, float]): The similarity, by Docstring node id.
+
+        Returns:
+            None
+        """
+        self.repository.set_node_properties(
+            [
+                {"id": node_id, "properties": {"summarization_similarity": similarity}}
+                for node_id, similarity in similarities.items()
+            ],
+            graph_name=graph,
+        )
+        self.metadata.record_graph_write(graph)
+
+    def get_dissimilar_docstrings(self, graph: str, threshold: float) -> List[JSONDict]:
+        """Get the docstrings that are less similar than a threshold to the summarization
+        of what they document.
+
+        Args:
+            graph (str): The graph to search.
+            threshold (float): The similarity threshold.
+
+        Returns:
+            List[JSONDict]
+        """
+        return self.repository.execute_query(
+            f"""
+            MATCH (n:Docstring)-[:Documents]->(m)
+            WHERE n.summarization_similarity < {float(threshold)}
+            RETURN n.summarization as `summarization`,
+            COALESCE(n.short_description, n.long_description) as `docstring`,
+            n.summarization_similarity as `similarity`, m.canonical_name as `name`,
+            labels(m) as `type`, m.repository_name as `repository`
+            """,
+            graph_name=graph,
+        )
+
     def get_files(self, graph: str, repository: Optional[str] = None) -> List[JSONDict]:
         """Get the file names for the given graph.
 
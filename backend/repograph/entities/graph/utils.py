@@ -2,13 +2,18 @@
 Utility functions for the graph entity.
 """
 # Base imports
+import hashlib
 from pathlib import PurePath
 from logging import getLogger
-from typing import Tuple
+from typing import Any, Tuple
 
 # Logging
 log = getLogger("repograph.entities.graph.utils")
 
+# Labels of nodes whose identity also includes their line range, e.g. so that a class
+# defined in both branches of a conditional gets two keys
+LINE_RANGE_LABELS = ["Class", "Function"]
+
 
 def get_path_name(file_path: str) -> str:
     """Gets the name of the file or directory pointed to by the file path.
@@ -52,3 +57,55 @@ def get_package_parent_and_name(package: str) -> Tuple[str, str]:
         return "", package
 
     return ".".join(parts[:-1]), parts[-1]
+
+
+def hash_key(*parts: Any) -> str:
+    """Hash the parts of a key.
+
+    Args:
+        *parts (Any): The parts of the key.
+
+    Returns:
+        str: The SHA-1 hex digest of the parts.
+    """
+    joined = "\x1f".join(["" if part is None else str(part) for part in parts])
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()
+
+
+def shared_node_key(label: str, canonical_name: str) -> str:
+    """Get the key of a shared node.
+
+    Shared nodes have no repository, so every build that creates the same shared node
+    assigns it this key, and the builds' writes merge into a single node.
+
+    Args:
+        label (str): The node label.
+        canonical_name (str): The canonical name of the node.
+
+    Returns:
+        str
+    """
+    parts = [None, label, canonical_name]
+    if label in LINE_RANGE_LABELS:
+        parts.extend([None, None])
+    return hash_key(*parts)
+
+
+def relationship_key(
+    start_key: str, relationship_type: str, end_key: str, occurrence: int = 0
+) -> str:
+    """Get the key of a relationship.
+
+    Args:
+        start_key (str): The key of the start node.
+        relationship_type (str): The relationship type.
+        end_key (str): The key of the end node.
+        occurrence (int): The number of relationships of the same type between the same
+                          nodes created before this one.
+
+    Returns:
+        str
+    """
+    if occurrence:
+        return hash_key(start_key, relationship_type, end_key, occurrence)
+    return hash_key(start_key, relationship_type, end_key)
@@ -0,0 +1,129 @@
+"""
+Client of the shared inference server.
+"""
+# Base imports
+import threading
+from logging import getLogger
+from multiprocessing.connection import Client, Connection
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Inference entity imports
+from repograph.entities.inference.exceptions import InferenceError
+
+# Configure logging
+log = getLogger("repograph.entities.inference.client")
+
+
+class InferenceClient:
+    """
+    Sends encode and summarize requests to an InferenceServer over its Unix socket.
+
+    The client can be used in place of a SentenceTransformer, as it has the same encode
+    method. Each thread has its own connection, so threads' requests don't wait on
+    each other in the client.
+    """
+
+    def __init__(self, address: str) -> None:
+        """Constructor
+
+        Args:
+            address (str): The path of the server's Unix socket.
+        """
+        self.address = address
+        self._local = threading.local()
+
+    def _connection(self) -> Connection:
+        """Get the connection of the current thread, connecting if necessary.
+
+        Returns:
+            Connection
+        """
+        connection: Optional[Connection] = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = Client(self.address, family="AF_UNIX")
+            self._local.connection = connection
+        return connection
+
+    def _disconnect(self) -> None:
+        """Close the connection of the current thread, if any.
+
+        Returns:
+            None
+        """
+        connection: Optional[Connection] = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            connection.close()
+
+    def _call(self, method: str, payload: Any = None) -> Any:
+        """Send a request and wait for its response.
+
+        If the connection has been lost, for example because the server restarted, the
+        client reconnects and retries once.
+
+        Args:
+            method (str): The method.
+            payload (Any): The arguments of the method.
+
+        Returns:
+            Any: The result.
+
+        Raises:
+            InferenceError: If the server can't be reached or failed to serve the request.
+        """
+        for attempt in range(2):
+            try:
+                connection = self._connection()
+                connection.send((method, payload))
+                status, result = connection.recv()
+                break
+            except (EOFError, OSError) as e:
+                self._disconnect()
+                if attempt:
+                    raise InferenceError(
+                        f"Unable to reach the inference server at {self.address}"
+                    ) from e
+                log.warning("Lost connection to the inference server, reconnecting...")
+
+        if status == "error":
+            raise InferenceError(result)
+        return result
+
+    def encode(self, sentences: Union[str, List[str]]) -> Any:
+        """Embed sentences with the server's sentence embedding model.
+
+        Args:
+            sentences (Union[str, List[str]]): A sentence, or a batch of sentences.
+
+        Returns:
+            Any: The embedding, or the batch of embeddings, as a numpy array.
+        """
+        return self._call("encode", sentences)
+
+    def summarize(self, source_codes: List[str]) -> List[Tuple[str, str]]:
+        """Summarize a batch of functions with the server's summarization model.
+
+        Args:
+            source_codes (List[str]): The source code of each function.
+
+        Returns:
+            List[Tuple[str, str]]: The summarization of each function, and how the
+                summarization policy summarized it.
+        """
+        return self._call("summarize", source_codes)
+
+    def warm_up(self) -> Dict[str, float]:
+        """Load and run the server's models.
+
+        Returns:
+            Dict[str, float]: The seconds each model took.
+        """
+        return self._call("warm_up")
+
+    def close(self) -> None:
+        """Close the current thread's connection.
+
+        Returns:
+            None
+        """
+        self._disconnect()
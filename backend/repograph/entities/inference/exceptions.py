@@ -0,0 +1,29 @@
+"""
+Custom exceptions for the inference entity.
+"""
+# pip imports
+from fastapi import status
+
+# Exceptions imports
+from repograph.utils.exception_handlers import RepographException
+
+
+class InferenceError(RepographException):
+    """
+    Exception for requests the inference server couldn't serve.
+    """
+
+    code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class InferenceServerRunningError(Exception):
+    """
+    Raised when starting an inference server on a socket another server is serving on.
+    """
+
+    def __init__(self, address: str):
+        super().__init__(f"Another inference server is already serving on {address}")
@@ -0,0 +1,208 @@
+"""
+Shared inference server.
+
+Each API worker and build worker normally loads its own sentence embedding and
+summarization models, so memory grows with the number of workers. The InferenceServer
+runs in its own process, owns a single copy of the models, and serves batched encode and
+summarize requests from InferenceClients over a Unix socket. Workers that are configured
+with the socket load no models, so they stay small and can be scaled independently.
+"""
+# Base imports
+import os
+import socket
+import threading
+from logging import getLogger
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, List, Optional, Tuple
+
+# Inference entity imports
+from repograph.entities.inference.exceptions import InferenceServerRunningError
+
+# Search entity imports
+from repograph.entities.search.service import SearchService
+
+# Summarization entity imports
+from repograph.entities.summarization.service import SummarizationService
+
+# Configure logging
+log = getLogger("repograph.entities.inference.server")
+
+
+class InferenceServer:
+    """
+    Serves the models of a SearchService and a SummarizationService over a Unix socket.
+
+    Each connection is served by its own thread. Requests are (method, payload) tuples,
+    and responses are ("ok", result) or ("error", message) tuples. The socket is only
+    accessible to its owner, as requests are pickled, so it's created under a umask
+    that leaves no window for others to connect. As the umask is process-wide, the
+    server should run in its own process.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        search: Optional[SearchService],
+        summarization: Optional[SummarizationService],
+    ) -> None:
+        """Constructor
+
+        Args:
+            address (str): The path of the Unix socket to listen on.
+            search (Optional[SearchService]): The service whose model encodes sentences.
+            summarization (Optional[SummarizationService]): The service that summarizes
+                                                            functions.
+        """
+        self.address = address
+        self.search = search
+        self.summarization = summarization
+
+        self._listener: Optional[Listener] = None
+        self._stopped = threading.Event()
+
+    def serve_forever(self) -> None:
+        """Accept and serve connections until the server is closed.
+
+        Returns:
+            None
+
+        Raises:
+            InferenceServerRunningError: If another server is serving on the socket.
+        """
+        # Replace the socket of a previous server that wasn't closed, but not of one
+        # that is still serving
+        if os.path.exists(self.address):
+            if self._is_serving():
+                raise InferenceServerRunningError(self.address)
+            os.remove(self.address)
+
+        umask = os.umask(0o177)
+        try:
+            self._listener = Listener(self.address, family="AF_UNIX")
+        finally:
+            os.umask(umask)
+        log.info("Serving inference requests on %s", self.address)
+
+        while not self._stopped.is_set():
+            try:
+                connection = self._listener.accept()
+            except OSError:
+                if self._stopped.is_set():
+                    break
+                raise
+
+            if self._stopped.is_set():
+                connection.close()
+                break
+
+            threading.Thread(
+                target=self._serve, args=(connection,), daemon=True
+            ).start()
+
+    def _is_serving(self) -> bool:
+        """Check whether a server is accepting connections on the socket.
+
+        Returns:
+            bool
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.address)
+            except OSError:
+                return False
+        return True
+
+    def _serve(self, connection: Connection) -> None:
+        """Serve the requests of a connection until it is closed.
+
+        Args:
+            connection (Connection): The connection.
+
+        Returns:
+            None
+        """
+        with connection:
+            while not self._stopped.is_set():
+                try:
+                    method, payload = connection.recv()
+                except (EOFError, OSError):
+                    return
+
+                try:
+                    response = ("ok", self._dispatch(method, payload))
+                except Exception as e:
+                    log.error("Unable to serve inference request `%s` - %s", method, e)
+                    response = ("error", str(e))
+
+                try:
+                    connection.send(response)
+                except OSError:
+                    return
+
+    def _dispatch(self, method: str, payload: Any) -> Any:
+        """Run a request.
+
+        Args:
+            method (str): The method.
+            payload (Any): The arguments of the method.
+
+        Returns:
+            Any: The result.
+
+        Raises:
+            ValueError: If the method is unknown, or its model isn't enabled.
+        """
+        if method == "encode":
+            if not self.search or not self.search.active:
+                raise ValueError("Semantic search isn't enabled on the inference server")
+            return self.search.model.encode(payload)
+
+        if method == "summarize":
+            if not self.summarization or not self.summarization.active:
+                raise ValueError("Summarization isn't enabled on the inference server")
+            return self._summarize(payload)
+
+        if method == "warm_up":
+            return {
+                "search": self.search.warm_up() if self.search else 0.0,
+                "summarization": self.summarization.warm_up()
+                if self.summarization
+                else 0.0,
+            }
+
+        raise ValueError(f"Unknown inference method '{method}'")
+
+    def _summarize(self, source_codes: List[str]) -> List[Tuple[str, str]]:
+        """Summarize a batch of functions.
+
+        The outcome of each is returned, so that clients can count them per build.
+
+        Args:
+            source_codes (List[str]): The source code of each function.
+
+        Returns:
+            List[Tuple[str, str]]: The summarization of each function, and how the
+                summarization policy summarized it.
+        """
+        return [
+            self.summarization.summarize_code_with_outcome(code)
+            for code in source_codes
+        ]
+
+    def close(self) -> None:
+        """Stop accepting connections, and remove the socket.
+
+        Returns:
+            None
+        """
+        self._stopped.set()
+        if self._listener is None:
+            return
+
+        # Wake the accepting thread, which doesn't notice the listener being closed
+        try:
+            Client(self.address, family="AF_UNIX").close()
+        except OSError:
+            pass
+        self._listener.close()
+        self._listener = None
@@ -3,6 +3,7 @@ Data models for the Metadata entity.
 """
 # Base imports
 import datetime
+from typing import Dict, List, Optional
 
 # pip imports
 from pydantic import BaseModel, Field
@@ -18,3 +19,90 @@ class Graph(BaseModel):
     description: str
     created: datetime.datetime = Field(default_factor=datetime.datetime.now)
     status: str = "PENDING"
+
+
+class BuildPhase(BaseModel):
+    """
+    Resource usage of a single phase of a build.
+
+    Peak memory delta is the growth in the peak resident set size of the process over the
+    phase, in bytes.
+    """
+
+    name: str
+    input_index: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    nodes: int = 0
+    relationships: int = 0
+    peak_memory_delta: int = 0
+
+
+class Build(BaseModel):
+    """
+    Represents a single build of a Graph, and the resource usage of its phases.
+
+    Summarization maps each outcome of the summarization policy to the number of
+    functions the build summarized that way.
+    """
+
+    id: str
+    neo4j_name: str
+    started: datetime.datetime = Field(default_factory=datetime.datetime.now)
+    finished: Optional[datetime.datetime] = None
+    status: str = "RUNNING"
+    phases: List[BuildPhase] = []
+    summarization: Dict[str, int] = {}
+
+
+class BuildJob(BaseModel):
+    """
+    Represents a build waiting in, or taken from, the build queue.
+
+    The fingerprint identifies the submission, so that identical pending submissions
+    can be deduplicated.
+    """
+
+    id: str
+    name: str
+    description: str
+    inputs: List[str]
+    prune: bool = False
+    cleanup: List[str] = []
+    fingerprint: str
+    status: str = "QUEUED"
+    progress: float = 0.0
+    phase: Optional[str] = None
+    message: Optional[str] = None
+    cancel_requested: bool = False
+    worker: Optional[str] = None
+    created: datetime.datetime = Field(default_factory=datetime.datetime.now)
+    started: Optional[datetime.datetime] = None
+    finished: Optional[datetime.datetime] = None
+
+
+class BuildWorker(BaseModel):
+    """
+    Represents a process executing jobs from the build queue.
+
+    Workers periodically record a heartbeat, so that jobs held by workers that have died
+    can be returned to the queue.
+    """
+
+    id: str
+    host: str
+    pid: int
+    started: datetime.datetime = Field(default_factory=datetime.datetime.now)
+    heartbeat: datetime.datetime = Field(default_factory=datetime.datetime.now)
+
+
+class RepositoryFingerprint(BaseModel):
+    """
+    Records the content hash of a repository built into a graph, so that identical
+    repositories can be reused instead of rebuilt.
+    """
+
+    neo4j_name: str
+    name: str
+    fingerprint: str
+    created: datetime.datetime = Field(default_factory=datetime.datetime.now)
@@ -2,11 +2,20 @@
 Metadata repository.
 """
 # Base imports
+import datetime
+import json
 import sqlite3
-from typing import List
+from typing import List, Optional
 
 # Metadata entity imports
-from repograph.entities.metadata.models import Graph
+from repograph.entities.metadata.models import (
+    Build,
+    BuildJob,
+    BuildPhase,
+    BuildWorker,
+    Graph,
+    RepositoryFingerprint,
+)
 from repograph.entities.metadata.utils import datetime_to_string, string_to_datetime
 
 
@@ -33,6 +42,55 @@ class MetadataRepository:
             (neo4j_name TEXT, name TEXT, description TEXT, created TEXT, status TEXT, PRIMARY KEY(neo4j_name));
         """
         )
+        db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS builds
+            (id TEXT, neo4j_name TEXT, started TEXT, finished TEXT, status TEXT, PRIMARY KEY(id));
+        """
+        )
+        db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS build_phases
+            (build_id TEXT, position INTEGER, input_index INTEGER, name TEXT, wall_time REAL,
+             cpu_time REAL, nodes INTEGER, relationships INTEGER, peak_memory_delta INTEGER,
+             PRIMARY KEY(build_id, position));
+        """
+        )
+        db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS build_summarization
+            (build_id TEXT, outcome TEXT, functions INTEGER,
+             PRIMARY KEY(build_id, outcome));
+        """
+        )
+        db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS build_jobs
+            (id TEXT, name TEXT, description TEXT, inputs TEXT, prune INTEGER, cleanup TEXT,
+             fingerprint TEXT, status TEXT, progress REAL, phase TEXT, message TEXT,
+             cancel_requested INTEGER, worker TEXT, created TEXT, started TEXT, finished TEXT,
+             PRIMARY KEY(id));
+        """
+        )
+        db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS build_workers
+            (id TEXT, host TEXT, pid INTEGER, started TEXT, heartbeat TEXT, PRIMARY KEY(id));
+        """
+        )
+        db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS repository_fingerprints
+            (neo4j_name TEXT, name TEXT, fingerprint TEXT, created TEXT,
+             PRIMARY KEY(neo4j_name, name));
+        """
+        )
+        db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS graph_generations
+            (neo4j_name TEXT, generation INTEGER, PRIMARY KEY(neo4j_name));
+        """
+        )
 
     def get_transaction(self) -> sqlite3.Connection:
         db = sqlite3.connect(self.db_path)
@@ -109,3 +167,640 @@ class MetadataRepository:
             (graph.name, graph.description, graph.status, graph.neo4j_name),
         )
         db.commit()
+
+    def add_build(self, build: Build) -> None:
+        """Add a Build to the metadata database.
+
+        A build with the same ID, left by an earlier attempt at a requeued job, is
+        replaced, and its phases and summarization counts are removed.
+
+        Args:
+            build (Build): Build metadata.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute("DELETE FROM build_phases WHERE build_id = ?", (build.id,))
+        db.execute("DELETE FROM build_summarization WHERE build_id = ?", (build.id,))
+        db.execute(
+            "INSERT OR REPLACE INTO builds VALUES (?, ?, ?, ?, ?)",
+            (
+                build.id,
+                build.neo4j_name,
+                datetime_to_string(build.started),
+                datetime_to_string(build.finished) if build.finished else None,
+                build.status,
+            ),
+        )
+        db.commit()
+
+    def update_build(self, build: Build) -> None:
+        """Update the status of a build, and replace its recorded phases and
+        summarization counts.
+
+        Args:
+            build (Build): Updated Build object.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute(
+            "UPDATE builds SET finished = ?, status = ? WHERE id = ?",
+            (
+                datetime_to_string(build.finished) if build.finished else None,
+                build.status,
+                build.id,
+            ),
+        )
+        db.execute("DELETE FROM build_phases WHERE build_id = ?", (build.id,))
+        db.executemany(
+            "INSERT INTO build_phases VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    build.id,
+                    position,
+                    phase.input_index,
+                    phase.name,
+                    phase.wall_time,
+                    phase.cpu_time,
+                    phase.nodes,
+                    phase.relationships,
+                    phase.peak_memory_delta,
+                )
+                for position, phase in enumerate(build.phases)
+            ],
+        )
+        db.execute("DELETE FROM build_summarization WHERE build_id = ?", (build.id,))
+        db.executemany(
+            "INSERT INTO build_summarization VALUES (?, ?, ?)",
+            [
+                (build.id, outcome, functions)
+                for outcome, functions in build.summarization.items()
+            ],
+        )
+        db.commit()
+
+    def get_build(self, build_id: str) -> Optional[Build]:
+        """Get a build and its phases.
+
+        Args:
+            build_id (str): The ID of the build.
+
+        Returns:
+            Optional[Build]
+        """
+        db = sqlite3.connect(self.db_path)
+        row = db.execute("SELECT * FROM builds WHERE id = ?", (build_id,)).fetchone()
+        if not row:
+            return None
+
+        return self._row_to_build(db, row)
+
+    def list_builds(self, neo4j_name: str) -> List[Build]:
+        """List the builds of a graph, oldest first.
+
+        Args:
+            neo4j_name (str): Neo4j name of the graph.
+
+        Returns:
+            List[Build]
+        """
+        db = sqlite3.connect(self.db_path)
+        rows = db.execute(
+            "SELECT * FROM builds WHERE neo4j_name = ? ORDER BY started", (neo4j_name,)
+        )
+        return [self._row_to_build(db, row) for row in rows.fetchall()]
+
+    def delete_builds(self, neo4j_name: str) -> None:
+        """Delete the builds of a graph, their phases and their summarization counts.
+
+        Args:
+            neo4j_name (str): Neo4j name of the graph.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        for table in ("build_phases", "build_summarization"):
+            db.execute(
+                f"DELETE FROM {table} WHERE build_id IN "
+                "(SELECT id FROM builds WHERE neo4j_name = ?)",
+                (neo4j_name,),
+            )
+        db.execute("DELETE FROM builds WHERE neo4j_name = ?", (neo4j_name,))
+        db.commit()
+
+    def increment_graph_generation(self, neo4j_name: str) -> None:
+        """Increment the number of writes made to a graph outside of its builds.
+
+        Args:
+            neo4j_name (str): Neo4j name of the graph.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute(
+            "INSERT INTO graph_generations VALUES (?, 1) ON CONFLICT(neo4j_name) "
+            "DO UPDATE SET generation = generation + 1",
+            (neo4j_name,),
+        )
+        db.commit()
+
+    def delete_graph_generation(self, neo4j_name: str) -> None:
+        """Delete the write count of a graph.
+
+        Args:
+            neo4j_name (str): Neo4j name of the graph.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute("DELETE FROM graph_generations WHERE neo4j_name = ?", (neo4j_name,))
+        db.commit()
+
+    def get_graph_version(self, neo4j_name: str) -> Optional[str]:
+        """Get a token that changes whenever a graph is recreated, built or written to.
+
+        Args:
+            neo4j_name (str): Neo4j name of the graph.
+
+        Returns:
+            Optional[str]: The version, or None if the graph doesn't exist.
+        """
+        db = sqlite3.connect(self.db_path)
+        row = db.execute(
+            "SELECT g.created, g.status, b.id, b.status, b.finished, n.generation "
+            "FROM graphs g LEFT JOIN builds b ON b.neo4j_name = g.neo4j_name "
+            "LEFT JOIN graph_generations n ON n.neo4j_name = g.neo4j_name "
+            "WHERE g.neo4j_name = ? ORDER BY b.started DESC LIMIT 1",
+            (neo4j_name,),
+        ).fetchone()
+        if not row:
+            return None
+
+        return "|".join(str(column) for column in row)
+
+    @staticmethod
+    def _row_to_build(db: sqlite3.Connection, row: tuple) -> Build:
+        """Convert a row of the builds table into a Build, fetching its phases and
+        summarization counts.
+
+        Args:
+            db (sqlite3.Connection): The connection to fetch phases with.
+            row (tuple): The builds row.
+
+        Returns:
+            Build
+        """
+        phases = db.execute(
+            "SELECT input_index, name, wall_time, cpu_time, nodes, relationships, "
+            "peak_memory_delta FROM build_phases WHERE build_id = ? ORDER BY position",
+            (row[0],),
+        )
+        summarization = db.execute(
+            "SELECT outcome, functions FROM build_summarization WHERE build_id = ?",
+            (row[0],),
+        )
+        return Build(
+            id=row[0],
+            neo4j_name=row[1],
+            started=string_to_datetime(row[2]),
+            finished=string_to_datetime(row[3]) if row[3] else None,
+            status=row[4],
+            phases=[
+                BuildPhase(
+                    input_index=phase[0],
+                    name=phase[1],
+                    wall_time=phase[2],
+                    cpu_time=phase[3],
+                    nodes=phase[4],
+                    relationships=phase[5],
+                    peak_memory_delta=phase[6],
+                )
+                for phase in phases.fetchall()
+            ],
+            summarization=dict(summarization.fetchall()),
+        )
+
+    def add_job(self, job: BuildJob) -> None:
+        """Add a BuildJob to the queue.
+
+        Args:
+            job (BuildJob): The job.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute(
+            "INSERT INTO build_jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                job.id,
+                job.name,
+                job.description,
+                json.dumps(job.inputs),
+                job.prune,
+                json.dumps(job.cleanup),
+                job.fingerprint,
+                job.status,
+                job.progress,
+                job.phase,
+                job.message,
+                job.cancel_requested,
+                job.worker,
+                datetime_to_string(job.created),
+                datetime_to_string(job.started) if job.started else None,
+                datetime_to_string(job.finished) if job.finished else None,
+            ),
+        )
+        db.commit()
+
+    def get_job(self, job_id: str) -> Optional[BuildJob]:
+        """Get a job.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            Optional[BuildJob]
+        """
+        db = sqlite3.connect(self.db_path)
+        row = db.execute("SELECT * FROM build_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, status: Optional[str] = None) -> List[BuildJob]:
+        """List jobs, oldest first.
+
+        Args:
+            status (Optional[str]): Optional status to filter by.
+
+        Returns:
+            List[BuildJob]
+        """
+        db = sqlite3.connect(self.db_path)
+        if status:
+            rows = db.execute(
+                "SELECT * FROM build_jobs WHERE status = ? ORDER BY created", (status,)
+            )
+        else:
+            rows = db.execute("SELECT * FROM build_jobs ORDER BY created")
+        return [self._row_to_job(row) for row in rows.fetchall()]
+
+    def find_queued_job(self, fingerprint: str) -> Optional[BuildJob]:
+        """Find a queued job with a given fingerprint.
+
+        Args:
+            fingerprint (str): The fingerprint of the submission.
+
+        Returns:
+            Optional[BuildJob]
+        """
+        db = sqlite3.connect(self.db_path)
+        row = db.execute(
+            "SELECT * FROM build_jobs WHERE fingerprint = ? AND status = 'QUEUED' "
+            "ORDER BY created LIMIT 1",
+            (fingerprint,),
+        ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim_job(self, worker: str) -> Optional[BuildJob]:
+        """Atomically take the oldest queued job and mark it as running.
+
+        Args:
+            worker (str): The identifier of the claiming worker.
+
+        Returns:
+            Optional[BuildJob]: The claimed job, if any were queued.
+        """
+        db = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            # Take the write lock up front so that concurrent workers can't claim the same job
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                "SELECT id FROM build_jobs WHERE status = 'QUEUED' ORDER BY created LIMIT 1"
+            ).fetchone()
+            if not row:
+                db.execute("COMMIT")
+                return None
+
+            db.execute(
+                "UPDATE build_jobs SET status = 'RUNNING', worker = ?, started = ? "
+                "WHERE id = ?",
+                (worker, datetime_to_string(datetime.datetime.now()), row[0]),
+            )
+            db.execute("COMMIT")
+        except sqlite3.Error as e:
+            db.execute("ROLLBACK")
+            raise e
+
+        return self.get_job(row[0])
+
+    def update_job_progress(
+        self, job_id: str, progress: float, phase: Optional[str]
+    ) -> bool:
+        """Update the progress of a running job.
+
+        Args:
+            job_id (str): The ID of the job.
+            progress (float): The fraction of the job completed.
+            phase (Optional[str]): The current phase of the job.
+
+        Returns:
+            bool: Whether cancellation of the job has been requested.
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute(
+            "UPDATE build_jobs SET progress = ?, phase = ? WHERE id = ?",
+            (progress, phase, job_id),
+        )
+        db.commit()
+        row = db.execute(
+            "SELECT cancel_requested FROM build_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return bool(row and row[0])
+
+    def finish_job(self, job_id: str, status: str, message: Optional[str]) -> None:
+        """Record the final status of a job.
+
+        Args:
+            job_id (str): The ID of the job.
+            status (str): The final status.
+            message (Optional[str]): Optional message, e.g. the error that occurred.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute(
+            "UPDATE build_jobs SET status = ?, message = ?, finished = ?, "
+            "progress = CASE WHEN ? = 'SUCCEEDED' THEN 1.0 ELSE progress END "
+            "WHERE id = ?",
+            (
+                status,
+                message,
+                datetime_to_string(datetime.datetime.now()),
+                status,
+                job_id,
+            ),
+        )
+        db.commit()
+
+    def cancel_job(self, job_id: str) -> None:
+        """Cancel a job.
+
+        Queued jobs are cancelled immediately. Running jobs are flagged, and are cancelled
+        by their worker at the next phase boundary.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute(
+            "UPDATE build_jobs SET status = 'CANCELLED', finished = ? "
+            "WHERE id = ? AND status = 'QUEUED'",
+            (datetime_to_string(datetime.datetime.now()), job_id),
+        )
+        db.execute(
+            "UPDATE build_jobs SET cancel_requested = 1 "
+            "WHERE id = ? AND status = 'RUNNING'",
+            (job_id,),
+        )
+        db.commit()
+
+    def requeue_running_jobs(
+        self, stale_before: Optional[datetime.datetime] = None
+    ) -> int:
+        """Return jobs held by workers that have died to the queue.
+
+        Jobs whose cancellation had been requested are cancelled instead.
+
+        Args:
+            stale_before (Optional[datetime.datetime]): Workers without a heartbeat since
+                                                        this time are considered dead. If
+                                                        not given, all running jobs are
+                                                        requeued.
+
+        Returns:
+            int: The number of requeued jobs.
+        """
+        condition = "status = 'RUNNING'"
+        parameters = ()
+        if stale_before is not None:
+            condition += (
+                " AND (worker IS NULL OR worker NOT IN "
+                "(SELECT id FROM build_workers WHERE heartbeat >= ?))"
+            )
+            parameters = (datetime_to_string(stale_before),)
+
+        db = sqlite3.connect(self.db_path)
+        db.execute(
+            "UPDATE build_jobs SET status = 'CANCELLED', finished = ? "
+            f"WHERE {condition} AND cancel_requested = 1",
+            (datetime_to_string(datetime.datetime.now()),) + parameters,
+        )
+        cursor = db.execute(
+            "UPDATE build_jobs SET status = 'QUEUED', progress = 0, phase = NULL, "
+            f"worker = NULL, started = NULL WHERE {condition}",
+            parameters,
+        )
+        db.commit()
+        return cursor.rowcount
+
+    def add_worker(self, worker: BuildWorker) -> None:
+        """Register a build worker.
+
+        Args:
+            worker (BuildWorker): The worker.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute(
+            "INSERT OR REPLACE INTO build_workers VALUES (?, ?, ?, ?, ?)",
+            (
+                worker.id,
+                worker.host,
+                worker.pid,
+                datetime_to_string(worker.started),
+                datetime_to_string(worker.heartbeat),
+            ),
+        )
+        db.commit()
+
+    def update_worker_heartbeat(self, worker_id: str) -> None:
+        """Record that a build worker is alive.
+
+        Args:
+            worker_id (str): The ID of the worker.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute(
+            "UPDATE build_workers SET heartbeat = ? WHERE id = ?",
+            (datetime_to_string(datetime.datetime.now()), worker_id),
+        )
+        db.commit()
+
+    def delete_worker(self, worker_id: str) -> None:
+        """Deregister a build worker.
+
+        Args:
+            worker_id (str): The ID of the worker.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute("DELETE FROM build_workers WHERE id = ?", (worker_id,))
+        db.commit()
+
+    def list_workers(self) -> List[BuildWorker]:
+        """List the registered build workers.
+
+        Returns:
+            List[BuildWorker]
+        """
+        db = sqlite3.connect(self.db_path)
+        rows = db.execute("SELECT * FROM build_workers ORDER BY started")
+        return [
+            BuildWorker(
+                id=row[0],
+                host=row[1],
+                pid=row[2],
+                started=string_to_datetime(row[3]),
+                heartbeat=string_to_datetime(row[4]),
+            )
+            for row in rows.fetchall()
+        ]
+
+    def add_repository_fingerprint(self, fingerprint: RepositoryFingerprint) -> None:
+        """Record the content hash of a repository in a graph.
+
+        Args:
+            fingerprint (RepositoryFingerprint): The fingerprint.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute(
+            "INSERT OR REPLACE INTO repository_fingerprints VALUES (?, ?, ?, ?)",
+            (
+                fingerprint.neo4j_name,
+                fingerprint.name,
+                fingerprint.fingerprint,
+                datetime_to_string(fingerprint.created),
+            ),
+        )
+        db.commit()
+
+    def find_repository_fingerprints(
+        self, fingerprint: str
+    ) -> List[RepositoryFingerprint]:
+        """Find the repositories with a content hash, oldest first.
+
+        Only repositories in graphs that have been created are returned.
+
+        Args:
+            fingerprint (str): The content hash.
+
+        Returns:
+            List[RepositoryFingerprint]
+        """
+        db = sqlite3.connect(self.db_path)
+        rows = db.execute(
+            "SELECT f.* FROM repository_fingerprints f "
+            "JOIN graphs g ON g.neo4j_name = f.neo4j_name "
+            "WHERE f.fingerprint = ? AND g.status = 'CREATED' ORDER BY f.created",
+            (fingerprint,),
+        )
+        return [
+            RepositoryFingerprint(
+                neo4j_name=row[0],
+                name=row[1],
+                fingerprint=row[2],
+                created=string_to_datetime(row[3]),
+            )
+            for row in rows.fetchall()
+        ]
+
+    def get_repository_fingerprint(
+        self, neo4j_name: str, name: str
+    ) -> Optional[RepositoryFingerprint]:
+        """Get the content hash recorded for a repository in a graph.
+
+        Args:
+            neo4j_name (str): The name of the graph.
+            name (str): The name of the repository.
+
+        Returns:
+            Optional[RepositoryFingerprint]
+        """
+        db = sqlite3.connect(self.db_path)
+        row = db.execute(
+            "SELECT * FROM repository_fingerprints WHERE neo4j_name = ? AND name = ?",
+            (neo4j_name, name),
+        ).fetchone()
+        if row is None:
+            return None
+
+        return RepositoryFingerprint(
+            neo4j_name=row[0],
+            name=row[1],
+            fingerprint=row[2],
+            created=string_to_datetime(row[3]),
+        )
+
+    def delete_repository_fingerprints(self, neo4j_name: str) -> None:
+        """Delete the repository content hashes recorded for a graph.
+
+        Args:
+            neo4j_name (str): The name of the graph.
+
+        Returns:
+            None
+        """
+        db = sqlite3.connect(self.db_path)
+        db.execute(
+            "DELETE FROM repository_fingerprints WHERE neo4j_name = ?", (neo4j_name,)
+        )
+        db.commit()
+
+    @staticmethod
+    def _row_to_job(row: tuple) -> BuildJob:
+        """Convert a row of the build_jobs table into a BuildJob.
+
+        Args:
+            row (tuple): The build_jobs row.
+
+        Returns:
+            BuildJob
+        """
+        return BuildJob(
+            id=row[0],
+            name=row[1],
+            description=row[2],
+            inputs=json.loads(row[3]),
+            prune=bool(row[4]),
+            cleanup=json.loads(row[5]),
+            fingerprint=row[6],
+            status=row[7],
+            progress=row[8],
+            phase=row[9],
+            message=row[10],
+            cancel_requested=bool(row[11]),
+            worker=row[12],
+            created=string_to_datetime(row[13]),
+            started=string_to_datetime(row[14]) if row[14] else None,
+            finished=string_to_datetime(row[15]) if row[15] else None,
+        )
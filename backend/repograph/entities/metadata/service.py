@@ -4,10 +4,18 @@ Metadata entity application logic.
 import sqlite3
 
 # Base imports
-from typing import List
+import datetime
+from typing import Dict, List, Optional
 
 # Metadata entity imports
-from repograph.entities.metadata.models import Graph
+from repograph.entities.metadata.models import (
+    Build,
+    BuildJob,
+    BuildPhase,
+    BuildWorker,
+    Graph,
+    RepositoryFingerprint,
+)
 from repograph.entities.metadata.repository import MetadataRepository
 
 
@@ -47,6 +55,9 @@ class MetadataService:
             None
         """
         self.repository.delete_database(graph_name)
+        self.repository.delete_builds(graph_name)
+        self.repository.delete_repository_fingerprints(graph_name)
+        self.repository.delete_graph_generation(graph_name)
 
     def get_all_graph_listings(self) -> List[Graph]:
         """Get all graphs
@@ -67,3 +78,279 @@ class MetadataService:
         """
         updated_graph = graph.copy(update={"status": "CREATED"})
         self.repository.update_database(updated_graph)
+
+    def record_graph_write(self, graph_name: str) -> None:
+        """Record a write to a graph made outside of its builds, changing its version.
+
+        Args:
+            graph_name (str): Neo4j name of the graph.
+
+        Returns:
+            None
+        """
+        self.repository.increment_graph_generation(graph_name)
+
+    def get_graph_version(self, graph_name: str) -> Optional[str]:
+        """Get a token that changes whenever a graph is recreated, built or written to.
+
+        Args:
+            graph_name (str): Neo4j name of the graph.
+
+        Returns:
+            Optional[str]: The version, or None if the graph doesn't exist.
+        """
+        return self.repository.get_graph_version(graph_name)
+
+    def register_build(self, build: Build) -> None:
+        """Register a new build.
+
+        Args:
+            build (Build): Build metadata.
+
+        Returns:
+            None
+        """
+        self.repository.add_build(build)
+
+    def complete_build(
+        self,
+        build: Build,
+        status: str,
+        phases: List[BuildPhase],
+        summarization: Optional[Dict[str, int]] = None,
+    ) -> Build:
+        """Record the outcome of a build and the resource usage of its phases.
+
+        Args:
+            build (Build): Original Build object to update.
+            status (str): The final status of the build.
+            phases (List[BuildPhase]): The recorded phases.
+            summarization (Optional[Dict[str, int]]): The number of functions the build
+                summarized with each outcome of the summarization policy.
+
+        Returns:
+            Build: The updated Build.
+        """
+        updated_build = build.copy(
+            update={
+                "status": status,
+                "finished": datetime.datetime.now(),
+                "phases": phases,
+                "summarization": summarization or {},
+            }
+        )
+        self.repository.update_build(updated_build)
+        return updated_build
+
+    def get_build(self, build_id: str) -> Optional[Build]:
+        """Get a build.
+
+        Args:
+            build_id (str): The ID of the build.
+
+        Returns:
+            Optional[Build]
+        """
+        return self.repository.get_build(build_id)
+
+    def get_builds(self, graph_name: str) -> List[Build]:
+        """Get the builds of a graph.
+
+        Args:
+            graph_name (str): Neo4j name of the graph.
+
+        Returns:
+            List[Build]
+        """
+        return self.repository.list_builds(graph_name)
+
+    def add_job(self, job: BuildJob) -> None:
+        """Add a job to the build queue.
+
+        Args:
+            job (BuildJob): The job.
+
+        Returns:
+            None
+        """
+        self.repository.add_job(job)
+
+    def get_job(self, job_id: str) -> Optional[BuildJob]:
+        """Get a job.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            Optional[BuildJob]
+        """
+        return self.repository.get_job(job_id)
+
+    def get_jobs(self, status: Optional[str] = None) -> List[BuildJob]:
+        """Get all jobs, optionally filtered by status.
+
+        Args:
+            status (Optional[str]): Optional status to filter by.
+
+        Returns:
+            List[BuildJob]
+        """
+        return self.repository.list_jobs(status)
+
+    def find_queued_job(self, fingerprint: str) -> Optional[BuildJob]:
+        """Find a queued job with a given fingerprint.
+
+        Args:
+            fingerprint (str): The fingerprint of the submission.
+
+        Returns:
+            Optional[BuildJob]
+        """
+        return self.repository.find_queued_job(fingerprint)
+
+    def claim_job(self, worker: str) -> Optional[BuildJob]:
+        """Take the oldest queued job, marking it as running.
+
+        Args:
+            worker (str): The identifier of the claiming worker.
+
+        Returns:
+            Optional[BuildJob]
+        """
+        return self.repository.claim_job(worker)
+
+    def update_job_progress(
+        self, job_id: str, progress: float, phase: Optional[str] = None
+    ) -> bool:
+        """Update the progress of a running job.
+
+        Args:
+            job_id (str): The ID of the job.
+            progress (float): The fraction of the job completed.
+            phase (Optional[str]): The current phase of the job.
+
+        Returns:
+            bool: Whether cancellation of the job has been requested.
+        """
+        return self.repository.update_job_progress(job_id, progress, phase)
+
+    def finish_job(
+        self, job_id: str, status: str, message: Optional[str] = None
+    ) -> None:
+        """Record the final status of a job.
+
+        Args:
+            job_id (str): The ID of the job.
+            status (str): The final status.
+            message (Optional[str]): Optional message, e.g. the error that occurred.
+
+        Returns:
+            None
+        """
+        self.repository.finish_job(job_id, status, message)
+
+    def cancel_job(self, job_id: str) -> None:
+        """Cancel a queued job, or request cancellation of a running job.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            None
+        """
+        self.repository.cancel_job(job_id)
+
+    def requeue_interrupted_jobs(
+        self, stale_before: Optional[datetime.datetime] = None
+    ) -> int:
+        """Return jobs held by workers that have died to the queue.
+
+        Args:
+            stale_before (Optional[datetime.datetime]): Workers without a heartbeat since
+                                                        this time are considered dead. If
+                                                        not given, all running jobs are
+                                                        requeued.
+
+        Returns:
+            int: The number of requeued jobs.
+        """
+        return self.repository.requeue_running_jobs(stale_before)
+
+    def register_worker(self, worker: BuildWorker) -> None:
+        """Register a build worker.
+
+        Args:
+            worker (BuildWorker): The worker.
+
+        Returns:
+            None
+        """
+        self.repository.add_worker(worker)
+
+    def record_worker_heartbeat(self, worker_id: str) -> None:
+        """Record that a build worker is alive.
+
+        Args:
+            worker_id (str): The ID of the worker.
+
+        Returns:
+            None
+        """
+        self.repository.update_worker_heartbeat(worker_id)
+
+    def deregister_worker(self, worker_id: str) -> None:
+        """Deregister a build worker.
+
+        Args:
+            worker_id (str): The ID of the worker.
+
+        Returns:
+            None
+        """
+        self.repository.delete_worker(worker_id)
+
+    def get_workers(self) -> List[BuildWorker]:
+        """Get the registered build workers.
+
+        Returns:
+            List[BuildWorker]
+        """
+        return self.repository.list_workers()
+
+    def record_repository_fingerprint(self, fingerprint: RepositoryFingerprint) -> None:
+        """Record the content hash of a repository built into a graph.
+
+        Args:
+            fingerprint (RepositoryFingerprint): The fingerprint.
+
+        Returns:
+            None
+        """
+        self.repository.add_repository_fingerprint(fingerprint)
+
+    def get_repository_fingerprint(
+        self, graph_name: str, repository_name: str
+    ) -> Optional[RepositoryFingerprint]:
+        """Get the content hash recorded for a repository in a graph.
+
+        Args:
+            graph_name (str): The name of the graph.
+            repository_name (str): The name of the repository.
+
+        Returns:
+            Optional[RepositoryFingerprint]
+        """
+        return self.repository.get_repository_fingerprint(graph_name, repository_name)
+
+    def find_repositories_by_fingerprint(
+        self, fingerprint: str
+    ) -> List[RepositoryFingerprint]:
+        """Find repositories with a content hash in created graphs, oldest first.
+
+        Args:
+            fingerprint (str): The content hash.
+
+        Returns:
+            List[RepositoryFingerprint]
+        """
+        return self.repository.find_repository_fingerprints(fingerprint)
@@ -0,0 +1,137 @@
+"""
+Micro-batching of concurrent requests.
+
+Encoding a single query with the sentence embedding model costs nearly as much as
+encoding a small batch of them, so concurrent semantic searches are collected into
+micro-batches and encoded and scored together.
+"""
+# Base imports
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from logging import getLogger
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+
+# Configure logging
+log = getLogger("repograph.entities.search.batching")
+
+# The default maximum time to wait for more requests to join a batch, in seconds
+DEFAULT_MAX_WAIT = 0.005
+
+# The default maximum number of requests in a batch
+DEFAULT_MAX_BATCH = 32
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collects concurrent requests into batches, which are processed by a worker thread.
+
+    A batch is processed as soon as it is full, or max_wait seconds after its first
+    request arrived. A single request therefore waits at most max_wait longer than it
+    would on its own.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[List[T]], List[R]],
+        max_wait: float = DEFAULT_MAX_WAIT,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        name: str = "micro-batcher",
+    ) -> None:
+        """Constructor
+
+        Args:
+            process (Callable[[List[T]], List[R]]): Processes a batch of requests,
+                                                    returning a result for each.
+            max_wait (float): The maximum time to wait for a batch to fill, in seconds.
+            max_batch (int): The maximum number of requests in a batch.
+            name (str): The name of the worker thread.
+        """
+        self.process = process
+        self.max_wait = max(0.0, max_wait)
+        self.max_batch = max(1, max_batch)
+        self.name = name
+
+        self._requests: "queue.Queue[Tuple[T, Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, request: T) -> R:
+        """Add a request to the next batch, and wait for its result.
+
+        Args:
+            request (T): The request.
+
+        Returns:
+            R: The result.
+
+        Raises:
+            Exception: Any error raised processing the request's batch.
+        """
+        self._start()
+        future: Future = Future()
+        self._requests.put((request, future))
+        return future.result()
+
+    def _start(self) -> None:
+        """Start the worker thread, if it hasn't been started.
+
+        Returns:
+            None
+        """
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._work, name=self.name, daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self) -> List[Tuple[T, Future]]:
+        """Wait for a request, then collect a batch of requests.
+
+        Returns:
+            List[Tuple[T, Future]]: The batch.
+        """
+        batch = [self._requests.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        # Requests that are already waiting join the batch even after the deadline
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._requests.get(timeout=remaining))
+                else:
+                    batch.append(self._requests.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _work(self) -> None:
+        """Process batches of requests forever.
+
+        Returns:
+            None
+        """
+        while True:
+            batch = self._collect()
+            requests = [request for request, _ in batch]
+            log.debug("Processing a batch of %d requests", len(batch))
+
+            try:
+                results = self.process(requests)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -0,0 +1,145 @@
+"""
+Bounded least-recently-used caches for semantic search.
+
+Users repeat the same queries, and page through their results with further requests.
+Query embeddings are cached by the normalised query, and ranked results by the graph,
+its version and the query, so that repeated queries skip encoding and scoring, and
+paging is a slice of the cached ranking.
+"""
+# Base imports
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+# pip imports
+import numpy as np
+
+# Model imports
+from repograph.entities.search.models import CacheStats
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+def approximate_size(value: Any) -> int:
+    """Approximate the memory used by a value, without walking the values it contains.
+
+    Arrays, and objects that report their own size, are counted with their data, and
+    tuples with their immediate items. Other values are counted on their own, so caches
+    of collections should be given their own sizeof.
+
+    Args:
+        value (Any): The value.
+
+    Returns:
+        int: The approximate size in bytes.
+    """
+    if isinstance(value, np.ndarray):
+        return sys.getsizeof(value) + (0 if value.base is None else value.nbytes)
+    if isinstance(getattr(value, "nbytes", None), int):
+        # Objects that report their own size, such as indexes of arrays
+        return sys.getsizeof(value) + value.nbytes
+    if isinstance(value, tuple):
+        # Such as cache keys
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A thread-safe cache of at most max_entries values, which evicts the least recently
+    used value when full. A cache with max_entries of 0 stores nothing.
+    """
+
+    def __init__(
+        self, max_entries: int, sizeof: Callable[[Any], int] = approximate_size
+    ) -> None:
+        """Constructor
+
+        Args:
+            max_entries (int): The maximum number of values to store.
+            sizeof (Callable[[Any], int]): Approximates the memory used by a value. Keys
+                                           are sized with approximate_size.
+        """
+        self.max_entries = max(0, max_entries)
+        self.sizeof = sizeof
+
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        """Get a value, marking it as the most recently used.
+
+        Args:
+            key (K): The key.
+
+        Returns:
+            Optional[V]: The value, or None if it isn't cached.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used values if the cache is full.
+
+        Args:
+            key (K): The key.
+            value (V): The value.
+
+        Returns:
+            None
+        """
+        if self.max_entries == 0:
+            return
+
+        size = approximate_size(key) + self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes[key]
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+
+    def clear(self) -> None:
+        """Remove all values, keeping the hit and miss counts.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Get the size and hit rate of the cache.
+
+        Returns:
+            CacheStats
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return CacheStats(
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+                bytes=self._bytes,
+                hits=self._hits,
+                misses=self._misses,
+                hit_rate=self._hits / lookups if lookups else 0.0,
+            )
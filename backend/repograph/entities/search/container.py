@@ -20,7 +20,15 @@ class SearchContainer(DeclarativeContainer):
     graph: Dependency[GraphService] = Dependency()
 
     service: Singleton[SearchService] = Singleton(
-        SearchService, graph=graph, active=config.search
+        SearchService,
+        graph=graph,
+        active=config.search,
+        inference_socket=config.inference_socket,
+        batch_wait_ms=config.search_batch_wait_ms,
+        max_batch=config.search_max_batch,
+        query_cache_size=config.search_query_cache_size,
+        result_cache_size=config.search_result_cache_size,
+        index_cache_size=config.search_index_cache_size,
     )
 
     router: Singleton[SearchRouter] = Singleton(
@@ -0,0 +1,114 @@
+"""
+Partitioned index of function summarization embeddings.
+
+The summarizations of a graph's functions are encoded once per graph version and stored
+with the repository, type, canonical name and test status of their functions. Rows are
+sorted by repository, so a repository's partition is a contiguous slice of the
+embeddings, and the other filters are applied as masks before any scores are computed.
+"""
+# Base imports
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# pip imports
+import numpy as np
+
+# Model imports
+from repograph.entities.graph.models.nodes import Function
+from repograph.entities.search.models import SearchFilters
+
+# Utils imports
+from repograph.entities.search.utils import is_test_function
+
+
+class SummarizationIndex:
+    """
+    The summarization embeddings of a graph, and the partition of each.
+    """
+
+    functions: List[Function]
+    summarizations: List[str]
+    embeddings: np.ndarray
+
+    def __init__(
+        self,
+        summarizations_map: Dict[str, Function],
+        encode: Callable[[List[str]], Any],
+    ) -> None:
+        """Constructor
+
+        Args:
+            summarizations_map (Dict[str, Function]): The summarizations of the graph,
+                                                      and the functions they summarize.
+            encode (Callable[[List[str]], Any]): Encodes a batch of sentences.
+        """
+        rows = sorted(
+            summarizations_map.items(),
+            key=lambda item: (
+                item[1].repository_name or "",
+                item[1].canonical_name or "",
+            ),
+        )
+        self.summarizations = [summarization for summarization, _ in rows]
+        self.functions = [function for _, function in rows]
+
+        self.embeddings = np.zeros((0, 0))
+        if rows:
+            self.embeddings = np.atleast_2d(
+                encode([f"{function.canonical_name} k" for function in self.functions])
+            )
+
+        # The slice of rows of each repository
+        self._repositories: Dict[str, Tuple[int, int]] = {}
+        for row, function in enumerate(self.functions):
+            start, _ = self._repositories.get(function.repository_name, (row, row))
+            self._repositories[function.repository_name] = (start, row + 1)
+
+        self._types = np.array(
+            [function.type.value for function in self.functions], dtype=str
+        )
+        self._is_test = np.array(
+            [is_test_function(function.canonical_name) for function in self.functions],
+            dtype=bool,
+        )
+        # Terminated, so that prefixes only match whole module names
+        self._names = np.array(
+            [f"{function.canonical_name or ''}." for function in self.functions],
+            dtype=str,
+        )
+
+    def __len__(self) -> int:
+        return len(self.functions)
+
+    @property
+    def nbytes(self) -> int:
+        """The approximate memory used by the embeddings and partitions, in bytes."""
+        return (
+            self.embeddings.nbytes
+            + self._types.nbytes
+            + self._is_test.nbytes
+            + self._names.nbytes
+        )
+
+    def select(self, filters: Optional[SearchFilters]) -> np.ndarray:
+        """Find the rows in the partitions matching filters.
+
+        Args:
+            filters (Optional[SearchFilters]): The filters. If None, all rows match.
+
+        Returns:
+            np.ndarray: The indices of the matching rows, in order.
+        """
+        start, end = 0, len(self)
+        if filters and filters.repository is not None:
+            start, end = self._repositories.get(filters.repository, (0, 0))
+
+        mask = np.ones(end - start, dtype=bool)
+        if filters and filters.type is not None:
+            mask &= self._types[start:end] == filters.type.value
+        if filters and filters.is_test is not None:
+            mask &= self._is_test[start:end] == filters.is_test
+        if filters and filters.module:
+            prefix = f"{filters.module.strip('.')}."
+            mask &= np.char.startswith(self._names[start:end], prefix)
+
+        return start + np.flatnonzero(mask)
@@ -2,7 +2,7 @@
 Search entity-related models.
 """
 # Base imports
-from typing import Callable, List
+from typing import Callable, List, Optional
 
 # pip imports
 from pydantic import BaseModel, Field, validator
@@ -12,6 +12,27 @@ from repograph.entities.graph.models.nodes import Function
 from repograph.utils import JSONDict
 
 
+class SearchFilters(BaseModel):
+    """Filters that restrict semantic search to a partition of a graph's functions.
+
+    Args:
+        repository (Optional[str]): The repository the functions are in.
+        type (Optional[Function.FunctionType]): Whether to search functions or methods.
+        module (Optional[str]): The module path the functions' canonical names start
+                                with, e.g. "package.module".
+        is_test (Optional[bool]): Whether to search only test functions, or only other
+                                  functions.
+    """
+
+    repository: Optional[str] = None
+    type: Optional[Function.FunctionType] = None
+    module: Optional[str] = None
+    is_test: Optional[bool] = None
+
+    class Config:
+        frozen = True
+
+
 class SemanticSearchResult(BaseModel):
     """Result for semantic search query.
 
@@ -38,6 +59,40 @@ class SemanticSearchResultSet(BaseModel):
     total: int
 
 
+class CacheStats(BaseModel):
+    """Size and hit rate of a cache.
+
+    Args:
+        entries (int): The number of cached values.
+        max_entries (int): The maximum number of cached values.
+        bytes (int): The approximate memory used by the cached values.
+        hits (int): The number of lookups that found a value.
+        misses (int): The number of lookups that didn't.
+        hit_rate (float): The fraction of lookups that found a value.
+    """
+
+    entries: int
+    max_entries: int
+    bytes: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class SearchCacheStats(BaseModel):
+    """Statistics of the semantic search caches.
+
+    Args:
+        queries (CacheStats): The query embedding cache.
+        results (CacheStats): The ranked result cache.
+        indexes (CacheStats): The summarization embedding index cache.
+    """
+
+    queries: CacheStats
+    results: CacheStats
+    indexes: CacheStats
+
+
 class AvailableSearchQuery(BaseModel):
     id: int
     name: str
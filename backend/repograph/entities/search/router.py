@@ -10,6 +10,7 @@ from typing import List
 from fastapi import APIRouter
 
 from repograph.entities.graph.models.graph import IssuesResult
+from repograph.entities.graph.models.nodes import Function
 
 # Build entity imports
 from repograph.entities.search.service import SearchService
@@ -17,6 +18,8 @@ from repograph.entities.search.service import SearchService
 # Model imports
 from repograph.entities.search.models import (
     AvailableSearchQuery,
+    SearchCacheStats,
+    SearchFilters,
     SemanticSearchResultSet,
 )
 from repograph.utils.exception_handlers import RepographException
@@ -62,16 +65,42 @@ class SearchRouter:
             methods=["GET"],
         )
 
+        self.cacheRouter = APIRouter(tags=["Search"], prefix="/search")
+        self.cacheRouter.add_api_route(
+            "/cache",
+            self.cache_stats,
+            methods=["GET"],
+            response_model=SearchCacheStats,
+        )
+
     def semantic_search(
-        self, graph: str, query: str = None, offset: int = 0, limit: int = 0
+        self,
+        graph: str,
+        query: str = None,
+        offset: int = 0,
+        limit: int = 0,
+        repository: str = None,
+        type: Function.FunctionType = None,
+        module: str = None,
+        is_test: bool = None,
     ) -> SemanticSearchResultSet:
-        """Semantic search endpoint."""
+        """Semantic search endpoint, optionally restricted to a repository, to functions
+        or methods, to a module path, or to or excluding tests."""
+        filters = SearchFilters(
+            repository=repository, type=type, module=module, is_test=is_test
+        )
         results = self.service.find_similar_functions_by_query(
-            graph, query, offset, limit
+            graph, query, offset, limit, filters=filters
         )
         return results
 
-    async def incorrect_docstrings(self, graph: str):
+    async def cache_stats(self) -> SearchCacheStats:
+        """Semantic search cache statistics endpoint."""
+        return self.service.cache_stats()
+
+    def incorrect_docstrings(self, graph: str):
+        """Possibly incorrect docstrings endpoint. A plain def, so that scoring unscored
+        docstrings runs in the threadpool rather than blocking the event loop."""
         incorrect = self.service.find_incorrect_docstrings(graph)
         return IssuesResult(
             columns=[
@@ -7,20 +7,25 @@ Typical usage:
     docstring_node = FunctionSummarizer.create_docstring_node(function_node)
 """
 # Base imports
+import sys
+import time
 from logging import getLogger
-from typing import Optional, Tuple, List
+from typing import Any, Optional, Tuple, List
 
 # pip imports
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
 
 from repograph.entities.graph.models.graph import (
     PossibleIncorrectDocstring,
     MissingDocstring,
 )
+from repograph.entities.graph.models.nodes import Function
 
 # Model imports
 from repograph.entities.search.models import (
     AvailableSearchQuery,
+    SearchCacheStats,
+    SearchFilters,
     SemanticSearchResult,
     SemanticSearchResultSet,
     SearchQueryResult,
@@ -29,28 +34,180 @@ from repograph.entities.search.models import (
 # Graph entity imports
 from repograph.entities.graph.service import GraphService
 
+# Inference entity imports
+from repograph.entities.inference.client import InferenceClient
+
+# Search entity imports
+from repograph.entities.search.batching import (
+    DEFAULT_MAX_BATCH,
+    DEFAULT_MAX_WAIT,
+    MicroBatcher,
+)
+from repograph.entities.search.cache import LRUCache
+from repograph.entities.search.index import SummarizationIndex
+
 # Utils imports
-from repograph.entities.search.utils import remove_stop_words
+from repograph.entities.search.utils import normalise_query, remove_stop_words
+from repograph.utils.lazy import Lazy
 
 # Setup logging
 log = getLogger("repograph.entities.search.service")
 
+# The sentence embedding model used for semantic search
+EMBEDDING_MODEL_NAME = "sentence-transformers/multi-qa-distilbert-cos-v1"
+
+# The default number of query embeddings, ranked results and graph indexes to cache
+DEFAULT_QUERY_CACHE_SIZE = 1024
+DEFAULT_RESULT_CACHE_SIZE = 256
+DEFAULT_INDEX_CACHE_SIZE = 4
+
+# Docstrings less similar than this to the summarization of what they document are
+# possibly incorrect
+INCORRECT_DOCSTRING_THRESHOLD = 0.25
+
+# The function, summarization and score of each summarization, best first
+Ranking = List[Tuple[Function, str, float]]
+
+# The approximate memory used by a row of a cached ranking, in bytes, measured for a
+# typical function and summarization
+RANKING_ROW_SIZE = 2048
+
+# The graph name, graph version, normalised query and filters of a semantic search
+SemanticQuery = Tuple[str, Optional[str], str, Optional[SearchFilters]]
+
+
+def _ranking_size(ranking: Ranking) -> int:
+    """Approximate the memory used by a ranking from its number of rows, without
+    walking the functions it holds.
+
+    Args:
+        ranking (Ranking): The ranking.
+
+    Returns:
+        int: The approximate size in bytes.
+    """
+    return sys.getsizeof(ranking) + len(ranking) * RANKING_ROW_SIZE
+
+
+def _load_embedding_model() -> Any:
+    """Load the sentence embedding model.
+
+    sentence_transformers, which imports torch, is only imported here.
+
+    Returns:
+        Any: The SentenceTransformer model.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    log.info("Initialising model...")
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    log.info("Ready!")
+    return model
+
+
+def _dot_score(a: Any, b: Any) -> np.ndarray:
+    """Compute the dot product of each pair of embeddings.
+
+    Args:
+        a (Any): The first embedding, or batch of embeddings.
+        b (Any): The second embedding, or batch of embeddings.
+
+    Returns:
+        np.ndarray: The scores, with a row for each of the first embeddings.
+    """
+    return np.atleast_2d(a) @ np.atleast_2d(b).T
+
 
 class SearchService:
     graph: GraphService
-    model: Optional[SentenceTransformer] = None
+    active: bool
 
-    def __init__(self, graph: GraphService, active: bool = True):
+    def __init__(
+        self,
+        graph: GraphService,
+        active: bool = True,
+        inference_socket: Optional[str] = None,
+        batch_wait_ms: Optional[float] = None,
+        max_batch: Optional[int] = None,
+        query_cache_size: Optional[int] = None,
+        result_cache_size: Optional[int] = None,
+        index_cache_size: Optional[int] = None,
+    ):
         """Constructor
 
+        The embedding model is loaded on first use, or by warm_up.
+
         Args:
+            graph (GraphService): The graph service.
+            active (bool): Whether semantic search is enabled.
+            inference_socket (Optional[str]): The Unix socket of a shared inference
+                                              server to encode with, rather than loading
+                                              the model in this process.
+            batch_wait_ms (Optional[float]): The maximum time to wait for concurrent
+                                             semantic queries to batch with, in
+                                             milliseconds. Defaults to 5.
+            max_batch (Optional[int]): The maximum number of semantic queries encoded
+                                       together. Defaults to 32.
+            query_cache_size (Optional[int]): The number of query embeddings to cache.
+                                              Defaults to 1024. 0 disables the cache.
+            result_cache_size (Optional[int]): The number of ranked semantic search
+                                               results to cache. Defaults to 256. 0
+                                               disables the cache.
+            index_cache_size (Optional[int]): The number of graph versions to cache the
+                                              summarization embeddings of. Defaults to
+                                              4. 0 disables the cache.
         """
         self.graph = graph
-        log.info("Initialising model...")
-        if active:
-            self.model = SentenceTransformer(
-                "sentence-transformers/multi-qa-distilbert-cos-v1"
-            )
+        self.active = active
+        self._model: Lazy[Any] = Lazy(
+            (lambda: InferenceClient(inference_socket))
+            if inference_socket
+            else _load_embedding_model
+        )
+
+        # Concurrent semantic queries are encoded and scored together
+        max_wait = DEFAULT_MAX_WAIT if batch_wait_ms is None else batch_wait_ms / 1000
+        self._queries: MicroBatcher[SemanticQuery, Ranking] = MicroBatcher(
+            self._score_queries,
+            max_wait=max_wait,
+            max_batch=max_batch if max_batch else DEFAULT_MAX_BATCH,
+            name="semantic-search",
+        )
+
+        # Repeated queries, and further pages of their results, are served from caches
+        if query_cache_size is None:
+            query_cache_size = DEFAULT_QUERY_CACHE_SIZE
+        if result_cache_size is None:
+            result_cache_size = DEFAULT_RESULT_CACHE_SIZE
+        if index_cache_size is None:
+            index_cache_size = DEFAULT_INDEX_CACHE_SIZE
+        self._embeddings: LRUCache[str, np.ndarray] = LRUCache(query_cache_size)
+        self._results: LRUCache[SemanticQuery, Ranking] = LRUCache(
+            result_cache_size, sizeof=_ranking_size
+        )
+        self._indexes: LRUCache[Tuple[str, str], SummarizationIndex] = LRUCache(
+            index_cache_size
+        )
+
+    @property
+    def model(self) -> Optional[Any]:
+        """The SentenceTransformer model, loaded on first use, or the InferenceClient
+        of the shared inference server. None if inactive."""
+        return self._model.get() if self.active else None
+
+    def warm_up(self) -> float:
+        """Load the embedding model and run it once, so that the first query is fast.
+
+        Returns:
+            float: The time taken, in seconds. 0 if semantic search isn't enabled or the
+                   model was already loaded.
+        """
+        if not self.active or self._model.loaded:
+            return 0.0
+
+        start = time.perf_counter()
+        self.model.encode("warm up")
+        return time.perf_counter() - start
 
     def find_similar_functions_by_query(
         self,
@@ -58,6 +215,7 @@ class SearchService:
         query: str,
         offset: int,
         limit: int,
+        filters: Optional[SearchFilters] = None,
     ) -> SemanticSearchResultSet:
         """Finds similar functions using semantic search of function summarizations.
 
@@ -66,38 +224,144 @@ class SearchService:
             query (str): The semantic query.
             offset (int): Where to start when slicing the total set of results. For pagination.
             limit (int): The maximum number of results to return in the result set. For pagination.
+            filters (Optional[SearchFilters]): Restricts the search to the functions of
+                                               matching partitions, which are the only
+                                               ones scored.
 
         Return:
             SemanticSearchResultSet
         """
-        query = remove_stop_words(query)
-        query_embedding = self.model.encode(query)
-        summarizations_map = self.graph.get_function_summarizations(graph)
-        summarizations_extended = list(
-            [f"{v.canonical_name} k" for k, v in summarizations_map.items()]
+        query = remove_stop_words(normalise_query(query))
+        if filters == SearchFilters():
+            filters = None
+
+        # The version is read first, so a ranking computed while the graph is rebuilt is
+        # cached under the old version, and never returned for the new one
+        version = self.graph.get_graph_version(graph)
+        key = (graph, version, query, filters)
+        ranking = self._results.get(key) if version else None
+        if ranking is None:
+            ranking = self._queries.submit(key)
+            if version:
+                self._results.put(key, ranking)
+
+        # Cached functions are copied, as their source code is added to the results
+        results = [
+            SemanticSearchResult(
+                function=function.copy(), summarization=summarization, score=score
+            )
+            for function, summarization, score in ranking[offset : offset + limit]
+        ]
+
+        # Source code may be in the blob store, so it is only read for returned results
+        for result in results:
+            result.function.source_code = self.graph.get_source_code(result.function)
+
+        return SemanticSearchResultSet(
+            total=len(ranking), limit=limit, offset=offset, results=results
         )
-        summarizations = summarizations_map.keys()
 
-        summarization_embeddings = self.model.encode(summarizations_extended)
+    def cache_stats(self) -> SearchCacheStats:
+        """Get the size and hit rate of the query embedding, result and index caches.
 
-        scores = (
-            util.dot_score(query_embedding, summarization_embeddings)[0].cpu().tolist()
+        Returns:
+            SearchCacheStats
+        """
+        return SearchCacheStats(
+            queries=self._embeddings.stats(),
+            results=self._results.stats(),
+            indexes=self._indexes.stats(),
         )
-        score_pairs = list(zip(summarizations, scores))
-        score_pairs = sorted(score_pairs, key=lambda x: x[1], reverse=True)
 
-        results = list(
-            map(
-                lambda x: SemanticSearchResult(
-                    function=summarizations_map[x[0]], summarization=x[0], score=x[1]
-                ),
-                score_pairs,
+    def _encode_queries(self, queries: List[str]) -> np.ndarray:
+        """Encode queries, using the cached embeddings of repeated queries.
+
+        Args:
+            queries (List[str]): The normalised queries.
+
+        Returns:
+            np.ndarray: The embedding of each query.
+        """
+        embeddings = {query: self._embeddings.get(query) for query in set(queries)}
+
+        missing = [query for query in embeddings if embeddings[query] is None]
+        if missing:
+            encoded = np.atleast_2d(self.model.encode(missing))
+            for query, embedding in zip(missing, encoded):
+                # Copied, so that the cache doesn't keep the whole batch alive
+                embeddings[query] = np.array(embedding)
+                self._embeddings.put(query, embeddings[query])
+
+        return np.stack([embeddings[query] for query in queries])
+
+    def _get_index(self, graph: str, version: Optional[str]) -> SummarizationIndex:
+        """Get the summarization embedding index of a graph, encoding it if it isn't
+        cached for the graph's version.
+
+        Args:
+            graph (str): The graph name.
+            version (Optional[str]): The graph version. If None, the index isn't cached.
+
+        Returns:
+            SummarizationIndex
+        """
+        index = self._indexes.get((graph, version)) if version else None
+        if index is None:
+            index = SummarizationIndex(
+                self.graph.get_function_summarizations(graph), self.model.encode
             )
-        )[offset : offset + limit]
+            if version:
+                self._indexes.put((graph, version), index)
+        return index
 
-        return SemanticSearchResultSet(
-            total=len(score_pairs), limit=limit, offset=offset, results=results
-        )
+    def _score_queries(self, queries: List[SemanticQuery]) -> List[Ranking]:
+        """Score the function summarizations of a graph against a batch of queries.
+
+        The queries are encoded together, and the rows of each graph's index that match
+        the same filters are scored against all of their queries at once.
+
+        Args:
+            queries (List[SemanticQuery]): The graph name, graph version, query and
+                                           filters of each search.
+
+        Returns:
+            List[Ranking]: For each query, the function, summarization and score of each
+                           matching summarization, in descending order of score.
+        """
+        query_embeddings = self._encode_queries([query[2] for query in queries])
+
+        results = [None] * len(queries)
+        for graph, version in dict.fromkeys(query[:2] for query in queries):
+            index = self._get_index(graph, version)
+            partitions = dict.fromkeys(
+                query[3] for query in queries if query[:2] == (graph, version)
+            )
+            for filters in partitions:
+                indices = [
+                    i
+                    for i, query in enumerate(queries)
+                    if query[:2] == (graph, version) and query[3] == filters
+                ]
+                rows = index.select(filters)
+
+                scores = np.zeros((len(indices), 0))
+                if len(rows):
+                    scores = _dot_score(
+                        query_embeddings[indices], index.embeddings[rows]
+                    )
+
+                for row, i in enumerate(indices):
+                    order = np.argsort(-scores[row], kind="stable")
+                    results[i] = [
+                        (
+                            index.functions[rows[j]],
+                            index.summarizations[rows[j]],
+                            float(scores[row, j]),
+                        )
+                        for j in order
+                    ]
+
+        return results
 
     def find_missing_docstrings(self, graph: str) -> List[MissingDocstring]:
         """Find nodes missing docstrings
@@ -124,44 +388,69 @@ class SearchService:
             )
         )
 
-    def find_incorrect_docstrings(self, graph: str) -> List[PossibleIncorrectDocstring]:
-        """Find possibly incorrect docstrings.
+    def score_docstrings(self, graph: str) -> int:
+        """Compare docstrings to the summarizations of what they document, and store the
+        similarity on their Docstring nodes.
 
-        Cosine similarity between docstring and generated summarization is less than 0.5
+        Only docstrings that haven't been scored are compared. Builds score the
+        docstrings of the repositories they build, so this is usually a no-op.
 
         Args:
             graph (str): The graph name.
 
         Returns:
-            List[PossibleIncorrectDocstring]: The possibly incorrect docstrings
+            int: The number of docstrings scored.
         """
-        docstrings = self.graph.repository.execute_query(
-            "MATCH (n:Docstring)-[:Documents]->(m) WHERE COALESCE(n.short_description, n.long_description) "
-            "IS NOT NULL AND n.summarization IS NOT NULL RETURN n.summarization as `summarization`, "
-            "COALESCE(n.short_description, n.long_description) as `docstring`,  "
-            "m.canonical_name as `name`, labels(m) as `type`, m.repository_name as `repository`",
-            graph_name=graph,
+        if not self.active:
+            return 0
+
+        docstrings = self.graph.get_unscored_docstrings(graph)
+        if not docstrings:
+            return 0
+
+        summarizations = np.atleast_2d(
+            self.model.encode([row["summarization"] for row in docstrings])
+        )
+        descriptions = np.atleast_2d(
+            self.model.encode([row["docstring"] for row in docstrings])
         )
+        scores = np.einsum("ij,ij->i", summarizations, descriptions)
 
-        low_scores = []
-        for docstring in list(docstrings):
-            embedding_1 = self.model.encode(docstring["summarization"])
-            embedding_2 = self.model.encode([docstring["docstring"], ""])
-            score = util.dot_score(embedding_1, embedding_2)[0].cpu().tolist()[0]
-
-            if score < 0.25:
-                low_scores.append(
-                    PossibleIncorrectDocstring(
-                        Name=docstring["name"],
-                        Type=docstring["type"][0],
-                        Summarization=docstring["summarization"],
-                        Docstring=docstring["docstring"],
-                        Similarity=round(score, 3),
-                        Repository=docstring["repository"],
-                    )
-                )
+        self.graph.set_docstring_similarities(
+            graph,
+            {row["id"]: float(score) for row, score in zip(docstrings, scores)},
+        )
+        log.info("Scored %d docstrings in graph '%s'", len(docstrings), graph)
+        return len(docstrings)
+
+    def find_incorrect_docstrings(self, graph: str) -> List[PossibleIncorrectDocstring]:
+        """Find possibly incorrect docstrings.
+
+        The similarity between the docstring and generated summarization is less than
+        INCORRECT_DOCSTRING_THRESHOLD. Docstrings that haven't been scored yet are
+        scored first.
+
+        Args:
+            graph (str): The graph name.
 
-        return low_scores
+        Returns:
+            List[PossibleIncorrectDocstring]: The possibly incorrect docstrings
+        """
+        self.score_docstrings(graph)
+
+        return [
+            PossibleIncorrectDocstring(
+                Name=docstring["name"],
+                Type=docstring["type"][0],
+                Summarization=docstring["summarization"],
+                Docstring=docstring["docstring"],
+                Similarity=round(docstring["similarity"], 3),
+                Repository=docstring["repository"],
+            )
+            for docstring in self.graph.get_dissimilar_docstrings(
+                graph, INCORRECT_DOCSTRING_THRESHOLD
+            )
+        ]
 
     def get_available_search_queries(self) -> List[AvailableSearchQuery]:
         available = [
@@ -2,28 +2,67 @@
 Code search utilities.
 """
 # Base imports
-import re
+from typing import FrozenSet, Optional
 
-# pip imports
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+# Summarization entity imports
+from repograph.entities.summarization.utils import clean_source_code  # noqa: F401
 
-# nltk initialisation
-nltk.download("stopwords", quiet=True)
-nltk.download("punkt_tab", quiet=True)
+# Utils imports
+from repograph.utils.lazy import Lazy
 
 
-def clean_source_code(source_code: str) -> str:
-    """Remove docstrings from source_code
+def _load_stop_words() -> FrozenSet[str]:
+    """Download the nltk data needed to remove stop words, if it isn't downloaded.
+
+    Returns:
+        FrozenSet[str]: The English stop words.
+    """
+    import nltk
+    from nltk.corpus import stopwords
+
+    nltk.download("stopwords", quiet=True)
+    nltk.download("punkt_tab", quiet=True)
+    return frozenset(stopwords.words("english"))
+
+
+# nltk is imported, and its data downloaded, on first use
+STOP_WORDS: Lazy[FrozenSet[str]] = Lazy(_load_stop_words)
+
+
+def is_test_function(canonical_name: Optional[str]) -> bool:
+    """Check whether a function is a test, from its canonical name.
+
+    Functions in test_*.py, *_test.py or tests.py modules, or in test or tests packages,
+    are tests, as are functions named test*.
 
     Args:
-        source_code (str): The source code to clean.
+        canonical_name (Optional[str]): The canonical name of the function.
 
     Returns:
-        str: Cleaned source_code
+        bool
     """
-    return re.sub('(?s)""".*"""\n', "", source_code)
+    if not canonical_name:
+        return False
+
+    *path, name = canonical_name.split(".")
+    return name.startswith("test") or any(
+        part in ("test", "tests") or part.startswith("test_") or part.endswith("_test")
+        for part in path
+    )
+
+
+def normalise_query(query: str) -> str:
+    """Normalise the case and whitespace of a query, so that equivalent queries can
+    share cached results. The embedding model is uncased, so case doesn't change a
+    query's embedding.
+
+    Args:
+        query (str): The query.
+
+    Returns:
+        str: The normalised query.
+    """
+    return " ".join(query.casefold().split())
 
 
 def remove_stop_words(sentence: str) -> str:
@@ -35,10 +74,11 @@ def remove_stop_words(sentence: str) -> str:
     Returns:
         str: Cleaned sentence
     """
+    stop_words = STOP_WORDS.get()
+    from nltk.tokenize import word_tokenize
+
     tokens = word_tokenize(sentence)
     filtered_words = [
-        word
-        for word in tokens
-        if (word.isalpha() and word not in set(stopwords.words("english")))
+        word for word in tokens if (word.isalpha() and word not in stop_words)
     ]
     return " ".join(filtered_words)
@@ -0,0 +1,239 @@
+"""
+Inference backends for the summarization model.
+
+Build hosts summarize on CPU, where full-precision PyTorch generation is slow. As well
+as the baseline PyTorch model, the model can be loaded with its linear layers dynamically
+quantized to int8, exported to ONNX Runtime, or both. Every backend returns a model with
+a Hugging Face compatible generate method.
+
+The ONNX backends require the optimum and onnxruntime packages. The export is saved, so
+it is only done the first time a model is loaded.
+
+The PyTorch backends can also load the model's weights from a memory-mapped file, so that
+processes running replicas of the model share a single copy of the weights in memory.
+"""
+# Base imports
+import glob
+import os
+from logging import getLogger
+from typing import Any, List, Optional
+
+# Summarization entity imports
+from repograph.entities.summarization.models import GenerationSettings
+
+# Configure logging
+log = getLogger("repograph.entities.summarization.backends")
+
+# Backends the summarization model can be loaded with
+INFERENCE_BACKENDS = ["pytorch", "quantized", "onnx", "onnx-quantized"]
+
+# The default directory ONNX exports and memory-mappable weights are saved in
+DEFAULT_EXPORT_DIR = os.path.join("~", ".cache", "repograph", "models")
+
+
+def load_model(
+    backend: str,
+    model_name: str,
+    export_dir: Optional[str] = None,
+    weights: Optional[str] = None,
+) -> Any:
+    """Load a sequence-to-sequence model with an inference backend.
+
+    Args:
+        backend (str): One of INFERENCE_BACKENDS.
+        model_name (str): The name of the model on the Hugging Face Hub.
+        export_dir (Optional[str]): The directory to save ONNX exports in.
+        weights (Optional[str]): Optional file saved by save_weights to memory-map the
+                                 weights of the PyTorch backends from.
+
+    Returns:
+        Any: The model.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}'")
+
+    if backend in ["pytorch", "quantized"]:
+        if weights:
+            model = _load_pytorch_mapped(model_name, weights)
+        else:
+            model = _load_pytorch(model_name)
+        return _quantize(model) if backend == "quantized" else model
+
+    return _load_onnx(
+        model_name, _export_path(export_dir), quantize=backend == "onnx-quantized"
+    )
+
+
+def generate_summaries(
+    model: Any, tokenizer: Any, chunks: List[List[int]], generation: GenerationSettings
+) -> List[str]:
+    """Generate a summarization of each chunk of source code, as a single batch.
+
+    Args:
+        model (Any): The model.
+        tokenizer (Any): The tokenizer.
+        chunks (List[List[int]]): The input IDs of each chunk.
+        generation (GenerationSettings): The generation controls.
+
+    Returns:
+        List[str]: The summarization of each chunk.
+    """
+    inputs = tokenizer.pad({"input_ids": chunks}, return_tensors="pt")
+    generated_ids = model.generate(
+        inputs.input_ids, attention_mask=inputs.attention_mask, **generation.kwargs()
+    )
+    return tokenizer.batch_decode(generated_ids, skip_special_tokens=True)
+
+
+def _export_path(export_dir: Optional[str]) -> str:
+    """Get the directory exports are saved in.
+
+    Args:
+        export_dir (Optional[str]): The configured directory, if any.
+
+    Returns:
+        str
+    """
+    return os.path.expanduser(export_dir if export_dir else DEFAULT_EXPORT_DIR)
+
+
+def save_weights(model_name: str, export_dir: Optional[str] = None) -> str:
+    """Save the weights of a PyTorch model to a file that can be memory-mapped.
+
+    The file is only written if it doesn't exist.
+
+    Args:
+        model_name (str): The name of the model.
+        export_dir (Optional[str]): The directory to save exports in.
+
+    Returns:
+        str: The path of the file.
+    """
+    import torch
+
+    path = os.path.join(
+        _export_path(export_dir), model_name.replace("/", "--"), "weights.pt"
+    )
+    if not os.path.exists(path):
+        log.info("Saving model weights to %s...", path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        torch.save(_load_pytorch(model_name).state_dict(), temp_path)
+        os.replace(temp_path, path)
+
+    return path
+
+
+def _load_pytorch_mapped(model_name: str, weights: str) -> Any:
+    """Load a full-precision PyTorch model with memory-mapped weights.
+
+    The model is created without allocating any weights, and its parameters are then
+    assigned the tensors mapped from the file. Processes mapping the same file share the
+    operating system's page cache, rather than holding their own copy of the weights.
+
+    Args:
+        model_name (str): The name of the model, for its configuration.
+        weights (str): The file saved by save_weights.
+
+    Returns:
+        Any: The T5ForConditionalGeneration model, in evaluation mode.
+    """
+    import torch
+    from transformers import AutoConfig, T5ForConditionalGeneration
+
+    with torch.device("meta"):
+        model = T5ForConditionalGeneration(AutoConfig.from_pretrained(model_name))
+
+    state = torch.load(weights, mmap=True, map_location="cpu", weights_only=True)
+    model.load_state_dict(state, assign=True)
+    model.tie_weights()
+    return model.eval()
+
+
+def _load_pytorch(model_name: str) -> Any:
+    """Load a full-precision PyTorch model.
+
+    Args:
+        model_name (str): The name of the model.
+
+    Returns:
+        Any: The T5ForConditionalGeneration model, in evaluation mode.
+    """
+    from transformers import T5ForConditionalGeneration
+
+    return T5ForConditionalGeneration.from_pretrained(model_name).eval()
+
+
+def _quantize(model: Any) -> Any:
+    """Dynamically quantize the linear layers of a PyTorch model to int8.
+
+    Weights are quantized ahead of time and activations as they are computed, so no
+    calibration data is needed.
+
+    Args:
+        model (Any): The PyTorch model.
+
+    Returns:
+        Any: The quantized model.
+    """
+    import torch
+
+    log.info("Quantizing model to int8...")
+    return torch.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def _load_onnx(model_name: str, export_dir: str, quantize: bool) -> Any:
+    """Load an ONNX Runtime export of a model, exporting it if it hasn't been exported.
+
+    The encoder, the decoder and the decoder with past key values are exported
+    separately, and are optionally quantized to int8.
+
+    Args:
+        model_name (str): The name of the model.
+        export_dir (str): The directory to save exports in.
+        quantize (bool): Whether to quantize the exported model.
+
+    Returns:
+        Any: The ORTModelForSeq2SeqLM model.
+
+    Raises:
+        ImportError: If optimum or onnxruntime isn't installed.
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    except ImportError as e:
+        raise ImportError(
+            "The ONNX inference backends require optimum[onnxruntime]"
+        ) from e
+
+    path = os.path.join(export_dir, model_name.replace("/", "--"))
+    if not glob.glob(os.path.join(path, "*.onnx")):
+        log.info("Exporting model to ONNX...")
+        ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True).save_pretrained(
+            path
+        )
+
+    if not quantize:
+        return ORTModelForSeq2SeqLM.from_pretrained(path)
+
+    quantized_path = os.path.join(path, "quantized")
+    if not glob.glob(os.path.join(quantized_path, "*.onnx")):
+        log.info("Quantizing ONNX model to int8...")
+        config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        for file in sorted(glob.glob(os.path.join(path, "*.onnx"))):
+            ORTQuantizer.from_pretrained(
+                path, file_name=os.path.basename(file)
+            ).quantize(save_dir=quantized_path, quantization_config=config)
+
+    return ORTModelForSeq2SeqLM.from_pretrained(
+        quantized_path,
+        encoder_file_name="encoder_model_quantized.onnx",
+        decoder_file_name="decoder_model_quantized.onnx",
+        decoder_with_past_file_name="decoder_with_past_model_quantized.onnx",
+    )
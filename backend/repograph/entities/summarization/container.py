@@ -4,15 +4,49 @@ Container for build entity for dependency injection.
 """
 # pip imports
 from dependency_injector.containers import DeclarativeContainer
-from dependency_injector.providers import Configuration, Singleton
+from dependency_injector.providers import Configuration, Dependency, Singleton
 
 # Summarize entity imports
+from repograph.entities.summarization.models import (
+    GenerationSettings,
+    SummarizationPolicy,
+)
 from repograph.entities.summarization.service import SummarizationService
 
+# Blob entity imports
+from repograph.entities.blob.service import BlobService
+
 
 class SummarizationContainer(DeclarativeContainer):
     config: Configuration = Configuration()
 
+    blobs: Dependency[BlobService] = Dependency()
+
+    generation: Singleton[GenerationSettings] = Singleton(
+        GenerationSettings,
+        num_beams=config.num_beams,
+        max_length=config.max_summary_length,
+    )
+
+    policy: Singleton[SummarizationPolicy] = Singleton(
+        SummarizationPolicy,
+        policy=config.summarization_policy,
+        min_tokens=config.policy_min_tokens,
+        summarize_documented=config.policy_summarize_documented,
+        cascade_model=config.cascade_model,
+    )
+
     service: Singleton[SummarizationService] = Singleton(
-        SummarizationService, summarize=config.summarize
+        SummarizationService,
+        summarize=config.summarize,
+        blobs=blobs,
+        backend=config.inference_backend,
+        generation=generation,
+        export_dir=config.onnx_export_dir,
+        replicas=config.summarization_replicas,
+        threads=config.summarization_threads,
+        max_source_tokens=config.max_source_tokens,
+        max_source_chunks=config.max_source_chunks,
+        policy=policy,
+        inference_socket=config.inference_socket,
     )
@@ -0,0 +1,166 @@
+"""
+Summarization entity-related models.
+"""
+# Base imports
+from typing import Any, Dict, List, Optional
+
+# pip imports
+from pydantic import BaseModel, validator
+
+
+# The default maximum number of tokens generated
+DEFAULT_MAX_LENGTH = 200
+
+# The default maximum number of source code tokens summarized at a time, which is the
+# length of the inputs CodeT5 was trained on
+DEFAULT_MAX_SOURCE_TOKENS = 512
+
+# Policies for which functions are summarized by the model
+SUMMARIZATION_POLICIES = ["all", "skip", "cascade"]
+
+
+class GenerationSettings(BaseModel):
+    """Controls for generating summarizations.
+
+    Args:
+        num_beams (Optional[int]): The number of beams for beam search. 1 is greedy
+                                   decoding, which is much faster on CPU. If None, the
+                                   model's default is used.
+        max_length (int): The maximum number of tokens generated.
+        min_length (Optional[int]): The minimum number of tokens generated.
+        no_repeat_ngram_size (Optional[int]): The size of n-grams that can only occur
+                                              once in a summarization.
+        early_stopping (Optional[bool]): Whether beam search stops once there are
+                                         num_beams finished candidates.
+    """
+
+    num_beams: Optional[int] = None
+    max_length: int = DEFAULT_MAX_LENGTH
+    min_length: Optional[int] = None
+    no_repeat_ngram_size: Optional[int] = None
+    early_stopping: Optional[bool] = None
+
+    @validator("max_length", pre=True)
+    def default_max_length(cls, v):
+        """Use the default maximum length if it isn't configured."""
+        return DEFAULT_MAX_LENGTH if v is None else v
+
+    @validator("num_beams", "max_length")
+    def positive(cls, v):
+        """Check that the number of beams and maximum length are positive."""
+        if v is not None and v < 1:
+            raise ValueError("must be at least 1")
+        return v
+
+    def kwargs(self) -> Dict[str, Any]:
+        """Get the keyword arguments for a model's generate method.
+
+        Returns:
+            Dict[str, Any]
+        """
+        return self.dict(exclude_none=True)
+
+
+
+class PreparedSource(BaseModel):
+    """Source code tokenized to fit the model's input window.
+
+    Args:
+        chunks (List[List[int]]): The input IDs of each chunk, with special tokens.
+        tokens (int): The number of tokens in the source code.
+        truncated_tokens (int): The number of tokens that were left out.
+    """
+
+    chunks: List[List[int]]
+    tokens: int
+    truncated_tokens: int = 0
+
+
+class TruncationStats(BaseModel):
+    """Counts of the source code truncated before summarization.
+
+    Args:
+        functions (int): The number of functions summarized.
+        truncated_functions (int): The number of functions that were truncated.
+        tokens (int): The number of source code tokens.
+        truncated_tokens (int): The number of source code tokens that were left out.
+    """
+
+    functions: int = 0
+    truncated_functions: int = 0
+    tokens: int = 0
+    truncated_tokens: int = 0
+
+    def record(self, prepared: PreparedSource) -> None:
+        """Count a function's prepared source code.
+
+        Args:
+            prepared (PreparedSource): The prepared source code.
+
+        Returns:
+            None
+        """
+        self.functions += 1
+        self.tokens += prepared.tokens
+        if prepared.truncated_tokens:
+            self.truncated_functions += 1
+            self.truncated_tokens += prepared.truncated_tokens
+
+
+class SummarizationPolicy(BaseModel):
+    """Controls for which functions are summarized by the model.
+
+    With the "all" policy, every function is summarized. With "skip", short functions
+    are given a template summarization based on their name instead. With "cascade",
+    short functions are summarized by a smaller, faster model. With either, documented
+    functions are given a template summarization too, as their docstring already
+    describes them.
+
+    Args:
+        policy (str): One of SUMMARIZATION_POLICIES.
+        min_tokens (int): Functions with fewer source code tokens are short.
+        summarize_documented (bool): Whether to summarize functions whose docstring has
+                                     a short description with the model, rather than
+                                     giving them a template summarization, when the
+                                     policy isn't "all".
+        min_docstring_words (int): The number of words a short description needs.
+        cascade_model (Optional[str]): The model to summarize short functions with.
+                                       Defaults to the summarization model, quantized
+                                       to int8 and with greedy decoding.
+    """
+
+    policy: str = "all"
+    min_tokens: int = 32
+    summarize_documented: bool = False
+    min_docstring_words: int = 3
+    cascade_model: Optional[str] = None
+
+    @validator("policy", pre=True)
+    def known_policy(cls, v):
+        """Check that the policy is known, using "all" if it isn't configured."""
+        if v is None:
+            return "all"
+        if v not in SUMMARIZATION_POLICIES:
+            raise ValueError(f"Unknown summarization policy '{v}'")
+        return v
+
+    @validator("min_tokens", "min_docstring_words", "summarize_documented", pre=True)
+    def default_thresholds(cls, v, field):
+        """Use the default thresholds if they aren't configured."""
+        return field.default if v is None else v
+
+
+class PolicyStats(BaseModel):
+    """Counts of how functions were summarized under the summarization policy.
+
+    Args:
+        summarized (int): The number of functions summarized by the model.
+        cascaded (int): The number of short functions summarized by the cascade model.
+        skipped_short (int): The number of short functions given a template.
+        skipped_documented (int): The number of documented functions given a template.
+    """
+
+    summarized: int = 0
+    cascaded: int = 0
+    skipped_short: int = 0
+    skipped_documented: int = 0
\ No newline at end of file
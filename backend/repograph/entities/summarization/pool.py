@@ -0,0 +1,247 @@
+"""
+A pool of summarization model replicas, each running in its own process.
+
+Generating a summarization is a long sequence of small matrix multiplications, which
+PyTorch's intra-op threading only speeds up on a few cores. Instead, the pool runs
+several replicas of the model, each pinned to its own subset of the cores and with its
+thread counts set to match, so throughput scales with the number of cores.
+
+The weights of the PyTorch backends are saved once and memory-mapped by every replica,
+so the replicas share a single copy of the weights. Replicas of the ONNX backends load
+the saved export.
+"""
+# Base imports
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from logging import getLogger
+from typing import Any, List, Optional
+
+# Summarization entity imports
+from repograph.entities.summarization.backends import (
+    generate_summaries,
+    load_model,
+    save_weights,
+)
+from repograph.entities.summarization.models import GenerationSettings
+
+# Configure logging
+log = getLogger("repograph.entities.summarization.pool")
+
+# The model replica of a worker process
+_replica: Optional[Any] = None
+
+
+def assign_cores(
+    cores: List[int], replicas: int, threads: Optional[int] = None
+) -> List[List[int]]:
+    """Divide cores between replicas.
+
+    Args:
+        cores (List[int]): The cores available.
+        replicas (int): The number of replicas.
+        threads (Optional[int]): The number of cores for each replica. Defaults to an
+                                 equal share of the cores.
+
+    Returns:
+        List[List[int]]: The cores of each replica. If there are fewer cores than
+                         replicas need, cores are shared.
+    """
+    cores = sorted(cores)
+    per_replica = threads if threads else max(1, len(cores) // replicas)
+
+    assignments = []
+    for index in range(replicas):
+        start = (index * per_replica) % len(cores)
+        assignment = cores[start : start + per_replica]
+        if len(assignment) < per_replica:
+            assignment += cores[: per_replica - len(assignment)]
+        assignments.append(assignment)
+
+    return assignments
+
+
+def _available_cores() -> List[int]:
+    """Get the cores the process may run on.
+
+    Returns:
+        List[int]
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return list(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class _Replica:
+    """
+    A model replica, loaded in a worker process.
+    """
+
+    def __init__(
+        self,
+        cores: List[int],
+        tokenizer_name: str,
+        model_name: str,
+        backend: str,
+        generation: GenerationSettings,
+        export_dir: Optional[str],
+        weights: Optional[str],
+    ) -> None:
+        """Pin the process to its cores, and load the tokenizer and model.
+
+        Args:
+            cores (List[int]): The cores to run on.
+            tokenizer_name (str): The name of the tokenizer.
+            model_name (str): The name of the model.
+            backend (str): The inference backend.
+            generation (GenerationSettings): The generation controls.
+            export_dir (Optional[str]): The directory exports are saved in.
+            weights (Optional[str]): The memory-mappable weights of the model.
+        """
+        import torch
+        from transformers import RobertaTokenizer
+
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cores)
+        torch.set_num_threads(len(cores))
+        torch.set_num_interop_threads(1)
+
+        self.tokenizer = RobertaTokenizer.from_pretrained(tokenizer_name)
+        self.model = load_model(backend, model_name, export_dir, weights=weights)
+        self.generation = generation
+
+    def generate(self, chunks: List[List[int]]) -> List[str]:
+        """Summarize tokenized code.
+
+        Args:
+            chunks (List[List[int]]): The input IDs of each chunk of the code.
+
+        Returns:
+            List[str]: The summarization of each chunk.
+        """
+        return generate_summaries(self.model, self.tokenizer, chunks, self.generation)
+
+
+def _initialise(assignments: List[List[int]], counter: Any, *args: Any) -> None:
+    """Load the replica of a worker process.
+
+    Args:
+        assignments (List[List[int]]): The cores of each replica.
+        counter (Any): Shared counter giving each worker its replica index.
+        *args (Any): The remaining arguments of _Replica.
+
+    Returns:
+        None
+    """
+    global _replica
+
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+
+    cores = assignments[index % len(assignments)]
+    _replica = _Replica(cores, *args)
+    log.info("Loaded summarization replica %d on cores %s", index, cores)
+
+
+def _generate(chunks: List[List[int]]) -> List[str]:
+    """Summarize tokenized code with the replica of the worker process.
+
+    Args:
+        chunks (List[List[int]]): The input IDs of each chunk of the code.
+
+    Returns:
+        List[str]: The summarization of each chunk.
+    """
+    return _replica.generate(chunks)
+
+
+class SummarizationPool:
+    """
+    Summarizes code with replicas of the model in worker processes.
+
+    Requests are queued, and run by the first replica to become free. Workers are
+    started with the spawn method, as PyTorch's thread pools don't survive forking.
+    """
+
+    def __init__(
+        self,
+        replicas: int,
+        tokenizer_name: str,
+        model_name: str,
+        backend: str = "pytorch",
+        generation: Optional[GenerationSettings] = None,
+        export_dir: Optional[str] = None,
+        threads: Optional[int] = None,
+    ) -> None:
+        """Constructor
+
+        Args:
+            replicas (int): The number of replicas.
+            tokenizer_name (str): The name of the tokenizer.
+            model_name (str): The name of the model.
+            backend (str): The inference backend.
+            generation (Optional[GenerationSettings]): The generation controls.
+            export_dir (Optional[str]): The directory exports are saved in.
+            threads (Optional[int]): The number of cores and threads of each replica.
+                                     Defaults to an equal share of the cores.
+        """
+        self.replicas = replicas
+        self.assignments = assign_cores(_available_cores(), replicas, threads)
+
+        # Save the weights once, for every replica to memory-map
+        weights = None
+        if backend in ["pytorch", "quantized"]:
+            weights = save_weights(model_name, export_dir)
+
+        context = multiprocessing.get_context("spawn")
+        self.executor = ProcessPoolExecutor(
+            max_workers=replicas,
+            mp_context=context,
+            initializer=_initialise,
+            initargs=(
+                self.assignments,
+                context.Value("i", 0),
+                tokenizer_name,
+                model_name,
+                backend,
+                generation if generation else GenerationSettings(),
+                export_dir,
+                weights,
+            ),
+        )
+        log.info(
+            "Started %d summarization replicas with %d threads each",
+            replicas,
+            len(self.assignments[0]),
+        )
+
+    def submit(self, chunks: List[List[int]]) -> Future:
+        """Queue tokenized code to be summarized.
+
+        Args:
+            chunks (List[List[int]]): The input IDs of each chunk of the code.
+
+        Returns:
+            Future: The future summarization of each chunk.
+        """
+        return self.executor.submit(_generate, chunks)
+
+    def generate(self, chunks: List[List[int]]) -> List[str]:
+        """Summarize tokenized code, waiting for a replica to become free.
+
+        Args:
+            chunks (List[List[int]]): The input IDs of each chunk of the code.
+
+        Returns:
+            List[str]: The summarization of each chunk.
+        """
+        return self.submit(chunks).result()
+
+    def close(self) -> None:
+        """Stop the worker processes.
+
+        Returns:
+            None
+        """
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -7,75 +7,384 @@ Typical usage:
     docstring_node = FunctionSummarizer.create_docstring_node(function_node)
 """
 # Base imports
+import threading
+import time
 from logging import getLogger
-
-# pip imports
-from transformers import RobertaTokenizer, T5ForConditionalGeneration
+from typing import List, Optional, Tuple
 
 # Model imports
 from repograph.entities.graph.models.nodes import Function
+from repograph.entities.summarization.models import (
+    DEFAULT_MAX_SOURCE_TOKENS,
+    GenerationSettings,
+    PolicyStats,
+    PreparedSource,
+    SummarizationPolicy,
+    TruncationStats,
+)
+
+# Blob entity imports
+from repograph.entities.blob.service import BlobService
+
+# Inference entity imports
+from repograph.entities.inference.client import InferenceClient
+
+# Summarization entity imports
+from repograph.entities.summarization.backends import generate_summaries, load_model
+from repograph.entities.summarization.pool import SummarizationPool
 
 # Utils imports
-from repograph.entities.summarization.utils import clean_source_code
+from repograph.entities.summarization.utils import (
+    clean_source_code,
+    docstring_summary,
+    prepare_source,
+    template_summary,
+)
+from repograph.utils.lazy import Lazy
 
 
 # Setup logging
 log = getLogger("repograph.entities.summarization.service")
 
+# The tokenizer and model used for summarization
+TOKENIZER_NAME = "Salesforce/codet5-base"
+MODEL_NAME = "Salesforce/codet5-base-multi-sum"
+
 
 class SummarizationService:
     tokenizer: any = None
     model: any = None
+    cascade_model: any = None
     active: bool
+    blobs: Optional[BlobService]
+    generation: GenerationSettings
+    policy: SummarizationPolicy
+    truncation: TruncationStats
+    policy_stats: PolicyStats
 
-    def __init__(self, summarize: bool = False):
+    def __init__(
+        self,
+        summarize: bool = False,
+        blobs: Optional[BlobService] = None,
+        backend: Optional[str] = None,
+        generation: Optional[GenerationSettings] = None,
+        export_dir: Optional[str] = None,
+        replicas: Optional[int] = None,
+        threads: Optional[int] = None,
+        max_source_tokens: Optional[int] = None,
+        max_source_chunks: Optional[int] = None,
+        policy: Optional[SummarizationPolicy] = None,
+        inference_socket: Optional[str] = None,
+    ):
         """Constructor
 
         Args:
             summarize (bool): Whether to initialise model and tokenizer.
+            blobs (Optional[BlobService]): The blob store to read source code from, for
+                                           functions that only store its key.
+            backend (Optional[str]): The inference backend to load the model with. One
+                                     of INFERENCE_BACKENDS. Defaults to "pytorch".
+            generation (Optional[GenerationSettings]): The generation controls.
+            export_dir (Optional[str]): The directory to save ONNX exports and
+                                        memory-mappable weights in.
+            replicas (Optional[int]): The number of model replicas to run in worker
+                                      processes. If 0 or None, the model is run in this
+                                      process.
+            threads (Optional[int]): The number of cores and threads of each replica.
+                                     Defaults to an equal share of the cores.
+            max_source_tokens (Optional[int]): The maximum number of source code tokens
+                                               summarized at a time. Defaults to 512.
+            max_source_chunks (Optional[int]): The maximum number of windows of a long
+                                               function to summarize. If 1 (the
+                                               default), long functions are truncated.
+            policy (Optional[SummarizationPolicy]): Which functions are summarized by the
+                                                    model. Defaults to all of them.
+            inference_socket (Optional[str]): The Unix socket of a shared inference
+                                              server to summarize with, rather than
+                                              loading the model in this process. The
+                                              server applies its own settings.
         """
         self.active = summarize
+        self.blobs = blobs
+        self.backend = backend if backend else "pytorch"
+        self.generation = generation if generation else GenerationSettings()
+        self.replicas = replicas if replicas else 0
+        self.pool: Optional[SummarizationPool] = None
+        self.max_source_tokens = (
+            max_source_tokens if max_source_tokens else DEFAULT_MAX_SOURCE_TOKENS
+        )
+        self.max_source_chunks = max_source_chunks if max_source_chunks else 1
+
+        self.policy = policy if policy else SummarizationPolicy()
+
+        # Counts of truncated source code and of the outcomes of the policy. Guarded by
+        # the lock, as functions are summarized concurrently.
+        self.truncation = TruncationStats()
+        self.policy_stats = PolicyStats()
+        self._stats_lock = threading.Lock()
+
+        self.export_dir = export_dir
+        self.threads = threads
+        self.inference_socket = inference_socket
+        self.client: Optional[InferenceClient] = None
+
+        # The models are loaded on first use, or by warm_up
+        self._models: Lazy[bool] = Lazy(self._load_models)
+        if not summarize:
+            log.info("Summarization flag not set. Skipping setup.")
 
-        if summarize:
-            log.info("Initialising CodeT5 model...")
-            self.tokenizer = RobertaTokenizer.from_pretrained("Salesforce/codet5-base")
-            self.model = T5ForConditionalGeneration.from_pretrained(
-                "Salesforce/codet5-base-multi-sum"
+    def _load_models(self) -> bool:
+        """Load the tokenizer and the model, or start the pool of model replicas.
+
+        transformers, and with it torch, is only imported here.
+
+        Returns:
+            bool: True
+        """
+        if self.inference_socket:
+            log.info("Summarizing with the inference server at %s", self.inference_socket)
+            self.client = InferenceClient(self.inference_socket)
+            return True
+
+        from transformers import RobertaTokenizer
+
+        if self.replicas:
+            log.info(
+                "Initialising %d CodeT5 replicas with the %s backend...",
+                self.replicas,
+                self.backend,
+            )
+            self.tokenizer = RobertaTokenizer.from_pretrained(TOKENIZER_NAME)
+            self.pool = SummarizationPool(
+                self.replicas,
+                TOKENIZER_NAME,
+                MODEL_NAME,
+                backend=self.backend,
+                generation=self.generation,
+                export_dir=self.export_dir,
+                threads=self.threads,
             )
-            log.info("Ready!")
         else:
-            log.info("Summarization flag not set. Skipping setup.")
+            log.info("Initialising CodeT5 model with the %s backend...", self.backend)
+            self.tokenizer = RobertaTokenizer.from_pretrained(TOKENIZER_NAME)
+            self.model = load_model(self.backend, MODEL_NAME, self.export_dir)
+            log.info("Ready!")
 
-    def summarize_function(self, function: Function) -> str:
+        if self.policy.policy == "cascade":
+            # The cascade model shares the CodeT5 tokenizer
+            cascade_backend = (
+                "onnx-quantized" if self.backend.startswith("onnx") else "quantized"
+            )
+            log.info("Initialising cascade model with the %s backend...", cascade_backend)
+            self.cascade_model = load_model(
+                cascade_backend, self.policy.cascade_model or MODEL_NAME, self.export_dir
+            )
+
+        return True
+
+    def warm_up(self) -> float:
+        """Load the models and summarize a function, so that the first build is fast.
+
+        Returns:
+            float: The time taken, in seconds. 0 if summarization isn't enabled or the
+                   models were already loaded.
+        """
+        if not self.active or self._models.loaded:
+            return 0.0
+
+        start = time.perf_counter()
+        self.summarize_code("def add(a, b):\n    return a + b\n")
+        return time.perf_counter() - start
+
+    def summarize_function(
+        self, function: Function, stats: Optional[PolicyStats] = None
+    ) -> str:
         """Summarize a function.
 
         Args:
             function (Function): The function node to summarization.
+            stats (Optional[PolicyStats]): Counts to record the outcome in, as well as
+                the service's own.
 
         Returns:
             str: The summarization
         """
-        if not self.model or not self.tokenizer:
+        if not self.active:
             log.warning("No model or tokenizer initialised!")
             return ""
 
         log.debug(f"Create Docstring node for function `{function.name}`...")
-        source_code = clean_source_code(function.source_code)
-        return self._summarize_code(source_code)
+        source_code = function.source_code
+        if not source_code and function.source_hash and self.blobs:
+            source_code = self.blobs.get(function.source_hash)
 
-    def _summarize_code(self, source_code: str) -> str:
-        """Summarize code.
+        if not source_code:
+            log.warning("No source code to summarize for function `%s`", function.name)
+            return ""
+
+        return self.summarize_code(source_code, stats)
+
+    def summarize_code(
+        self, source_code: str, stats: Optional[PolicyStats] = None
+    ) -> str:
+        """Summarize the source code of a function, without its docstring.
+
+        Unless the policy is "all", documented functions and short functions are given
+        a template summarization, or short functions are summarized by the cascade
+        model.
+
+        Long functions are truncated, or split into chunks, to fit the model's input
+        window. The summarizations of the chunks are joined.
 
         Args:
-            source_code (str): The source code to summarization.
+            source_code (str): The source code.
+            stats (Optional[PolicyStats]): Counts to record the outcome in, as well as
+                the service's own.
 
         Returns:
             str: The summarization.
         """
+        return self.summarize_code_with_outcome(source_code, stats)[0]
+
+    def summarize_code_with_outcome(
+        self, source_code: str, stats: Optional[PolicyStats] = None
+    ) -> Tuple[str, str]:
+        """Summarize the source code of a function, and report how it was summarized.
+
+        Args:
+            source_code (str): The source code.
+            stats (Optional[PolicyStats]): Counts to record the outcome in, as well as
+                the service's own.
+
+        Returns:
+            Tuple[str, str]: The summarization, and the PolicyStats field of its
+                outcome.
+        """
+        if self.active:
+            self._models.get()
+        if self.client:
+            summary, outcome = self.client.summarize([source_code])[0]
+        else:
+            summary, outcome = self._summarize_code(source_code)
+
+        self._record_outcome(outcome, stats)
+        return summary, outcome
+
+    def _summarize_code(self, source_code: str) -> Tuple[str, str]:
+        """Summarize the source code of a function with the local models.
+
+        Args:
+            source_code (str): The source code.
+
+        Returns:
+            Tuple[str, str]: The summarization, and the PolicyStats field of its
+                outcome.
+        """
+        if self.policy.policy != "all" and not self.policy.summarize_documented:
+            if docstring_summary(source_code, self.policy.min_docstring_words):
+                return template_summary(source_code), "skipped_documented"
+
         log.debug("Tokenizing...")
-        input_ids = self.tokenizer(source_code, return_tensors="pt").input_ids
+        prepared = prepare_source(
+            self.tokenizer,
+            clean_source_code(source_code),
+            self.max_source_tokens,
+            self.max_source_chunks,
+        )
+
+        if self.policy.policy != "all" and prepared.tokens < self.policy.min_tokens:
+            if self.policy.policy == "skip":
+                return template_summary(source_code), "skipped_short"
+
+            summaries = generate_summaries(
+                self.cascade_model,
+                self.tokenizer,
+                prepared.chunks,
+                self.generation.copy(update={"num_beams": 1}),
+            )
+            return summaries[0].strip(), "cascaded"
+
+        self._record_truncation(prepared)
 
         log.debug("Summarizing...")
-        generated_ids = self.model.generate(input_ids, max_length=200)
+        summaries = self._generate(prepared.chunks)
+        summary = " ".join(summary.strip() for summary in summaries if summary.strip())
+        return summary, "summarized"
+
+    def log_stats(self) -> None:
+        """Log how many functions the policy summarized, skipped and cascaded, and how
+        many were truncated, since the service was created.
+
+        Returns:
+            None
+        """
+        with self._stats_lock:
+            policy_stats = self.policy_stats.copy()
+            truncation = self.truncation.copy()
+
+        log.info(
+            "Summarization policy '%s': %d summarized, %d cascaded, %d short functions "
+            "skipped, %d documented functions skipped",
+            self.policy.policy,
+            policy_stats.summarized,
+            policy_stats.cascaded,
+            policy_stats.skipped_short,
+            policy_stats.skipped_documented,
+        )
+        log.info(
+            "Truncated %d of %d functions (%d of %d tokens)",
+            truncation.truncated_functions,
+            truncation.functions,
+            truncation.truncated_tokens,
+            truncation.tokens,
+        )
+
+    def _record_outcome(
+        self, outcome: str, stats: Optional[PolicyStats] = None
+    ) -> None:
+        """Count how the policy summarized a function.
+
+        Args:
+            outcome (str): The PolicyStats field to increment.
+            stats (Optional[PolicyStats]): Counts to increment as well as the service's.
+
+        Returns:
+            None
+        """
+        with self._stats_lock:
+            for counts in (self.policy_stats, stats):
+                if counts is not None:
+                    setattr(counts, outcome, getattr(counts, outcome) + 1)
+
+    def _record_truncation(self, prepared: PreparedSource) -> None:
+        """Count how much of a function's source code was truncated.
+
+        Args:
+            prepared (PreparedSource): The prepared source code.
+
+        Returns:
+            None
+        """
+        if prepared.truncated_tokens:
+            log.debug(
+                "Truncated %d of %d tokens of source code",
+                prepared.truncated_tokens,
+                prepared.tokens,
+            )
+
+        with self._stats_lock:
+            self.truncation.record(prepared)
+
+    def _generate(self, chunks: List[List[int]]) -> List[str]:
+        """Summarize tokenized code.
+
+        Args:
+            chunks (List[List[int]]): The input IDs of each chunk of the code.
+
+        Returns:
+            List[str]: The summarization of each chunk.
+        """
+        if self.pool:
+            return self.pool.generate(chunks)
 
-        return self.tokenizer.decode(generated_ids[0], skip_special_tokens=True)
+        return generate_summaries(self.model, self.tokenizer, chunks, self.generation)
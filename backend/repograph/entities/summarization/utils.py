@@ -1,11 +1,59 @@
 """
 Code summarization utilities.
 """
+# Base imports
+import ast
 import re
+import textwrap
+from typing import Any, List, Optional, Tuple
+
+# Summarization entity imports
+from repograph.entities.summarization.models import PreparedSource
+
+# Matches the first triple-quoted string, for source code that can't be parsed
+DOCSTRING_PATTERN = re.compile(r'(?s)[ \t]*(""".*?"""|\'\'\'.*?\'\'\')[ \t]*\n?')
+
+# Template summarizations of common special methods
+SPECIAL_METHOD_SUMMARIES = {
+    "__init__": "Initialise the object.",
+    "__repr__": "Return a representation of the object.",
+    "__str__": "Return the string form of the object.",
+    "__eq__": "Check whether the object is equal to another.",
+    "__hash__": "Return the hash of the object.",
+    "__len__": "Return the length of the object.",
+    "__iter__": "Iterate over the object.",
+    "__enter__": "Enter the context.",
+    "__exit__": "Exit the context.",
+}
+
+
+def _get_definition(source_code: str) -> Optional[ast.AST]:
+    """Parse the function or class that source_code starts with.
+
+    Args:
+        source_code (str): The source code, which may be indented.
+
+    Returns:
+        Optional[ast.AST]: The FunctionDef, AsyncFunctionDef or ClassDef node, or None
+                           if the source code can't be parsed or isn't a definition.
+    """
+    try:
+        module = ast.parse(textwrap.dedent(source_code))
+    except (SyntaxError, ValueError):
+        return None
+
+    if module.body and isinstance(
+        module.body[0], (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+    ):
+        return module.body[0]
+    return None
 
 
 def clean_source_code(source_code: str) -> str:
-    """Remove docstrings from source_code
+    """Remove the docstring from source_code
+
+    Only the leading docstring of the definition is removed, leaving the rest of its
+    body, including any other strings, untouched.
 
     Args:
         source_code (str): The source code to clean.
@@ -13,4 +61,154 @@ def clean_source_code(source_code: str) -> str:
     Returns:
         str: Cleaned source_code
     """
-    return re.sub('(?s)""".*"""\n', "", source_code)
+    definition = _get_definition(source_code)
+    if definition is None:
+        return DOCSTRING_PATTERN.sub("", source_code, count=1)
+
+    docstring = definition.body[0]
+    if not (
+        isinstance(docstring, ast.Expr)
+        and isinstance(docstring.value, ast.Constant)
+        and isinstance(docstring.value.value, str)
+    ):
+        return source_code
+
+    # Dedenting doesn't change line numbers, so whole lines can be removed from the
+    # original. Column offsets are in bytes of the dedented source.
+    lines = source_code.splitlines(keepends=True)
+    dedented = textwrap.dedent(source_code).splitlines(keepends=True)
+    before = dedented[docstring.lineno - 1].encode()[: docstring.col_offset]
+    after = dedented[docstring.end_lineno - 1].encode()[docstring.end_col_offset :]
+    if before.strip() or after.strip():
+        # The docstring shares a line with other code
+        return source_code
+
+    return "".join(lines[: docstring.lineno - 1] + lines[docstring.end_lineno :])
+
+
+def split_signature(source_code: str) -> Tuple[str, str]:
+    """Split source code into its signature, including any decorators, and its body.
+
+    Args:
+        source_code (str): The source code.
+
+    Returns:
+        str: The signature. The first line, if the source code can't be parsed.
+        str: The body.
+    """
+    lines = source_code.splitlines(keepends=True)
+    definition = _get_definition(source_code)
+
+    end = max(definition.lineno, definition.body[0].lineno - 1) if definition else 1
+    return "".join(lines[:end]), "".join(lines[end:])
+
+
+def _tokenize(tokenizer: Any, text: str) -> List[int]:
+    """Tokenize text, without special tokens.
+
+    Args:
+        tokenizer (Any): The tokenizer.
+        text (str): The text.
+
+    Returns:
+        List[int]: The input IDs.
+    """
+    if not text:
+        return []
+    return tokenizer(text, add_special_tokens=False).input_ids
+
+
+def prepare_source(
+    tokenizer: Any, source_code: str, max_tokens: int, max_chunks: int = 1
+) -> PreparedSource:
+    """Tokenize source code to fit the model's input window.
+
+    Source code that fits is tokenized as a whole. Otherwise, its signature is kept and
+    its body is split into chunks that fill the rest of the window, each of which is
+    prefixed with the signature. Only the first max_chunks chunks are kept, so the head
+    of the body takes priority. The signature is limited to half of the window.
+
+    Args:
+        tokenizer (Any): The tokenizer.
+        source_code (str): The source code.
+        max_tokens (int): The size of the window, including special tokens.
+        max_chunks (int): The maximum number of chunks. If 1, the source code is
+                          truncated to a single window.
+
+    Returns:
+        PreparedSource
+    """
+    window = max_tokens - tokenizer.num_special_tokens_to_add()
+    max_chunks = max(1, max_chunks)
+
+    input_ids = _tokenize(tokenizer, source_code)
+    if len(input_ids) <= window:
+        return PreparedSource(
+            chunks=[tokenizer.build_inputs_with_special_tokens(input_ids)],
+            tokens=len(input_ids),
+        )
+
+    signature, body = split_signature(source_code)
+    signature_ids = _tokenize(tokenizer, signature)
+    body_ids = _tokenize(tokenizer, body)
+    kept_signature = signature_ids[: window // 2]
+
+    size = window - len(kept_signature)
+    chunks = [
+        kept_signature + body_ids[start : start + size]
+        for start in range(0, max(1, len(body_ids)), size)
+    ][:max_chunks]
+
+    tokens = len(signature_ids) + len(body_ids)
+    kept = sum(len(chunk) for chunk in chunks) - len(kept_signature) * (len(chunks) - 1)
+    return PreparedSource(
+        chunks=[tokenizer.build_inputs_with_special_tokens(chunk) for chunk in chunks],
+        tokens=tokens,
+        truncated_tokens=max(0, tokens - kept),
+    )
+
+
+def docstring_summary(source_code: str, min_words: int) -> Optional[str]:
+    """Get the short description of a definition's docstring.
+
+    Args:
+        source_code (str): The source code of the definition.
+        min_words (int): The number of words the short description needs.
+
+    Returns:
+        Optional[str]: The first line of the docstring, or None if there is no docstring
+                       or it is too short.
+    """
+    definition = _get_definition(source_code)
+    docstring = ast.get_docstring(definition) if definition else None
+    if not docstring:
+        return None
+
+    short_description = docstring.strip().splitlines()[0].strip()
+    if len(short_description.split()) < min_words:
+        return None
+    return short_description
+
+
+def template_summary(source_code: str) -> str:
+    """Create a summarization of a function from its name.
+
+    For example, get_file_name and getFileName are summarized as "Get file name."
+
+    Args:
+        source_code (str): The source code of the function.
+
+    Returns:
+        str: The summarization, or an empty string if the source code can't be parsed.
+    """
+    definition = _get_definition(source_code)
+    if definition is None:
+        return ""
+    if definition.name in SPECIAL_METHOD_SUMMARIES:
+        return SPECIAL_METHOD_SUMMARIES[definition.name]
+
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", definition.name)
+    words = name.replace("_", " ").lower().split()
+    if not words:
+        return ""
+    return " ".join(words).capitalize() + "."
@@ -0,0 +1,73 @@
+# pragma: no cover
+"""
+Shared inference server entrypoint.
+
+Loads the semantic search and summarization models once, and serves them to API and
+build workers whose config sets inference_socket to the same path. Models are loaded on
+first use, or when a worker warms them up.
+"""
+# Base imports
+import logging
+import signal
+from typing import Any
+
+# pip imports
+import configargparse
+from dependency_injector.providers import Object
+
+# Inference entity imports
+from repograph.entities.inference.server import InferenceServer
+
+# Search entity imports
+from repograph.entities.search.service import SearchService
+
+# Summarization entity imports
+from repograph.entities.summarization.container import SummarizationContainer
+
+# Utilities
+from repograph.utils.arguments import add_summarization_arguments
+from repograph.utils.logging import configure_logging
+
+# Configure logging format
+configure_logging(logging.INFO)
+log = logging.getLogger("repograph.inference")
+
+# Command-line / config-file argument parsing
+p = configargparse.ArgParser(default_config_files=["../default_config.yaml"])
+p.add_argument("-c", "--config", is_config_file=True, help="Config file path.")
+p.add_argument(
+    "--inference_socket", required=True, help="The path of the Unix socket to serve on."
+)
+p.add_argument(
+    "--search",
+    required=False,
+    dest="search",
+    action="store_true",
+    help="Whether to serve the semantic search model.",
+)
+add_summarization_arguments(p)
+
+
+if __name__ == "__main__":
+    args, _ = p.parse_known_args()
+
+    # The server's own services load the models, rather than connecting to themselves
+    config = {**vars(args), "inference_socket": None}
+    summarization = SummarizationContainer(blobs=Object(None))
+    summarization.config.from_dict(config)
+
+    server = InferenceServer(
+        args.inference_socket,
+        search=SearchService(None, active=args.search),
+        summarization=summarization.service(),
+    )
+
+    def stop(*_: Any) -> None:
+        server.close()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("Stopping inference server...")
+        server.close()
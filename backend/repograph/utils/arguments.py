@@ -0,0 +1,178 @@
+"""
+Command-line / config-file arguments shared by the entrypoints.
+"""
+# pip imports
+import configargparse
+
+# Summarization entity imports
+from repograph.entities.summarization.backends import INFERENCE_BACKENDS
+from repograph.entities.summarization.models import SUMMARIZATION_POLICIES
+
+
+def add_build_arguments(p: configargparse.ArgParser) -> None:
+    """Add the arguments of the services that builds use, e.g. to the CLI and the build
+    workers.
+
+    Args:
+        p (configargparse.ArgParser): The parser to add the arguments to.
+
+    Returns:
+        None
+    """
+    p.add_argument("--uri", required=True, help="The URI of the Neo4J server.")
+    p.add_argument(
+        "--driver_uri", required=True, help="Alternative URI of the Neo4J server."
+    )
+    p.add_argument(
+        "--username", required=True, help="The username to supply to the Neo4J server."
+    )
+    p.add_argument(
+        "--password", required=True, help="The password to supply to the Neo4J server."
+    )
+    p.add_argument(
+        "--database", required=False, default="neo4j", help="The database name to use."
+    )
+    p.add_argument(
+        "--compact_schema",
+        required=False,
+        dest="compact_schema",
+        action="store_true",
+        help="Whether to store arguments, return values and docstring parts as "
+        "properties of their Function or Docstring, rather than as separate nodes.",
+    )
+    p.add_argument(
+        "--blob_store",
+        required=False,
+        help="Directory of the blob store to keep function source code and ASTs in, "
+        "rather than in the graph.",
+    )
+    p.add_argument(
+        "--skip_ast",
+        required=False,
+        dest="skip_ast",
+        action="store_true",
+        help="Whether to skip extracting and storing function ASTs.",
+    )
+    p.add_argument(
+        "--search",
+        required=False,
+        dest="search",
+        action="store_true",
+        help="Whether to enable semantic search, which docstrings are scored against "
+        "their summarizations with after building.",
+    )
+    add_summarization_arguments(p)
+    p.add_argument(
+        "--inference_socket",
+        required=False,
+        help="The Unix socket of a shared inference server to run the models on, "
+        "rather than loading them in this process.",
+    )
+    p.add_argument(
+        "--summarization_workers",
+        required=False,
+        type=int,
+        default=1,
+        help="The number of threads each build summarizes functions in, while it "
+        "parses and writes the graph. If 0, functions are summarized as they are "
+        "parsed.",
+    )
+
+
+def add_summarization_arguments(p: configargparse.ArgParser) -> None:
+    """Add the arguments of the summarization model and policy, e.g. to the build
+    entrypoints and the inference server.
+
+    Args:
+        p (configargparse.ArgParser): The parser to add the arguments to.
+
+    Returns:
+        None
+    """
+    p.add_argument(
+        "--summarize",
+        required=False,
+        dest="summarize",
+        action="store_true",
+        help="Whether to generate function summarization docstrings.",
+    )
+    p.add_argument(
+        "--inference_backend",
+        required=False,
+        default="pytorch",
+        choices=INFERENCE_BACKENDS,
+        help="How to run the summarization model: full-precision PyTorch, PyTorch "
+        "quantized to int8, ONNX Runtime, or ONNX Runtime quantized to int8.",
+    )
+    p.add_argument(
+        "--num_beams",
+        required=False,
+        type=int,
+        help="The number of beams to generate summarizations with. 1 is greedy "
+        "decoding. Defaults to the model's setting.",
+    )
+    p.add_argument(
+        "--max_summary_length",
+        required=False,
+        type=int,
+        help="The maximum number of tokens in a summarization.",
+    )
+    p.add_argument(
+        "--max_source_tokens",
+        required=False,
+        type=int,
+        help="The maximum number of source code tokens summarized at a time. Longer "
+        "functions are truncated. Defaults to 512.",
+    )
+    p.add_argument(
+        "--max_source_chunks",
+        required=False,
+        type=int,
+        help="The maximum number of windows of a long function to summarize, joining "
+        "their summarizations. Defaults to 1.",
+    )
+    p.add_argument(
+        "--summarization_policy",
+        required=False,
+        default="all",
+        choices=SUMMARIZATION_POLICIES,
+        help="Which functions to summarize with the model: all of them, all but short "
+        "and documented functions, or all but documented functions, with short "
+        "functions summarized by a faster cascade model.",
+    )
+    p.add_argument(
+        "--policy_min_tokens",
+        required=False,
+        type=int,
+        help="Functions with fewer source code tokens are skipped or cascaded. "
+        "Defaults to 32.",
+    )
+    p.add_argument(
+        "--policy_summarize_documented",
+        required=False,
+        dest="policy_summarize_documented",
+        action="store_true",
+        help="Whether to summarize documented functions with the model, rather than "
+        "giving them a template summary, when the policy isn't 'all'.",
+    )
+    p.add_argument(
+        "--cascade_model",
+        required=False,
+        help="The model to summarize short functions with. Defaults to the "
+        "summarization model quantized to int8.",
+    )
+    p.add_argument(
+        "--summarization_replicas",
+        required=False,
+        type=int,
+        default=0,
+        help="The number of summarization model replicas to run in worker processes. "
+        "If 0, the model is run in the main process.",
+    )
+    p.add_argument(
+        "--summarization_threads",
+        required=False,
+        type=int,
+        help="The number of cores and threads of each summarization model replica. "
+        "Defaults to an equal share of the cores.",
+    )
@@ -0,0 +1,46 @@
+"""
+Lazy initialisation utilities.
+"""
+# Base imports
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+    """
+    A value created on first use, such as a model that is slow to load.
+
+    The value is created at most once, even if it is first used by several threads at
+    the same time. If creating it fails, it is created again on next use.
+    """
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        """Constructor
+
+        Args:
+            factory (Callable[[], T]): Creates the value.
+        """
+        self.factory = factory
+        self._value: Optional[T] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the value has been created."""
+        return self._loaded
+
+    def get(self) -> T:
+        """Get the value, creating it if it hasn't been created.
+
+        Returns:
+            T: The value.
+        """
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._value = self.factory()
+                    self._loaded = True
+        return self._value
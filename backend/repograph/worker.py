@@ -0,0 +1,96 @@
+# pragma: no cover
+"""
+Build worker entrypoint.
+
+Runs queued builds outside the API process. Workers claim jobs from the build queue in
+the metadata DB, so they can be started alongside an API whose build_workers is 0.
+"""
+# Base imports
+import logging
+import signal
+from typing import Any, Dict
+
+# pip imports
+import configargparse
+
+# Application Container
+from repograph.container import ApplicationContainer
+
+# Build entity imports
+from repograph.entities.build.runner import BuildRunnerPool, WORKER_MODES
+
+# Utilities
+from repograph.utils.arguments import add_build_arguments
+from repograph.utils.logging import configure_logging
+
+# Configure logging format
+configure_logging(logging.INFO)
+log = logging.getLogger("repograph.worker")
+
+# Command-line / config-file argument parsing
+p = configargparse.ArgParser(default_config_files=["../default_config.yaml"])
+p.add_argument("-c", "--config", is_config_file=True, help="Config file path.")
+add_build_arguments(p)
+p.add_argument(
+    "--metadata_db", required=True, help="The path of the SQLite3 metadata DB to use."
+)
+p.add_argument(
+    "--extract_metadata",
+    required=False,
+    dest="extract_metadata",
+    action="store_true",
+    help="Whether to extract repository metadata with inspect4py.",
+)
+p.add_argument(
+    "--build_workers",
+    required=False,
+    type=int,
+    default=1,
+    help="The number of builds to run concurrently.",
+)
+p.add_argument(
+    "--build_worker_mode",
+    required=False,
+    default="process",
+    choices=WORKER_MODES,
+    help="Whether to run each build worker in its own process or thread.",
+)
+
+
+def run_worker(config: Dict[str, Any], stop: Any) -> None:
+    """Run a build worker process until stopped.
+
+    This is the target of the worker processes started by a BuildRunnerPool. Each
+    process builds its own application container from the config.
+
+    Args:
+        config (Dict[str, Any]): The application config.
+        stop (Any): Event that is set to stop the worker.
+
+    Returns:
+        None
+    """
+    configure_logging(logging.INFO)
+
+    # Shutdown is coordinated by the parent process through the stop event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    container = ApplicationContainer()
+    container.config.from_dict(config)
+    container.build.container.runner().run(stop)
+
+
+if __name__ == "__main__":
+    args, _ = p.parse_known_args()
+
+    container = ApplicationContainer()
+    container.config.from_dict(vars(args))
+
+    pool: BuildRunnerPool = container.build.container.workers()
+    pool.start()
+
+    try:
+        pool.join()
+    except KeyboardInterrupt:
+        log.info("Stopping build workers once their current jobs have finished...")
+        pool.stop(timeout=None)
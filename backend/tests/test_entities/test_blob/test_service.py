@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+
+from repograph.entities.blob.exceptions import BlobNotFoundError
+from repograph.entities.blob.service import BlobService
+
+
+class TestBlobService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.blobs = BlobService(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_put_and_get(self):
+        source = "def f(a):\n    return a\n" * 100
+        key = self.blobs.put(source)
+
+        self.assertEqual(key, BlobService.key(source))
+        self.assertTrue(self.blobs.contains(key))
+        self.assertEqual(self.blobs.get(key), source)
+
+        # The blob is compressed, and identical content is only stored once
+        path = os.path.join(self.directory, key[:2], key)
+        self.assertLess(os.path.getsize(path), len(source))
+        self.assertEqual(self.blobs.put(source), key)
+        self.assertEqual(os.listdir(os.path.join(self.directory, key[:2])), [key])
+
+    def test_get_zlib_blob(self):
+        """
+        Test that zlib blobs are readable whether or not zstandard is installed
+        """
+        key = BlobService.key("content")
+        os.makedirs(os.path.join(self.directory, key[:2]))
+        with open(os.path.join(self.directory, key[:2], key), "wb") as file:
+            file.write(zlib.compress(b"content"))
+
+        self.assertEqual(self.blobs.get(key), "content")
+
+    def test_get_missing(self):
+        self.assertFalse(self.blobs.contains("ab" * 32))
+        self.assertRaises(BlobNotFoundError, self.blobs.get, "ab" * 32)
+        self.assertRaises(BlobNotFoundError, BlobService().get, "ab" * 32)
+        self.assertFalse(BlobService().active)
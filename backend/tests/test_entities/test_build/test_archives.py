@@ -0,0 +1,138 @@
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from parameterized import parameterized
+
+from repograph.entities.build.archives import (
+    ExtractionLimits,
+    archive_stem,
+    extract_archive,
+    is_archive,
+    spool_upload,
+)
+from repograph.entities.build.exceptions import (
+    UnsafeArchiveError,
+    UnsupportedArchiveError,
+    UploadTooLargeError,
+)
+
+
+class TestArchives(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _zip(self, files: dict, name: str = "repo.zip") -> str:
+        path = os.path.join(self.directory, name)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for filename, content in files.items():
+                archive.writestr(filename, content)
+        return path
+
+    def _tar(self, files: dict, name: str = "repo.tar.gz") -> str:
+        path = os.path.join(self.directory, name)
+        with tarfile.open(path, "w:gz") as archive:
+            for filename, content in files.items():
+                info = tarfile.TarInfo(filename)
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+        return path
+
+    @parameterized.expand(
+        [
+            ["repo.zip", True, "repo"],
+            ["repo.tar.gz", True, "repo"],
+            ["repo.v1.tgz", True, "repo.v1"],
+            ["REPO.TAR", True, "REPO"],
+            ["repo.gz", False, "repo.gz"],
+            ["repo.py", False, "repo.py"],
+        ]
+    )
+    def test_is_archive(self, filename, expected, stem):
+        self.assertEqual(is_archive(filename), expected)
+        self.assertEqual(archive_stem(filename), stem)
+
+    def test_spool_upload(self):
+        destination = os.path.join(self.directory, "upload")
+        content = os.urandom(3 * 1024 * 1024 + 7)
+
+        digest, size = spool_upload(io.BytesIO(content), destination, len(content))
+
+        self.assertEqual(size, len(content))
+        with open(destination, "rb") as file:
+            self.assertEqual(file.read(), content)
+        self.assertRaises(
+            UploadTooLargeError,
+            spool_upload,
+            io.BytesIO(content),
+            destination,
+            len(content),
+            1,
+        )
+
+    @parameterized.expand([["_zip"], ["_tar"]])
+    def test_extract_single_root(self, create):
+        path = getattr(self, create)({"repo-main/a.py": b"x = 1", "repo-main/b/c.py": b""})
+
+        result = extract_archive(path, os.path.join(self.directory, "repo"))
+
+        self.assertEqual(result, os.path.join(self.directory, "repo", "repo-main"))
+        self.assertTrue(os.path.isfile(os.path.join(result, "b", "c.py")))
+
+    def test_extract_without_root(self):
+        path = self._zip({"a.py": b"x = 1", "b.py": b"y = 2"})
+
+        result = extract_archive(path, os.path.join(self.directory, "repo"))
+
+        self.assertEqual(result, os.path.join(self.directory, "repo"))
+
+    @parameterized.expand([["_zip"], ["_tar"]])
+    def test_extract_rejects_traversal(self, create):
+        path = getattr(self, create)({"../escaped.py": b"x = 1"})
+        destination = os.path.join(self.directory, "repo")
+
+        self.assertRaises(UnsafeArchiveError, extract_archive, path, destination)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "escaped.py")))
+        self.assertFalse(os.path.exists(destination))
+
+    @parameterized.expand([["_zip"], ["_tar"]])
+    def test_extract_rejects_bombs(self, create):
+        path = getattr(self, create)({"zeros": bytes(8 * 1024 * 1024)})
+        limits = ExtractionLimits(max_ratio=2.0, min_ratio_size=1024)
+
+        self.assertRaises(
+            UnsafeArchiveError,
+            extract_archive,
+            path,
+            os.path.join(self.directory, "repo"),
+            limits,
+        )
+
+    def test_extract_rejects_too_many_entries(self):
+        path = self._zip({f"{i}.py": b"" for i in range(10)})
+
+        self.assertRaises(
+            UnsafeArchiveError,
+            extract_archive,
+            path,
+            os.path.join(self.directory, "repo"),
+            ExtractionLimits(max_entries=5),
+        )
+
+    def test_extract_unsupported(self):
+        path = os.path.join(self.directory, "repo.zip")
+        with open(path, "wb") as file:
+            file.write(b"not an archive")
+
+        self.assertRaises(
+            UnsupportedArchiveError,
+            extract_archive,
+            path,
+            os.path.join(self.directory, "repo"),
+        )
@@ -0,0 +1,316 @@
+import unittest
+from parameterized import parameterized
+
+from evaluation.synthetic import WorkloadConfig, generate_workload
+from repograph.entities.build.buffer import (
+    COUNT_PROPERTY,
+    KEY_PROPERTY,
+    WEIGHTED_RELATIONSHIPS,
+    GraphBuffer,
+)
+from repograph.entities.build.builder import RepographBuilder
+from repograph.entities.build.exceptions import RepographBuildError
+from repograph.entities.build.sinks import MemoryGraphSink
+from repograph.entities.graph.models.base import InvalidRelationshipException
+from repograph.entities.graph.models.nodes import (
+    Argument,
+    Class,
+    Function,
+    Module,
+    Package,
+)
+from repograph.entities.graph.models.relationships import (
+    Calls,
+    Contains,
+    HasArgument,
+    HasMethod,
+)
+
+REPOSITORY_NAME = "REPOSITORY"
+
+
+class TestGraphBuffer(unittest.TestCase):
+    def test_node_properties(self):
+        """
+        Test that node properties are exposed as attributes, and None values are dropped
+        """
+        buffer = GraphBuffer()
+        node = buffer.node(
+            Function,
+            name="func",
+            canonical_name="module.func",
+            summarization=None,
+            repository_name=REPOSITORY_NAME,
+        )
+
+        self.assertTrue(node.has_label(Function))
+        self.assertFalse(node.has_label(Class))
+        self.assertEqual(node.name, "func")
+        self.assertEqual(node.canonical_name, "module.func")
+        self.assertIsNone(node.summarization)
+        self.assertNotIn("summarization", node.properties)
+
+    def test_add(self):
+        """
+        Test that only added nodes, and the endpoints of added relationships, are written
+        """
+        buffer = GraphBuffer()
+        module = buffer.node(Module, name="module", repository_name=REPOSITORY_NAME)
+        function = buffer.node(Function, name="func", repository_name=REPOSITORY_NAME)
+        buffer.node(Function, name="unused", repository_name=REPOSITORY_NAME)
+
+        buffer.add(
+            buffer.relationship(Contains, module, function, REPOSITORY_NAME), None
+        )
+
+        self.assertEqual(buffer.node_count, 2)
+        self.assertEqual(buffer.relationship_count, 1)
+        self.assertEqual({node.name for node in buffer.nodes()}, {"module", "func"})
+
+    def test_weighted_relationships(self):
+        """
+        Test that repeated calls between the same nodes are written once, with a count
+        """
+        buffer = GraphBuffer()
+        caller = buffer.node(Function, name="caller", repository_name=REPOSITORY_NAME)
+        callee = buffer.node(Function, name="callee", repository_name=REPOSITORY_NAME)
+        other = buffer.node(Function, name="other", repository_name=REPOSITORY_NAME)
+
+        for child in [callee, callee, other, callee]:
+            buffer.add(buffer.relationship(Calls, caller, child, REPOSITORY_NAME))
+
+        self.assertEqual(buffer.relationship_count, 2)
+        self.assertEqual(
+            [r.properties[COUNT_PROPERTY] for r in buffer.relationships()], [3, 1]
+        )
+
+    def test_weighted_relationships_in_build(self):
+        """
+        Test that a build has no parallel Calls or Imports relationships
+        """
+        config = WorkloadConfig.for_function_count(1000)
+        sink = MemoryGraphSink()
+        RepographBuilder(None, "tmp", config.name, None, None, sink=sink).build(
+            *generate_workload(config)
+        )
+
+        weighted = [
+            relationship
+            for relationship in sink.relationships
+            if relationship.type in WEIGHTED_RELATIONSHIPS
+        ]
+        identities = {(r.type, r.start, r.end) for r in weighted}
+        self.assertEqual(len(identities), len(weighted))
+        self.assertTrue(all(r.properties[COUNT_PROPERTY] >= 1 for r in weighted))
+        self.assertGreater(
+            sum(r.properties[COUNT_PROPERTY] for r in weighted), len(weighted)
+        )
+
+    def test_call_sites_counted_in_build(self):
+        """
+        Test that the Calls relationship of a function calling the same function from
+        several call sites counts each of them
+        """
+        config = WorkloadConfig.for_function_count(20)
+        directory_info, call_graph = generate_workload(config)
+        (files,) = call_graph.values()
+        files["synthetic/pkg_0/mod_0.py"]["functions"]["func_0"] = {
+            "local": ["len", "len", "print", "len"]
+        }
+
+        sink = MemoryGraphSink()
+        RepographBuilder(None, "tmp", config.name, None, None, sink=sink).build(
+            directory_info, call_graph
+        )
+
+        nodes = {node.handle: node for node in sink.nodes}
+        counts = {
+            nodes[r.end].properties["name"]: r.properties[COUNT_PROPERTY]
+            for r in sink.relationships
+            if r.type == "Calls"
+            and nodes[r.start].properties.get("canonical_name") == "pkg_0.mod_0.func_0"
+        }
+        self.assertEqual(counts, {"len": 3, "print": 1})
+
+    @parameterized.expand(
+        [
+            [HasMethod, Function, Class],
+            [Contains, Function, Package],
+        ]
+    )
+    def test_invalid_relationship(self, relationship, parent, child):
+        """
+        Test that relationships between disallowed node types are rejected
+        """
+        buffer = GraphBuffer()
+        parent_node = buffer.node(
+            parent, name="parent", repository_name=REPOSITORY_NAME
+        )
+        child_node = buffer.node(child, name="child", repository_name=REPOSITORY_NAME)
+
+        with self.assertRaises(InvalidRelationshipException):
+            buffer.relationship(relationship, parent_node, child_node, REPOSITORY_NAME)
+
+    def test_missing_node(self):
+        """
+        Test that relationships with a missing node are rejected
+        """
+        buffer = GraphBuffer()
+        function = buffer.node(Function, name="func", repository_name=REPOSITORY_NAME)
+
+        with self.assertRaises(ValueError):
+            buffer.relationship(Calls, function, None, REPOSITORY_NAME)
+
+    def test_to_subgraph(self):
+        """
+        Test conversion of the buffer into a py2neo Subgraph
+        """
+        buffer = GraphBuffer()
+        self.assertIsNone(buffer.to_subgraph())
+
+        caller = buffer.node(Function, name="caller", repository_name=REPOSITORY_NAME)
+        callee = buffer.node(Function, name="callee", repository_name=REPOSITORY_NAME)
+        buffer.add(buffer.relationship(Calls, caller, callee, REPOSITORY_NAME))
+
+        subgraph = buffer.to_subgraph()
+        self.assertEqual(len(subgraph.nodes), 2)
+        self.assertEqual(len(subgraph.relationships), 1)
+
+        relationship = next(iter(subgraph.relationships))
+        self.assertEqual(type(relationship).__name__, "Calls")
+        self.assertEqual(relationship.start_node["name"], "caller")
+        self.assertEqual(relationship.end_node["name"], "callee")
+        self.assertEqual(relationship["repository_name"], REPOSITORY_NAME)
+
+    def test_assign_keys(self):
+        """
+        Test that keys identify nodes by their identity, or by the node they attach to
+        """
+
+        def build(min_line_number):
+            buffer = GraphBuffer()
+            function = buffer.node(
+                Function,
+                name="func",
+                canonical_name="module.func",
+                min_line_number=min_line_number,
+                max_line_number=10,
+                repository_name=REPOSITORY_NAME,
+            )
+            for _ in range(2):
+                argument = buffer.node(
+                    Argument, name="arg", repository_name=REPOSITORY_NAME
+                )
+                buffer.add(
+                    buffer.relationship(
+                        HasArgument, function, argument, REPOSITORY_NAME
+                    )
+                )
+            buffer.assign_keys()
+            return [record.properties[KEY_PROPERTY] for record in buffer.nodes()] + [
+                record.properties[KEY_PROPERTY] for record in buffer.relationships()
+            ]
+
+        keys = build(1)
+        self.assertEqual(len(set(keys)), len(keys))
+        self.assertEqual(keys, build(1))
+
+        # Moving a function changes its key, and the keys of its arguments
+        self.assertTrue(set(keys).isdisjoint(build(2)))
+
+    def test_assign_keys_by_path(self):
+        """
+        Test that same-named modules in different directories get different keys
+        """
+        buffer = GraphBuffer()
+        modules = [
+            buffer.node(
+                Module,
+                name="utils",
+                canonical_name="utils",
+                path=path,
+                repository_name=REPOSITORY_NAME,
+            )
+            for path in ["a/utils.py", "b/utils.py"]
+        ]
+        buffer.add(*modules)
+        buffer.assign_keys()
+
+        self.assertNotEqual(
+            modules[0].properties[KEY_PROPERTY], modules[1].properties[KEY_PROPERTY]
+        )
+
+    def test_assign_keys_collision(self):
+        """
+        Test that different nodes with the same identity are an error
+        """
+        buffer = GraphBuffer()
+        for source_code in ["def func(): pass", "def func(): return 1"]:
+            buffer.add(
+                buffer.node(
+                    Function,
+                    name="func",
+                    canonical_name="module.func",
+                    min_line_number=1,
+                    max_line_number=10,
+                    source_code=source_code,
+                    repository_name=REPOSITORY_NAME,
+                )
+            )
+
+        with self.assertRaises(RepographBuildError):
+            buffer.assign_keys()
+
+    def test_assign_keys_merges_duplicates(self):
+        """
+        Test that identical nodes with the same identity, e.g. an object inferred from
+        two imports, are merged, along with their relationships
+        """
+        buffer = GraphBuffer()
+        caller = buffer.node(
+            Function,
+            name="caller",
+            canonical_name="module.caller",
+            repository_name=REPOSITORY_NAME,
+        )
+        callees = [
+            buffer.node(
+                Function,
+                name="callee",
+                canonical_name="other.callee",
+                inferred=True,
+                repository_name=REPOSITORY_NAME,
+            )
+            for _ in range(2)
+        ]
+        for callee in callees:
+            buffer.add(buffer.relationship(Calls, caller, callee, REPOSITORY_NAME))
+        buffer.assign_keys()
+
+        self.assertEqual(buffer.node_count, 2)
+        self.assertEqual([node.name for node in buffer.nodes()], ["caller", "callee"])
+        relationships = list(buffer.relationships())
+        self.assertEqual(len(relationships), 1)
+        self.assertEqual(relationships[0].end, callees[0].handle)
+        self.assertEqual(relationships[0].properties[COUNT_PROPERTY], 2)
+
+    def test_assign_keys_is_deterministic(self):
+        """
+        Test that building the same input always assigns the same, unique, keys
+        """
+        config = WorkloadConfig.for_function_count(200)
+
+        def build():
+            sink = MemoryGraphSink()
+            RepographBuilder(None, "tmp", config.name, None, None, sink=sink).build(
+                *generate_workload(config)
+            )
+            return [node.properties[KEY_PROPERTY] for node in sink.nodes], [
+                relationship.properties[KEY_PROPERTY]
+                for relationship in sink.relationships
+            ]
+
+        nodes, relationships = build()
+        self.assertEqual(len(set(nodes)), len(nodes))
+        self.assertEqual(len(set(relationships)), len(relationships))
+        self.assertEqual((nodes, relationships), build())
@@ -0,0 +1,207 @@
+import shutil
+import tempfile
+import unittest
+from parameterized import parameterized
+
+from evaluation.synthetic import WorkloadConfig, generate_workload
+from repograph.entities.blob.service import BlobService
+from repograph.entities.graph.utils import shared_node_key
+from repograph.entities.build.builder import RepographBuilder
+from repograph.entities.build.sinks import MemoryGraphSink
+from repograph.entities.graph.models.nodes import Docstring
+
+
+class TestRepographBuilder(unittest.TestCase):
+    def test_synthetic_workload_is_deterministic(self):
+        """
+        Test that the synthetic workload generator is deterministic for a given seed
+        """
+        config = WorkloadConfig.for_function_count(200)
+        self.assertEqual(generate_workload(config), generate_workload(config))
+
+    @parameterized.expand([[100], [1000]])
+    def test_build_synthetic_workload(self, functions):
+        """
+        Test building a synthetic workload into an in-memory sink
+        """
+        config = WorkloadConfig.for_function_count(functions)
+        directory_info, call_graph = generate_workload(config)
+
+        sink = MemoryGraphSink()
+        builder = RepographBuilder(None, "tmp", config.name, None, None, sink=sink)
+        builder.build(directory_info, call_graph)
+
+        labels = [node.label for node in sink.nodes]
+        types = {relationship.type for relationship in sink.relationships}
+
+        # Every generated function and method, plus the called built-ins
+        self.assertGreaterEqual(labels.count("Function"), config.function_count)
+        self.assertEqual(
+            labels.count("Class"),
+            config.directories
+            * config.modules_per_directory
+            * config.classes_per_module,
+        )
+        self.assertEqual(labels.count("Repository"), 1)
+        self.assertEqual(builder.instrumentation.phases[-1].nodes, sink.node_count)
+        self.assertEqual(
+            sum(phase.nodes for phase in builder.instrumentation.phases[:-1]),
+            sink.node_count,
+        )
+        self.assertTrue({"Calls", "Imports", "Extends", "HasMethod"}.issubset(types))
+        self.assertEqual(
+            [phase.name for phase in builder.instrumentation.phases],
+            [
+                "repository",
+                "directories",
+                "dependencies",
+                "call_graph",
+                "extends",
+                "readme",
+                "commit",
+            ],
+        )
+
+    @parameterized.expand([[False], [True]])
+    def test_build_blob_store(self, skip_ast):
+        """
+        Test that source code and ASTs are moved to the blob store
+        """
+        config = WorkloadConfig.for_function_count(100)
+        directory_info, _ = generate_workload(config)
+        sources = {
+            info["source_code"]
+            for files in directory_info.values()
+            if isinstance(files, list)
+            for file in files
+            for info in file.get("functions", {}).values()
+        }
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        blobs = BlobService(directory)
+
+        sink = MemoryGraphSink()
+        RepographBuilder(
+            None,
+            "tmp",
+            config.name,
+            None,
+            None,
+            sink=sink,
+            blobs=blobs,
+            skip_ast=skip_ast,
+        ).build(*generate_workload(config))
+
+        functions = [
+            node
+            for node in sink.nodes
+            if node.label == "Function" and not node.properties.get("builtin")
+        ]
+        self.assertGreaterEqual(len(functions), config.function_count)
+        for function in functions:
+            self.assertNotIn("source_code", function.properties)
+            self.assertNotIn("ast", function.properties)
+            self.assertEqual(skip_ast, "ast_hash" not in function.properties)
+
+        stored = {blobs.get(function.source_hash) for function in functions}
+        self.assertTrue(sources.issubset(stored))
+
+    def test_build_compact_schema(self):
+        """
+        Test that the compact schema stores arguments and return values as properties
+        """
+        config = WorkloadConfig.for_function_count(200)
+
+        def build(compact):
+            sink = MemoryGraphSink()
+            RepographBuilder(
+                None, "tmp", config.name, None, None, sink=sink, compact=compact
+            ).build(*generate_workload(config))
+            return sink
+
+        full = build(False)
+        compact = build(True)
+
+        labels = {node.label for node in compact.nodes}
+        self.assertTrue({"Argument", "ReturnValue"}.isdisjoint(labels))
+        self.assertTrue(
+            {"HasArgument", "Returns"}.isdisjoint(
+                {relationship.type for relationship in compact.relationships}
+            )
+        )
+
+        arguments = [node for node in full.nodes if node.label == "Argument"]
+        return_values = [node for node in full.nodes if node.label == "ReturnValue"]
+        self.assertEqual(
+            compact.node_count, full.node_count - len(arguments) - len(return_values)
+        )
+
+        functions = [node for node in compact.nodes if node.source_code]
+        self.assertEqual(
+            sum(len(node.argument_names) for node in functions), len(arguments)
+        )
+        self.assertEqual(
+            sum(len(node.return_value_names) for node in functions), len(return_values)
+        )
+        for node in functions:
+            self.assertEqual(len(node.argument_names), len(node.argument_types))
+
+    def test_build_shared_nodes(self):
+        """
+        Test that built-in and external nodes have the same keys in every repository
+        """
+        config = WorkloadConfig.for_function_count(200)
+
+        def build(repository_name):
+            sink = MemoryGraphSink()
+            RepographBuilder(
+                None, "tmp", repository_name, None, None, sink=sink
+            ).build(*generate_workload(config))
+            return {
+                node.key: node for node in sink.nodes if node.shared
+            }, sink
+
+        first, first_sink = build("first")
+        second, _ = build("second")
+
+        self.assertTrue(first)
+        self.assertEqual(first.keys(), second.keys())
+        for key, node in first.items():
+            self.assertIsNone(node.repository_name)
+            self.assertEqual(key, shared_node_key(node.label, node.canonical_name))
+
+        builtins = [node for node in first_sink.nodes if node.builtin]
+        self.assertTrue(builtins)
+        self.assertTrue(all(node.key in first for node in builtins))
+        self.assertEqual(
+            len({node.canonical_name for node in builtins}), len(builtins)
+        )
+
+    def test_inline_docstring_parts(self):
+        """
+        Test that docstring parts are stored as properties, with missing values as ""
+        """
+        sink = MemoryGraphSink()
+        builder = RepographBuilder(None, "tmp", "name", None, None, sink=sink)
+        docstring = builder.buffer.node(Docstring, short_description="Description.")
+
+        builder._inline_docstring_parts(
+            {
+                "args": {
+                    "a": {"type_name": "int", "description": "A.", "is_optional": True},
+                    "b": {"description": "B."},
+                },
+                "returns": {"type_name": "str"},
+                "raises": [{"type_name": "ValueError"}],
+            },
+            docstring,
+        )
+
+        self.assertEqual(docstring.argument_names, ["a", "b"])
+        self.assertEqual(docstring.argument_types, ["int", ""])
+        self.assertEqual(docstring.argument_optional, [True, False])
+        self.assertEqual(docstring.returns_type, "str")
+        self.assertNotIn("returns_name", docstring.properties)
+        self.assertEqual(docstring.raises_types, ["ValueError"])
+        self.assertEqual(docstring.raises_descriptions, [""])
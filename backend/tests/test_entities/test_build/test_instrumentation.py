@@ -0,0 +1,77 @@
+import resource
+import subprocess
+import sys
+import unittest
+
+from repograph.entities.build.buffer import GraphBuffer
+from repograph.entities.build.instrumentation import BuildInstrumentation
+from repograph.entities.graph.models.nodes import Function
+
+REPOSITORY_NAME = "REPOSITORY"
+
+
+class TestBuildInstrumentation(unittest.TestCase):
+    def test_phase(self):
+        """
+        Test that a phase records time and the nodes emitted to the buffer
+        """
+        buffer = GraphBuffer()
+        instrumentation = BuildInstrumentation()
+
+        with instrumentation.phase("parse", buffer):
+            buffer.add(
+                buffer.node(Function, name="a", repository_name=REPOSITORY_NAME),
+                buffer.node(Function, name="b", repository_name=REPOSITORY_NAME),
+            )
+            sum(range(10000))
+
+        self.assertEqual(len(instrumentation.phases), 1)
+        phase = instrumentation.phases[0]
+        self.assertEqual(phase.name, "parse")
+        self.assertEqual(phase.nodes, 2)
+        self.assertEqual(phase.relationships, 0)
+        self.assertGreater(phase.wall_time, 0)
+        self.assertGreaterEqual(phase.cpu_time, 0)
+        self.assertGreaterEqual(phase.peak_memory_delta, 0)
+
+    def test_child_cpu_time(self):
+        """
+        Test that the CPU time of child processes, e.g. inspect4py, is recorded
+        """
+        instrumentation = BuildInstrumentation()
+
+        before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        with instrumentation.phase("extraction"):
+            subprocess.check_call([sys.executable, "-c", "sum(range(10 ** 7))"])
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+        child_cpu_time = (after.ru_utime + after.ru_stime) - (
+            before.ru_utime + before.ru_stime
+        )
+        self.assertGreater(child_cpu_time, 0)
+        self.assertGreaterEqual(instrumentation.phases[0].cpu_time, child_cpu_time)
+
+    def test_accumulate(self):
+        """
+        Test that a phase recorded twice for the same input accumulates
+        """
+        instrumentation = BuildInstrumentation()
+
+        instrumentation.start("commit")
+        instrumentation.stop("commit", nodes=3, relationships=1)
+        instrumentation.start("commit")
+        instrumentation.stop("commit", nodes=2)
+
+        # Stopping a phase that isn't running is ignored
+        self.assertIsNone(instrumentation.stop("commit", nodes=100))
+
+        instrumentation.input_index = 1
+        with instrumentation.phase("commit"):
+            pass
+
+        self.assertEqual(
+            [(phase.name, phase.input_index) for phase in instrumentation.phases],
+            [("commit", 0), ("commit", 1)],
+        )
+        self.assertEqual(instrumentation.phases[0].nodes, 5)
+        self.assertEqual(instrumentation.phases[0].relationships, 1)
@@ -0,0 +1,120 @@
+import threading
+import time
+import unittest
+from parameterized import parameterized
+
+from evaluation.synthetic import WorkloadConfig, generate_workload
+from repograph.entities.build.buffer import KEY_PROPERTY, GraphBuffer
+from repograph.entities.build.builder import RepographBuilder
+from repograph.entities.build.pipeline import SummarizationPipeline
+from repograph.entities.build.sinks import MemoryGraphSink
+from repograph.entities.graph.models.nodes import Docstring, Function
+
+
+def summarize(function):
+    time.sleep(0.001)
+    return f"Summary of {function.name}."
+
+
+class CountingGraphSink(MemoryGraphSink):
+    def __init__(self, incremental):
+        super().__init__()
+        self.incremental = incremental
+        self.writes = 0
+
+    def write(self, buffer):
+        self.writes += 1
+        super().write(buffer)
+
+
+class TestSummarizationPipeline(unittest.TestCase):
+    def build(self, workers, incremental=True):
+        config = WorkloadConfig.for_function_count(200)
+        sink = CountingGraphSink(incremental)
+        RepographBuilder(
+            summarize,
+            "tmp",
+            config.name,
+            None,
+            None,
+            sink=sink,
+            summarization_workers=workers,
+        ).build(*generate_workload(config))
+        return sink
+
+    @parameterized.expand([[1, True], [4, True], [4, False]])
+    def test_build_matches_sequential(self, workers, incremental):
+        """
+        Test that a pipelined build writes the same graph as summarizing during parsing
+        """
+        sequential = self.build(0)
+        pipelined = self.build(workers, incremental)
+
+        def contents(sink):
+            return (
+                sorted(
+                    (node.properties[KEY_PROPERTY], node.summarization)
+                    for node in sink.nodes
+                ),
+                sorted(r.properties[KEY_PROPERTY] for r in sink.relationships),
+            )
+
+        self.assertEqual(contents(pipelined), contents(sequential))
+        self.assertEqual(sequential.writes, 1)
+        self.assertEqual(pipelined.writes > 1, incremental)
+
+        summaries = [node.summarization for node in pipelined.nodes]
+        self.assertEqual(
+            len([summary for summary in summaries if summary]),
+            len([node for node in pipelined.nodes if node.label == "Docstring"]),
+        )
+
+    def test_backpressure(self):
+        """
+        Test that submitting blocks once the maximum number of functions are waiting
+        """
+        release = threading.Event()
+
+        def blocking_summarize(function):
+            release.wait()
+            return function.name
+
+        buffer = GraphBuffer()
+        pipeline = SummarizationPipeline(blocking_summarize, workers=1, max_pending=2)
+        records = [
+            (buffer.node(Function, name=str(i)), buffer.node(Docstring))
+            for i in range(4)
+        ]
+
+        # One function is being summarized and two are waiting, so the last one blocks
+        submitter = threading.Thread(
+            target=lambda: [pipeline.submit(*record) for record in records]
+        )
+        submitter.start()
+        submitter.join(0.2)
+        self.assertTrue(submitter.is_alive())
+
+        release.set()
+        submitter.join()
+        pipeline.join()
+        pipeline.close()
+
+        self.assertEqual(
+            [docstring.summarization for _, docstring in records], ["0", "1", "2", "3"]
+        )
+
+    def test_summarization_error(self):
+        """
+        Test that summarization errors fail the build
+        """
+
+        def failing_summarize(function):
+            raise ValueError(function.name)
+
+        config = WorkloadConfig.for_function_count(100)
+        builder = RepographBuilder(
+            failing_summarize, "tmp", config.name, None, None, sink=MemoryGraphSink()
+        )
+
+        self.assertRaises(ValueError, builder.build, *generate_workload(config))
+        self.assertEqual(builder.pipeline._threads, [])
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from repograph.entities.build.exceptions import (
+    BuildNotFoundError,
+    JobNotCancellableError,
+    JobNotFoundError,
+)
+from repograph.entities.build.queue import BuildQueue
+from repograph.entities.metadata.repository import MetadataRepository
+from repograph.entities.metadata.service import MetadataService
+
+
+class TestBuildQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.metadata = MetadataService(
+            MetadataRepository(os.path.join(self.directory, "test.db"))
+        )
+        self.queue = BuildQueue(self.metadata)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_submit_deduplicates_queued_jobs(self):
+        job, created = self.queue.submit(["/input"], "test", "description")
+        duplicate, duplicate_created = self.queue.submit(
+            ["/input"], "test", "description"
+        )
+        other, other_created = self.queue.submit(["/other"], "test", "description")
+
+        self.assertTrue(created)
+        self.assertFalse(duplicate_created)
+        self.assertEqual(duplicate.id, job.id)
+        self.assertTrue(other_created)
+        self.assertEqual(len(self.queue.list_jobs("queued")), 2)
+
+    def test_cancel_queued_job(self):
+        upload = os.path.join(self.directory, "upload")
+        os.makedirs(upload)
+        job, _ = self.queue.submit(["/input"], "test", "description", cleanup=[upload])
+
+        self.assertEqual(self.queue.cancel(job.id).status, "CANCELLED")
+        self.assertFalse(os.path.exists(upload))
+        self.assertIsNone(self.metadata.claim_job("worker"))
+        self.assertRaises(JobNotCancellableError, self.queue.cancel, job.id)
+        self.assertRaises(JobNotFoundError, self.queue.cancel, "missing")
+
+    def test_cancel_running_job(self):
+        job, _ = self.queue.submit(["/input"], "test", "description")
+        self.metadata.claim_job("worker")
+
+        result = self.queue.cancel(job.id)
+        self.assertEqual(result.status, "RUNNING")
+        self.assertTrue(result.cancel_requested)
+
+    def test_get_missing_build(self):
+        self.assertRaises(BuildNotFoundError, self.queue.get_build, "missing")
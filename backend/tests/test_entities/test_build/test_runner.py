@@ -0,0 +1,178 @@
+import datetime
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import zipfile
+from unittest.mock import MagicMock
+
+from repograph.entities.build.queue import BuildQueue
+from repograph.entities.build.runner import BuildRunner, BuildRunnerPool
+from repograph.entities.build.service import BuildService
+from repograph.entities.metadata.models import Build, BuildPhase, BuildWorker
+from repograph.entities.metadata.repository import MetadataRepository
+from repograph.entities.metadata.service import MetadataService
+
+
+class TestBuildRunner(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.metadata = MetadataService(
+            MetadataRepository(os.path.join(self.directory, "test.db"))
+        )
+        self.serviceMock = MagicMock(autospec=BuildService)
+        self.serviceMock.build.return_value = Build(
+            id="build", neo4j_name="test", status="SUCCEEDED"
+        )
+        self.queue = BuildQueue(self.metadata)
+        self.runner = BuildRunner(
+            self.serviceMock, self.metadata, poll_interval=0.01, heartbeat_interval=0.01
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _wait_for_status(self, job_id: str, status: str) -> None:
+        for _ in range(500):
+            if self.queue.get_job(job_id).status == status:
+                return
+            time.sleep(0.01)
+
+    def test_run_next(self):
+        upload = os.path.join(self.directory, "upload")
+        os.makedirs(upload)
+        job, _ = self.queue.submit(["/input"], "test", "description", cleanup=[upload])
+
+        self.assertTrue(self.runner.run_next("worker"))
+        self.assertFalse(self.runner.run_next("worker"))
+
+        result = self.queue.get_job(job.id)
+        self.assertEqual(result.status, "SUCCEEDED")
+        self.assertEqual(result.progress, 1.0)
+        self.assertFalse(os.path.exists(upload))
+        self.assertEqual(self.serviceMock.build.call_args.kwargs["build_id"], job.id)
+
+    def test_run_archive_job(self):
+        upload = os.path.join(self.directory, "upload")
+        os.makedirs(upload)
+        archive = os.path.join(upload, "repo.zip")
+        with zipfile.ZipFile(archive, "w") as file:
+            file.writestr("repo-main/a.py", "x = 1")
+
+        inputs = []
+        self.serviceMock.build.side_effect = lambda paths, *args, **kwargs: (
+            inputs.extend(paths) or self.serviceMock.build.return_value
+        )
+        job, _ = self.queue.submit([archive], "test", "description", cleanup=[upload])
+        self.runner.run_next("worker")
+
+        self.assertEqual(self.queue.get_job(job.id).status, "SUCCEEDED")
+        self.assertEqual(inputs, [os.path.join(upload, "repo", "repo-main")])
+        self.assertFalse(os.path.exists(upload))
+
+    def test_run_failing_job(self):
+        self.serviceMock.build.side_effect = RuntimeError("inspect4py failed")
+        job, _ = self.queue.submit(["/input"], "test", "description")
+
+        self.runner.run_next("worker")
+
+        result = self.queue.get_job(job.id)
+        self.assertEqual(result.status, "FAILED")
+        self.assertEqual(result.message, "inspect4py failed")
+
+    def test_cancel_running_job(self):
+        job, _ = self.queue.submit(["/input"], "test", "description")
+
+        def build(*args, progress=None, **kwargs):
+            progress(0.25, "call_graph")
+            self.queue.cancel(job.id)
+            progress(0.5, "extends")
+            self.fail("Progress callback didn't raise after cancellation")
+
+        self.serviceMock.build.side_effect = build
+        self.runner.run_next("worker")
+
+        result = self.queue.get_job(job.id)
+        self.assertEqual(result.status, "CANCELLED")
+        self.assertEqual(result.phase, "extends")
+        self.assertIsNone(result.message)
+
+    def test_requeue_stale_jobs(self):
+        stale = datetime.datetime.now() - datetime.timedelta(minutes=5)
+        self.metadata.register_worker(
+            BuildWorker(id="dead", host="host", pid=1, heartbeat=stale)
+        )
+        self.metadata.register_worker(BuildWorker(id="alive", host="host", pid=2))
+        dead_job, _ = self.queue.submit(["/dead"], "test", "description")
+        self.metadata.claim_job("dead")
+        alive_job, _ = self.queue.submit(["/alive"], "test", "description")
+        self.metadata.claim_job("alive")
+
+        self.assertEqual(self.runner.requeue_stale_jobs(), 1)
+        self.assertEqual(self.queue.get_job(dead_job.id).status, "QUEUED")
+        self.assertEqual(self.queue.get_job(alive_job.id).status, "RUNNING")
+
+    def test_rerun_requeued_job(self):
+        """
+        Test that a job requeued after its worker died can be built again under the
+        same build ID
+        """
+
+        def build(*args, build_id=None, **kwargs):
+            started = Build(id=build_id, neo4j_name="test")
+            self.metadata.register_build(started)
+            return self.metadata.complete_build(started, "SUCCEEDED", [])
+
+        self.serviceMock.build.side_effect = build
+        job, _ = self.queue.submit(["/input"], "test", "description")
+
+        # The first attempt registers its build, then its worker dies
+        self.metadata.claim_job("dead")
+        self.metadata.register_build(
+            Build(id=job.id, neo4j_name="test", phases=[BuildPhase(name="extraction")])
+        )
+        self.metadata.requeue_interrupted_jobs()
+
+        self.assertTrue(self.runner.run_next("worker"))
+        self.assertEqual(self.queue.get_job(job.id).status, "SUCCEEDED")
+
+        builds = self.metadata.get_builds("test")
+        self.assertEqual([b.id for b in builds], [job.id])
+        self.assertEqual(builds[0].status, "SUCCEEDED")
+        self.assertEqual(builds[0].phases, [])
+
+    def test_run_registers_worker(self):
+        stop = threading.Event()
+        thread = threading.Thread(target=self.runner.run, args=(stop,))
+        thread.start()
+
+        job, _ = self.queue.submit(["/input"], "test", "description")
+        self._wait_for_status(job.id, "SUCCEEDED")
+        workers = self.queue.list_workers()
+
+        stop.set()
+        thread.join()
+
+        self.assertEqual(self.queue.get_job(job.id).status, "SUCCEEDED")
+        self.assertEqual(len(workers), 1)
+        self.assertEqual(self.queue.get_job(job.id).worker, workers[0].id)
+        self.assertEqual(self.queue.list_workers(), [])
+
+    def test_thread_pool(self):
+        pool = BuildRunnerPool(lambda: self.runner, {}, workers=2, mode="thread")
+        pool.start()
+
+        jobs = [
+            self.queue.submit([f"/input_{i}"], "test", "description")[0]
+            for i in range(4)
+        ]
+        for job in jobs:
+            self._wait_for_status(job.id, "SUCCEEDED")
+        pool.stop()
+
+        self.assertEqual(
+            [self.queue.get_job(job.id).status for job in jobs], ["SUCCEEDED"] * 4
+        )
+        self.assertRaises(ValueError, BuildRunnerPool, lambda: self.runner, {}, 1, "x")
@@ -1,14 +1,19 @@
 import datetime
 import os
+import shutil
+import subprocess
+import tempfile
 import unittest
 from unittest.mock import MagicMock
 from parameterized import parameterized
 
 from py2neo import Transaction
 
+from repograph.entities.build.instrumentation import BuildInstrumentation
 from repograph.entities.build.service import BuildService
+from repograph.entities.graph.models.graph import RepositoryCopy
 from repograph.entities.graph.service import GraphService
-from repograph.entities.metadata.models import Graph
+from repograph.entities.metadata.models import Graph, RepositoryFingerprint
 from repograph.entities.metadata.service import MetadataService
 
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -21,6 +26,7 @@ class TestBuildService(unittest.TestCase):
         self.summarizeMock = MagicMock()
         self.summarizeMock.summarize_function.return_value = "FAKE SUMMARIZATION"
         self.summarizeMock.active = True
+        self.summarizeMock.replicas = 0
         self.txMock = MagicMock(autospec=Transaction)
         self.graphMock = MagicMock(autospec=GraphService)
         self.metadataMock = MagicMock(autospec=MetadataService)
@@ -91,3 +97,169 @@ class TestBuildService(unittest.TestCase):
             self.service.build(paths, "name", "description", prune=True)
         except Exception:
             self.fail("Test failed with exception")
+
+    def test_build_reuses_identical_repository(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = os.path.join(directory, "repo")
+        os.makedirs(path)
+        with open(os.path.join(path, "main.py"), "w") as file:
+            file.write("x = 1")
+
+        self.graphMock.get_transaction.return_value = self.txMock
+        self.graphMock.get_system_transaction.return_value.__enter__.return_value = (
+            MagicMock(),
+            MagicMock(),
+        )
+        self.graphMock.create_graph.return_value = Graph(
+            name="name",
+            neo4j_name="name",
+            description="description",
+            created=datetime.datetime.now(),
+        )
+        self.graphMock.copy_repository.return_value = RepositoryCopy(
+            source_graph="other", target_graph="name", repository_name="repo"
+        )
+        self.metadataMock.find_repositories_by_fingerprint.return_value = [
+            RepositoryFingerprint(neo4j_name="other", name="repo", fingerprint="hash")
+        ]
+        self.service.call_inspect4py = MagicMock()
+
+        self.service.build([path, path], "name", "description")
+
+        self.graphMock.copy_repository.assert_called_once_with(
+            "other", "name", "repo", tx=self.txMock.__enter__.return_value
+        )
+        self.service.call_inspect4py.assert_not_called()
+        recorded = self.metadataMock.record_repository_fingerprint.call_args.args[0]
+        self.assertEqual((recorded.neo4j_name, recorded.name), ("name", "repo"))
+
+    def test_build_skips_repository_in_graph(self):
+        """
+        Test that uploading the same repository to a graph again doesn't rebuild it
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        with open(os.path.join(directory, "main.py"), "w") as file:
+            file.write("x = 1")
+
+        graph = Graph(
+            name="name",
+            neo4j_name="name",
+            description="description",
+            created=datetime.datetime.now(),
+        )
+        recorded = []
+        self.metadataMock.record_repository_fingerprint.side_effect = recorded.append
+        self.metadataMock.find_repositories_by_fingerprint.side_effect = lambda f: [
+            fingerprint for fingerprint in recorded if fingerprint.fingerprint == f
+        ]
+        self.metadataMock.get_all_graph_listings.side_effect = lambda: (
+            [graph] if recorded else []
+        )
+        self.graphMock.get_transaction.return_value = self.txMock
+        self.graphMock.get_system_transaction.return_value.__enter__.return_value = (
+            MagicMock(),
+            MagicMock(),
+        )
+        self.graphMock.create_graph.return_value = graph
+        self.service.build_repository = MagicMock(return_value="repo")
+
+        for _ in range(2):
+            self.service.build([directory], "name", "description")
+
+        self.service.build_repository.assert_called_once()
+        self.graphMock.copy_repository.assert_not_called()
+        self.assertEqual(self.metadataMock.complete_build.call_args.args[1], "SUCCEEDED")
+
+    def test_build_records_policy_stats(self):
+        """
+        Test that how the functions of each repository were summarized is recorded
+        with the build
+        """
+        directories = []
+        for content in ["x = 1", "x = 2"]:
+            directory = tempfile.mkdtemp()
+            self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+            with open(os.path.join(directory, "main.py"), "w") as file:
+                file.write(content)
+            directories.append(directory)
+
+        self.metadataMock.get_all_graph_listings.return_value = []
+        self.metadataMock.find_repositories_by_fingerprint.return_value = []
+        self.graphMock.get_transaction.return_value = self.txMock
+        self.graphMock.get_system_transaction.return_value.__enter__.return_value = (
+            MagicMock(),
+            MagicMock(),
+        )
+        self.graphMock.create_graph.return_value = Graph(
+            name="name",
+            neo4j_name="name",
+            description="description",
+            created=datetime.datetime.now(),
+        )
+
+        def build_repository(*args, policy_stats, **kwargs):
+            policy_stats.summarized += 2
+            policy_stats.skipped_documented += 1
+            return "repo"
+
+        self.service.build_repository = MagicMock(side_effect=build_repository)
+        self.service.build(directories, "name", "description")
+
+        self.assertEqual(
+            self.metadataMock.complete_build.call_args.args[3],
+            dict(summarized=4, cascaded=0, skipped_short=0, skipped_documented=2),
+        )
+
+    @parameterized.expand([[True], [False]])
+    def test_failed_build_deletes_only_new_graph(self, exists):
+        """
+        Test that a build with no successful repositories only deletes the graph if it
+        created it
+        """
+        graph = Graph(
+            name="name",
+            neo4j_name="name",
+            description="description",
+            created=datetime.datetime.now(),
+        )
+        self.metadataMock.get_all_graph_listings.return_value = [graph] if exists else []
+        self.metadataMock.find_repositories_by_fingerprint.return_value = []
+        self.graphMock.get_transaction.return_value = self.txMock
+        self.graphMock.get_system_transaction.return_value.__enter__.return_value = (
+            MagicMock(),
+            MagicMock(),
+        )
+        self.graphMock.create_graph.return_value = graph
+        # Like GraphService.get_transaction, roll back and suppress the error
+        self.txMock.__exit__.return_value = True
+        self.service.call_inspect4py = MagicMock(
+            side_effect=subprocess.CalledProcessError(1, "inspect4py")
+        )
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.service.build([directory], "name", "description")
+
+        if exists:
+            self.graphMock.delete_graph.assert_not_called()
+        else:
+            self.graphMock.delete_graph.assert_called_once_with("name")
+        self.assertEqual(self.metadataMock.complete_build.call_args.args[1], "FAILED")
+
+    def test_score_docstrings(self):
+        """
+        Test that docstrings are scored after building, and scoring errors are ignored
+        """
+        searchMock = MagicMock()
+        searchMock.score_docstrings.side_effect = RuntimeError("encode failed")
+        service = BuildService(
+            self.graphMock, self.summarizeMock, self.metadataMock, search=searchMock
+        )
+        instrumentation = BuildInstrumentation()
+
+        service.score_docstrings("name", instrumentation)
+
+        searchMock.score_docstrings.assert_called_once_with("name")
+        self.assertEqual(instrumentation.phases[0].name, "docstring_similarity")
@@ -0,0 +1,187 @@
+import csv
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+from parameterized import parameterized
+
+from evaluation.synthetic import WorkloadConfig, generate_workload
+from repograph.entities.build.buffer import GraphBuffer
+from repograph.entities.build.builder import RepographBuilder
+from repograph.entities.build.exceptions import RepographBuildError
+from repograph.entities.build.sinks import (
+    CSV_ARRAY_DELIMITER,
+    CsvGraphSink,
+    MemoryGraphSink,
+)
+from repograph.entities.graph.models.nodes import Function, Module
+from repograph.entities.graph.models.relationships import Contains
+
+
+def read_csv_files(files):
+    """Read the rows of CSV file groups, keyed by label/type."""
+    rows = dict()
+    for (name, _), (header, data) in files.items():
+        with open(header, newline="") as file:
+            columns = next(csv.reader(file))
+        with open(data, newline="") as file:
+            rows.setdefault(name, []).extend(
+                dict(zip(columns, row)) for row in csv.reader(file)
+            )
+    return rows
+
+
+class TestCsvGraphSink(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_export_matches_builder_output(self):
+        config = WorkloadConfig.for_function_count(200)
+
+        # The builder consumes its input, so each build is given a fresh copy
+        memory = MemoryGraphSink()
+        RepographBuilder(None, "tmp", config.name, None, None, sink=memory).build(
+            *generate_workload(config)
+        )
+
+        sink = CsvGraphSink(self.directory)
+        RepographBuilder(None, "tmp", config.name, None, None, sink=sink).build(
+            *generate_workload(config)
+        )
+
+        nodes = read_csv_files(sink.node_files)
+        relationships = read_csv_files(sink.relationship_files)
+
+        self.assertEqual(sink.node_count, memory.node_count)
+        self.assertEqual(sink.relationship_count, memory.relationship_count)
+
+        # Every node is written once, under its label, with its properties
+        exported = {
+            row[":ID(Node)"]: row for label_rows in nodes.values() for row in label_rows
+        }
+        self.assertEqual(len(exported), memory.node_count)
+        for node in memory.nodes:
+            if node.shared:
+                row = exported[f"shared:{node.key}"]
+            else:
+                row = exported[f"{config.name}:{node.handle}"]
+            self.assertEqual(row[":LABEL"], node.label)
+            for key, value in node.properties.items():
+                column = next(c for c in row if c.split(":")[0] == key)
+                if isinstance(value, bool):
+                    value = str(value).lower()
+                self.assertEqual(row[column], str(value))
+
+        # Every relationship connects exported nodes
+        self.assertEqual(
+            sum(len(rows) for rows in relationships.values()),
+            memory.relationship_count,
+        )
+        for rel_type, rows in relationships.items():
+            for row in rows:
+                self.assertEqual(row[":TYPE"], rel_type)
+                self.assertIn(row[":START_ID(Node)"], exported)
+                self.assertIn(row[":END_ID(Node)"], exported)
+
+    def test_shared_nodes_written_once(self):
+        """
+        Test that the shared nodes of several repositories are only exported once
+        """
+        config = WorkloadConfig.for_function_count(100)
+
+        memory = MemoryGraphSink()
+        RepographBuilder(None, "tmp", config.name, None, None, sink=memory).build(
+            *generate_workload(config)
+        )
+        shared_count = len([node for node in memory.nodes if node.shared])
+
+        sink = CsvGraphSink(self.directory)
+        for _ in range(2):
+            RepographBuilder(None, "tmp", config.name, None, None, sink=sink).build(
+                *generate_workload(config)
+            )
+
+        nodes = read_csv_files(sink.node_files)
+        ids = [row[":ID(Node)"] for rows in nodes.values() for row in rows]
+
+        self.assertGreater(shared_count, 0)
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(len([i for i in ids if i.startswith("shared:")]), shared_count)
+        self.assertEqual(len(ids), 2 * memory.node_count - shared_count)
+
+        # Relationships of the second repository link to the first one's shared nodes
+        ids = set(ids)
+        relationships = read_csv_files(sink.relationship_files)
+        for rows in relationships.values():
+            for row in rows:
+                self.assertIn(row[":START_ID(Node)"], ids)
+                self.assertIn(row[":END_ID(Node)"], ids)
+
+    def test_import_command(self):
+        buffer = GraphBuffer()
+        module = buffer.node(Module, name="main", repository_name="repo")
+        function = buffer.node(Function, name="f", repository_name="repo")
+        buffer.add(buffer.relationship(Contains, module, function, "repo"))
+
+        sink = CsvGraphSink(self.directory)
+        sink.write(buffer)
+        command = sink.import_command("graph")
+
+        self.assertEqual(command[:4], ["neo4j-admin", "database", "import", "full"])
+        self.assertEqual(command[-1], "graph")
+        self.assertIn(
+            "--nodes=Function="
+            + os.path.join(self.directory, "nodes_Function_0_header.csv")
+            + ","
+            + os.path.join(self.directory, "nodes_Function_0.csv"),
+            command,
+        )
+        self.assertEqual(
+            len([argument for argument in command if "--relationships" in argument]), 1
+        )
+        self.assertIn("--array-delimiter=U+001F", command)
+
+    def test_array_elements(self):
+        """
+        Test that array elements containing ";" are kept whole, and elements containing
+        the array delimiter are rejected
+        """
+        buffer = GraphBuffer()
+        buffer.add(buffer.node(Function, name="f", args=["a: str = ';'", "b"]))
+
+        sink = CsvGraphSink(self.directory)
+        sink.write(buffer)
+
+        (row,) = read_csv_files(sink.node_files)["Function"]
+        self.assertEqual(
+            row["args:string[]"].split(CSV_ARRAY_DELIMITER), ["a: str = ';'", "b"]
+        )
+
+        buffer = GraphBuffer()
+        buffer.add(buffer.node(Function, name="g", args=[f"a{CSV_ARRAY_DELIMITER}b"]))
+        self.assertRaises(RepographBuildError, sink.write, buffer)
+
+    @parameterized.expand(
+        [
+            [[1, 2], "line:long"],
+            [[1, 2.5], "line:double"],
+            [[True, False], "line:boolean"],
+            [[["a"], ["b", "c"]], "line:string[]"],
+            [[1, "a"], "line:string"],
+            [[datetime.datetime(2023, 1, 1), None], "line:datetime"],
+        ]
+    )
+    def test_column_types(self, values, column):
+        buffer = GraphBuffer()
+        for value in values:
+            buffer.add(buffer.node(Function, name="f", line=value))
+
+        sink = CsvGraphSink(self.directory)
+        sink.write(buffer)
+
+        ((_, columns),) = sink.node_files.keys()
+        self.assertIn(column, columns)
@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import unittest
 from parameterized import parameterized
 
@@ -9,6 +12,7 @@ from repograph.entities.build.utils import (
     is_root_folder,
     get_path_root,
     get_module_and_object_from_canonical_object_name,
+    hash_file_tree,
 )
 
 
@@ -65,3 +69,45 @@ class TestBuildUtils(unittest.TestCase):
         )
         self.assertEqual(root, result_root)
         self.assertEqual(child, result_child)
+
+
+class TestHashFileTree(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _write_tree(self, root: str, files: dict) -> str:
+        path = os.path.join(self.directory, root)
+        for name, content in files.items():
+            os.makedirs(os.path.dirname(os.path.join(path, name)), exist_ok=True)
+            with open(os.path.join(path, name), "w") as file:
+                file.write(content)
+        return path
+
+    def test_identical_trees(self):
+        a = self._write_tree("a/repo", {"main.py": "x = 1", "pkg/util.py": "y = 2"})
+        b = self._write_tree("b/repo", {"pkg/util.py": "y = 2", "main.py": "x = 1"})
+
+        self.assertEqual(hash_file_tree(a), hash_file_tree(b))
+        self.assertNotEqual(hash_file_tree(a), hash_file_tree(a, salt="settings"))
+
+    @parameterized.expand(
+        [
+            ["b/repo", {"main.py": "x = 2"}],
+            ["b/repo", {"other.py": "x = 1"}],
+            ["b/other", {"main.py": "x = 1"}],
+        ]
+    )
+    def test_different_trees(self, root, files):
+        a = self._write_tree("a/repo", {"main.py": "x = 1"})
+        b = self._write_tree(root, files)
+
+        self.assertNotEqual(hash_file_tree(a), hash_file_tree(b))
+
+    def test_ignores_version_control(self):
+        a = self._write_tree("a/repo", {"main.py": "x = 1"})
+        b = self._write_tree("b/repo", {"main.py": "x = 1", ".git/HEAD": "ref"})
+
+        self.assertEqual(hash_file_tree(a), hash_file_tree(b))
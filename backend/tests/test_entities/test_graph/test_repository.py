@@ -58,3 +58,115 @@ class TestGraphRepository(unittest.TestCase):
         self.driver.execute_query.assert_called_with(
             f"DROP DATABASE {GRAPH_NAME} IF EXISTS"
         )
+
+    def test_copy_repository(self):
+        self.graph.run.side_effect = [
+            [
+                {"id": 1, "labels": ["Repository"], "properties": {"name": "repo"}},
+                {"id": 2, "labels": ["Module"], "properties": {"name": "main"}},
+                {"id": 3, "labels": ["Module"], "properties": {"name": "util"}},
+            ],
+            [],
+            [
+                {"start": 1, "end": 2, "type": "Contains", "properties": {}},
+                {"start": 1, "end": 3, "type": "Contains", "properties": {}},
+            ],
+            [],
+        ]
+        txMock = MagicMock(autospec=Transaction)
+        txMock.run.side_effect = [
+            [{"source": 1, "target": 11}],
+            [{"source": 2, "target": 12}],
+            [{"source": 3, "target": 13}],
+            None,
+        ]
+
+        nodes, relationships = self.repository.copy_repository(
+            "source", "repo", txMock, batch_size=2
+        )
+
+        self.assertEqual((nodes, relationships), (3, 2))
+        self.neo4j.__getitem__.assert_called_with("source")
+        self.assertEqual(
+            txMock.run.call_args.kwargs["rows"],
+            [
+                {"start": 11, "end": 12, "properties": {}},
+                {"start": 11, "end": 13, "properties": {}},
+            ],
+        )
+
+    def test_compact_shared_nodes(self):
+        """
+        Test that duplicate nodes are merged into the shared node, or the oldest node
+        """
+        candidates = [
+            {"id": 1, "labels": ["Package"], "name": "numpy", "shared": None},
+            {"id": 5, "labels": ["Package"], "name": "numpy", "shared": None},
+            {"id": 2, "labels": ["Function"], "name": "builtins.len", "shared": None},
+            {"id": 6, "labels": ["Function"], "name": "builtins.len", "shared": True},
+        ]
+        relationships = [
+            {"id": 10, "start": "a", "type": "Calls", "end": "len", "shared": False},
+            {"id": 11, "start": "a", "type": "Calls", "end": "len", "shared": False},
+            {"id": 12, "start": "np", "type": "Contains", "end": "m", "shared": True},
+            {"id": 13, "start": "np", "type": "Contains", "end": "m", "shared": True},
+        ]
+
+        def run(query, **kwargs):
+            if "UNION" in query:
+                return candidates
+            if "DISTINCT type(r)" in query:
+                return [{"type": "Calls"}]
+            if "ORDER BY id" in query:
+                return relationships
+            return []
+
+        txMock = MagicMock(autospec=Transaction)
+        txMock.run.side_effect = run
+        self.graph.begin.return_value = txMock
+
+        self.assertEqual(self.repository.compact_shared_nodes(GRAPH_NAME), (2, 2))
+        txMock.commit.assert_called_once()
+
+        calls = {call.args[0]: call.kwargs for call in txMock.run.call_args_list}
+        moved = [kwargs["rows"] for query, kwargs in calls.items() if "CREATE" in query]
+        self.assertEqual(
+            moved[0], [{"duplicate": 5, "keep": 1}, {"duplicate": 2, "keep": 6}]
+        )
+        deleted = [kwargs for query, kwargs in calls.items() if "DELETE r" in query]
+        self.assertEqual(deleted[-1]["ids"], [13])
+        keys = [
+            kwargs["rows"] for query, kwargs in calls.items() if "r.key = row.key" in query
+        ]
+        self.assertEqual(
+            [row["id"] for row in keys[0]] + [row["id"] for row in keys[1]], [10, 11, 12]
+        )
+        self.assertNotEqual(keys[0][0]["key"], keys[0][1]["key"])
+
+    def test_create_key_constraints(self):
+        self.repository.create_key_constraints(["Function"], GRAPH_NAME)
+        self.neo4j.__getitem__.assert_called_with(GRAPH_NAME)
+        self.graph.run.assert_called_with(
+            "CREATE CONSTRAINT `Function_key` IF NOT EXISTS "
+            "FOR (n:`Function`) REQUIRE n.key IS UNIQUE"
+        )
+
+    def test_merge(self):
+        txMock = MagicMock(autospec=Transaction)
+        nodes = {"Function": [{"key": str(i), "properties": {}} for i in range(3)]}
+        relationships = {
+            ("Calls", "Function", "Function"): [
+                {"start": "0", "end": "1", "key": "a", "properties": {}}
+            ]
+        }
+
+        self.repository.merge(nodes, relationships, tx=txMock, batch_size=2)
+
+        self.assertEqual(txMock.run.call_count, 3)
+        self.assertIn(
+            "MERGE (n:`Function` {key: row.key})", txMock.run.call_args_list[0].args[0]
+        )
+        self.assertIn(
+            "MERGE (a)-[r:`Calls` {key: row.key}]->(b)", txMock.run.call_args.args[0]
+        )
+        txMock.commit.assert_not_called()
@@ -0,0 +1,128 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from repograph.entities.blob.service import BlobService
+from repograph.entities.graph.exceptions import NodeNotFoundError
+from repograph.entities.graph.repository import GraphRepository
+from repograph.entities.graph.service import GraphService
+from repograph.entities.metadata.service import MetadataService
+
+GRAPH_NAME = "example"
+
+FULL_RESULT = {
+    "node": {"name": "func", "canonical_name": "module.func"},
+    "arguments": [{"name": "a", "type": "int", "repository_name": "repo"}],
+    "return_values": [{"name": "result", "type": "str"}],
+    "docstring": {"short_description": "Description."},
+    "parts": [
+        {
+            "labels": ["DocstringArgument", "Argument"],
+            "properties": {"name": "a", "description": "A.", "is_optional": False},
+        },
+        {
+            "labels": ["DocstringReturnValue", "ReturnValue"],
+            "properties": {"description": "The result.", "is_generator": False},
+        },
+        {
+            "labels": ["DocstringRaises"],
+            "properties": {"type": "ValueError", "description": "Invalid."},
+        },
+    ],
+}
+
+COMPACT_RESULT = {
+    "node": {
+        "name": "func",
+        "canonical_name": "module.func",
+        "argument_names": ["a"],
+        "argument_types": ["int"],
+        "return_value_names": ["result"],
+        "return_value_types": ["str"],
+    },
+    "arguments": [],
+    "return_values": [],
+    "docstring": {
+        "short_description": "Description.",
+        "argument_names": ["a"],
+        "argument_types": [""],
+        "argument_descriptions": ["A."],
+        "argument_optional": [False],
+        "argument_defaults": [""],
+        "returns_description": "The result.",
+        "returns_is_generator": False,
+        "raises_types": ["ValueError"],
+        "raises_descriptions": ["Invalid."],
+    },
+    "parts": [{"labels": None, "properties": None}],
+}
+
+
+class TestGraphService(unittest.TestCase):
+    def setUp(self):
+        self.repository = MagicMock(autospec=GraphRepository)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.blobs = BlobService(self.directory)
+        self.service = GraphService(
+            self.repository, MagicMock(autospec=MetadataService), self.blobs
+        )
+
+    def test_get_node_details_layouts(self):
+        """
+        Test that both the compact schema and separate nodes are read the same way
+        """
+        self.repository.execute_query.return_value = [FULL_RESULT]
+        full = self.service.get_node_details(1, GRAPH_NAME)
+
+        self.repository.execute_query.return_value = [COMPACT_RESULT]
+        compact = self.service.get_node_details(1, GRAPH_NAME)
+
+        self.assertEqual(full, compact)
+        self.assertEqual([a.name for a in full.arguments], ["a"])
+        self.assertEqual(full.return_values[0].type, "str")
+        self.assertEqual(full.docstring.arguments[0].description, "A.")
+        self.assertIsNone(full.docstring.arguments[0].type)
+        self.assertEqual(full.docstring.returns.description, "The result.")
+        self.assertEqual(full.docstring.raises[0].type, "ValueError")
+
+    def test_get_node_details_missing(self):
+        self.repository.execute_query.return_value = []
+        self.assertRaises(
+            NodeNotFoundError, self.service.get_node_details, 1, GRAPH_NAME
+        )
+
+    def test_get_function_source(self):
+        """
+        Test that source code and ASTs are read from either the graph or the blob store
+        """
+        self.repository.execute_query.return_value = [
+            {
+                "source_code": None,
+                "source_hash": self.blobs.put("def f():\n    pass\n"),
+                "ast": None,
+                "ast_hash": self.blobs.put("[]"),
+            }
+        ]
+        source = self.service.get_function_source(1, GRAPH_NAME, ast=True)
+        self.assertEqual(source.source_code, "def f():\n    pass\n")
+        self.assertEqual(source.ast, "[]")
+        self.assertIsNone(self.service.get_function_source(1, GRAPH_NAME).ast)
+
+        self.repository.execute_query.return_value = [
+            {
+                "source_code": "def g(): ...",
+                "source_hash": None,
+                "ast": "[]",
+                "ast_hash": None,
+            }
+        ]
+        source = self.service.get_function_source(1, GRAPH_NAME, ast=True)
+        self.assertEqual(source.source_code, "def g(): ...")
+        self.assertEqual(source.ast, "[]")
+
+        self.repository.execute_query.return_value = []
+        self.assertRaises(
+            NodeNotFoundError, self.service.get_function_source, 1, GRAPH_NAME
+        )
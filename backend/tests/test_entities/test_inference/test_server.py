@@ -0,0 +1,145 @@
+import os
+import socket
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from repograph.entities.inference.client import InferenceClient
+from repograph.entities.inference.exceptions import (
+    InferenceError,
+    InferenceServerRunningError,
+)
+from repograph.entities.inference.server import InferenceServer
+from repograph.entities.search.service import SearchService
+from repograph.entities.summarization.service import SummarizationService
+
+
+class FakeEncoder:
+    def encode(self, sentences):
+        if isinstance(sentences, str):
+            return np.array([len(sentences), 1.0])
+        return np.array([[len(sentence), 1.0] for sentence in sentences])
+
+
+class TestInferenceServer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.directory.name, "inference.sock")
+
+        search = SearchService(None)
+        search._model.factory = FakeEncoder
+        summarization = SummarizationService(True)
+        summarization._models.factory = lambda: True
+        summarization.summarize_code_with_outcome = lambda source_code: (
+            f"Summary of {source_code}",
+            "summarized",
+        )
+
+        self.server = InferenceServer(self.address, search, summarization)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        while not os.path.exists(self.address):
+            time.sleep(0.01)
+
+        self.client = InferenceClient(self.address)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.close()
+        self.thread.join()
+        self.directory.cleanup()
+
+    def test_encode(self):
+        """
+        Test that single sentences and batches are encoded by the server
+        """
+        np.testing.assert_array_equal(self.client.encode("abc"), [3, 1])
+        np.testing.assert_array_equal(self.client.encode(["a", "ab"]), [[1, 1], [2, 1]])
+
+    def test_summarize(self):
+        """
+        Test that a service configured with the socket summarizes through the server,
+        and counts the outcomes the server reports
+        """
+        service = SummarizationService(True, inference_socket=self.address)
+        summary = service.summarize_code("def f(): pass")
+
+        self.assertEqual(summary, "Summary of def f(): pass")
+        self.assertIsNone(service.model)
+        self.assertEqual(service.policy_stats.summarized, 1)
+
+    def test_concurrent_clients(self):
+        """
+        Test that the requests of several threads are served concurrently
+        """
+        results = {}
+
+        def encode(index):
+            results[index] = self.client.encode("a" * index).tolist()
+
+        threads = [threading.Thread(target=encode, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {i: [i, 1] for i in range(8)})
+
+    def test_errors(self):
+        """
+        Test that failed and unknown requests raise an InferenceError in the client
+        """
+        self.server.search.active = False
+        self.assertRaises(InferenceError, self.client.encode, "abc")
+        self.assertRaises(InferenceError, self.client._call, "train")
+
+        # The connection is still usable after an error
+        self.assertEqual(self.client.summarize(["x"]), [("Summary of x", "summarized")])
+
+    def test_unreachable(self):
+        """
+        Test that an unreachable server raises an InferenceError
+        """
+        client = InferenceClient(os.path.join(self.directory.name, "missing.sock"))
+        self.assertRaises(InferenceError, client.encode, "abc")
+
+    def test_socket_permissions(self):
+        """
+        Test that the socket is only accessible to its owner
+        """
+        self.assertEqual(stat.S_IMODE(os.stat(self.address).st_mode), 0o600)
+
+    def test_refuses_running_server(self):
+        """
+        Test that a server doesn't replace the socket of a server that is serving
+        """
+        server = InferenceServer(self.address, None, None)
+        self.assertRaises(InferenceServerRunningError, server.serve_forever)
+
+        self.assertEqual(self.client.summarize(["x"]), [("Summary of x", "summarized")])
+
+    def test_replaces_stale_socket(self):
+        """
+        Test that the socket left by a server that wasn't closed is replaced
+        """
+        address = os.path.join(self.directory.name, "stale.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(address)
+
+        server = InferenceServer(address, self.server.search, None)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        while server._listener is None:
+            time.sleep(0.01)
+
+        client = InferenceClient(address)
+        np.testing.assert_array_equal(client.encode("abc"), [3, 1])
+
+        client.close()
+        server.close()
+        thread.join()
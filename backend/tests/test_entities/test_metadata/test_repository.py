@@ -1,11 +1,20 @@
+import os
+import shutil
 import sqlite3
+import tempfile
 import unittest
 import datetime
 from unittest import mock
 from unittest.mock import MagicMock
 
 from repograph.entities.metadata.repository import MetadataRepository
-from repograph.entities.metadata.models import Graph
+from repograph.entities.metadata.models import (
+    Build,
+    BuildJob,
+    BuildPhase,
+    Graph,
+    RepositoryFingerprint,
+)
 from repograph.entities.metadata.utils import datetime_to_string
 
 
@@ -43,3 +52,237 @@ class TestGraphRepository(unittest.TestCase):
                 graph.status,
             ),
         )
+
+
+class TestBuildRepository(unittest.TestCase):
+    repository: MetadataRepository
+
+    def setUp(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), "test.db")
+        self.repository = MetadataRepository(self.db_path)
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.db_path), ignore_errors=True)
+
+    def test_add_and_update_build(self):
+        build = Build(id="build", neo4j_name="test")
+        self.repository.add_build(build)
+
+        result = self.repository.get_build("build")
+        self.assertEqual(result.status, "RUNNING")
+        self.assertIsNone(result.finished)
+        self.assertEqual(result.phases, [])
+        self.assertEqual(result.summarization, {})
+
+        phases = [
+            BuildPhase(name="extraction", wall_time=1.5, cpu_time=0.5),
+            BuildPhase(name="commit", nodes=10, relationships=20),
+        ]
+        self.repository.update_build(
+            build.copy(
+                update={
+                    "status": "SUCCEEDED",
+                    "finished": datetime.datetime.now(),
+                    "phases": phases,
+                    "summarization": {"summarized": 3, "skipped_documented": 2},
+                }
+            )
+        )
+
+        result = self.repository.get_build("build")
+        self.assertEqual(result.status, "SUCCEEDED")
+        self.assertIsNotNone(result.finished)
+        self.assertEqual(result.phases, phases)
+        self.assertEqual(
+            result.summarization, {"summarized": 3, "skipped_documented": 2}
+        )
+        self.assertEqual(self.repository.list_builds("test"), [result])
+
+    def test_get_missing_build(self):
+        self.assertIsNone(self.repository.get_build("missing"))
+
+    def test_delete_builds(self):
+        self.repository.add_build(Build(id="build", neo4j_name="test"))
+        self.repository.delete_builds("test")
+
+        self.assertEqual(self.repository.list_builds("test"), [])
+
+    def test_graph_version(self):
+        self.assertIsNone(self.repository.get_graph_version("test"))
+
+        db = self.repository.get_transaction()
+        self.repository.add_database(
+            Graph(
+                neo4j_name="test",
+                name="test",
+                description="description",
+                created=datetime.datetime.now(),
+            ),
+            db,
+        )
+        db.commit()
+        versions = [self.repository.get_graph_version("test")]
+
+        build = Build(id="build", neo4j_name="test")
+        self.repository.add_build(build)
+        versions.append(self.repository.get_graph_version("test"))
+
+        self.repository.update_build(
+            build.copy(update={"status": "SUCCEEDED", "finished": datetime.datetime.now()})
+        )
+        versions.append(self.repository.get_graph_version("test"))
+
+        self.repository.increment_graph_generation("test")
+        versions.append(self.repository.get_graph_version("test"))
+        self.repository.increment_graph_generation("test")
+        versions.append(self.repository.get_graph_version("test"))
+
+        self.assertEqual(len(set(versions)), 5)
+        self.assertEqual(self.repository.get_graph_version("test"), versions[-1])
+
+        self.repository.delete_graph_generation("test")
+        self.assertEqual(self.repository.get_graph_version("test"), versions[2])
+
+
+class TestRepositoryFingerprintRepository(unittest.TestCase):
+    repository: MetadataRepository
+
+    def setUp(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), "test.db")
+        self.repository = MetadataRepository(self.db_path)
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.db_path), ignore_errors=True)
+
+    def _add_graph(self, neo4j_name: str, status: str) -> None:
+        db = self.repository.get_transaction()
+        self.repository.add_database(
+            Graph(
+                neo4j_name=neo4j_name,
+                name=neo4j_name,
+                description="description",
+                created=datetime.datetime.now(),
+                status=status,
+            ),
+            db,
+        )
+        db.commit()
+
+    def test_find_repository_fingerprints(self):
+        self._add_graph("created", "CREATED")
+        self._add_graph("pending", "PENDING")
+        for index, graph in enumerate(["pending", "created"]):
+            self.repository.add_repository_fingerprint(
+                RepositoryFingerprint(
+                    neo4j_name=graph,
+                    name="repo",
+                    fingerprint="fingerprint",
+                    created=datetime.datetime.now() + datetime.timedelta(seconds=index),
+                )
+            )
+
+        fingerprints = self.repository.find_repository_fingerprints("fingerprint")
+        self.assertEqual([f.neo4j_name for f in fingerprints], ["created"])
+        self.assertEqual(fingerprints[0].name, "repo")
+        self.assertEqual(self.repository.find_repository_fingerprints("other"), [])
+
+        self.repository.delete_repository_fingerprints("created")
+        self.assertEqual(self.repository.find_repository_fingerprints("fingerprint"), [])
+
+
+class TestBuildJobRepository(unittest.TestCase):
+    repository: MetadataRepository
+
+    def setUp(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), "test.db")
+        self.repository = MetadataRepository(self.db_path)
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.db_path), ignore_errors=True)
+
+    def _add_job(self, job_id: str, fingerprint: str = "fingerprint") -> BuildJob:
+        job = BuildJob(
+            id=job_id,
+            name="test",
+            description="description",
+            inputs=["/tmp/input"],
+            cleanup=["/tmp/upload"],
+            fingerprint=fingerprint,
+            created=datetime.datetime.now() + datetime.timedelta(seconds=len(job_id)),
+        )
+        self.repository.add_job(job)
+        return job
+
+    def test_add_and_get_job(self):
+        job = self._add_job("a")
+
+        result = self.repository.get_job("a")
+        self.assertEqual(result.inputs, job.inputs)
+        self.assertEqual(result.cleanup, job.cleanup)
+        self.assertEqual(result.status, "QUEUED")
+        self.assertIsNone(self.repository.get_job("missing"))
+
+    def test_claim_job_in_order(self):
+        self._add_job("a")
+        self._add_job("bb")
+
+        first = self.repository.claim_job("worker")
+        second = self.repository.claim_job("worker")
+
+        self.assertEqual(first.id, "a")
+        self.assertEqual(first.status, "RUNNING")
+        self.assertEqual(first.worker, "worker")
+        self.assertIsNotNone(first.started)
+        self.assertEqual(second.id, "bb")
+        self.assertIsNone(self.repository.claim_job("worker"))
+
+    def test_find_queued_job(self):
+        self._add_job("a")
+
+        self.assertEqual(self.repository.find_queued_job("fingerprint").id, "a")
+        self.assertIsNone(self.repository.find_queued_job("other"))
+
+        self.repository.claim_job("worker")
+        self.assertIsNone(self.repository.find_queued_job("fingerprint"))
+
+    def test_progress_and_finish(self):
+        self._add_job("a")
+        self.repository.claim_job("worker")
+
+        self.assertFalse(self.repository.update_job_progress("a", 0.5, "call_graph"))
+        result = self.repository.get_job("a")
+        self.assertEqual(result.progress, 0.5)
+        self.assertEqual(result.phase, "call_graph")
+
+        self.repository.finish_job("a", "SUCCEEDED", None)
+        result = self.repository.get_job("a")
+        self.assertEqual(result.status, "SUCCEEDED")
+        self.assertEqual(result.progress, 1.0)
+        self.assertIsNotNone(result.finished)
+
+    def test_cancel_job(self):
+        self._add_job("a")
+        self._add_job("bb")
+        self.repository.claim_job("worker")
+
+        self.repository.cancel_job("a")
+        self.repository.cancel_job("bb")
+
+        self.assertEqual(self.repository.get_job("a").status, "RUNNING")
+        self.assertTrue(self.repository.update_job_progress("a", 0.5, None))
+        self.assertEqual(self.repository.get_job("bb").status, "CANCELLED")
+        self.assertEqual(self.repository.list_jobs("CANCELLED")[0].id, "bb")
+
+    def test_requeue_running_jobs(self):
+        self._add_job("a")
+        self._add_job("bb")
+        self.repository.claim_job("worker")
+        self.repository.claim_job("worker")
+        self.repository.cancel_job("bb")
+
+        self.assertEqual(self.repository.requeue_running_jobs(), 1)
+
+        result = self.repository.get_job("a")
+        self.assertEqual(result.status, "QUEUED")
+        self.assertIsNone(result.worker)
+        self.assertEqual(self.repository.get_job("bb").status, "CANCELLED")
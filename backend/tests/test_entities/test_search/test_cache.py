@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from repograph.entities.search.cache import LRUCache, approximate_size
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_stats(self):
+        cache = LRUCache(2, sizeof=len)
+        cache.put("a", "xyz")
+        cache.put("a", "xy")
+        cache.get("a")
+        cache.get("b")
+
+        stats = cache.stats()
+        self.assertEqual(stats.entries, 1)
+        self.assertEqual(stats.bytes, approximate_size("a") + 2)
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+        self.assertEqual(stats.hit_rate, 0.5)
+
+        cache.clear()
+        self.assertEqual((cache.stats().entries, cache.stats().bytes), (0, 0))
+
+    def test_disabled(self):
+        cache = LRUCache(0)
+        cache.put("a", 1)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats().entries, 0)
+
+    @parameterized.expand([[np.zeros(256)], [np.zeros((2, 256))[0]]])
+    def test_array_size(self, array):
+        """
+        Test that the data of arrays, including views, is counted
+        """
+        self.assertGreaterEqual(approximate_size(array), array.nbytes)
+
+    def test_key_size(self):
+        """
+        Test that keys are sized with their items, and values with the given sizeof
+        """
+        cache = LRUCache(1, sizeof=len)
+        cache.put(("graph", "query"), [1, 2, 3])
+
+        self.assertGreater(cache.stats().bytes, len("graph") + len("query") + 3)
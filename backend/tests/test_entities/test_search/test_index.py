@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from repograph.entities.graph.models.nodes import Function
+from repograph.entities.search.index import SummarizationIndex
+from repograph.entities.search.models import SearchFilters
+
+FUNCTIONS = [
+    ("b", "b.module.run", Function.FunctionType.FUNCTION),
+    ("a", "a.module.Class.run", Function.FunctionType.METHOD),
+    ("a", "a.module.run", Function.FunctionType.FUNCTION),
+    ("a", "a.modules.run", Function.FunctionType.FUNCTION),
+    ("a", "a.tests.test_module.test_run", Function.FunctionType.FUNCTION),
+]
+
+
+def encode(sentences):
+    return np.array([[float(len(sentence))] for sentence in sentences])
+
+
+class TestSummarizationIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = SummarizationIndex(
+            {
+                f"Summary of {name}": Function(
+                    name=name.split(".")[-1],
+                    canonical_name=name,
+                    type=function_type,
+                    repository_name=repository,
+                )
+                for repository, name, function_type in FUNCTIONS
+            },
+            encode,
+        )
+
+    def test_partitions_sorted_by_repository(self):
+        self.assertEqual(
+            [function.repository_name for function in self.index.functions],
+            ["a", "a", "a", "a", "b"],
+        )
+        self.assertEqual(self.index.embeddings.shape, (5, 1))
+        self.assertGreater(self.index.nbytes, 0)
+
+    @parameterized.expand(
+        [
+            [None, [0, 1, 2, 3, 4]],
+            [SearchFilters(repository="b"), [4]],
+            [SearchFilters(repository="missing"), []],
+            [SearchFilters(repository="a", type="Method"), [0]],
+            [SearchFilters(module="a.module"), [0, 1]],
+            [SearchFilters(module="a.module."), [0, 1]],
+            [SearchFilters(is_test=True), [3]],
+            [SearchFilters(repository="a", is_test=False, type="Function"), [1, 2]],
+        ]
+    )
+    def test_select(self, filters, rows):
+        """
+        Test that filters select the rows of matching partitions
+        """
+        names = [self.index.functions[row].canonical_name for row in rows]
+        selected = self.index.select(filters)
+
+        self.assertEqual(
+            [self.index.functions[row].canonical_name for row in selected], names
+        )
+
+    def test_empty(self):
+        index = SummarizationIndex({}, encode)
+
+        self.assertEqual(len(index), 0)
+        self.assertEqual(len(index.select(SearchFilters(module="a"))), 0)
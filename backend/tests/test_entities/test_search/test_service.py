@@ -0,0 +1,302 @@
+import datetime
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from repograph.entities.graph.models.nodes import Function
+from repograph.entities.graph.repository import GraphRepository
+from repograph.entities.graph.service import GraphService
+from repograph.entities.metadata.models import Graph
+from repograph.entities.metadata.repository import MetadataRepository
+from repograph.entities.metadata.service import MetadataService
+from repograph.entities.search.batching import MicroBatcher
+from repograph.entities.search.models import SearchFilters
+from repograph.entities.search.service import RANKING_ROW_SIZE, SearchService
+
+SUMMARIZATIONS = {
+    f"Summary {i}": Function(
+        name=f"f{i}",
+        canonical_name=f"module.f{i}",
+        type=Function.FunctionType.FUNCTION,
+        repository_name="repository",
+    )
+    for i in range(3)
+}
+
+
+class CountingEncoder:
+    """Embeds each sentence as its length, recording the size of each batch."""
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, sentences):
+        self.batches.append(len(sentences))
+        time.sleep(0.01)
+        return np.array([[float(len(sentence))] for sentence in sentences])
+
+
+def run_concurrently(target, count):
+    results = [None] * count
+
+    def run(index):
+        results[index] = target(index)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_batches_concurrent_requests(self):
+        """
+        Test that concurrent requests are processed in batches, and get their own result
+        """
+        batches = []
+
+        def process(requests):
+            batches.append(list(requests))
+            time.sleep(0.01)
+            return [request * 2 for request in requests]
+
+        batcher = MicroBatcher(process, max_wait=0.005, max_batch=4)
+        results = run_concurrently(batcher.submit, 12)
+
+        self.assertEqual(results, [i * 2 for i in range(12)])
+        self.assertLess(len(batches), 12)
+        self.assertTrue(all(len(batch) <= 4 for batch in batches))
+
+    def test_errors(self):
+        """
+        Test that an error processing a batch is raised for each of its requests
+        """
+
+        def process(requests):
+            raise ValueError("failed")
+
+        batcher = MicroBatcher(process)
+        self.assertRaises(ValueError, batcher.submit, 1)
+        self.assertRaises(ValueError, batcher.submit, 2)
+
+
+@patch("repograph.entities.search.service.remove_stop_words", lambda query: query)
+class TestSemanticSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.graph = MagicMock()
+        self.graph.get_function_summarizations.return_value = SUMMARIZATIONS
+        self.graph.get_source_code.return_value = "def f(): pass"
+        self.graph.get_graph_version.return_value = "1"
+
+        self.encoder = CountingEncoder()
+        self.service = SearchService(self.graph, batch_wait_ms=20)
+        self.service._model.factory = lambda: self.encoder
+
+    def test_single_query(self):
+        results = self.service.find_similar_functions_by_query("graph", "abc", 0, 2)
+
+        self.assertEqual(results.total, 3)
+        self.assertEqual(len(results.results), 2)
+        self.assertEqual(results.results[0].score, 3 * len("module.f0 k"))
+        self.assertEqual(results.results[0].function.source_code, "def f(): pass")
+
+    def test_concurrent_queries(self):
+        """
+        Test that concurrent queries are encoded and scored in batches
+        """
+        results = run_concurrently(
+            lambda i: self.service.find_similar_functions_by_query(
+                f"graph{i % 2}", "a" * (i + 1), 0, 1
+            ),
+            8,
+        )
+
+        self.assertEqual(
+            [result.results[0].score for result in results],
+            [(i + 1) * len("module.f0 k") for i in range(8)],
+        )
+        # Fewer encodes than one for each query and one for each query's summarizations
+        self.assertLess(len(self.encoder.batches), 16)
+        self.assertGreater(max(self.encoder.batches), 3)
+
+    def test_cached_pages(self):
+        """
+        Test that further pages of a query, in any case, are served from the cache
+        """
+        first = self.service.find_similar_functions_by_query("graph", "abc", 0, 2)
+        second = self.service.find_similar_functions_by_query("graph", " ABC ", 2, 2)
+
+        self.assertEqual(self.encoder.batches, [1, 3])
+        self.assertEqual(second.total, 3)
+        self.assertEqual(
+            [result.function.name for result in first.results + second.results],
+            ["f0", "f1", "f2"],
+        )
+
+        stats = self.service.cache_stats()
+        self.assertEqual((stats.results.hits, stats.results.misses), (1, 1))
+        self.assertEqual(stats.queries.entries, 1)
+        self.assertGreater(stats.results.bytes, 3 * RANKING_ROW_SIZE)
+
+    def test_graph_version(self):
+        """
+        Test that results are recomputed once the graph is rebuilt, without re-encoding
+        the query
+        """
+        self.service.find_similar_functions_by_query("graph", "abc", 0, 1)
+        self.graph.get_graph_version.return_value = "2"
+        self.service.find_similar_functions_by_query("graph", "abc", 0, 1)
+
+        self.assertEqual(self.encoder.batches, [1, 3, 3])
+        self.assertEqual(self.service.cache_stats().queries.hits, 1)
+
+    def test_filters(self):
+        """
+        Test that filtered queries only score matching functions, with the graph encoded
+        once for all of them
+        """
+        self.graph.get_function_summarizations.return_value = {
+            "Other summary": Function(
+                name="g",
+                canonical_name="other.g",
+                type=Function.FunctionType.METHOD,
+                repository_name="other",
+            ),
+            **SUMMARIZATIONS,
+        }
+
+        unfiltered = self.service.find_similar_functions_by_query("graph", "a", 0, 5)
+        filtered = self.service.find_similar_functions_by_query(
+            "graph", "a", 0, 5, filters=SearchFilters(repository="other")
+        )
+        methods = self.service.find_similar_functions_by_query(
+            "graph", "a", 0, 5, filters=SearchFilters(type="Function")
+        )
+
+        self.assertEqual(unfiltered.total, 4)
+        self.assertEqual([r.function.name for r in filtered.results], ["g"])
+        self.assertEqual(methods.total, 3)
+        self.assertEqual(self.encoder.batches, [1, 4])
+
+    def test_cached_functions_unchanged(self):
+        """
+        Test that adding source code to results doesn't change the cached functions
+        """
+        self.service.find_similar_functions_by_query("graph", "abc", 0, 1)
+        ranking = self.service._results.get(("graph", "1", "abc", None))
+
+        self.assertIsNone(ranking[0][0].source_code)
+
+
+@patch("repograph.entities.search.service.remove_stop_words", lambda query: query)
+class TestSemanticSearchGraphWrites(unittest.TestCase):
+    def setUp(self) -> None:
+        metadata = MetadataService(
+            MetadataRepository(os.path.join(tempfile.mkdtemp(), "test.db"))
+        )
+        for name in ["source", "target"]:
+            tx = metadata.get_transaction()
+            metadata.register_graph(
+                Graph(
+                    neo4j_name=name,
+                    name=name,
+                    description="",
+                    created=datetime.datetime.now(),
+                    status="CREATED",
+                ),
+                tx,
+            )
+            tx.commit()
+
+        self.summarizations = dict(SUMMARIZATIONS)
+        self.graph = GraphService(MagicMock(autospec=GraphRepository), metadata)
+        self.graph.get_function_summarizations = MagicMock(
+            side_effect=lambda graph: dict(self.summarizations)
+        )
+        self.graph.get_repository_names = MagicMock(
+            side_effect=lambda graph: ["copied"] if graph == "source" else []
+        )
+        self.graph.get_source_code = MagicMock(return_value=None)
+
+        self.service = SearchService(self.graph, batch_wait_ms=0)
+        self.service._model.factory = lambda: CountingEncoder()
+
+    def test_copy_repository(self):
+        """
+        Test that a repeated query sees a repository copied into the graph
+        """
+
+        def copy_repository(source_graph, repository_name, tx):
+            self.summarizations["Copied summary"] = Function(
+                name="copied",
+                canonical_name="copied.module.function_with_a_long_name",
+                type=Function.FunctionType.FUNCTION,
+                repository_name="copied",
+            )
+            return 1, 0
+
+        self.graph.repository.copy_repository.side_effect = copy_repository
+
+        before = self.service.find_similar_functions_by_query("target", "a", 0, 5)
+        self.graph.copy_repository("source", "target", "copied")
+        after = self.service.find_similar_functions_by_query("target", "a", 0, 5)
+
+        self.assertEqual(before.total, 3)
+        self.assertEqual(after.total, 4)
+        self.assertEqual(after.results[0].function.name, "copied")
+
+
+class TestIncorrectDocstrings(unittest.TestCase):
+    def setUp(self) -> None:
+        self.graph = MagicMock()
+        self.graph.get_unscored_docstrings.return_value = [
+            {"id": 1, "summarization": "ab", "docstring": "abc"},
+            {"id": 2, "summarization": "abcd", "docstring": "a"},
+        ]
+        self.graph.get_dissimilar_docstrings.return_value = [
+            {
+                "name": "module.f",
+                "type": ["Function"],
+                "summarization": "Summary",
+                "docstring": "Docstring",
+                "similarity": 0.12345,
+                "repository": "repository",
+            }
+        ]
+
+        self.encoder = CountingEncoder()
+        self.service = SearchService(self.graph)
+        self.service._model.factory = lambda: self.encoder
+
+    def test_score_docstrings(self):
+        """
+        Test that unscored docstrings are scored with one encode of each column
+        """
+        self.assertEqual(self.service.score_docstrings("graph"), 2)
+
+        self.assertEqual(self.encoder.batches, [2, 2])
+        self.graph.set_docstring_similarities.assert_called_once_with(
+            "graph", {1: 6.0, 2: 4.0}
+        )
+
+    def test_score_scored_docstrings(self):
+        self.graph.get_unscored_docstrings.return_value = []
+
+        self.assertEqual(self.service.score_docstrings("graph"), 0)
+        self.assertEqual(self.encoder.batches, [])
+        self.graph.set_docstring_similarities.assert_not_called()
+
+    def test_find_incorrect_docstrings(self):
+        results = self.service.find_incorrect_docstrings("graph")
+
+        self.graph.get_dissimilar_docstrings.assert_called_once_with("graph", 0.25)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].type, "Function")
+        self.assertEqual(results[0].similarity, 0.123)
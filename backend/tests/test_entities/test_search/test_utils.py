@@ -1,6 +1,10 @@
 import unittest
 from parameterized import parameterized
-from repograph.entities.search.utils import remove_stop_words, clean_source_code
+from repograph.entities.search.utils import (
+    clean_source_code,
+    is_test_function,
+    remove_stop_words,
+)
 
 
 class TestSearchUtils(unittest.TestCase):
@@ -36,3 +40,17 @@ class TestSearchUtils(unittest.TestCase):
         output = clean_source_code(original)
         output = " ".join(output.split())
         self.assertEqual(output, target)
+
+    @parameterized.expand(
+        [
+            ["package.module.function", False],
+            ["package.module.test_function", True],
+            ["package.tests.module.function", True],
+            ["package.test_module.Class.function", True],
+            ["package.module_test.function", True],
+            ["package.testing.function", False],
+            [None, False],
+        ]
+    )
+    def test_is_test_function(self, canonical_name, target):
+        self.assertEqual(is_test_function(canonical_name), target)
@@ -0,0 +1,49 @@
+import unittest
+from parameterized import parameterized
+from pydantic import ValidationError
+
+from evaluation.summarization_parity import DEFAULT_PATH, compare, sample_functions
+from repograph.entities.summarization.backends import load_model
+from repograph.entities.summarization.models import GenerationSettings
+
+
+class TestGenerationSettings(unittest.TestCase):
+    @parameterized.expand(
+        [
+            [dict(), {"max_length": 200}],
+            [dict(max_length=None), {"max_length": 200}],
+            [dict(num_beams=1, max_length=64), {"num_beams": 1, "max_length": 64}],
+        ]
+    )
+    def test_kwargs(self, settings, expected):
+        self.assertEqual(GenerationSettings(**settings).kwargs(), expected)
+
+    @parameterized.expand([[dict(num_beams=0)], [dict(max_length=0)]])
+    def test_invalid(self, settings):
+        self.assertRaises(ValidationError, GenerationSettings, **settings)
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, load_model, "tensorrt", "model")
+
+
+class TestSummarizationParity(unittest.TestCase):
+    def test_sample_functions(self):
+        functions = sample_functions(DEFAULT_PATH, 10)
+        self.assertEqual(len(functions), 10)
+        self.assertTrue(all(f.lstrip().startswith(("def", "async")) for f in functions))
+
+    def test_compare(self):
+        result = compare(
+            "quantized",
+            GenerationSettings(num_beams=1),
+            ["Return the sum of a and b", "Parse a file"],
+            ["Return the sum of a and b", "Parse the file"],
+            tokens=20,
+            seconds=2.0,
+            baseline_seconds=4.0,
+        )
+
+        self.assertEqual(result.agreement, 0.5)
+        self.assertAlmostEqual(result.similarity, (1 + 2 / 3) / 2)
+        self.assertEqual(result.tokens_per_second, 10)
+        self.assertEqual(result.speedup, 2)
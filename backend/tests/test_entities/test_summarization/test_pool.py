@@ -0,0 +1,32 @@
+import unittest
+from parameterized import parameterized
+
+from repograph.entities.summarization.pool import assign_cores
+
+
+class TestAssignCores(unittest.TestCase):
+    @parameterized.expand(
+        [
+            [[0, 1, 2, 3, 4, 5, 6, 7], 4, None, [[0, 1], [2, 3], [4, 5], [6, 7]]],
+            [[0, 1, 2, 3, 4, 5, 6, 7], 3, None, [[0, 1], [2, 3], [4, 5]]],
+            [[0, 1, 2, 3, 4, 5, 6, 7], 2, 3, [[0, 1, 2], [3, 4, 5]]],
+            [[3, 1, 2, 0], 1, None, [[0, 1, 2, 3]]],
+        ]
+    )
+    def test_assign_cores(self, cores, replicas, threads, expected):
+        """
+        Test that cores are divided between replicas without overlapping
+        """
+        self.assertEqual(assign_cores(cores, replicas, threads), expected)
+
+    @parameterized.expand(
+        [
+            [[0, 1], 4, None, [[0], [1], [0], [1]]],
+            [[0, 1, 2], 2, 2, [[0, 1], [2, 0]]],
+        ]
+    )
+    def test_assign_cores_shared(self, cores, replicas, threads, expected):
+        """
+        Test that cores are shared when there are fewer cores than the replicas need
+        """
+        self.assertEqual(assign_cores(cores, replicas, threads), expected)
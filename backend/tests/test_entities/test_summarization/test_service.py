@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from parameterized import parameterized
+from pydantic import ValidationError
+
+from repograph.entities.summarization.models import PolicyStats, SummarizationPolicy
+from repograph.entities.summarization.service import SummarizationService
+from tests.test_entities.test_summarization.test_utils import WhitespaceTokenizer
+
+SHORT_FUNCTION = "def get_name(self):\n    return self.name\n"
+
+DOCUMENTED_FUNCTION = '''def get_name(self):
+    """Get the name of the object."""
+    return self.name
+'''
+
+LONG_FUNCTION = "def parse(path):\n" + "    x = 1\n" * 20
+
+
+class TestSummarizationPolicy(unittest.TestCase):
+    def summarize(self, policy, source_code):
+        service = SummarizationService(policy=SummarizationPolicy(**policy))
+        service.tokenizer = WhitespaceTokenizer()
+        service._generate = MagicMock(return_value=["Model summary."])
+
+        with patch(
+            "repograph.entities.summarization.service.generate_summaries",
+            return_value=["Cascade summary."],
+        ):
+            summary = service.summarize_code(source_code)
+
+        return summary, service.policy_stats
+
+    @parameterized.expand(
+        [
+            [dict(), SHORT_FUNCTION, "Model summary.", "summarized"],
+            [dict(), DOCUMENTED_FUNCTION, "Model summary.", "summarized"],
+            [dict(policy="skip"), SHORT_FUNCTION, "Get name.", "skipped_short"],
+            [dict(policy="skip"), LONG_FUNCTION, "Model summary.", "summarized"],
+            [
+                dict(policy="skip"),
+                DOCUMENTED_FUNCTION,
+                "Get name.",
+                "skipped_documented",
+            ],
+            [
+                dict(policy="cascade"),
+                DOCUMENTED_FUNCTION,
+                "Get name.",
+                "skipped_documented",
+            ],
+            [
+                dict(policy="skip", summarize_documented=True),
+                DOCUMENTED_FUNCTION,
+                "Get name.",
+                "skipped_short",
+            ],
+            [dict(policy="cascade"), SHORT_FUNCTION, "Cascade summary.", "cascaded"],
+            [dict(policy="cascade"), LONG_FUNCTION, "Model summary.", "summarized"],
+        ]
+    )
+    def test_policy(self, policy, source_code, expected, outcome):
+        """
+        Test that functions are summarized, skipped or cascaded by the policy
+        """
+        summary, stats = self.summarize(policy, source_code)
+
+        self.assertEqual(summary, expected)
+        self.assertEqual(getattr(stats, outcome), 1)
+        self.assertEqual(sum(stats.dict().values()), 1)
+
+    def test_stats(self):
+        """
+        Test that outcomes are counted in the given stats as well as the service's
+        """
+        service = SummarizationService(policy=SummarizationPolicy(policy="skip"))
+        service.tokenizer = WhitespaceTokenizer()
+        stats = PolicyStats()
+
+        service.summarize_code(SHORT_FUNCTION, stats)
+        service.summarize_code(DOCUMENTED_FUNCTION)
+
+        self.assertEqual(stats, PolicyStats(skipped_short=1))
+        self.assertEqual(
+            service.policy_stats, PolicyStats(skipped_short=1, skipped_documented=1)
+        )
+
+    def test_unknown_policy(self):
+        self.assertRaises(ValidationError, SummarizationPolicy, policy="never")
@@ -0,0 +1,109 @@
+import unittest
+from types import SimpleNamespace
+from parameterized import parameterized
+
+from repograph.entities.summarization.utils import (
+    clean_source_code,
+    prepare_source,
+    split_signature,
+)
+
+LONG_FUNCTION = '''    def parse(self, path):
+        """Parse a file."""
+        query = """
+        MATCH (n) RETURN n
+        """
+        return query
+'''
+
+SIGNATURE = "@cached\ndef add(a, b):\n"
+
+
+class WhitespaceTokenizer:
+    """Tokenizes words as their lengths, with a start and an end token."""
+
+    def __call__(self, text, add_special_tokens=True):
+        return SimpleNamespace(input_ids=[len(word) for word in text.split()])
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+    def build_inputs_with_special_tokens(self, input_ids):
+        return [0] + input_ids + [0]
+
+
+class TestSummarizationUtils(unittest.TestCase):
+    @parameterized.expand(
+        [
+            [
+                LONG_FUNCTION,
+                "def parse(self, path): query = \"\"\" MATCH (n) RETURN n \"\"\" "
+                "return query",
+            ],
+            [
+                "def square(n):\n    '''Square n.\n\n    Returns:\n        int\n    '''"
+                "\n    return n**2\n",
+                "def square(n): return n**2",
+            ],
+            [
+                "def square(n):\n    return n**2\n",
+                "def square(n): return n**2",
+            ],
+            [
+                "def square(n): return n**2\n",
+                "def square(n): return n**2",
+            ],
+            [
+                'def square(n)\n    """Square n."""\n    return """a"""\n',
+                'def square(n) return """a"""',
+            ],
+        ]
+    )
+    def test_clean_source_code(self, original, target):
+        """
+        Test that only the leading docstring is removed
+        """
+        output = " ".join(clean_source_code(original).split())
+        self.assertEqual(output, target)
+
+    def test_split_signature(self):
+        signature, body = split_signature(SIGNATURE + '    """Add."""\n    return a + b\n')
+        self.assertEqual(signature, SIGNATURE)
+        self.assertEqual(body, '    """Add."""\n    return a + b\n')
+
+    def test_prepare_short_source(self):
+        """
+        Test that source code which fits the window isn't truncated
+        """
+        prepared = prepare_source(WhitespaceTokenizer(), "def f(a):\n    return a\n", 8)
+        self.assertEqual(prepared.chunks, [[0, 3, 5, 6, 1, 0]])
+        self.assertEqual(prepared.tokens, 4)
+        self.assertEqual(prepared.truncated_tokens, 0)
+
+    @parameterized.expand(
+        [
+            [1, [[0, 3, 7, 1, 1, 0]], 3],
+            [2, [[0, 3, 7, 1, 1, 0], [0, 3, 7, 1, 1, 0]], 1],
+            [3, [[0, 3, 7, 1, 1, 0], [0, 3, 7, 1, 1, 0], [0, 3, 7, 1, 0]], 0],
+        ]
+    )
+    def test_prepare_long_source(self, max_chunks, chunks, truncated_tokens):
+        """
+        Test that the signature is kept in every chunk, and the head of the body first
+        """
+        source_code = "def add(a):\n    a\n    b\n    c\n    d\n    e\n"
+        prepared = prepare_source(WhitespaceTokenizer(), source_code, 6, max_chunks)
+
+        self.assertEqual(prepared.chunks, chunks)
+        self.assertEqual(prepared.tokens, 7)
+        self.assertEqual(prepared.truncated_tokens, truncated_tokens)
+
+    def test_prepare_long_signature(self):
+        """
+        Test that the signature is limited to half of the window
+        """
+        source_code = "def add(a,\n        b):\n    return a\n"
+        prepared = prepare_source(WhitespaceTokenizer(), source_code, 6)
+
+        self.assertEqual(prepared.chunks, [[0, 3, 6, 6, 1, 0]])
+        self.assertEqual(prepared.truncated_tokens, 1)
@@ -0,0 +1,61 @@
+import threading
+import time
+import unittest
+
+from evaluation.startup import measure_import
+from repograph.utils.lazy import Lazy
+
+
+class TestLazy(unittest.TestCase):
+    def test_created_once(self):
+        """
+        Test that the value is only created once when first used by several threads
+        """
+        calls = []
+
+        def factory():
+            calls.append(None)
+            time.sleep(0.05)
+            return object()
+
+        lazy = Lazy(factory)
+        self.assertFalse(lazy.loaded)
+
+        values = []
+        threads = [
+            threading.Thread(target=lambda: values.append(lazy.get())) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(lazy.loaded)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(set(map(id, values))), 1)
+
+    def test_retried_after_error(self):
+        """
+        Test that the value is created again on next use if creating it failed
+        """
+        results = iter([ValueError("download failed"), "value"])
+
+        def factory():
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        lazy = Lazy(factory)
+        self.assertRaises(ValueError, lazy.get)
+        self.assertFalse(lazy.loaded)
+        self.assertEqual(lazy.get(), "value")
+
+
+class TestStartup(unittest.TestCase):
+    def test_no_heavy_imports(self):
+        """
+        Test that models' dependencies aren't imported until the models are used
+        """
+        result = measure_import("repograph.container", repeat=1)
+        self.assertEqual(result.heavy_modules, [])